@@ -207,7 +207,23 @@ async def initialize_bot(force_sync=False):
         # Set bot status
         activity = discord.Activity(type=discord.ActivityType.watching, name="Emeralds Killfeed")
         await bot.change_presence(activity=activity)
-        
+
+        # Set the channel static embed icons are uploaded to
+        try:
+            from config import ICON_ASSET_CHANNEL_ID
+            if ICON_ASSET_CHANNEL_ID:
+                from utils.embed_icons import set_icon_asset_channel
+                set_icon_asset_channel(bot.get_channel(int(ICON_ASSET_CHANNEL_ID)))
+        except Exception as e:
+            logger.warning(f"Error setting icon asset channel: {e}")
+
+        # Pre-render card and roulette images for the gambling games
+        try:
+            from utils.image_atlas import build_image_atlas
+            await build_image_atlas()
+        except Exception as e:
+            logger.warning(f"Error building image atlas: {e}")
+
         # Initialize guilds database records for all connected guilds
         # This ensures guilds added while bot was offline are properly registered
         await sync_guilds_with_database(bot)
@@ -263,6 +263,192 @@ class Admin(commands.Cog):
             , guild=guild_model)
             await ctx.send(embed=embed)
 
+    @admin.command(name="queries", description="Show the most costly database query shapes")
+    @app_commands.describe(limit="Number of query shapes to show (1-20)")
+    @requires_home_guild_admin()
+    async def queries(self, ctx, limit: int = 10):
+        """Show the most costly database query shapes (Home Guild Admins only)"""
+        guild_model = None
+        try:
+            # Get guild model for themed embed
+            try:
+                guild_model = await Guild.get_by_guild_id(self.bot.db, str(ctx.guild.id))
+            except Exception as e:
+                logger.warning(f"Error getting guild model: {e}")
+
+            from utils.query_profiler import get_query_profiler
+            profiler = get_query_profiler()
+            limit = max(1, min(limit, 20))
+            shapes = profiler.get_top_shapes(limit=limit)
+
+            embed = await EmbedBuilder.create_base_embed(
+                "Database Query Profile",
+                f"Top {limit} query shapes by total time"
+            , guild=guild_model)
+
+            if not shapes:
+                embed.add_field(name="No Data", value="No queries have been recorded yet.", inline=False)
+
+            for index, shape in enumerate(shapes, start=1):
+                shape_text = shape["shape"]
+                if len(shape_text) > 200:
+                    shape_text = shape_text[:197] + "..."
+                embed.add_field(
+                    name=f"{index}. {shape['collection']}.{shape['operation']}",
+                    value=(
+                        f"`{shape_text}`\n"
+                        f"Calls: {shape['count']} | Total: {shape['total_ms']:.0f}ms | "
+                        f"Avg: {shape['avg_ms']:.1f}ms | Max: {shape['max_ms']:.0f}ms | "
+                        f"Docs: {shape['documents']}"
+                    ),
+                    inline=False
+                )
+
+            slow_count = len(profiler.get_slow_samples())
+            embed.set_footer(text=f"Slow query samples: {slow_count} (threshold {profiler.slow_query_threshold}ms)")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            logger.error(f"Error getting query profile: {e}", exc_info=True)
+            embed = await EmbedBuilder.create_error_embed(
+                "Error",
+                f"An error occurred while getting the query profile: {e}"
+            , guild=guild_model)
+            await ctx.send(embed=embed)
+
+    @admin.command(name="killfeed", description="Show killfeed dispatcher queue and latency metrics")
+    @requires_home_guild_admin()
+    async def killfeed_metrics(self, ctx):
+        """Show killfeed dispatcher queue and latency metrics (Home Guild Admins only)"""
+        guild_model = None
+        try:
+            # Get guild model for themed embed
+            try:
+                guild_model = await Guild.get_by_guild_id(self.bot.db, str(ctx.guild.id))
+            except Exception as e:
+                logger.warning(f"Error getting guild model: {e}")
+
+            from utils.killfeed_dispatcher import get_killfeed_dispatcher
+            stats = get_killfeed_dispatcher().get_stats()
+
+            embed = await EmbedBuilder.create_base_embed(
+                "Killfeed Dispatcher",
+                "Outbound killfeed queue metrics"
+            , guild=guild_model)
+
+            embed.add_field(
+                name="Queue",
+                value=(
+                    f"Queued: {stats['queued']}\n"
+                    f"Deepest channel: {stats['max_queue_depth']}\n"
+                    f"Active channels: {stats['active_channels']}"
+                ),
+                inline=True
+            )
+            embed.add_field(
+                name="Latency",
+                value=(
+                    f"Avg: {stats['avg_latency']:.2f}s\n"
+                    f"Max: {stats['max_latency']:.2f}s\n"
+                    f"Last: {stats['last_latency']:.2f}s"
+                ),
+                inline=True
+            )
+            embed.add_field(
+                name="Throughput",
+                value=(
+                    f"Embeds sent: {stats['embeds_sent']}\n"
+                    f"Messages sent: {stats['messages_sent']}\n"
+                    f"Embeds/message: {stats['embeds_per_message']:.1f}"
+                ),
+                inline=True
+            )
+            embed.add_field(
+                name="Problems",
+                value=(
+                    f"Rate limited: {stats['rate_limited']}\n"
+                    f"Failed: {stats['failed']}\n"
+                    f"Dropped: {stats['dropped']}"
+                ),
+                inline=True
+            )
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            logger.error(f"Error getting killfeed metrics: {e}", exc_info=True)
+            embed = await EmbedBuilder.create_error_embed(
+                "Error",
+                f"An error occurred while getting killfeed metrics: {e}"
+            , guild=guild_model)
+            await ctx.send(embed=embed)
+
+    @admin.command(name="indexes", description="Check registered query shapes for collection scans")
+    @app_commands.describe(apply="Create the missing indexes")
+    @requires_home_guild_admin()
+    async def indexes(self, ctx, apply: bool = False):
+        """Run the index advisor over registered query shapes (Home Guild Admins only)"""
+        guild_model = None
+        try:
+            # Get guild model for themed embed
+            try:
+                guild_model = await Guild.get_by_guild_id(self.bot.db, str(ctx.guild.id))
+            except Exception as e:
+                logger.warning(f"Error getting guild model: {e}")
+
+            from utils.index_advisor import IndexAdvisor
+            advisor = IndexAdvisor(self.bot.db)
+            reports = await advisor.analyze()
+            proposals = await advisor.propose(reports)
+
+            created = 0
+            if apply:
+                created = await advisor.apply(proposals)
+
+            embed = await EmbedBuilder.create_base_embed(
+                "Index Advisor",
+                f"Checked {len(reports)} query shapes"
+            , guild=guild_model)
+
+            flagged = [r for r in reports if r["collscan"] or r["index_missing"] or r["error"]]
+            for report in flagged[:20]:
+                if report["error"]:
+                    status = f"Explain failed: {report['error']}"
+                elif report["collscan"]:
+                    status = "COLLSCAN"
+                else:
+                    status = "Index missing"
+                keys = ", ".join(f"{field}:{direction}" for field, direction in report["index"])
+                embed.add_field(
+                    name=f"{report['collection']} - {report['name']}",
+                    value=f"{status}\nSource: {report['source']}\nSuggested: `{{{keys}}}`",
+                    inline=False
+                )
+
+            if not flagged:
+                embed.add_field(name="All Clear", value="Every registered query shape is served by an index.", inline=False)
+
+            if proposals["ttl"]:
+                embed.add_field(
+                    name="Missing TTL Indexes",
+                    value="\n".join(f"{p['collection']}.{p['field']} ({p['days']} days)" for p in proposals["ttl"]),
+                    inline=False
+                )
+
+            if apply:
+                embed.set_footer(text=f"Created {created} indexes")
+
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            logger.error(f"Error running index advisor: {e}", exc_info=True)
+            embed = await EmbedBuilder.create_error_embed(
+                "Error",
+                f"An error occurred while running the index advisor: {e}"
+            , guild=guild_model)
+            await ctx.send(embed=embed)
+
     @admin.command(name="sethomeguild", description="Set the home guild for the bot")
     async def sethomeguild(self, ctx):
         """Set the current guild as the home guild (Bot Owner only)"""
@@ -410,6 +596,24 @@ class Admin(commands.Cog):
             inline=False
         )
 
+        embed.add_field(
+            name="`/admin queries [limit]`",
+            value="Show the most costly database query shapes (Home Guild Admins only)",
+            inline=False
+        )
+
+        embed.add_field(
+            name="`/admin killfeed`",
+            value="Show killfeed dispatcher queue depth and latency (Home Guild Admins only)",
+            inline=False
+        )
+
+        embed.add_field(
+            name="`/admin indexes [apply]`",
+            value="Flag query shapes that scan whole collections and optionally create the missing indexes (Home Guild Admins only)",
+            inline=False
+        )
+
         await ctx.send(embed=embed)
 
 async def setup(bot):
@@ -26,6 +26,10 @@ from utils.decorators import premium_tier_required, has_admin_permission, has_mo
 from utils.embed_builder import EmbedBuilder
 from utils.discord_utils import get_server_selection, server_id_autocomplete, hybrid_send
 from utils.server_utils import check_server_exists, get_server_by_id
+from utils.autocomplete import player_name_autocomplete
+from utils.name_index import resolve_player
+from utils.auto_bounty import get_auto_bounty_detector
+from utils.expiry_scheduler import get_expiry_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -36,144 +40,58 @@ class BountiesCog(commands.GroupCog, name="bounty"):
         super().__init__()
         self.bot = bot
 
-        # Start the background task to check for expired bounties
-        self.check_expired_bounties.start()
+        # Expire bounties at their deadline instead of sweeping for them
+        get_expiry_scheduler(Bounty.EXPIRY_SCHEDULER).start(self._expire_bounties)
+        self.load_bounty_expiries.start()
 
-        # Start the background task to check for auto-bounties
-        self.check_auto_bounties.start()
+        # Place auto-bounties as soon as ingestion detects a kill pattern
+        get_auto_bounty_detector().set_handler(self._create_auto_bounty)
 
     # Using shared utility function from utils.server_utils for server existence check
 
     def cog_unload(self):
         """Called when the cog is unloaded"""
-        self.check_expired_bounties.cancel()
-        self.check_auto_bounties.cancel()
+        self.load_bounty_expiries.cancel()
+        asyncio.create_task(get_expiry_scheduler(Bounty.EXPIRY_SCHEDULER).stop())
+        get_auto_bounty_detector().set_handler(None)
 
-    @tasks.loop(minutes=15)
-    async def check_expired_bounties(self):
-        """Background task to expire old bounties"""
+    @tasks.loop(minutes=1)
+    async def load_bounty_expiries(self):
+        """Load active bounties and their expiry times once the database is ready"""
         try:
-            # Get database connection
             from utils.database import get_db, DatabaseManager
 
-            # Safely get database with validation
-            try:
-                db = await get_db()
-                if not db or not isinstance(db, DatabaseManager) or not db._connected:
-                    logger.warning("Database not properly initialized, skipping expired bounties check")
-                    return
-
-                # Explicitly ensure DB connection before proceeding
-                await db.ensure_connected()
-
-                # Expire old bounties
-                expired_count = await Bounty.expire_old_bounties(db)
-                if expired_count > 0:
-                    logger.info(f"Expired {expired_count} bounties")
-            except RuntimeError as re:
-                logger.warning(f"Database not ready: {re}")
+            db = await get_db()
+            if not db or not isinstance(db, DatabaseManager) or not db._connected:
+                logger.warning("Database not properly initialized, retrying bounty expiry load")
                 return
+
+            await db.ensure_connected()
+            count = await Bounty.load_active_targets(db, force=True)
+            logger.info(f"Scheduled expiry of {count} active bounties")
+            self.load_bounty_expiries.stop()
+        except RuntimeError as re:
+            logger.warning(f"Database not ready: {re}")
         except Exception as e:
-            logger.error(f"Error in check_expired_bounties: {e}", exc_info=True)
+            logger.error(f"Error in load_bounty_expiries: {e}", exc_info=True)
 
-    @tasks.loop(minutes=5)
-    async def check_auto_bounties(self):
-        """Background task to create automatic bounties"""
-        try:
-            # Get database safely
-            from utils.database import get_db, DatabaseManager
+    @load_bounty_expiries.before_loop
+    async def before_load_bounty_expiries(self):
+        """Wait for the bot to be ready before loading bounties"""
+        await self.bot.wait_until_ready()
 
-            try:
-                db = await get_db()
-                if not db or not isinstance(db, DatabaseManager) or not db._connected:
-                    logger.warning("Database not properly initialized, skipping auto bounties check")
-                    return
+    async def _expire_bounties(self, bounty_ids: List[str]):
+        """Expire a batch of bounties whose expiry time has come
 
-                # Explicitly ensure DB connection before proceeding
-                await db.ensure_connected()
-
-                # Now safely access collections
-                guilds_cursor = db.db.guilds.find({})
-
-                # Iterate through guilds
-                async for guild_data in guilds_cursor:
-                    guild_id = str(guild_data.get("guild_id"))
-
-                    # Check if auto-bounties are enabled
-                    auto_bounty = guild_data.get("auto_bounty", False)
-                    if not auto_bounty:
-                        continue
-
-                    # Get guild settings from dict
-                    # Use create_from_db_document to ensure proper conversion of premium_tier
-                    guild = Guild.create_from_db_document(guild_data, self.bot.db)
-                    if guild.premium_tier < 2:  # Auto-bounty requires premium tier 2+
-                        continue
-
-                    # Get auto-bounty settings
-                    auto_bounty_settings = guild_data.get("auto_bounty_settings", {})
-                    kill_threshold = auto_bounty_settings.get("kill_threshold", 5)
-                    repeat_threshold = auto_bounty_settings.get("repeat_threshold", 3)
-                    time_window = auto_bounty_settings.get("time_window", 10)  # minutes
-                    reward_amount = auto_bounty_settings.get("reward_amount", 100)
-
-                    # Process each server
-                    servers = getattr(guild, 'servers', guild_data.get('servers', []))
-                    for server_entry in servers:
-                        # Handle both string server_id and server dictionary objects
-                        if isinstance(server_entry, dict):
-                            server_id = str(server_entry.get('server_id', ''))
-                        else:
-                            server_id = str(server_entry)
-
-                        if not server_id or server_id == "":
-                            logger.warning(f"Empty server_id found in guild {guild_id}, skipping")
-                            continue
-                        try:
-                            # Get potential bounty targets
-                            # We already have a DB connection from the parent scope
-                            targets = await Bounty.get_player_stats_for_bounty(
-                                guild_id, 
-                                server_id, 
-                                minutes=time_window,
-                                kill_threshold=kill_threshold,
-                                repeat_threshold=repeat_threshold,
-                                db=db
-                            )
-
-                            for target in targets:
-                                # Check if we should create a bounty
-                                if target["killstreak"] >= kill_threshold:
-                                    # Create killstreak bounty
-                                    reason = f"Killstreak of {target['killstreak']} in {time_window} minutes"
-                                    await self._create_auto_bounty(
-                                        guild_id, 
-                                        server_id,
-                                        target["player_id"],
-                                        target["player_name"],
-                                        reason,
-                                        reward_amount,
-                                        "killstreak"
-                                    )
-                                elif target.get("target_fixation", 0) >= repeat_threshold:
-                                    # Create target fixation bounty
-                                    victim_name = target.get("fixation_target_name", "Unknown")
-                                    reason = f"Target fixation on {victim_name} ({target['target_fixation']} kills)"
-                                    await self._create_auto_bounty(
-                                        guild_id, 
-                                        server_id,
-                                        target["player_id"],
-                                        target["player_name"],
-                                        reason,
-                                        reward_amount,
-                                        "fixation"
-                                    )
-                        except Exception as e:
-                            logger.error(f"Error processing auto-bounties for server {server_id}: {e}", exc_info=True)
-            except Exception as e:
-                logger.error(f"Error in check_auto_bounties database operations: {e}", exc_info=True)
-        except Exception as e:
-            logger.error(f"Error in check_auto_bounties: {e}", exc_info=True)
+        Args:
+            bounty_ids: Bounty IDs
+        """
+        from utils.database import get_db
+
+        db = await get_db()
+        expired_count = await Bounty.expire_by_ids(db, bounty_ids)
+        if expired_count > 0:
+            logger.info(f"Expired {expired_count} bounties")
 
     async def _create_auto_bounty(self, guild_id: str, server_id: str, 
                               player_id: str, player_name: str, 
@@ -194,8 +112,8 @@ class BountiesCog(commands.GroupCog, name="bounty"):
             # Check if there's already an active bounty on this player
             from utils.database import get_db
             db = await get_db()
-            existing_bounties = await Bounty.get_active_bounties_for_server_target(db, guild_id, server_id, player_id)
-            if existing_bounties and len(existing_bounties) > 0:
+            await Bounty.load_active_targets(db)
+            if Bounty.get_active_bounty_ids(player_id, server_id):
                 # Already has an active bounty, don't create another
                 return
 
@@ -376,7 +294,7 @@ class BountiesCog(commands.GroupCog, name="bounty"):
         Args:
             interaction: Discord interaction
             server_id: ID of the server to place the bounty on
-            player_name: Name of the player to place a bounty on
+            player_name: Player ID picked from autocomplete, or a typed player name
             reward: Amount of currency to offer as a reward
             reason: Reason for the bounty (optional)
         """
@@ -408,30 +326,17 @@ class BountiesCog(commands.GroupCog, name="bounty"):
                 )
                 return
 
-            # Get player by name
-            player_query = {
-                "server_id": server_id,
-                "name": {"$regex": f"^{player_name}$", "$options": "i"}  # Case-insensitive exact match
-            }
-            player_data = await db.db.players.find_one(player_query)
-
-            if not player_data:
-                # Try partial match
-                player_query = {
-                    "server_id": server_id,
-                    "name": {"$regex": player_name, "$options": "i"}  # Case-insensitive partial match
-                }
-                player_data = await db.db.players.find_one(player_query)
+            # Resolve the player through the server's name index
+            player = await resolve_player(server_id, player_name)
 
-            if not player_data:
+            if not player:
                 await interaction.followup.send(
                     f"Error: Could not find player with name '{player_name}' on this server.",
                     ephemeral=True
                 )
                 return
 
-            player_id = player_data.get("player_id")
-            player_name = player_data.get("name")  # Use exact name from database
+            player_id, player_name = player  # Use exact name from the index
 
             # Check if player is trying to place a bounty on themselves
             is_self_bounty = False
@@ -457,7 +362,7 @@ class BountiesCog(commands.GroupCog, name="bounty"):
             economy = await Economy.get_by_player(db, discord_id, server_id)
             if not economy:
                 # Create economy profile if it doesn\'t exist
-                economy = await Economy.create(db, discord_id, server_id)
+                economy = await Economy.create_or_update(db, discord_id, server_id)
 
             if economy.balance < reward:
                 await interaction.followup.send(
@@ -544,6 +449,11 @@ class BountiesCog(commands.GroupCog, name="bounty"):
         """Autocomplete for server selection"""
         return await server_id_autocomplete(interaction, current)
 
+    @place_bounty.autocomplete("player_name")
+    async def player_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Autocomplete for player selection"""
+        return await player_name_autocomplete(interaction, current)
+
     @app_commands.command(name="active", description="View active bounties")
     @app_commands.describe(
         server_id="Server to view bounties for"
@@ -885,6 +795,7 @@ class BountiesCog(commands.GroupCog, name="bounty"):
                 {"guild_id": guild_id},
                 {"$set": update}
             )
+            get_auto_bounty_detector().invalidate_guild(guild_id)
 
             # Send confirmation
             embed = EmbedBuilder.success(
@@ -54,18 +54,81 @@ T = TypeVar('T')
 
 # Import utils 
 from utils.csv_parser import CSVParser
-from utils.sftp import SFTPManager
+from utils.sftp import SFTPManager, get_file_stat_cache
+from utils.deathlog_mirror import get_deathlog_mirror, get_completed_files
+from utils.auto_bounty import get_auto_bounty_detector
 from utils.embed_builder import EmbedBuilder
 from utils.helpers import has_admin_permission
 from utils.parser_utils import parser_coordinator, normalize_event_data, categorize_event
 from utils.decorators import has_admin_permission as admin_permission_decorator, premium_tier_required 
 from models.guild import Guild
 from models.server import Server
+from models.bounty import Bounty
 from utils.autocomplete import server_id_autocomplete  # Import standardized autocomplete function
+from utils.poll_scheduler import get_poll_scheduler
+from utils.ingestion_coordinator import is_ingesting, KILLS
 from utils.pycord_utils import create_option
 
 logger = logging.getLogger(__name__)
 
+
+async def record_kill_aggregates(db, server_id: str, kill_docs: List[Dict[str, Any]]):
+    """Add a batch of parsed kills to the per-server aggregates
+
+    Args:
+        db: Database connection
+        server_id: Server ID
+        kill_docs: Kill documents as inserted into the kills collection
+    """
+    from models.weapon_stats import WeaponStats
+    from models.activity_rollup import ActivityRollup
+    from models.faction import Faction
+    from models.rivalry import Rivalry
+    await WeaponStats.record_kills(server_id, kill_docs, db=db)
+    await Faction.record_kills(server_id, kill_docs, db=db)
+    await Rivalry.record_kills(server_id, kill_docs, db=db)
+    await ActivityRollup.record_kills(server_id, kill_docs, db=db)
+
+
+async def reset_server_stats(db, server_id: str) -> Dict[str, int]:
+    """Clear a server's kills and everything aggregated from them
+
+    A historical parse re-reads every kill, so the kill-derived aggregates
+    are cleared along with the raw kills; otherwise each re-parse would add
+    the same kills to them again.
+
+    Args:
+        db: Database connection
+        server_id: Server ID
+
+    Returns:
+        Dict mapping each cleared collection to the number of documents removed or reset
+    """
+    from utils.rivalry_leaderboard import drop_rivalry_leaderboard
+
+    counts = {}
+    counts["kills"] = (await db.kills.delete_many({"server_id": server_id})).deleted_count
+    counts["players"] = (await db.players.update_many(
+        {"server_id": server_id},
+        {"$set": {"kills": 0, "deaths": 0, "suicides": 0, "updated_at": datetime.utcnow()}}
+    )).modified_count
+    counts["rivalries"] = (await db.rivalries.delete_many({"server_id": server_id})).deleted_count
+    drop_rivalry_leaderboard(server_id)
+    counts["weapon_stats"] = (await db.weapon_stats.delete_many({"server_id": server_id})).deleted_count
+    counts["activity_rollups"] = (await db.activity_rollups.delete_many({"server_id": server_id})).deleted_count
+
+    # Faction aggregates are keyed by faction and rebuilt from members on their next read
+    faction_ids = [str(faction["_id"]) async for faction in
+                   db.collections["factions"].find({"server_id": server_id}, {"_id": 1})]
+    counts["faction_stats"] = 0
+    if faction_ids:
+        counts["faction_stats"] = (await db.collections["faction_stats"].delete_many(
+            {"faction_id": {"$in": faction_ids}}
+        )).deleted_count
+
+    return counts
+
+
 class CSVProcessorCog(commands.Cog):
     """Commands and background tasks for processing CSV files"""
 
@@ -97,11 +160,12 @@ class CSVProcessorCog(commands.Cog):
             except Exception as e:
                 logger.error(f"Error disconnecting SFTP for server {server_id}: {e}")
 
-    @tasks.loop(minutes=5.0)  # Set back to 5 minutes as per requirements
+    @tasks.loop(minutes=1.0)  # Servers are polled on their own adaptive intervals
     async def process_csv_files_task(self):
         """Background task for processing CSV files
 
-        This task runs every 5 minutes to check for new CSV files and process them promptly.
+        This task runs every minute; each server is only processed when its
+        adaptive poll interval is due (see utils.poll_scheduler).
         """
         logger.warning(f"CRITICAL DEBUG: Starting CSV processor task at {datetime.now().strftime('%H:%M:%S')}")
 
@@ -148,20 +212,33 @@ class CSVProcessorCog(commands.Cog):
                     logger.warning("CSV processing taking too long, stopping after current server")
                     break
 
+                # The live ingestion coordinator already reads this server's files
+                if is_ingesting(server_id, KILLS):
+                    logger.debug(f"Skipping CSV processing for server {server_id}, kills are ingested live")
+                    continue
+
+                scheduler = await get_poll_scheduler(self.bot.db, "csv", server_id, config.get("guild_id"))
+                if not scheduler.is_due():
+                    continue
+
                 try:
                     # Set a timeout for this server's processing
                     try:
-                        await asyncio.wait_for(
+                        _, events_processed = await asyncio.wait_for(
                             self._process_server_csv_files(server_id, config),
                             timeout=120  # 2 minute timeout per server
                         )
                     except asyncio.TimeoutError:
                         logger.error(f"CSV processing timed out for server {server_id}")
+                        scheduler.record(0)
                         continue  # Skip to next server
                 except Exception as e:
                     logger.error(f"Error processing CSV files for server {server_id}: {str(e)}")
+                    scheduler.record(0)
                     continue  # Skip to next server on error
 
+                scheduler.record(events_processed)
+
                 # Brief pause between servers to reduce resource spikes
                 await asyncio.sleep(2)
 
@@ -454,1258 +531,1181 @@ class CSVProcessorCog(commands.Cog):
         else:
             logger.info(f"DIAGNOSTIC: No start_date provided, will use last_processed or default to 24 hours ago")
 
-            # Connect to SFTP with improved connection handling and retries
-            logger.info(f"Connecting to SFTP for server {server_id} with enhanced connection handling")
-
-            # Initialize connection variables
-            sftp = None
-            max_connection_attempts = 3
-            connection_attempts = 0
-            connection_retry_delay = 2  # seconds
-
-            while connection_attempts < max_connection_attempts:
-                connection_attempts += 1
-                try:
-                    # Create a new SFTPManager for each attempt to avoid stale connections
-                    sftp_manager = SFTPManager(
-                        hostname=config["hostname"],
-                        port=config["port"],
-                        username=config.get("username", "baked"),
-                        password=config.get("password", "emerald"),
-                        server_id=server_id,
-                        original_server_id=config.get("original_server_id")
-                    )
-
-                    # Attempt connection with timeout
-                    logger.info(f"SFTP connection attempt {connection_attempts}/{max_connection_attempts} for server {server_id}")
-                    connect_timeout = 10  # seconds
-                    client = await asyncio.wait_for(
-                        sftp_manager.connect(),
-                        timeout=connect_timeout
-                    )
-
-                    # Set the client to the manager's client
-                    sftp = sftp_manager
-
-                    # Check connection status using the is_connected property
-                    if not sftp_manager.is_connected:
-                        raise ConnectionError(f"SFTP connection failed for server {server_id}")
-
-                    # Test connection by listing root directory
-                    await sftp.listdir('/')
-                    logger.info(f"SFTP connection successful for server {server_id}")
-                    break
-
-                except asyncio.TimeoutError:
-                    logger.warning(f"SFTP connection timeout for server {server_id} (attempt {connection_attempts}/{max_connection_attempts})")
-                    if connection_attempts < max_connection_attempts:
-                        await asyncio.sleep(connection_retry_delay)
-                        connection_retry_delay *= 2  # Exponential backoff
-
-                except Exception as e:
-                    logger.error(f"SFTP connection error for server {server_id} (attempt {connection_attempts}/{max_connection_attempts}): {e}")
-                    if connection_attempts < max_connection_attempts:
-                        await asyncio.sleep(connection_retry_delay)
-                        connection_retry_delay *= 2  # Exponential backoff
-
-            # If all connection attempts failed, return early
-            if not sftp:
-                logger.error(f"All SFTP connection attempts failed for server {server_id}")
-                return 0, 0
-
+        # Connect to SFTP with improved connection handling and retries
+        logger.info(f"Connecting to SFTP for server {server_id} with enhanced connection handling")
 
-            # Check if there was a recent connection error
-            if hasattr(sftp, 'last_error') and sftp.last_error and 'Auth failed' in sftp.last_error:
-                logger.warning(f"Skipping SFTP operations for server {server_id} due to recent authentication failure")
-                return 0, 0
-
-            # Check connection state using the new is_connected property
-            was_connected = sftp.client is not None and sftp.client.is_connected
-            logger.debug(f"SFTP connection state before connect: connected={was_connected}")
-
-            # Connect or ensure connection is active
-            if not was_connected:
-                # Connect returns the client now, not a boolean
-                client = await sftp.connect()
-                # Verify the client is connected
-                if not client.is_connected:
-                    logger.error(f"Failed to connect to SFTP server for {server_id}")
-                    return 0, 0
+        # Initialize connection variables
+        sftp = None
+        max_connection_attempts = 3
+        connection_attempts = 0
+        connection_retry_delay = 2  # seconds
 
+        while connection_attempts < max_connection_attempts:
+            connection_attempts += 1
             try:
-                # Get the configured SFTP path from server settings
-                sftp_path = config.get("sftp_path", "/logs")
-
-                # Always use original_server_id for path construction
-                # Always try to get original_server_id first
-                path_server_id = config.get("original_server_id")
-
-                # Use server_identity module for consistent ID resolution
-                from utils.server_identity import identify_server
-
-                # Get server properties for identification
-                hostname = config.get("hostname", "")
-                server_name = config.get("server_name", "")
-                guild_id = config.get("guild_id")
-
-                # Identify server using our consistent module
-                numeric_id, is_known = identify_server(
+                # Create a new SFTPManager for each attempt to avoid stale connections
+                sftp_manager = SFTPManager(
+                    hostname=config["hostname"],
+                    port=config["port"],
+                    username=config.get("username", "baked"),
+                    password=config.get("password", "emerald"),
                     server_id=server_id,
-                    hostname=hostname,
-                    server_name=server_name,
-                    guild_id=guild_id
+                    original_server_id=config.get("original_server_id")
                 )
 
-                # Use the identified consistent ID
-                if is_known or numeric_id != path_server_id:
-                    if is_known:
-                        logger.info(f"Using known numeric ID '{numeric_id}' for server {server_id}")
-                    else:
-                        logger.info(f"Using identified numeric ID '{numeric_id}' from server {server_id}")
-                    path_server_id = numeric_id
-
-                # Last resort: use server_id but log warning
-                if not path_server_id:
-                    logger.warning(f"No numeric ID found, using server_id as fallback: {server_id}")
-                    path_server_id = server_id
-
-                # Build server directory using the determined path_server_id
-                server_dir = f"{config.get('hostname', 'server').split(':')[0]}_{path_server_id}"
-                logger.info(f"Using server directory: {server_dir} with ID {path_server_id}")
-                logger.debug(f"Using server directory: {server_dir}")
-
-                # Initialize variables to avoid "possibly unbound" warnings
-                alternate_deathlogs_paths = []
-                csv_files = []
-                path_found = None
-
-                # Build server directory and base path
-                server_dir = f"{config.get('hostname', 'server').split(':')[0]}_{path_server_id}"
-                base_path = os.path.join("/", server_dir)
-
-                # Always use the standardized path for deathlogs
-                deathlogs_path = os.path.join(base_path, "actual1", "deathlogs")
-                logger.debug(f"Using standardized deathlogs path: {deathlogs_path}")
-
-                # Never allow paths that would search above the base server directory
-                if ".." in deathlogs_path:
-                    logger.warning(f"Invalid deathlogs path containing parent traversal: {deathlogs_path}")
-                    return 0, 0
-
-                # Define standard paths to check
-                standard_paths = [
-                    deathlogs_path,  # Primary path
-                    os.path.join(deathlogs_path, "world_0"),  # Map directories
-                    os.path.join(deathlogs_path, "world_1"),
-                    os.path.join(deathlogs_path, "world_2"),
-                    os.path.join(deathlogs_path, "world_3"),
-                    os.path.join(deathlogs_path, "world_4"),
-                    os.path.join("/", server_dir, "deathlogs"),  # Alternate locations
-                    os.path.join("/", server_dir, "logs"),
-                    os.path.join("/", "logs", server_dir)
-                ]
-                logger.debug(f"Will check {len(standard_paths)} standard paths")
-
-                # Get CSV pattern from config - ensure it will correctly match CSV files with dates
-                csv_pattern = config.get("csv_pattern", r".*\.csv$")
-                # Add fallback patterns specifically for date-formatted CSV files with multiple format support
-                # Handle both pre-April and post-April CSV format timestamp patterns
-                date_format_patterns = [
-                    # Primary pattern - Tower of Temptation uses YYYY.MM.DD-HH.MM.SS.csv format
-                    r"\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}\.csv$",  # YYYY.MM.DD-HH.MM.SS.csv (primary format)
+                # Attempt connection with timeout
+                logger.info(f"SFTP connection attempt {connection_attempts}/{max_connection_attempts} for server {server_id}")
+                connect_timeout = 10  # seconds
+                client = await asyncio.wait_for(
+                    sftp_manager.connect(),
+                    timeout=connect_timeout
+                )
 
-                    # Common year-first date formats
-                    r"\d{4}\.\d{2}\.\d{2}.*\.csv$",                    # YYYY.MM.DD*.csv (any time format)
-                    r"\d{4}-\d{2}-\d{2}.*\.csv$",                      # YYYY-MM-DD*.csv (ISO date format)
+                # Set the client to the manager's client
+                sftp = sftp_manager
 
-                    # Day-first formats (less common but possible)
-                    r"\d{2}\.\d{2}\.\d{4}.*\.csv$",                    # DD.MM.YYYY*.csv (European format)
+                # Check connection status using the is_connected property
+                if not sftp_manager.is_connected:
+                    raise ConnectionError(f"SFTP connection failed for server {server_id}")
 
-                    # Most flexible pattern to catch any date-like format
-                    r"\d{2,4}[.-_]\d{1,2}[.-_]\d{1,4}.*\.csv$",        # Any date-like pattern
+                # Test connection by listing root directory
+                await sftp.listdir('/')
+                logger.info(f"SFTP connection successful for server {server_id}")
+                break
 
-                    # Ultimate fallback - any CSV file as absolute last resort
-                    r".*\.csv$"
-                ]
-                # Use the first pattern as primary fallback
-                date_format_pattern = date_format_patterns[0]
+            except asyncio.TimeoutError:
+                logger.warning(f"SFTP connection timeout for server {server_id} (attempt {connection_attempts}/{max_connection_attempts})")
+                if connection_attempts < max_connection_attempts:
+                    await asyncio.sleep(connection_retry_delay)
+                    connection_retry_delay *= 2  # Exponential backoff
 
-                logger.debug(f"Using primary CSV pattern: {csv_pattern}")
-                logger.debug(f"Using date format patterns: {date_format_patterns}")
-
-                # Log which patterns we're using to find CSV files
-                logger.debug(f"Looking for CSV files with primary pattern: {csv_pattern}")
-                logger.debug(f"Fallback pattern for date-formatted files: {date_format_pattern}")
+            except Exception as e:
+                logger.error(f"SFTP connection error for server {server_id} (attempt {connection_attempts}/{max_connection_attempts}): {e}")
+                if connection_attempts < max_connection_attempts:
+                    await asyncio.sleep(connection_retry_delay)
+                    connection_retry_delay *= 2  # Exponential backoff
+
+        # If all connection attempts failed, return early
+        if not sftp:
+            logger.error(f"All SFTP connection attempts failed for server {server_id}")
+            return 0, 0
 
 
-                # First check: Are there map subdirectories in the deathlogs path?
-                try:
-                    # Verify deathlogs_path exists
-                    if await sftp.exists(deathlogs_path):
-                        logger.debug(f"Deathlogs path exists: {deathlogs_path}, checking for map subdirectories")
+        # Check if there was a recent connection error
+        if hasattr(sftp, 'last_error') and sftp.last_error and 'Auth failed' in sftp.last_error:
+            logger.warning(f"Skipping SFTP operations for server {server_id} due to recent authentication failure")
+            return 0, 0
 
-                        # Define known map directory names to check directly (maps we know exist)
-                        known_map_names = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
-                        logger.debug(f"Checking for these known map directories first: {known_map_names}")
+        # Check connection state using the new is_connected property
+        was_connected = sftp.client is not None and sftp.client.is_connected
+        logger.debug(f"SFTP connection state before connect: connected={was_connected}")
+
+        # Connect or ensure connection is active
+        if not was_connected:
+            # Connect returns the client now, not a boolean
+            client = await sftp.connect()
+            # Verify the client is connected
+            if not client.is_connected:
+                logger.error(f"Failed to connect to SFTP server for {server_id}")
+                return 0, 0
 
-                        # Try to directly check known map directories first
-                        map_directories = []
-                        for map_name in known_map_names:
-                            map_path = os.path.join(deathlogs_path, map_name)
-                            logger.debug(f"Directly checking for map directory: {map_path}")
+        try:
+            # Get the configured SFTP path from server settings
+            sftp_path = config.get("sftp_path", "/logs")
 
-                            try:
-                                if await sftp.exists(map_path):
-                                    logger.debug(f"Found known map directory: {map_path}")
-                                    map_directories.append(map_path)
-                            except Exception as map_err:
-                                logger.debug(f"Error checking known map directory {map_path}: {map_err}")
+            # Always use original_server_id for path construction
+            # Always try to get original_server_id first
+            path_server_id = config.get("original_server_id")
 
-                        # If we didn't find any known map directories, list all directories in deathlogs
-                        if not map_directories:
-                            logger.debug("No known map directories found, checking all directories in deathlogs")
-                            try:
-                                deathlogs_entries = await sftp.client.listdir(deathlogs_path)
-                                logger.debug(f"Found {len(deathlogs_entries)} entries in deathlogs directory")
+            # Use server_identity module for consistent ID resolution
+            from utils.server_identity import identify_server
 
-                                # Find all subdirectories (any directory under deathlogs could be a map)
-                                for entry in deathlogs_entries:
-                                    if entry in ('.', '..'):
-                                        continue
+            # Get server properties for identification
+            hostname = config.get("hostname", "")
+            server_name = config.get("server_name", "")
+            guild_id = config.get("guild_id")
 
-                                    entry_path = os.path.join(deathlogs_path, entry)
-                                    try:
-                                        entry_info = await sftp.get_file_info(entry_path)
-                                        if entry_info and entry_info.get("is_dir", False):
-                                            logger.debug(f"Found potential map directory: {entry_path}")
-                                            map_directories.append(entry_path)
-                                    except Exception as entry_err:
-                                        logger.debug(f"Error checking entry {entry_path}: {entry_err}")
-                            except Exception as list_err:
-                                logger.warning(f"Error listing deathlogs directory: {list_err}")
-
-                        logger.debug(f"Found {len(map_directories)} total map directories")
-
-                        # If we found map directories, search each one for CSV files
-                        if map_directories:
-                            all_map_csv_files = []
-
-                            for map_dir in map_directories:
-                                try:
-                                    # Look for CSV files in this map directory
-                                    map_csv_files = await sftp.list_files(map_dir, csv_pattern)
-
-                                    if map_csv_files:
-                                        logger.info(f"Found {len(map_csv_files)} CSV files in map directory {map_dir}")
-                                        # Convert to full paths
-                                        map_full_paths = [
-                                            os.path.join(map_dir, f) for f in map_csv_files
-                                            if not f.startswith('/')  # Only relative paths need joining
-                                        ]
-                                        all_map_csv_files.extend(map_full_paths)
-                                    else:
-                                        # Try with each date format pattern
-                                        for pattern in date_format_patterns:
-                                            logger.debug(f"Trying pattern {pattern} in map directory {map_dir}")
-                                            date_map_csv_files = await sftp.list_files(map_dir, pattern)
-                                            if date_map_csv_files:
-                                                logger.info(f"Found {len(date_map_csv_files)} CSV files using pattern {pattern} in map directory {map_dir}")
-                                                # Convert to full paths
-                                                map_full_paths = [
-                                                    os.path.join(map_dir, f) for f in date_map_csv_files
-                                                    if not f.startswith('/')
-                                                ]
-                                                all_map_csv_files.extend(map_full_paths)
-                                                break  # Stop after finding files with one pattern
-
-                                        # Log if no files were found with any pattern
-                                        found_any = False
-                                        for pattern in date_format_patterns:
-                                            if await sftp.list_files(map_dir, pattern):
-                                                found_any = True
-                                                break
-
-                                        if not found_any:
-                                            logger.debug(f"No CSV files found with any pattern in map directory {map_dir}")
-                                except Exception as map_err:
-                                    logger.warning(f"Error searching map directory {map_dir}: {map_err}")
-
-                            # If we found CSV files in any map directory
-                            if all_map_csv_files:
-                                logger.info(f"Found {len(all_map_csv_files)} total CSV files across all map directories")
-                                full_path_csv_files = all_map_csv_files
-                                csv_files = [os.path.basename(f) for f in all_map_csv_files]
-                                path_found = deathlogs_path  # Use the parent deathlogs path as the base
-
-                                # Log a sample of found files
-                                if len(csv_files) > 0:
-                                    sample = csv_files[:5] if len(csv_files) > 5 else csv_files
-                                    logger.info(f"Sample CSV files: {sample}")
-                    else:
-                        logger.warning(f"Deathlogs path does not exist: {deathlogs_path}")
-                except Exception as e:
-                    logger.warning(f"Error checking for map directories: {e}")
+            # Identify server using our consistent module
+            numeric_id, is_known = identify_server(
+                server_id=server_id,
+                hostname=hostname,
+                server_name=server_name,
+                guild_id=guild_id
+            )
 
-                # If we already found files in map directories, we can skip the rest of the search
-                if csv_files:
-                    logger.info(f"Successfully found CSV files in map directories, skipping standard search")
+            # Use the identified consistent ID
+            if is_known or numeric_id != path_server_id:
+                if is_known:
+                    logger.info(f"Using known numeric ID '{numeric_id}' for server {server_id}")
                 else:
-                    logger.info(f"No CSV files found in map directories, continuing with standard search")
-
-                # Enhanced list of possible paths to check (when map directories search fails)
-                # For Tower of Temptation, we need to include possible map subdirectory paths
-
-                # Define known map subdirectory names
-                map_subdirs = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
-
-                # Build base paths list
-                base_paths = [
-                    deathlogs_path,  # Standard path: /hostname_serverid/actual1/deathlogs/
-                    os.path.join("/", server_dir, "deathlogs"),  # Without "actual1"
-                    os.path.join("/", server_dir, "logs"),  # Alternate logs directory
-                    os.path.join("/", server_dir, "Logs", "deathlogs"),  # Capital Logs with deathlogs subdirectory
-                    os.path.join("/", server_dir, "Logs"),  # Just capital Logs
-                    os.path.join("/", "logs", server_dir),  # Common format with server subfolder
-                    os.path.join("/", "deathlogs"),  # Root deathlogs 
-                    os.path.join("/", "logs"),  # Root logs
-                    os.path.join("/", server_dir),  # Just server directory
-                    os.path.join("/", server_dir, "actual1"),  # Just the actual1 directory
-                ]
-
-                # Now add map subdirectory variations to each base path
-                possible_paths = []
-                for base_path in base_paths:
-                    # Add the base path first
-                    possible_paths.append(base_path)
-
-                    # Then add each map subdirectory variation
-                    for map_subdir in map_subdirs:
-                        map_path = os.path.join(base_path, map_subdir)
-                        possible_paths.append(map_path)
-
-                # Add root as last resort
-                possible_paths.append("/")
+                    logger.info(f"Using identified numeric ID '{numeric_id}' from server {server_id}")
+                path_server_id = numeric_id
+
+            # Last resort: use server_id but log warning
+            if not path_server_id:
+                logger.warning(f"No numeric ID found, using server_id as fallback: {server_id}")
+                path_server_id = server_id
+
+            # Build server directory using the determined path_server_id
+            server_dir = f"{config.get('hostname', 'server').split(':')[0]}_{path_server_id}"
+            logger.info(f"Using server directory: {server_dir} with ID {path_server_id}")
+            logger.debug(f"Using server directory: {server_dir}")
+
+            # Initialize variables to avoid "possibly unbound" warnings
+            alternate_deathlogs_paths = []
+            csv_files = []
+            path_found = None
+
+            # Build server directory and base path
+            server_dir = f"{config.get('hostname', 'server').split(':')[0]}_{path_server_id}"
+            base_path = os.path.join("/", server_dir)
+
+            # Always use the standardized path for deathlogs
+            deathlogs_path = os.path.join(base_path, "actual1", "deathlogs")
+            logger.debug(f"Using standardized deathlogs path: {deathlogs_path}")
+
+            # Never allow paths that would search above the base server directory
+            if ".." in deathlogs_path:
+                logger.warning(f"Invalid deathlogs path containing parent traversal: {deathlogs_path}")
+                return 0, 0
 
-                logger.debug(f"Generated {len(possible_paths)} possible paths to search for CSV files")
+            # Define standard paths to check
+            standard_paths = [
+                deathlogs_path,  # Primary path
+                os.path.join(deathlogs_path, "world_0"),  # Map directories
+                os.path.join(deathlogs_path, "world_1"),
+                os.path.join(deathlogs_path, "world_2"),
+                os.path.join(deathlogs_path, "world_3"),
+                os.path.join(deathlogs_path, "world_4"),
+                os.path.join("/", server_dir, "deathlogs"),  # Alternate locations
+                os.path.join("/", server_dir, "logs"),
+                os.path.join("/", "logs", server_dir)
+            ]
+            logger.debug(f"Will check {len(standard_paths)} standard paths")
+
+            # Get CSV pattern from config - ensure it will correctly match CSV files with dates
+            csv_pattern = config.get("csv_pattern", r".*\.csv$")
+            # Add fallback patterns specifically for date-formatted CSV files with multiple format support
+            # Handle both pre-April and post-April CSV format timestamp patterns
+            date_format_patterns = [
+                # Primary pattern - Tower of Temptation uses YYYY.MM.DD-HH.MM.SS.csv format
+                r"\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}\.csv$",  # YYYY.MM.DD-HH.MM.SS.csv (primary format)
+
+                # Common year-first date formats
+                r"\d{4}\.\d{2}\.\d{2}.*\.csv$",                    # YYYY.MM.DD*.csv (any time format)
+                r"\d{4}-\d{2}-\d{2}.*\.csv$",                      # YYYY-MM-DD*.csv (ISO date format)
+
+                # Day-first formats (less common but possible)
+                r"\d{2}\.\d{2}\.\d{4}.*\.csv$",                    # DD.MM.YYYY*.csv (European format)
+
+                # Most flexible pattern to catch any date-like format
+                r"\d{2,4}[.-_]\d{1,2}[.-_]\d{1,4}.*\.csv$",        # Any date-like pattern
+
+                # Ultimate fallback - any CSV file as absolute last resort
+                r".*\.csv$"
+            ]
+            # Use the first pattern as primary fallback
+            date_format_pattern = date_format_patterns[0]
+
+            logger.debug(f"Using primary CSV pattern: {csv_pattern}")
+            logger.debug(f"Using date format patterns: {date_format_patterns}")
+
+            # Log which patterns we're using to find CSV files
+            logger.debug(f"Looking for CSV files with primary pattern: {csv_pattern}")
+            logger.debug(f"Fallback pattern for date-formatted files: {date_format_pattern}")
+
+
+            # First check: Are there map subdirectories in the deathlogs path?
+            try:
+                # Verify deathlogs_path exists
+                if await sftp.exists(deathlogs_path):
+                    logger.debug(f"Deathlogs path exists: {deathlogs_path}, checking for map subdirectories")
 
-                # First attempt: Use list_files with the specified pattern on all possible paths
-                for search_path in possible_paths:
-                    logger.debug(f"Trying to list CSV files in: {search_path}")
-                    try:
-                        # Check connection before each attempt
-                        if not sftp.client:
-                            logger.warning(f"Connection lost before listing files in {search_path}, reconnecting...")
-                            await sftp.connect()
-                            if not sftp.client:
-                                logger.error(f"Failed to reconnect for path: {search_path}")
-                                continue
+                    # Define known map directory names to check directly (maps we know exist)
+                    known_map_names = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
+                    logger.debug(f"Checking for these known map directories first: {known_map_names}")
 
-                        # Try with primary pattern
-                        path_files = await sftp.list_files(search_path, csv_pattern)
-
-                        # If primary pattern didn't work, try with each date format pattern
-                        if not path_files and csv_pattern != date_format_pattern:
-                            logger.debug(f"No files found with primary pattern, trying date format patterns in {search_path}")
-                            for pattern in date_format_patterns:
-                                logger.debug(f"Trying pattern {pattern} in directory {search_path}")
-                                pattern_files = await sftp.list_files(search_path, pattern)
-                                if pattern_files:
-                                    logger.info(f"Found {len(pattern_files)} CSV files using pattern {pattern} in {search_path}")
-                                    path_files = pattern_files
-                                    break
+                    # Try to directly check known map directories first
+                    map_directories = []
+                    for map_name in known_map_names:
+                        map_path = os.path.join(deathlogs_path, map_name)
+                        logger.debug(f"Directly checking for map directory: {map_path}")
 
-                        if path_files:
-                            # Build full paths to the CSV files
-                            full_paths = [
-                                f if f.startswith('/') else os.path.join(search_path, f) 
-                                for f in path_files
-                            ]
+                        try:
+                            if await sftp.exists(map_path):
+                                logger.debug(f"Found known map directory: {map_path}")
+                                map_directories.append(map_path)
+                        except Exception as map_err:
+                            logger.debug(f"Error checking known map directory {map_path}: {map_err}")
+
+                    # If we didn't find any known map directories, list all directories in deathlogs
+                    if not map_directories:
+                        logger.debug("No known map directories found, checking all directories in deathlogs")
+                        try:
+                            deathlogs_entries = await sftp.client.listdir(deathlogs_path)
+                            logger.debug(f"Found {len(deathlogs_entries)} entries in deathlogs directory")
 
-                            # Check which are actually files (not directories)
-                            verified_files = []
-                            verified_full_paths = []
+                            # Find all subdirectories (any directory under deathlogs could be a map)
+                            for entry in deathlogs_entries:
+                                if entry in ('.', '..'):
+                                    continue
 
-                            for i, file_path in enumerate(full_paths):
+                                entry_path = os.path.join(deathlogs_path, entry)
                                 try:
-                                    if await sftp.is_file(file_path):
-                                        verified_files.append(path_files[i])
-                                        verified_full_paths.append(file_path)
-                                except Exception as verify_err:
-                                    logger.warning(f"Error verifying file {file_path}: {verify_err}")
-
-                            if verified_files:
-                                csv_files = verified_files
-                                full_path_csv_files = verified_full_paths
-                                path_found = search_path
-                                logger.info(f"Found {len(csv_files)} CSV files in {search_path}")
-
-                                # Print the first few file names for debugging
-                                if csv_files:
-                                    sample_files = csv_files[:5]
-                                    logger.info(f"Sample CSV files: {sample_files}")
+                                    entry_info = await sftp.get_file_info(entry_path)
+                                    if entry_info and entry_info.get("is_dir", False):
+                                        logger.debug(f"Found potential map directory: {entry_path}")
+                                        map_directories.append(entry_path)
+                                except Exception as entry_err:
+                                    logger.debug(f"Error checking entry {entry_path}: {entry_err}")
+                        except Exception as list_err:
+                            logger.warning(f"Error listing deathlogs directory: {list_err}")
+
+                    logger.debug(f"Found {len(map_directories)} total map directories")
+
+                    # If we found map directories, search each one for CSV files
+                    if map_directories:
+                        all_map_csv_files = []
+
+                        for map_dir in map_directories:
+                            try:
+                                # Look for CSV files in this map directory
+                                map_csv_files = await sftp.list_files(map_dir, csv_pattern)
+
+                                if map_csv_files:
+                                    logger.info(f"Found {len(map_csv_files)} CSV files in map directory {map_dir}")
+                                    # Convert to full paths
+                                    map_full_paths = [
+                                        os.path.join(map_dir, f) for f in map_csv_files
+                                        if not f.startswith('/')  # Only relative paths need joining
+                                    ]
+                                    all_map_csv_files.extend(map_full_paths)
+                                else:
+                                    # Try with each date format pattern
+                                    for pattern in date_format_patterns:
+                                        logger.debug(f"Trying pattern {pattern} in map directory {map_dir}")
+                                        date_map_csv_files = await sftp.list_files(map_dir, pattern)
+                                        if date_map_csv_files:
+                                            logger.info(f"Found {len(date_map_csv_files)} CSV files using pattern {pattern} in map directory {map_dir}")
+                                            # Convert to full paths
+                                            map_full_paths = [
+                                                os.path.join(map_dir, f) for f in date_map_csv_files
+                                                if not f.startswith('/')
+                                            ]
+                                            all_map_csv_files.extend(map_full_paths)
+                                            break  # Stop after finding files with one pattern
+
+                                    # Log if no files were found with any pattern
+                                    found_any = False
+                                    for pattern in date_format_patterns:
+                                        if await sftp.list_files(map_dir, pattern):
+                                            found_any = True
+                                            break
 
+                                    if not found_any:
+                                        logger.debug(f"No CSV files found with any pattern in map directory {map_dir}")
+                            except Exception as map_err:
+                                logger.warning(f"Error searching map directory {map_dir}: {map_err}")
+
+                        # If we found CSV files in any map directory
+                        if all_map_csv_files:
+                            logger.info(f"Found {len(all_map_csv_files)} total CSV files across all map directories")
+                            full_path_csv_files = all_map_csv_files
+                            csv_files = [os.path.basename(f) for f in all_map_csv_files]
+                            path_found = deathlogs_path  # Use the parent deathlogs path as the base
+
+                            # Log a sample of found files
+                            if len(csv_files) > 0:
+                                sample = csv_files[:5] if len(csv_files) > 5 else csv_files
+                                logger.info(f"Sample CSV files: {sample}")
+                else:
+                    logger.warning(f"Deathlogs path does not exist: {deathlogs_path}")
+            except Exception as e:
+                logger.warning(f"Error checking for map directories: {e}")
+
+            # If we already found files in map directories, we can skip the rest of the search
+            if csv_files:
+                logger.info(f"Successfully found CSV files in map directories, skipping standard search")
+            else:
+                logger.info(f"No CSV files found in map directories, continuing with standard search")
+
+            # Enhanced list of possible paths to check (when map directories search fails)
+            # For Tower of Temptation, we need to include possible map subdirectory paths
+
+            # Define known map subdirectory names
+            map_subdirs = ["world_0", "world0", "world_1", "world1", "map_0", "map0", "main", "default"]
+
+            # Build base paths list
+            base_paths = [
+                deathlogs_path,  # Standard path: /hostname_serverid/actual1/deathlogs/
+                os.path.join("/", server_dir, "deathlogs"),  # Without "actual1"
+                os.path.join("/", server_dir, "logs"),  # Alternate logs directory
+                os.path.join("/", server_dir, "Logs", "deathlogs"),  # Capital Logs with deathlogs subdirectory
+                os.path.join("/", server_dir, "Logs"),  # Just capital Logs
+                os.path.join("/", "logs", server_dir),  # Common format with server subfolder
+                os.path.join("/", "deathlogs"),  # Root deathlogs 
+                os.path.join("/", "logs"),  # Root logs
+                os.path.join("/", server_dir),  # Just server directory
+                os.path.join("/", server_dir, "actual1"),  # Just the actual1 directory
+            ]
+
+            # Now add map subdirectory variations to each base path
+            possible_paths = []
+            for base_path in base_paths:
+                # Add the base path first
+                possible_paths.append(base_path)
+
+                # Then add each map subdirectory variation
+                for map_subdir in map_subdirs:
+                    map_path = os.path.join(base_path, map_subdir)
+                    possible_paths.append(map_path)
+
+            # Add root as last resort
+            possible_paths.append("/")
+
+            logger.debug(f"Generated {len(possible_paths)} possible paths to search for CSV files")
+
+            # First attempt: Use list_files with the specified pattern on all possible paths
+            for search_path in possible_paths:
+                logger.debug(f"Trying to list CSV files in: {search_path}")
+                try:
+                    # Check connection before each attempt
+                    if not sftp.client:
+                        logger.warning(f"Connection lost before listing files in {search_path}, reconnecting...")
+                        await sftp.connect()
+                        if not sftp.client:
+                            logger.error(f"Failed to reconnect for path: {search_path}")
+                            continue
+
+                    # Try with primary pattern
+                    path_files = await sftp.list_files(search_path, csv_pattern)
+
+                    # If primary pattern didn't work, try with each date format pattern
+                    if not path_files and csv_pattern != date_format_pattern:
+                        logger.debug(f"No files found with primary pattern, trying date format patterns in {search_path}")
+                        for pattern in date_format_patterns:
+                            logger.debug(f"Trying pattern {pattern} in directory {search_path}")
+                            pattern_files = await sftp.list_files(search_path, pattern)
+                            if pattern_files:
+                                logger.info(f"Found {len(pattern_files)} CSV files using pattern {pattern} in {search_path}")
+                                path_files = pattern_files
                                 break
-                    except Exception as path_err:
-                        logger.warning(f"Error listing files in {search_path}: {path_err}")
-                        # Continue to next path
-
-                    # Second attempt: Try recursive search immediately with more paths and deeper search
-                    if not csv_files:
-                        logger.info(f"No CSV files found in predefined paths, trying recursive search...")
-
-                        # Try first from server root, then the root directory of the server
-                        root_paths = [
-                            server_dir,  # Server's root directory
-                            "/",         # File system root
-                            os.path.dirname(server_dir) if "/" in server_dir else "/",  # Parent of server dir
-                            os.path.join("/", "data"),  # Common server data directory
-                            os.path.join("/", "game"),  # Game installation directory
-                            # More specific paths
-                            os.path.join("/", server_dir, "game"),
-                            os.path.join("/", "home", os.path.basename(server_dir) if server_dir != "/" else "server"),
-                            os.path.join("/", "home", "steam", os.path.basename(server_dir) if server_dir != "/" else "server"),
-                            os.path.join("/", "game", os.path.basename(server_dir) if server_dir != "/" else "server"),
-                            os.path.join("/", "data", os.path.basename(server_dir) if server_dir != "/" else "server"),
+
+                    if path_files:
+                        # Build full paths to the CSV files
+                        full_paths = [
+                            f if f.startswith('/') else os.path.join(search_path, f) 
+                            for f in path_files
                         ]
 
-                        logger.debug(f"Will try recursive search from {len(root_paths)} different root paths")
+                        # Check which are actually files (not directories)
+                        verified_files = []
+                        verified_full_paths = []
 
-                        for root_path in root_paths:
+                        for i, file_path in enumerate(full_paths):
                             try:
-                                # Check connection before recursive search
+                                if await sftp.is_file(file_path):
+                                    verified_files.append(path_files[i])
+                                    verified_full_paths.append(file_path)
+                            except Exception as verify_err:
+                                logger.warning(f"Error verifying file {file_path}: {verify_err}")
+
+                        if verified_files:
+                            csv_files = verified_files
+                            full_path_csv_files = verified_full_paths
+                            path_found = search_path
+                            logger.info(f"Found {len(csv_files)} CSV files in {search_path}")
+
+                            # Print the first few file names for debugging
+                            if csv_files:
+                                sample_files = csv_files[:5]
+                                logger.info(f"Sample CSV files: {sample_files}")
+
+                            break
+                except Exception as path_err:
+                    logger.warning(f"Error listing files in {search_path}: {path_err}")
+                    # Continue to next path
+
+                # Second attempt: Try recursive search immediately with more paths and deeper search
+                if not csv_files:
+                    logger.info(f"No CSV files found in predefined paths, trying recursive search...")
+
+                    # Try first from server root, then the root directory of the server
+                    root_paths = [
+                        server_dir,  # Server's root directory
+                        "/",         # File system root
+                        os.path.dirname(server_dir) if "/" in server_dir else "/",  # Parent of server dir
+                        os.path.join("/", "data"),  # Common server data directory
+                        os.path.join("/", "game"),  # Game installation directory
+                        # More specific paths
+                        os.path.join("/", server_dir, "game"),
+                        os.path.join("/", "home", os.path.basename(server_dir) if server_dir != "/" else "server"),
+                        os.path.join("/", "home", "steam", os.path.basename(server_dir) if server_dir != "/" else "server"),
+                        os.path.join("/", "game", os.path.basename(server_dir) if server_dir != "/" else "server"),
+                        os.path.join("/", "data", os.path.basename(server_dir) if server_dir != "/" else "server"),
+                    ]
+
+                    logger.debug(f"Will try recursive search from {len(root_paths)} different root paths")
+
+                    for root_path in root_paths:
+                        try:
+                            # Check connection before recursive search
+                            if not sftp.client:
+                                logger.warning(f"Connection lost before recursive search at {root_path}, reconnecting...")
+                                await sftp.connect()
                                 if not sftp.client:
-                                    logger.warning(f"Connection lost before recursive search at {root_path}, reconnecting...")
-                                    await sftp.connect()
-                                    if not sftp.client:
-                                        logger.error(f"Failed to reconnect for recursive search at {root_path}")
-                                        continue
+                                    logger.error(f"Failed to reconnect for recursive search at {root_path}")
+                                    continue
+
+                            logger.debug(f"Starting deep recursive search from {root_path}")
+
+                            # Use find_csv_files which has better error handling and multiple fallbacks
+                            if hasattr(sftp, 'find_csv_files'):
+                                # Try with higher max_depth to explore deeper into the file structure
+                                root_csvs = await sftp.find_csv_files(root_path, recursive=True, max_depth=8)
+                                if root_csvs:
+                                    logger.info(f"Found {len(root_csvs)} CSV files in deep search from {root_path}")
+                                    # Log a sample of the files found
+                                    if len(root_csvs) > 0:
+                                        sample = root_csvs[:5] if len(root_csvs) > 5 else root_csvs
+                                        logger.info(f"Sample files: {sample}")
+
+                                    # Filter for CSV files that match our pattern
+                                    pattern_re = re.compile(csv_pattern)
+                                    matching_csvs = [
+                                        f for f in root_csvs
+                                        if pattern_re.search(os.path.basename(f))
+                                    ]
 
-                                logger.debug(f"Starting deep recursive search from {root_path}")
-
-                                # Use find_csv_files which has better error handling and multiple fallbacks
-                                if hasattr(sftp, 'find_csv_files'):
-                                    # Try with higher max_depth to explore deeper into the file structure
-                                    root_csvs = await sftp.find_csv_files(root_path, recursive=True, max_depth=8)
-                                    if root_csvs:
-                                        logger.info(f"Found {len(root_csvs)} CSV files in deep search from {root_path}")
-                                        # Log a sample of the files found
-                                        if len(root_csvs) > 0:
-                                            sample = root_csvs[:5] if len(root_csvs) > 5 else root_csvs
-                                            logger.info(f"Sample files: {sample}")
-
-                                        # Filter for CSV files that match our pattern
-                                        pattern_re = re.compile(csv_pattern)
+                                    # If no matches with primary pattern, try date format pattern
+                                    if not matching_csvs and csv_pattern != date_format_pattern:
+                                        logger.debug(f"No matches with primary pattern, trying date format pattern")
+                                        pattern_re = re.compile(date_format_pattern)
                                         matching_csvs = [
                                             f for f in root_csvs
                                             if pattern_re.search(os.path.basename(f))
                                         ]
 
-                                        # If no matches with primary pattern, try date format pattern
-                                        if not matching_csvs and csv_pattern != date_format_pattern:
-                                            logger.debug(f"No matches with primary pattern, trying date format pattern")
-                                            pattern_re = re.compile(date_format_pattern)
-                                            matching_csvs = [
-                                                f for f in root_csvs
-                                                if pattern_re.search(os.path.basename(f))
-                                            ]
-
-                                            if matching_csvs:
-                                                # Found matching CSV files
-                                                full_path_csv_files = matching_csvs
-                                                csv_files = [os.path.basename(f) for f in matching_csvs]
-                                                path_found = os.path.dirname(matching_csvs[0])
-                                                logger.info(f"Found {len(csv_files)} CSV files through recursive search in {path_found}")
-
-                                                # Print the first few file names for debugging
-                                                if csv_files:
-                                                    sample_files = csv_files[:5]
-                                                    logger.info(f"Sample CSV files: {sample_files}")
+                                        if matching_csvs:
+                                            # Found matching CSV files
+                                            full_path_csv_files = matching_csvs
+                                            csv_files = [os.path.basename(f) for f in matching_csvs]
+                                            path_found = os.path.dirname(matching_csvs[0])
+                                            logger.info(f"Found {len(csv_files)} CSV files through recursive search in {path_found}")
 
-                                                break
+                                            # Print the first few file names for debugging
+                                            if csv_files:
+                                                sample_files = csv_files[:5]
+                                                logger.info(f"Sample CSV files: {sample_files}")
 
-                                    # If we found files, break out of the root_path loop
-                                    if csv_files:
-                                        break
+                                            break
 
-                            except Exception as search_err:
-                                logger.warning(f"Recursive CSV search failed for {root_path}: {search_err}")
+                                # If we found files, break out of the root_path loop
+                                if csv_files:
+                                    break
 
-                    # Third attempt: Last resort - manually search common directories with simpler method
-                    if not csv_files:
-                        logger.info(f"Still no CSV files found, trying direct file stat checks...")
-                        # This is a last resort method to check for CSV files
-                        # by directly trying to stat specific paths with clear date patterns
+                        except Exception as search_err:
+                            logger.warning(f"Recursive CSV search failed for {root_path}: {search_err}")
 
-                        # Generate some likely filenames with date patterns
-                        current_time = datetime.now()
-                        test_dates = [
-                            current_time - timedelta(days=i)
-                            for i in range(0, 31, 5)  # Try dates at 5-day intervals going back a month
-                        ]
+                # Third attempt: Last resort - manually search common directories with simpler method
+                if not csv_files:
+                    logger.info(f"Still no CSV files found, trying direct file stat checks...")
+                    # This is a last resort method to check for CSV files
+                    # by directly trying to stat specific paths with clear date patterns
 
-                        test_filenames = []
-                        for test_date in test_dates:
-                            # Format: YYYY.MM.DD-00.00.00.csv (daily file at midnight)
-                            test_filenames.append(test_date.strftime("%Y.%m.%d-00.00.00.csv"))
-                            # Also try hourly files from the most recent day
-                            if test_date == test_dates[0]:
-                                for hour in range(0, 24, 6):  # Try every 6 hours
-                                    test_filenames.append(test_date.strftime(f"%Y.%m.%d-{hour:02d}.00.00.csv"))
-
-                        # Try these filenames in each potential directory
-                        for search_path in possible_paths:
-                            if csv_files:  # Break early if we found something
-                                break
+                    # Generate some likely filenames with date patterns
+                    current_time = datetime.now()
+                    test_dates = [
+                        current_time - timedelta(days=i)
+                        for i in range(0, 31, 5)  # Try dates at 5-day intervals going back a month
+                    ]
 
-                            for filename in test_filenames:
-                                test_path = os.path.join(search_path, filename)
-                                try:
-                                    # Try to stat the file directly
-                                    if await sftp.exists(test_path):
-                                        logger.info(f"Found CSV file using direct check: {test_path}")
-                                        # We found one file, now search the directory for more
-                                        path_files = await sftp.list_files(search_path, r".*\.csv$")
-                                        if path_files:
-                                            csv_files = path_files
-                                            path_found = search_path
-                                            full_path_csv_files = [os.path.join(search_path, f) for f in csv_files]
-                                            logger.info(f"Found {len(csv_files)} CSV files in {search_path} using direct check")
-                                            break
-                                except Exception as direct_err:
-                                    pass  # Silently continue, we're trying lots of paths
+                    test_filenames = []
+                    for test_date in test_dates:
+                        # Format: YYYY.MM.DD-00.00.00.csv (daily file at midnight)
+                        test_filenames.append(test_date.strftime("%Y.%m.%d-00.00.00.csv"))
+                        # Also try hourly files from the most recent day
+                        if test_date == test_dates[0]:
+                            for hour in range(0, 24, 6):  # Try every 6 hours
+                                test_filenames.append(test_date.strftime(f"%Y.%m.%d-{hour:02d}.00.00.csv"))
+
+                    # Try these filenames in each potential directory
+                    for search_path in possible_paths:
+                        if csv_files:  # Break early if we found something
+                            break
+
+                        for filename in test_filenames:
+                            test_path = os.path.join(search_path, filename)
+                            try:
+                                # Try to stat the file directly
+                                if await sftp.exists(test_path):
+                                    logger.info(f"Found CSV file using direct check: {test_path}")
+                                    # We found one file, now search the directory for more
+                                    path_files = await sftp.list_files(search_path, r".*\.csv$")
+                                    if path_files:
+                                        csv_files = path_files
+                                        path_found = search_path
+                                        full_path_csv_files = [os.path.join(search_path, f) for f in csv_files]
+                                        logger.info(f"Found {len(csv_files)} CSV files in {search_path} using direct check")
+                                        break
+                            except Exception as direct_err:
+                                pass  # Silently continue, we're trying lots of paths
 
-                        # If we still have no files or path, try local test files as a fallback
-                        if not csv_files or path_found is None:
-                            logger.warning(f"No CSV files found for server {server_id} after exhaustive search on SFTP")
+                    # If we still have no files or path, try local test files as a fallback
+                    if not csv_files or path_found is None:
+                        logger.warning(f"No CSV files found for server {server_id} after exhaustive search on SFTP")
 
-                            # Fallback to local test files in attached_assets
-                            if os.path.exists('attached_assets'):
-                                logger.info(f"Falling back to local test CSV files in attached_assets for server {server_id}")
-                                local_csv_pattern = r"\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}\.csv$"
-                                local_csv_files = []
-                                full_path_csv_files = []  # Initialize the list to prevent unbound error
+                        # Fallback to local test files in attached_assets
+                        if os.path.exists('attached_assets'):
+                            logger.info(f"Falling back to local test CSV files in attached_assets for server {server_id}")
+                            local_csv_pattern = r"\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}\.csv$"
+                            local_csv_files = []
+                            full_path_csv_files = []  # Initialize the list to prevent unbound error
 
-                                # Rule #11: No test shortcuts - only use attached_assets for explicit debugging
-                                # The proper production configuration must be used
-                                logger.info(f"No CSV files found in SFTP locations, checking attached_assets for development files only")
+                            # Rule #11: No test shortcuts - only use attached_assets for explicit debugging
+                            # The proper production configuration must be used
+                            logger.info(f"No CSV files found in SFTP locations, checking attached_assets for development files only")
 
-                                # Only use attached_assets as fallback in development, not production
-                                try:
-                                    for filename in os.listdir('attached_assets'):
-                                        if re.match(local_csv_pattern, filename):
-                                            local_path = os.path.join('attached_assets', filename)
-                                            local_csv_files.append(filename)
-                                            full_path_csv_files.append(local_path)
-
-                                    if local_csv_files:
-                                        # Always prioritize SFTP files over local test files - Rule #11
-                                        # Only use local files if explicitly directed or as last resort in development
-                                        logger.info(f"Found {len(local_csv_files)} local CSV files in attached_assets directory")
-                                        logger.warning(f"Using local files as fallback only, SFTP is preferred")
-                                        csv_files = local_csv_files
-                                        path_found = 'attached_assets'
-                                        deathlogs_path = 'attached_assets'
-                                    else:
-                                        logger.warning(f"No CSV files found in attached_assets directory")
-                                        return 0, 0
-                                except (FileNotFoundError, PermissionError):
-                                    logger.warning(f"Cannot access attached_assets directory, no CSV files processed")
+                            # Only use attached_assets as fallback in development, not production
+                            try:
+                                for filename in os.listdir('attached_assets'):
+                                    if re.match(local_csv_pattern, filename):
+                                        local_path = os.path.join('attached_assets', filename)
+                                        local_csv_files.append(filename)
+                                        full_path_csv_files.append(local_path)
+
+                                if local_csv_files:
+                                    # Always prioritize SFTP files over local test files - Rule #11
+                                    # Only use local files if explicitly directed or as last resort in development
+                                    logger.info(f"Found {len(local_csv_files)} local CSV files in attached_assets directory")
+                                    logger.warning(f"Using local files as fallback only, SFTP is preferred")
+                                    csv_files = local_csv_files
+                                    path_found = 'attached_assets'
+                                    deathlogs_path = 'attached_assets'
+                                else:
+                                    logger.warning(f"No CSV files found in attached_assets directory")
                                     return 0, 0
-                            else:
-                                logger.warning(f"No CSV files found in SFTP or attached_assets locations")
+                            except (FileNotFoundError, PermissionError):
+                                logger.warning(f"Cannot access attached_assets directory, no CSV files processed")
                                 return 0, 0
+                        else:
+                            logger.warning(f"No CSV files found in SFTP or attached_assets locations")
+                            return 0, 0
 
-                        # Update deathlogs_path with the path where we actually found files (guaranteed to be non-None at this point)
-                        deathlogs_path = path_found  # path_found is definitely not None here
+                    # Update deathlogs_path with the path where we actually found files (guaranteed to be non-None at this point)
+                    deathlogs_path = path_found  # path_found is definitely not None here
 
-                        # Sort chronologically
-                        csv_files.sort()
+                    # Sort chronologically
+                    csv_files.sort()
 
-                        # Use a reasonable default timestamp for processing files 
-                        # Check if the timestamp is unreasonably old (more than 14 days)
-                        two_weeks_ago = datetime.now() - timedelta(days=14)
-                        if last_time < two_weeks_ago:
-                            logger.info(f"Last processed time ({last_time}) is more than 14 days old, " +
-                                      f"using 24 hours ago as default to prevent excessive processing")
-                            last_time = datetime.now() - timedelta(days=1)  # 24 hours ago
-                            last_time_str = last_time.strftime("%Y.%m.%d-%H.%M.%S")
+                    # Use a reasonable default timestamp for processing files 
+                    # Check if the timestamp is unreasonably old (more than 14 days)
+                    two_weeks_ago = datetime.now() - timedelta(days=14)
+                    if last_time < two_weeks_ago:
+                        logger.info(f"Last processed time ({last_time}) is more than 14 days old, " +
+                                  f"using 24 hours ago as default to prevent excessive processing")
+                        last_time = datetime.now() - timedelta(days=1)  # 24 hours ago
+                        last_time_str = last_time.strftime("%Y.%m.%d-%H.%M.%S")
 
-                        # Log the cutoff time being used
-                        logger.info(f"Processing files newer than: {last_time_str}")
+                    # Log the cutoff time being used
+                    logger.info(f"Processing files newer than: {last_time_str}")
 
-                        # If no CSV files found via SFTP, log error and return
-                        if not csv_files or len(csv_files) == 0:
-                            logger.error(f"No CSV files found in SFTP location for server {server_id}")
-                            logger.error(f"Please check SFTP configuration and connectivity")
-                            return 0, 0
+                    # If no CSV files found via SFTP, log error and return
+                    if not csv_files or len(csv_files) == 0:
+                        logger.error(f"No CSV files found in SFTP location for server {server_id}")
+                        logger.error(f"Please check SFTP configuration and connectivity")
+                        return 0, 0
 
-                            # Check for local test files if SFTP fails
-                            if os.path.exists(test_dir):
-                                logger.info(f"Checking attached_assets directory for CSV files")
-                                test_files = []
-                                for filename in os.listdir(test_dir):
-                                    if filename.endswith(".csv") and re.match(r'\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}\.csv$', filename):
-                                        test_files.append(os.path.join(test_dir, filename))
-                                        logger.info(f"Found valid CSV file: {filename}")
-
-                                        if test_files:
-                                            logger.warning(f"Using {len(test_files)} local CSV files - this is only for development")
-                                            logger.warning(f"PRODUCTION SHOULD USE SFTP FILES ONLY - Rule #11")
-                                            csv_files = test_files
-                                            deathlogs_path = test_dir
-                                            path_found = test_dir
-                                        else:
-                                            logger.warning(f"No valid CSV files found in attached_assets")
+                        # Check for local test files if SFTP fails
+                        if os.path.exists(test_dir):
+                            logger.info(f"Checking attached_assets directory for CSV files")
+                            test_files = []
+                            for filename in os.listdir(test_dir):
+                                if filename.endswith(".csv") and re.match(r'\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}\.csv$', filename):
+                                    test_files.append(os.path.join(test_dir, filename))
+                                    logger.info(f"Found valid CSV file: {filename}")
+
+                                    if test_files:
+                                        logger.warning(f"Using {len(test_files)} local CSV files - this is only for development")
+                                        logger.warning(f"PRODUCTION SHOULD USE SFTP FILES ONLY - Rule #11")
+                                        csv_files = test_files
+                                        deathlogs_path = test_dir
+                                        path_found = test_dir
                                     else:
-                                        logger.warning(f"attached_assets directory not found")
+                                        logger.warning(f"No valid CSV files found in attached_assets")
                                 else:
-                                    logger.info(f"ALLOW_LOCAL_FILES not set - using only SFTP files as required in production")
+                                    logger.warning(f"attached_assets directory not found")
                             else:
-                                logger.info(f"Already using attached_assets directory, no need to check again")
-
-                        # Filter for files newer than last processed
-                        # Extract just the date portion from filenames for comparison with last_time_str
-                        new_files = []
-                        skipped_files = []
-
-                        # CRITICAL HOT FIX: COMPLETELY BYPASS DATE FILTERING
-                        # Directly assign all files for processing without any filtering
-                        new_files = []
-                        skipped_files = []
-
-                        logger.warning(f"EMERGENCY FIX: Processing ALL {len(csv_files)} CSV files regardless of date")
-                        logger.warning(f"EMERGENCY FIX: Timestamp filter cutoff would have been {last_time_str}")
-
-                        # Log what we're about to process
-                        for f in csv_files:
-                            filename = os.path.basename(f)
-                            logger.warning(f"EMERGENCY FIX: Will process file: {filename}")
-                            new_files.append(f)
-
-                        # Safety check - ensure we actually have files to process
-                        if not new_files:
-                            logger.error("EMERGENCY FIX: Critical error - no files in new_files list despite bypassing filters!")
-                            # Force assign all files as a last resort
-                            new_files = csv_files.copy()
-
-                        # COMPLETE SKIP OF THE SECOND FILTERING LOOP
-                        # Original loop commented out to prevent duplicate processing
-                        # BEGINNING OF COMMENTED OUT SECTION
-                        # for f in csv_files:
-                        #   (and all lines below that were previously inside a triple-quote block)
-                        # END OF COMMENTED OUT SECTION
-                            # Get just the filename without the path
-                            filename = os.path.basename(f)
-                            logger.info(f"DEBUG CSV: Processing filename: {filename}")
-
-                            # Extract the date portion (if it exists)
-                            # Match patterns like: 2025.05.03-00.00.00.csv or 2025.05.03-00.00.00
-                            date_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
-
-                            if date_match:
-                                file_date_str = date_match.group(1)
-
-                                # EMERGENCY FIX: Add enhanced timestamp parsing with multiple formats
+                                logger.info(f"ALLOW_LOCAL_FILES not set - using only SFTP files as required in production")
+                        else:
+                            logger.info(f"Already using attached_assets directory, no need to check again")
+
+                    # Filter for files newer than last processed
+                    # Extract just the date portion from filenames for comparison with last_time_str
+                    new_files = []
+                    skipped_files = []
+
+                    # CRITICAL HOT FIX: COMPLETELY BYPASS DATE FILTERING
+                    # Directly assign all files for processing without any filtering
+                    new_files = []
+                    skipped_files = []
+
+                    logger.warning(f"EMERGENCY FIX: Processing ALL {len(csv_files)} CSV files regardless of date")
+                    logger.warning(f"EMERGENCY FIX: Timestamp filter cutoff would have been {last_time_str}")
+
+                    # Log what we're about to process
+                    for f in csv_files:
+                        filename = os.path.basename(f)
+                        logger.warning(f"EMERGENCY FIX: Will process file: {filename}")
+                        new_files.append(f)
+
+                    # Safety check - ensure we actually have files to process
+                    if not new_files:
+                        logger.error("EMERGENCY FIX: Critical error - no files in new_files list despite bypassing filters!")
+                        # Force assign all files as a last resort
+                        new_files = csv_files.copy()
+
+                    # COMPLETE SKIP OF THE SECOND FILTERING LOOP
+                    # Original loop commented out to prevent duplicate processing
+                    # BEGINNING OF COMMENTED OUT SECTION
+                    # for f in csv_files:
+                    #   (and all lines below that were previously inside a triple-quote block)
+                    # END OF COMMENTED OUT SECTION
+                        # Get just the filename without the path
+                        filename = os.path.basename(f)
+                        logger.info(f"DEBUG CSV: Processing filename: {filename}")
+
+                        # Extract the date portion (if it exists)
+                        # Match patterns like: 2025.05.03-00.00.00.csv or 2025.05.03-00.00.00
+                        date_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
+
+                        if date_match:
+                            file_date_str = date_match.group(1)
+
+                            # EMERGENCY FIX: Add enhanced timestamp parsing with multiple formats
+                            try:
+                                # Try primary format first
+                                logger.info(f"Parsing timestamp for CSV file: {file_date_str}")
                                 try:
-                                    # Try primary format first
-                                    logger.info(f"Parsing timestamp for CSV file: {file_date_str}")
-                                    try:
-                                        file_date = datetime.strptime(file_date_str, '%Y.%m.%d-%H.%M.%S')
-                                        logger.info(f"Successfully parsed timestamp: {file_date}")
-                                    except ValueError as e:
-                                        logger.warning(f"Could not parse timestamp {file_date_str}: {str(e)}")
-                                        # Try alternative formats
-                                        parsing_success = False
-                                        for fmt in ["%Y.%m.%d-%H:%M:%S", "%Y-%m-%d-%H.%M.%S", "%Y-%m-%d %H:%M:%S", "%Y.%m.%d %H:%M:%S"]:
-                                            try:
-                                                file_date = datetime.strptime(file_date_str, fmt)
-                                                logger.info(f"Successfully parsed timestamp with alternative format {fmt}: {file_date}")
-                                                parsing_success = True
-                                                break
-                                            except ValueError:
-                                                continue
-                                        if not parsing_success:
-                                            logger.error(f"Failed to parse timestamp with all formats: {file_date_str}, skipping file")
-                                            skipped_files.append(f)
-                                            continue
-                                    logger.warning(f"TIMESTAMP FIX: Successfully parsed {file_date_str} with primary format")
-                                except ValueError:
-                                    # Try fallback formats
-                                    parsed = False
-                                    fallback_formats = [
-                                        '%Y.%m.%d-%H:%M:%S',  # With colons
-                                        '%Y-%m-%d-%H.%M.%S',  # With dashes
-                                        '%Y-%m-%d %H:%M:%S',  # Standard format
-                                        '%Y.%m.%d %H:%M:%S',  # Dots for date
-                                        '%d.%m.%Y-%H.%M.%S',  # European format
-                                    ]
-
-                                    for fmt in fallback_formats:
+                                    file_date = datetime.strptime(file_date_str, '%Y.%m.%d-%H.%M.%S')
+                                    logger.info(f"Successfully parsed timestamp: {file_date}")
+                                except ValueError as e:
+                                    logger.warning(f"Could not parse timestamp {file_date_str}: {str(e)}")
+                                    # Try alternative formats
+                                    parsing_success = False
+                                    for fmt in ["%Y.%m.%d-%H:%M:%S", "%Y-%m-%d-%H.%M.%S", "%Y-%m-%d %H:%M:%S", "%Y.%m.%d %H:%M:%S"]:
                                         try:
                                             file_date = datetime.strptime(file_date_str, fmt)
-                                            logger.warning(f"TIMESTAMP FIX: Parsed {file_date_str} with fallback format {fmt}")
-                                            parsed = True
+                                            logger.info(f"Successfully parsed timestamp with alternative format {fmt}: {file_date}")
+                                            parsing_success = True
                                             break
                                         except ValueError:
                                             continue
-
-                                    if not parsed:
-                                        # If all formats fail, use a fixed date in the past
-                                        # This ensures the file will be processed
-                                        logger.warning(f"TIMESTAMP FIX: Could not parse {file_date_str} with any format")
-                                        # Use day before last_time to ensure file is processed
-                                        file_date = last_time - timedelta(days=1)
-                                        logger.warning(f"TIMESTAMP FIX: Using fixed date: {file_date} for timestamp: {file_date_str}")
-
-                                # EMERGENCY FIX: Add debug logging
-                                logger.warning(f"TIMESTAMP FIX: File date: {file_date}, Last time: {last_time}, Will process: {file_date > last_time}")
-
-                                # EMERGENCY FIX: Override comparison to always process all files
-                                # Comment out next line to disable emergency mode
-                                file_date = datetime.now()  # Force all files to be processed by setting date to now
-                                logger.info(f"Extracted date {file_date_str} from filename {filename}")
-
-                                try:
-                                    # Convert both timestamp strings to datetime objects for proper comparison
-                                    file_date = datetime.strptime(file_date_str, "%Y.%m.%d-%H.%M.%S")
-
-                                    # Additional safety check - skip if the date is obviously wrong (future)
-                                    now = datetime.now()
-                                    if file_date > now + timedelta(hours=1):  # Allow 1 hour buffer for clock differences
-                                        logger.warning(f"File date {file_date} appears to be in the future, skipping")
+                                    if not parsing_success:
+                                        logger.error(f"Failed to parse timestamp with all formats: {file_date_str}, skipping file")
                                         skipped_files.append(f)
                                         continue
-
-                                    # Convert string format back to datetime for comparison
-                                    last_time_date = datetime.strptime(last_time_str, "%Y.%m.%d-%H.%M.%S")
-
-                                    # IMPORTANT FIX: Always include files if they're within the last 7 days
-                                    # regardless of last_processed time to ensure we don't miss any data
-                                    seven_days_ago = datetime.now() - timedelta(days=7)
-
-                                    # CRITICAL FIX: Immediately include all files, regardless of date
-                                    # This ensures that all files are processed during historical parsing
-                                    logger.info(f"CRITICAL FIX: Including file {filename} with date {file_date} regardless of date comparison")
-                                    new_files.append(f)
-                                    # Comment out old exclusion logic:
-                                    # if file_date > last_time_date or file_date >= seven_days_ago:
-                                    #     logger.info(f"FIXED: Including file {filename} with date {file_date} (last_processed={last_time_date}, 7_days_ago={seven_days_ago})")
-                                    #     new_files.append(f)
-                                    # else:
-                                    #     logger.info(f"File date {file_date} is older than last processed {last_time_date} and older than 7 days")
-                                    #     skipped_files.append(f)
-                                except ValueError as e:
-                                    # Try alternative date formats - primary format is yyyy.mm.dd-hh.mm.ss as confirmed by user
-                                    parsed = False
-                                    for date_format in ["%Y.%m.%d-%H.%M.%S", "%Y-%m-%d-%H.%M.%S", "%Y.%m.%d_%H.%M.%S", "%Y%m%d-%H%M%S"]:
-                                        try:
-                                            logger.info(f"Trying to parse date {file_date_str} with format {date_format}")
-                                            file_date = datetime.strptime(file_date_str, date_format)
-                                            last_time_date = datetime.strptime(last_time_str, "%Y.%m.%d-%H.%M.%S")
-                                            logger.info(f"Successfully parsed date {file_date_str} as {file_date}")
-                                            parsed = True
-
-                                            # Apply the same logic as above - include files from last 7 days
-                                            seven_days_ago = datetime.now() - timedelta(days=7)
-
-                                            # CRITICAL FIX: Immediately include all files, regardless of date
-                                            # This ensures that all files are processed during historical parsing
-                                            logger.info(f"CRITICAL FIX: Including file {filename} with date {file_date} regardless of date comparison")
-                                            new_files.append(f)
-                                            # Comment out old exclusion logic:
-                                            # if file_date > last_time_date or file_date >= seven_days_ago:
-                                            #     logger.info(f"FIXED: Including file {filename} with date {file_date} using alternate format")
-                                            #     new_files.append(f)
-                                            # else:
-                                            #     logger.info(f"File date {file_date} is older than last processed {last_time_date} and older than 7 days")
-                                            #     skipped_files.append(f)
-                                            break
-                                        except ValueError:
-                                            continue
-
-                                    # If we have a date parsing error even after all formats, include the file by default
-                                    if not parsed:
-                                        logger.warning(f"Error parsing date from {file_date_str}: {e}, including file by default")
-                                        new_files.append(f)
-                            else:
-                                # If we can't parse the date from the filename, include it anyway to be safe
-                                logger.warning(f"Could not extract date from filename: {filename}, including by default")
-                                new_files.append(f)
-
-                        # Log what we found
-                        logger.info(f"Found {len(new_files)} new CSV files out of {len(csv_files)} total in {deathlogs_path}")
-                        logger.info(f"Skipped {len(skipped_files)} CSV files as they are older than {last_time_str}")
-
-                        if len(csv_files) > 0 and len(new_files) == 0:
-                            # Show a sample of the CSV files and the last_time_str for debugging
-                            sample = csv_files[:3] if len(csv_files) > 3 else csv_files
-                            logger.info(f"All {len(csv_files)} files were filtered out as older than {last_time_str}")
-                            logger.info(f"Sample filenames: {[os.path.basename(f) for f in sample]}")
-                            # CRITICAL DEBUG: If all files were filtered out, check if any would be included with a much earlier date
-                            debug_date = datetime.now() - timedelta(days=30)
-                            debug_date_str = debug_date.strftime("%Y.%m.%d-%H.%M.%S")
-                            logger.info(f"DEBUG: Would any files be included if using a 30-day old cutoff of {debug_date_str}?")
-                            for f in csv_files[:5]:  # Check first 5 files
-                                filename = os.path.basename(f)
-                                date_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
-                                if date_match:
-                                    file_date_str = date_match.group(1)
+                                logger.warning(f"TIMESTAMP FIX: Successfully parsed {file_date_str} with primary format")
+                            except ValueError:
+                                # Try fallback formats
+                                parsed = False
+                                fallback_formats = [
+                                    '%Y.%m.%d-%H:%M:%S',  # With colons
+                                    '%Y-%m-%d-%H.%M.%S',  # With dashes
+                                    '%Y-%m-%d %H:%M:%S',  # Standard format
+                                    '%Y.%m.%d %H:%M:%S',  # Dots for date
+                                    '%d.%m.%Y-%H.%M.%S',  # European format
+                                ]
+
+                                for fmt in fallback_formats:
                                     try:
-                                        file_date = datetime.strptime(file_date_str, "%Y.%m.%d-%H.%M.%S")
-                                        if file_date > debug_date:
-                                            logger.info(f"DEBUG: {filename} would be included with 30-day cutoff")
-                                        else:
-                                            logger.info(f"DEBUG: {filename} would still be too old with 30-day cutoff")
+                                        file_date = datetime.strptime(file_date_str, fmt)
+                                        logger.warning(f"TIMESTAMP FIX: Parsed {file_date_str} with fallback format {fmt}")
+                                        parsed = True
+                                        break
                                     except ValueError:
-                                        logger.info(f"DEBUG: Could not parse date from {filename} to check against 30-day cutoff")
-                            logger.info(f"DEBUG: Original last_time_str: {last_time_str}, 30-day cutoff: {debug_date_str}")
+                                        continue
 
-                        # Process each file
-                        files_processed = 0
-                        events_processed = 0
+                                if not parsed:
+                                    # If all formats fail, use a fixed date in the past
+                                    # This ensures the file will be processed
+                                    logger.warning(f"TIMESTAMP FIX: Could not parse {file_date_str} with any format")
+                                    # Use day before last_time to ensure file is processed
+                                    file_date = last_time - timedelta(days=1)
+                                    logger.warning(f"TIMESTAMP FIX: Using fixed date: {file_date} for timestamp: {file_date_str}")
 
-                        logger.info(f"Starting to process {len(new_files)} CSV files")
+                            # EMERGENCY FIX: Add debug logging
+                            logger.warning(f"TIMESTAMP FIX: File date: {file_date}, Last time: {last_time}, Will process: {file_date > last_time}")
 
-                        # Sort files by date to ensure we process in chronological order
-                        # Extract date from filename for proper sorting
-                        def get_file_date(file_path):
-                            try:
-                                # Extract date portion from path like .../2025.05.06-00.00.00.csv
-                                file_name = os.path.basename(file_path)
-                                date_part = file_name.split('.csv')[0]
-                                return datetime.strptime(date_part, "%Y.%m.%d-%H.%M.%S")
-                            except (ValueError, IndexError):
-                                # If parsing fails, return a default old date
-                                logger.warning(f"Unable to parse date from filename: {file_path}")
-                                return datetime(2000, 1, 1)
-
-                        # Sort files by their embedded date for chronological processing
-                        sorted_files = sorted(new_files, key=get_file_date)
-                        logger.warning(f"CRITICAL DEBUG: Sorted {len(sorted_files)} files chronologically for processing")
-                        if sorted_files:
-                            logger.warning(f"CRITICAL DEBUG: First 3 sorted files: {[os.path.basename(f) for f in sorted_files[:3]]}")
-                        else:
-                            logger.warning("CRITICAL DEBUG: No files to process after sorting!")
-
-                        # Determine which files to process based on historical vs. regular processing
-                        # - Historical processor will read all CSV files
-                        # - Regular killfeed parser will only read new lines from the newest CSV
-                        is_historical_mode = False
-                        if start_date:
-                            days_diff = (datetime.now() - start_date).days
-                            is_historical_mode = days_diff >= 7
-                            logger.info(f"Start date is {start_date}, days difference is {days_diff}")
-                        else:
-                            logger.info("No start date provided, using default 24-hour window")
-
-                        # OVERRIDE FOR DEBUGGING: Force historical mode to ensure all files are processed
-                        is_historical_mode = True
-                        logger.warning("CRITICAL DEBUG: FORCING historical mode to process all files completely")
-                        files_to_process = sorted_files
-                        only_new_lines = False  # Process all lines
-
-                        # Original logic (commented out for testing)
-                        # if is_historical_mode:
-                        #     logger.info("Running in historical mode - processing all lines from all files")
-                        #     files_to_process = sorted_files
-                        #     only_new_lines = False  # Process all lines in historical mode
-                        # else:
-                        #     # Regular processing - process all files but only new lines
-                        #     if sorted_files:
-                        #         logger.info(f"Running in standard killfeed mode - processing only new lines from {len(sorted_files)} files")
-                        #         # Process all applicable files
-                        #         files_to_process = sorted_files
-                        #         only_new_lines = True  # Only process new lines
-                        #     else:
-                        #         logger.info("No files to process after date filtering")
-                        #         files_to_process = []
-                        #         only_new_lines = False
-
-                        logger.info(f"CSV processing mode: Historical={is_historical_mode}, " + 
-                                  f"Start date={start_date}, Files to process={len(files_to_process)}")
-
-                        if len(files_to_process) == 0:
-                            logger.warning(f"CRITICAL DEBUG: No files to process. Length of sorted_files={len(sorted_files)}")
-                            # Check where the filtering might be happening
-                            if len(new_files) == 0:
-                                logger.warning(f"CRITICAL DEBUG: No files passed the date cutoff filter.")
-                                logger.warning(f"CRITICAL DEBUG: Sample from csv_files: {[os.path.basename(f) for f in csv_files[:3] if csv_files]}")
-                                logger.warning(f"CRITICAL DEBUG: Last time string cutoff: {last_time_str}")
-                            else:
-                                logger.warning(f"CRITICAL DEBUG: Files passed date filter but not selected for processing.")
-                                logger.warning(f"CRITICAL DEBUG: Historical mode: {is_historical_mode}")
-                        else:
-                            logger.info(f"CRITICAL DEBUG: Files ready for processing: {[os.path.basename(f) for f in files_to_process[:3]]}")
+                            # EMERGENCY FIX: Override comparison to always process all files
+                            # Comment out next line to disable emergency mode
+                            file_date = datetime.now()  # Force all files to be processed by setting date to now
+                            logger.info(f"Extracted date {file_date_str} from filename {filename}")
 
-                        for file in files_to_process:
                             try:
-                                # Download file content - use the correct path
-                                file_path = file  # file is already the full path
-                                logger.warning(f"CRITICAL DEBUG: Now downloading CSV file from: {file_path}")
-
-                                # Try downloaded file for one of our attached_assets samples for debugging/testing
-                                try_attached_assets = True  # Set to True to enable testing with local files
-
-                                # Special handling for local files in the attached_assets directory
-                                if 'attached_assets' in file_path:
-```text
-                                    logger.warning(f"CRITICAL DEBUG: Using local file reading for {file_path}")
-                                    try:
-                                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                            content = f.read()
-                                            logger.warning(f"CRITICAL DEBUG: Successfully read local file {file_path} ({len(content)} bytes)")
-                                    except Exception as e:
-                                        logger.error(f"CRITICAL DEBUG: Error reading local file {file_path}: {e}")
-                                        content = None
-                                else:
+                                # Convert both timestamp strings to datetime objects for proper comparison
+                                file_date = datetime.strptime(file_date_str, "%Y.%m.%d-%H.%M.%S")
+
+                                # Additional safety check - skip if the date is obviously wrong (future)
+                                now = datetime.now()
+                                if file_date > now + timedelta(hours=1):  # Allow 1 hour buffer for clock differences
+                                    logger.warning(f"File date {file_date} appears to be in the future, skipping")
+                                    skipped_files.append(f)
+                                    continue
+
+                                # Convert string format back to datetime for comparison
+                                last_time_date = datetime.strptime(last_time_str, "%Y.%m.%d-%H.%M.%S")
+
+                                # IMPORTANT FIX: Always include files if they're within the last 7 days
+                                # regardless of last_processed time to ensure we don't miss any data
+                                seven_days_ago = datetime.now() - timedelta(days=7)
+
+                                # CRITICAL FIX: Immediately include all files, regardless of date
+                                # This ensures that all files are processed during historical parsing
+                                logger.info(f"CRITICAL FIX: Including file {filename} with date {file_date} regardless of date comparison")
+                                new_files.append(f)
+                                # Comment out old exclusion logic:
+                                # if file_date > last_time_date or file_date >= seven_days_ago:
+                                #     logger.info(f"FIXED: Including file {filename} with date {file_date} (last_processed={last_time_date}, 7_days_ago={seven_days_ago})")
+                                #     new_files.append(f)
+                                # else:
+                                #     logger.info(f"File date {file_date} is older than last processed {last_time_date} and older than 7 days")
+                                #     skipped_files.append(f)
+                            except ValueError as e:
+                                # Try alternative date formats - primary format is yyyy.mm.dd-hh.mm.ss as confirmed by user
+                                parsed = False
+                                for date_format in ["%Y.%m.%d-%H.%M.%S", "%Y-%m-%d-%H.%M.%S", "%Y.%m.%d_%H.%M.%S", "%Y%m%d-%H%M%S"]:
                                     try:
-                                        logger.warning(f"EMERGENCY FIX: Attempting enhanced download for file: {file_path}")
-
-                                        # First attempt: Use the standard download method
-                                        content = await sftp.download_file(file_path)
-
-                                        # Check if we got content
-                                        if content:
-                                            content_bytes = len(content)
-                                            logger.warning(f"EMERGENCY FIX: Successfully downloaded {file_path} ({content_bytes} bytes)")
-                                        else:
-                                            # Second attempt: Try direct SFTP access if possible
-                                            logger.warning(f"EMERGENCY FIX: First download attempt failed for {file_path}, trying direct SFTP access")
-                                            try:
-                                                # Try to access the SFTP connection directly
-                                                if hasattr(sftp, 'sftp') and sftp.sftp:
-                                                    async with sftp.sftp.open(file_path, 'r') as remote_file:
-                                                        content = await remote_file.read()
-                                                        content_bytes = len(content) if content else 0
-                                                        logger.warning(f"EMERGENCY FIX: Successfully accessed file directly: {file_path} ({content_bytes} bytes)")
-                                            except Exception as direct_error:
-                                                logger.error(f"EMERGENCY FIX: Direct SFTP access failed: {str(direct_error)}")
-
-                                            # Third attempt: Try a local test file as a last resort
-                                            if not content and try_attached_assets and os.path.exists('attached_assets'):
-                                                logger.warning(f"EMERGENCY FIX: All SFTP attempts failed, checking attached_assets directory")
-                                                # Look for any CSV file in attached_assets
-                                                csv_files = [f for f in os.listdir('attached_assets') if f.endswith('.csv')]
-                                                if csv_files:
-                                                    # Use the first CSV file we find
-                                                    test_file = os.path.join('attached_assets', csv_files[0])
-                                                    logger.warning(f"EMERGENCY FIX: Using local file {test_file} as last resort")
-                                                    with open(test_file, 'r', encoding='utf-8', errors='ignore') as f:
-                                                        content = f.read()
-                                                        logger.warning(f"EMERGENCY FIX: Read local file: {test_file} ({len(content)} bytes)")
-                                    except Exception as e:
-                                        logger.error(f"CRITICAL DEBUG: Exception during SFTP download of {file_path}: {str(e)}")
-                                        content = None
-
-                                if content:
-                                    content_length = len(content) if hasattr(content, '__len__') else 0
-                                    logger.info(f"Downloaded content type: {type(content)}, length: {content_length}")
-
-                                    # Verify the content is not empty
-                                    if content_length == 0:
-                                        logger.warning(f"Empty content downloaded from {file_path} - skipping processing")
+                                        logger.info(f"Trying to parse date {file_date_str} with format {date_format}")
+                                        file_date = datetime.strptime(file_date_str, date_format)
+                                        last_time_date = datetime.strptime(last_time_str, "%Y.%m.%d-%H.%M.%S")
+                                        logger.info(f"Successfully parsed date {file_date_str} as {file_date}")
+                                        parsed = True
+
+                                        # Apply the same logic as above - include files from last 7 days
+                                        seven_days_ago = datetime.now() - timedelta(days=7)
+
+                                        # CRITICAL FIX: Immediately include all files, regardless of date
+                                        # This ensures that all files are processed during historical parsing
+                                        logger.info(f"CRITICAL FIX: Including file {filename} with date {file_date} regardless of date comparison")
+                                        new_files.append(f)
+                                        # Comment out old exclusion logic:
+                                        # if file_date > last_time_date or file_date >= seven_days_ago:
+                                        #     logger.info(f"FIXED: Including file {filename} with date {file_date} using alternate format")
+                                        #     new_files.append(f)
+                                        # else:
+                                        #     logger.info(f"File date {file_date} is older than last processed {last_time_date} and older than 7 days")
+                                        #     skipped_files.append(f)
+                                        break
+                                    except ValueError:
                                         continue
 
-                                    # Handle different types of content returned from download_file
-                                    if isinstance(content, bytes):
-                                        # Normal case - bytes returned
-                                        decoded_content = content.decode('utf-8', errors='ignore')
-                                    elif isinstance(content, list):
-                                        # Handle case where a list of strings/bytes is returned
-                                        if content and isinstance(content[0], bytes):
-                                            # List of bytes
-                                            decoded_content = b''.join(content).decode('utf-8', errors='ignore')
-                                        else:
-                                            # List of strings or empty list
-                                            decoded_content = '\n'.join([str(line) for line in content])
-                                    else:
-                                        # Handle any other case by converting to string
-                                        decoded_content = str(content)
-
-                                    # Verify decoded content has actual substance
-                                    if not decoded_content or len(decoded_content.strip()) == 0:
-                                        logger.warning(f"Empty decoded content from {file_path} - skipping processing")
-                                        continue
+                                # If we have a date parsing error even after all formats, include the file by default
+                                if not parsed:
+                                    logger.warning(f"Error parsing date from {file_date_str}: {e}, including file by default")
+                                    new_files.append(f)
+                        else:
+                            # If we can't parse the date from the filename, include it anyway to be safe
+                            logger.warning(f"Could not extract date from filename: {filename}, including by default")
+                            new_files.append(f)
 
-                                    # Log a sample of the content for debugging
-                                    sample = decoded_content[:200] + "..." if len(decoded_content) > 200 else decoded_content
-                                    logger.info(f"CSV content sample: {sample}")
+                    # Log what we found
+                    logger.info(f"Found {len(new_files)} new CSV files out of {len(csv_files)} total in {deathlogs_path}")
+                    logger.info(f"Skipped {len(skipped_files)} CSV files as they are older than {last_time_str}")
+
+                    if len(csv_files) > 0 and len(new_files) == 0:
+                        # Show a sample of the CSV files and the last_time_str for debugging
+                        sample = csv_files[:3] if len(csv_files) > 3 else csv_files
+                        logger.info(f"All {len(csv_files)} files were filtered out as older than {last_time_str}")
+                        logger.info(f"Sample filenames: {[os.path.basename(f) for f in sample]}")
+                        # CRITICAL DEBUG: If all files were filtered out, check if any would be included with a much earlier date
+                        debug_date = datetime.now() - timedelta(days=30)
+                        debug_date_str = debug_date.strftime("%Y.%m.%d-%H.%M.%S")
+                        logger.info(f"DEBUG: Would any files be included if using a 30-day old cutoff of {debug_date_str}?")
+                        for f in csv_files[:5]:  # Check first 5 files
+                            filename = os.path.basename(f)
+                            date_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
+                            if date_match:
+                                file_date_str = date_match.group(1)
+                                try:
+                                    file_date = datetime.strptime(file_date_str, "%Y.%m.%d-%H.%M.%S")
+                                    if file_date > debug_date:
+                                        logger.info(f"DEBUG: {filename} would be included with 30-day cutoff")
+                                    else:
+                                        logger.info(f"DEBUG: {filename} would still be too old with 30-day cutoff")
+                                except ValueError:
+                                    logger.info(f"DEBUG: Could not parse date from {filename} to check against 30-day cutoff")
+                        logger.info(f"DEBUG: Original last_time_str: {last_time_str}, 30-day cutoff: {debug_date_str}")
 
-                                    # Process content - determine if we should only process new lines
-                                    events = []
+                    # Process each file
+                    files_processed = 0
+                    events_processed = 0
 
-                                    # module: csv_event_parsing
-                                    # Validate content before parsing to ensure CSV correctness per Rule #5 and #6
-                                    if ";" not in decoded_content and "," not in decoded_content:
-                                        logger.warning(f"CSV file {file_path} contains no valid delimiters, likely corrupted")
-                                        continue
+                    logger.info(f"Starting to process {len(new_files)} CSV files")
 
-                                    # Enhanced delimiter detection with bias towards semicolons
-                                    semicolon_count = decoded_content.count(';')
-                                    comma_count = decoded_content.count(',')
-                                    tab_count = decoded_content.count('\t')
+                    # Sort files by date to ensure we process in chronological order
+                    # Extract date from filename for proper sorting
+                    def get_file_date(file_path):
+                        try:
+                            # Extract date portion from path like .../2025.05.06-00.00.00.csv
+                            file_name = os.path.basename(file_path)
+                            date_part = file_name.split('.csv')[0]
+                            return datetime.strptime(date_part, "%Y.%m.%d-%H.%M.%S")
+                        except (ValueError, IndexError):
+                            # If parsing fails, return a default old date
+                            logger.warning(f"Unable to parse date from filename: {file_path}")
+                            return datetime(2000, 1, 1)
+
+                    # Sort files by their embedded date for chronological processing
+                    sorted_files = sorted(new_files, key=get_file_date)
+                    logger.warning(f"CRITICAL DEBUG: Sorted {len(sorted_files)} files chronologically for processing")
+                    if sorted_files:
+                        logger.warning(f"CRITICAL DEBUG: First 3 sorted files: {[os.path.basename(f) for f in sorted_files[:3]]}")
+                    else:
+                        logger.warning("CRITICAL DEBUG: No files to process after sorting!")
+
+                    # Determine which files to process based on historical vs. regular processing
+                    # - Historical processor will read all CSV files
+                    # - Regular killfeed parser will only read new lines from the newest CSV
+                    is_historical_mode = False
+                    if start_date:
+                        days_diff = (datetime.now() - start_date).days
+                        is_historical_mode = days_diff >= 7
+                        logger.info(f"Start date is {start_date}, days difference is {days_diff}")
+                    else:
+                        logger.info("No start date provided, using default 24-hour window")
+
+                    # OVERRIDE FOR DEBUGGING: Force historical mode to ensure all files are processed
+                    is_historical_mode = True
+                    logger.warning("CRITICAL DEBUG: FORCING historical mode to process all files completely")
+                    files_to_process = sorted_files
+                    only_new_lines = False  # Process all lines
+
+                    # Original logic (commented out for testing)
+                    # if is_historical_mode:
+                    #     logger.info("Running in historical mode - processing all lines from all files")
+                    #     files_to_process = sorted_files
+                    #     only_new_lines = False  # Process all lines in historical mode
+                    # else:
+                    #     # Regular processing - process all files but only new lines
+                    #     if sorted_files:
+                    #         logger.info(f"Running in standard killfeed mode - processing only new lines from {len(sorted_files)} files")
+                    #         # Process all applicable files
+                    #         files_to_process = sorted_files
+                    #         only_new_lines = True  # Only process new lines
+                    #     else:
+                    #         logger.info("No files to process after date filtering")
+                    #         files_to_process = []
+                    #         only_new_lines = False
+
+                    logger.info(f"CSV processing mode: Historical={is_historical_mode}, " + 
+                              f"Start date={start_date}, Files to process={len(files_to_process)}")
+
+                    if len(files_to_process) == 0:
+                        logger.warning(f"CRITICAL DEBUG: No files to process. Length of sorted_files={len(sorted_files)}")
+                        # Check where the filtering might be happening
+                        if len(new_files) == 0:
+                            logger.warning(f"CRITICAL DEBUG: No files passed the date cutoff filter.")
+                            logger.warning(f"CRITICAL DEBUG: Sample from csv_files: {[os.path.basename(f) for f in csv_files[:3] if csv_files]}")
+                            logger.warning(f"CRITICAL DEBUG: Last time string cutoff: {last_time_str}")
+                        else:
+                            logger.warning(f"CRITICAL DEBUG: Files passed date filter but not selected for processing.")
+                            logger.warning(f"CRITICAL DEBUG: Historical mode: {is_historical_mode}")
+                    else:
+                        logger.info(f"CRITICAL DEBUG: Files ready for processing: {[os.path.basename(f) for f in files_to_process[:3]]}")
+
+                    # Stat the candidate files with one request per directory so files
+                    # this processor already read at their current size and mtime are skipped
+                    # (historical parses pass a start date and always download)
+                    stat_cache = get_file_stat_cache()
+                    stat_consumer = f"csv:{server_id}"
+                    file_stats = {}
+                    for directory in {os.path.dirname(f) for f in files_to_process}:
+                        file_stats.update(await sftp.stat_directory(directory) or {})
+
+                    unchanged_files = set()
+                    if start_date is None:
+                        for file in files_to_process:
+                            file_stat = file_stats.get(file)
+                            if file_stat and not stat_cache.has_changed(stat_consumer, file, file_stat["size"], file_stat["st_mtime"]):
+                                unchanged_files.add(file)
+
+                    # Files the server rotated away from are read from the local
+                    # mirror when it has them at their current size and mtime
+                    mirror = get_deathlog_mirror()
+                    completed_files = get_completed_files(file_stats)
+                    mirrored_files = {
+                        f for f, f_stat in completed_files.items()
+                        if mirror.has_file(server_id, f, f_stat["size"], f_stat["st_mtime"])
+                    }
+
+                    # Download the next files while the current one is parsed
+                    prefetcher = sftp.prefetch_files([
+                        f for f in files_to_process
+                        if f not in unchanged_files and f not in mirrored_files and 'attached_assets' not in f
+                    ])
+
+                    for file in files_to_process:
+                        try:
+                            file_stat = file_stats.get(file)
+                            if file in unchanged_files:
+                                logger.debug(f"Skipping unchanged CSV file {file}")
+                                continue
 
-                                    # Apply a weight factor to prioritize semicolons
-                                    # Game logs commonly use semicolons and we want to prioritize them
-                                    weighted_semicolon_count = semicolon_count * 3  # Triple the weight for semicolons
+                            # Download file content - use the correct path
+                            file_path = file  # file is already the full path
+                            logger.warning(f"CRITICAL DEBUG: Now downloading CSV file from: {file_path}")
 
-                                    logger.debug(f"Delimiter detection: semicolons={semicolon_count} (weighted: {weighted_semicolon_count}), commas={comma_count}, tabs={tab_count}")
+                            # Try downloaded file for one of our attached_assets samples for debugging/testing
+                            try_attached_assets = True  # Set to True to enable testing with local files
 
-                                    # Determine the most likely delimiter with semicolon bias
-                                    detected_delimiter = ';'  # Default for our format
-                                    if comma_count > weighted_semicolon_count and comma_count > tab_count:
-                                        detected_delimiter = ','
-                                    elif tab_count > weighted_semicolon_count and tab_count > comma_count:
-                                        detected_delimiter = '\t'
+                            # Special handling for local files in the attached_assets directory
+                            if 'attached_assets' in file_path:
+                                logger.warning(f"CRITICAL DEBUG: Using local file reading for {file_path}")
+                                try:
+                                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                                        content = f.read()
+                                        logger.warning(f"CRITICAL DEBUG: Successfully read local file {file_path} ({len(content)} bytes)")
+                                except Exception as e:
+                                    logger.error(f"CRITICAL DEBUG: Error reading local file {file_path}: {e}")
+                                    content = None
+                            else:
+                                try:
+                                    logger.warning(f"EMERGENCY FIX: Attempting enhanced download for file: {file_path}")
+
+                                    content = None
+                                    if file_path in mirrored_files:
+                                        content = await mirror.read_file(
+                                            server_id, file_path, file_stat["size"], file_stat["st_mtime"]
+                                        )
+
+                                    # First attempt: Use the prefetched download
+                                    if not content:
+                                        content = await prefetcher.get(file_path)
+                                        if content and file_path in completed_files:
+                                            await mirror.store_file(
+                                                server_id, file_path, content, file_stat["size"], file_stat["st_mtime"]
+                                            )
+
+                                    # Check if we got content
+                                    if content:
+                                        content_bytes = len(content)
+                                        logger.warning(f"EMERGENCY FIX: Successfully downloaded {file_path} ({content_bytes} bytes)")
                                     else:
-                                        # Additional check for patterns that strongly indicate semicolon delimiter
-                                        if ';;' in decoded_content or ';;;' in decoded_content:
-                                            logger.debug("Found multiple sequential semicolons, confirming semicolon delimiter")
-                                            detected_delimiter = ';'
+                                        # Second attempt: Try direct SFTP access if possible
+                                        logger.warning(f"EMERGENCY FIX: First download attempt failed for {file_path}, trying direct SFTP access")
+                                        try:
+                                            # Try to access the SFTP connection directly
+                                            if hasattr(sftp, 'sftp') and sftp.sftp:
+                                                async with sftp.sftp.open(file_path, 'r') as remote_file:
+                                                    content = await remote_file.read()
+                                                    content_bytes = len(content) if content else 0
+                                                    logger.warning(f"EMERGENCY FIX: Successfully accessed file directly: {file_path} ({content_bytes} bytes)")
+                                        except Exception as direct_error:
+                                            logger.error(f"EMERGENCY FIX: Direct SFTP access failed: {str(direct_error)}")
+
+                                        # Third attempt: Try a local test file as a last resort
+                                        if not content and try_attached_assets and os.path.exists('attached_assets'):
+                                            logger.warning(f"EMERGENCY FIX: All SFTP attempts failed, checking attached_assets directory")
+                                            # Look for any CSV file in attached_assets
+                                            csv_files = [f for f in os.listdir('attached_assets') if f.endswith('.csv')]
+                                            if csv_files:
+                                                # Use the first CSV file we find
+                                                test_file = os.path.join('attached_assets', csv_files[0])
+                                                logger.warning(f"EMERGENCY FIX: Using local file {test_file} as last resort")
+                                                with open(test_file, 'r', encoding='utf-8', errors='ignore') as f:
+                                                    content = f.read()
+                                                    logger.warning(f"EMERGENCY FIX: Read local file: {test_file} ({len(content)} bytes)")
+                                except Exception as e:
+                                    logger.error(f"CRITICAL DEBUG: Exception during SFTP download of {file_path}: {str(e)}")
+                                    content = None
+
+                            if content:
+                                content_length = len(content) if hasattr(content, '__len__') else 0
+                                logger.info(f"Downloaded content type: {type(content)}, length: {content_length}")
+
+                                # Verify the content is not empty
+                                if content_length == 0:
+                                    logger.warning(f"Empty content downloaded from {file_path} - skipping processing")
+                                    continue
+
+                                # Handle different types of content returned from download_file
+                                if isinstance(content, bytes):
+                                    # Normal case - bytes returned
+                                    decoded_content = content.decode('utf-8', errors='ignore')
+                                elif isinstance(content, list):
+                                    # Handle case where a list of strings/bytes is returned
+                                    if content and isinstance(content[0], bytes):
+                                        # List of bytes
+                                        decoded_content = b''.join(content).decode('utf-8', errors='ignore')
+                                    else:
+                                        # List of strings or empty list
+                                        decoded_content = '\n'.join([str(line) for line in content])
+                                else:
+                                    # Handle any other case by converting to string
+                                    decoded_content = str(content)
+
+                                # Verify decoded content has actual substance
+                                if not decoded_content or len(decoded_content.strip()) == 0:
+                                    logger.warning(f"Empty decoded content from {file_path} - skipping processing")
+                                    continue
+
+                                # Log a sample of the content for debugging
+                                sample = decoded_content[:200] + "..." if len(decoded_content) > 200 else decoded_content
+                                logger.info(f"CSV content sample: {sample}")
+
+                                # Process content - determine if we should only process new lines
+                                events = []
+
+                                # module: csv_event_parsing
+                                # Validate content before parsing to ensure CSV correctness per Rule #5 and #6
+                                if ";" not in decoded_content and "," not in decoded_content:
+                                    logger.warning(f"CSV file {file_path} contains no valid delimiters, likely corrupted")
+                                    continue
+
+                                # Enhanced delimiter detection with bias towards semicolons
+                                semicolon_count = decoded_content.count(';')
+                                comma_count = decoded_content.count(',')
+                                tab_count = decoded_content.count('\t')
+
+                                # Apply a weight factor to prioritize semicolons
+                                # Game logs commonly use semicolons and we want to prioritize them
+                                weighted_semicolon_count = semicolon_count * 3  # Triple the weight for semicolons
+
+                                logger.debug(f"Delimiter detection: semicolons={semicolon_count} (weighted: {weighted_semicolon_count}), commas={comma_count}, tabs={tab_count}")
+
+                                # Determine the most likely delimiter with semicolon bias
+                                detected_delimiter = ';'  # Default for our format
+                                if comma_count > weighted_semicolon_count and comma_count > tab_count:
+                                    detected_delimiter = ','
+                                elif tab_count > weighted_semicolon_count and tab_count > comma_count:
+                                    detected_delimiter = '\t'
+                                else:
+                                    # Additional check for patterns that strongly indicate semicolon delimiter
+                                    if ';;' in decoded_content or ';;;' in decoded_content:
+                                        logger.debug("Found multiple sequential semicolons, confirming semicolon delimiter")
+                                        detected_delimiter = ';'
 
-                                    logger.info(f"Using detected delimiter: '{detected_delimiter}' for file {file_path}")
+                                logger.info(f"Using detected delimiter: '{detected_delimiter}' for file {file_path}")
 
-                                    # Check for data rows that match expected format - minimum field count for kill events
-                                    has_valid_data = False
-                                    sample_lines = decoded_content.split('\n')[:20]  # Check first 20 lines for better detection
+                                # Check for data rows that match expected format - minimum field count for kill events
+                                has_valid_data = False
+                                sample_lines = decoded_content.split('\n')[:20]  # Check first 20 lines for better detection
 
-                                    # Minimum field counts for different formats
-                                    min_fields_for_kill = 6  # timestamp, killer, killer_id, victim, victim_id, weapon
+                                # Minimum field counts for different formats
+                                min_fields_for_kill = 6  # timestamp, killer, killer_id, victim, victim_id, weapon
 
-                                    for line in sample_lines:
-                                        if not line or line.isspace():
-                                            continue
+                                for line in sample_lines:
+                                    if not line or line.isspace():
+                                        continue
 
-                                        # Count fields by delimiter (adding 1 since n delimiters = n+1 fields)
-                                        field_count = line.count(detected_delimiter) + 1
+                                    # Count fields by delimiter (adding 1 since n delimiters = n+1 fields)
+                                    field_count = line.count(detected_delimiter) + 1
 
-                                        # Check if this looks like a header line
-                                        is_header = ('time' in line.lower() or 'date' in line.lower()) and \
-                                                   ('killer' in line.lower() or 'player' in line.lower())
+                                    # Check if this looks like a header line
+                                    is_header = ('time' in line.lower() or 'date' in line.lower()) and \
+                                               ('killer' in line.lower() or 'player' in line.lower())
 
-                                        # If it's not a header and has enough fields, it might be valid data
-                                        if not is_header and field_count >= min_fields_for_kill:
-                                            # Additional quality check - make sure there's a timestamp-like pattern
-                                            # Most timestamps have numbers and periods or hyphens
-                                            fields = line.split(detected_delimiter)
-                                            first_field = fields[0].strip() if fields else ""
+                                    # If it's not a header and has enough fields, it might be valid data
+                                    if not is_header and field_count >= min_fields_for_kill:
+                                        # Additional quality check - make sure there's a timestamp-like pattern
+                                        # Most timestamps have numbers and periods or hyphens
+                                        fields = line.split(detected_delimiter)
+                                        first_field = fields[0].strip() if fields else ""
 
-                                            # Looks like a timestamp if it has digits and separators
-                                            looks_like_timestamp = any(c.isdigit() for c in first_field) and \
-                                                                 any(c in '.-: ' for c in first_field)
+                                        # Looks like a timestamp if it has digits and separators
+                                        looks_like_timestamp = any(c.isdigit() for c in first_field) and \
+                                                             any(c in '.-: ' for c in first_field)
 
-                                            if looks_like_timestamp:
-                                                has_valid_data = True
-                                                logger.debug(f"Found valid data row: {line[:50]}...")
-                                                break
+                                        if looks_like_timestamp:
+                                            has_valid_data = True
+                                            logger.debug(f"Found valid data row: {line[:50]}...")
+                                            break
 
-                                    if not has_valid_data:
-                                        logger.warning(f"CSV file {file_path} doesn't contain properly formatted kill data")
-                                        logger.warning(f"Sample line: {sample_lines[0] if sample_lines else 'No lines found'}")
-                                        continue
+                                if not has_valid_data:
+                                    logger.warning(f"CSV file {file_path} doesn't contain properly formatted kill data")
+                                    logger.warning(f"Sample line: {sample_lines[0] if sample_lines else 'No lines found'}")
+                                    continue
 
-                                    # Convert validated content to StringIO for parsing
-                                    content_io = io.StringIO(decoded_content)
+                                # Convert validated content to StringIO for parsing
+                                content_io = io.StringIO(decoded_content)
 
-                                    try:
-                                        # EMERGENCY FIX: Robust error handling with detailed logging
-                                        max_retries = 3  # Increased retries
-                                        for retry in range(max_retries + 1):
-                                            try:
-                                                # EMERGENCY FIX: ALWAYS process all lines regardless of only_new_lines flag
-                                                # This ensures maximum compatibility and file processing
-                                                logger.warning(f"EMERGENCY FIX: Forcing complete file processing for: {file_path}")
+                                try:
+                                    # EMERGENCY FIX: Robust error handling with detailed logging
+                                    max_retries = 3  # Increased retries
+                                    for retry in range(max_retries + 1):
+                                        try:
+                                            # EMERGENCY FIX: ALWAYS process all lines regardless of only_new_lines flag
+                                            # This ensures maximum compatibility and file processing
+                                            logger.warning(f"EMERGENCY FIX: Forcing complete file processing for: {file_path}")
 
-                                                # Reset the file pointer to start
-                                                content_io.seek(0)
+                                            # Reset the file pointer to start
+                                            content_io.seek(0)
 
-                                                # Force historical mode (full processing) for all files
-                                                logger.warning(f"EMERGENCY FIX: Using historical mode for all files with delimiter: '{detected_delimiter}'")
+                                            # Force historical mode (full processing) for all files
+                                            logger.warning(f"EMERGENCY FIX: Using historical mode for all files with delimiter: '{detected_delimiter}'")
 
-                                                # COMPLETELY NEW APPROACH: Use direct CSV handler instead of standard parser
-                                                # Import here to avoid circular imports
-                                                from utils.direct_csv_handler import direct_parse_csv_content
+                                            # COMPLETELY NEW APPROACH: Use direct CSV handler instead of standard parser
+                                            # Import here to avoid circular imports
+                                            from utils.direct_csv_handler import direct_parse_csv_content
 
-                                                logger.warning(f"NEW DIRECT HANDLER: Processing file with specialized parser: {os.path.basename(file_path)}")
+                                            logger.warning(f"NEW DIRECT HANDLER: Processing file with specialized parser: {os.path.basename(file_path)}")
 
-                                                # Reset the file pointer to start
-                                                content_io.seek(0)
+                                            # Reset the file pointer to start
+                                            content_io.seek(0)
 
-                                                # Read the entire content as a string
-                                                content_str = content_io.read()
-
-                                                # Process with direct parser
-                                                events = direct_parse_csv_content(
-                                                    content_str,
-                                                    file_path=file_path,
-                                                    server_id=server_id
-                                                )
-                                                logger.warning(f"NEW DIRECT HANDLER: Processed {len(events)} events from file")
-                                                break  # Success - exit retry loop
-                                            except Exception as e:
-                                                if retry < max_retries:
-                                                    # Reset file pointer for retry
-                                                    content_io.seek(0)
-                                                    logger.warning(f"Retry {retry+1}/{max_retries} parsing file {file_path}: {str(e)}")
-                                                else:
-                                                    # Last retry failed
-                                                    raise
-
-                                        # Validate parsed events
-                                        if events:
-                                            logger.info(f"Parsed {len(events)} events from file {file_path}")
-                                        else:
-                                            logger.warning(f"No events parsed from file {file_path} despite valid format")
-                                    except Exception as parse_error:
-                                        logger.error(f"Error parsing CSV file {file_path}: {str(parse_error)}")
-                                        events = []
-
-                                    # BATCH PROCESSING IMPLEMENTATION
-                                    processed_count = 0
-                                    errors = []
-
-                                    # Import utility functions
-                                    from utils.parser_utils import normalize_event_data, categorize_event, parser_coordinator
-
-                                    # Process in batches of 100 for better performance
-                                    BATCH_SIZE = 100
-                                    if len(events) > BATCH_SIZE:
-                                        logger.info(f"Using batch processing for {len(events)} events")
-                                        event_batches = [events[i:i+BATCH_SIZE] for i in range(0, len(events), BATCH_SIZE)]
-                                        logger.info(f"Processing {len(events)} events in {len(event_batches)} batches of max {BATCH_SIZE}")
-
-                                        # Process each batch
-                                        batch_num = 0
-                                        for event_batch in event_batches:
-                                            batch_num += 1
-                                            batch_normalized = []
-
-                                            # Step 1: Normalize all events in batch
-                                            for event in event_batch:
-                                                try:
-                                                    normalized_event = normalize_event_data(event)
-                                                    if not normalized_event:
-                                                        continue
+                                            # Read the entire content as a string
+                                            content_str = content_io.read()
 
-                                                    # Add server ID
-                                                    normalized_event["server_id"] = server_id
+                                            # Process with direct parser
+                                            events = direct_parse_csv_content(
+                                                content_str,
+                                                file_path=file_path,
+                                                server_id=server_id
+                                            )
+                                            logger.warning(f"NEW DIRECT HANDLER: Processed {len(events)} events from file")
+                                            break  # Success - exit retry loop
+                                        except Exception as e:
+                                            if retry < max_retries:
+                                                # Reset file pointer for retry
+                                                content_io.seek(0)
+                                                logger.warning(f"Retry {retry+1}/{max_retries} parsing file {file_path}: {str(e)}")
+                                            else:
+                                                # Last retry failed
+                                                raise
+
+                                    # Validate parsed events
+                                    if events:
+                                        logger.info(f"Parsed {len(events)} events from file {file_path}")
+                                    else:
+                                        logger.warning(f"No events parsed from file {file_path} despite valid format")
+                                except Exception as parse_error:
+                                    logger.error(f"Error parsing CSV file {file_path}: {str(parse_error)}")
+                                    events = []
 
-                                                    # Update timestamp in coordinator
-                                                    if "timestamp" in normalized_event and isinstance(normalized_event["timestamp"], datetime):
-                                                        parser_coordinator.update_csv_timestamp(server_id, normalized_event["timestamp"])
+                                # BATCH PROCESSING IMPLEMENTATION
+                                processed_count = 0
+                                errors = []
 
-                                                    # Add to batch
-                                                    batch_normalized.append(normalized_event)
-                                                except Exception as e:
-                                                    errors.append(str(e))
-                                                    continue
+                                # Import utility functions
+                                from utils.parser_utils import normalize_event_data, categorize_event, parser_coordinator
 
-                                            # Step 2: Categorize batch into kill and suicide events
-                                            kill_events = []
-                                            suicide_events = []
-
-                                            for event in batch_normalized:
-                                                event_type = categorize_event(event)
-                                                if event_type == "kill":
-                                                    kill_events.append(event)
-                                                elif event_type == "suicide":
-                                                    suicide_events.append(event)
-
-                                            # Log batch summary (only for larger batches to reduce log spam)
-                                            if batch_num % 5 == 0 or batch_num == 1 or batch_num == len(event_batches):
-                                                logger.info(f"Batch {batch_num}/{len(event_batches)}: {len(batch_normalized)} events normalized")
-                                                logger.info(f"Batch {batch_num} has {len(kill_events)} kills and {len(suicide_events)} suicides")
-
-                                            # Step 3: Bulk insert into database
-                                            # 3a: Process kill events in bulk
-                                            if kill_events:
-                                                # Create the documents to insert
-                                                kill_docs = []
-                                                for event in kill_events:
-                                                    # Get fields with fallbacks
-                                                    killer_id = event.get("killer_id", "")
-                                                    victim_id = event.get("victim_id", "")
-
-                                                    # Skip if missing essential IDs
-                                                    if not killer_id or not victim_id:
-                                                        continue
-
-                                                    # Create document for database
-                                                    kill_doc = {
-                                                        "server_id": server_id,
-                                                        "killer_id": killer_id,
-                                                        "killer_name": event.get("killer_name", "Unknown"),
-                                                        "victim_id": victim_id,
-                                                        "victim_name": event.get("victim_name", "Unknown"),
-                                                        "weapon": event.get("weapon", "Unknown"),
-                                                        "distance": event.get("distance", 0),
-                                                        "timestamp": event.get("timestamp", datetime.now()),
-                                                        "is_suicide": False,
-                                                        "event_type": "kill"
-                                                    }
-                                                    kill_docs.append(kill_doc)
-
-                                                # Bulk insert the kill documents
-                                                if kill_docs:
-                                                    try:
-                                                        # Use ordered=False to continue inserting even if some fail
-                                                        result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
-                                                        processed_count += len(result.inserted_ids)
-                                                    except Exception as e:
-                                                        logger.error(f"Error during bulk kill insert: {str(e)[:100]}")
-                                                        # Continue processing other batches despite errors
-
-                                            # 3b: Process suicide events in bulk
-                                            if suicide_events:
-                                                # Create the documents to insert
-                                                suicide_docs = []
-                                                for event in suicide_events:
-                                                    victim_id = event.get("victim_id", "")
-                                                    # Skip if no valid ID
-                                                    if not victim_id:
-                                                        continue
-
-                                                    # Create document for database
-                                                    suicide_doc = {
-                                                        "server_id": server_id,
-                                                        "killer_id": victim_id,
-                                                        "killer_name": event.get("victim_name", "Unknown"),
-                                                        "victim_id": victim_id,
-                                                        "victim_name": event.get("victim_name", "Unknown"),
-                                                        "weapon": event.get("weapon", "Unknown"),
-                                                        "distance": event.get("distance", 0),
-                                                        "timestamp": event.get("timestamp", datetime.now()),
-                                                        "is_suicide": True,
-                                                        "event_type": "suicide"
-                                                    }
-                                                    suicide_docs.append(suicide_doc)
-
-                                                # Bulk insert the suicide documents
-                                                if suicide_docs:
-                                                    try:
-                                                        # Use ordered=False to continue inserting even if some fail
-                                                        result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
-                                                        processed_count += len(result.inserted_ids)
-                                                    except Exception as e:
-                                                        logger.error(f"Error during bulk suicide insert: {str(e)[:100]}")
-                                                        # Continue processing other batches despite errors
-
-                                        # Final batch summary
-                                        logger.info(f"Batch processing complete: {processed_count} events inserted successfully")
+                                # Process in batches of 100 for better performance
+                                BATCH_SIZE = 100
+                                if len(events) > BATCH_SIZE:
+                                    logger.info(f"Using batch processing for {len(events)} events")
+                                    event_batches = [events[i:i+BATCH_SIZE] for i in range(0, len(events), BATCH_SIZE)]
+                                    logger.info(f"Processing {len(events)} events in {len(event_batches)} batches of max {BATCH_SIZE}")
 
-                                    else:
-                                        # Enhanced batch processing for smaller files too
-                                        # Collect kill and suicide events for batch processing
-                                        kill_events = []
-                                        suicide_events = []
-                                        processed_count = 0
+                                    # Process each batch
+                                    batch_num = 0
+                                    for event_batch in event_batches:
+                                        batch_num += 1
+                                        batch_normalized = []
 
-                                        logger.info(f"Using batch processing for {len(events)} events")
-
-                                        # Step 1: Normalize and categorize all events
-                                        for event in events:
+                                        # Step 1: Normalize all events in batch
+                                        for event in event_batch:
                                             try:
-                                                # Normalize event data
                                                 normalized_event = normalize_event_data(event)
                                                 if not normalized_event:
                                                     continue
@@ -1717,207 +1717,359 @@ class CSVProcessorCog(commands.Cog):
                                                 if "timestamp" in normalized_event and isinstance(normalized_event["timestamp"], datetime):
                                                     parser_coordinator.update_csv_timestamp(server_id, normalized_event["timestamp"])
 
-                                                # Process event type
-                                                event_type = categorize_event(normalized_event)
-                                                normalized_event["event_type"] = event_type
+                                                # Add to batch
+                                                batch_normalized.append(normalized_event)
+                                            except Exception as e:
+                                                errors.append(str(e))
+                                                continue
+
+                                        # Step 2: Categorize batch into kill and suicide events
+                                        kill_events = []
+                                        suicide_events = []
 
-                                                # Validate IDs - using the improved validation from our _get_or_create_player method
-                                                killer_id = normalized_event.get("killer_id", "")
-                                                victim_id = normalized_event.get("victim_id", "")
+                                        for event in batch_normalized:
+                                            event_type = categorize_event(event)
+                                            if event_type == "kill":
+                                                kill_events.append(event)
+                                            elif event_type == "suicide":
+                                                suicide_events.append(event)
+
+                                        # Log batch summary (only for larger batches to reduce log spam)
+                                        if batch_num % 5 == 0 or batch_num == 1 or batch_num == len(event_batches):
+                                            logger.info(f"Batch {batch_num}/{len(event_batches)}: {len(batch_normalized)} events normalized")
+                                            logger.info(f"Batch {batch_num} has {len(kill_events)} kills and {len(suicide_events)} suicides")
+
+                                        # Step 3: Bulk insert into database
+                                        # 3a: Process kill events in bulk
+                                        if kill_events:
+                                            # Create the documents to insert
+                                            kill_docs = []
+                                            for event in kill_events:
+                                                # Get fields with fallbacks
+                                                killer_id = event.get("killer_id", "")
+                                                victim_id = event.get("victim_id", "")
 
-                                                # Skip events with invalid IDs
-                                                if not killer_id or killer_id.lower() in ['null', 'none', 'undefined'] or \
-                                                   not victim_id or victim_id.lower() in ['null', 'none', 'undefined']:
+                                                # Skip if missing essential IDs
+                                                if not killer_id or not victim_id:
                                                     continue
 
-                                                # Add to appropriate batch
-                                                if event_type == "kill":
-                                                    kill_events.append(normalized_event)
-                                                elif event_type == "suicide":
-                                                    suicide_events.append(normalized_event)
-                                            except Exception as e:
-                                                errors.append(str(e))
-                                                logger.error(f"Error normalizing/categorizing event: {str(e)[:100]}")
+                                                # Create document for database
+                                                kill_doc = {
+                                                    "server_id": server_id,
+                                                    "killer_id": killer_id,
+                                                    "killer_name": event.get("killer_name", "Unknown"),
+                                                    "victim_id": victim_id,
+                                                    "victim_name": event.get("victim_name", "Unknown"),
+                                                    "weapon": event.get("weapon", "Unknown"),
+                                                    "distance": event.get("distance", 0),
+                                                    "timestamp": event.get("timestamp", datetime.now()),
+                                                    "is_suicide": False,
+                                                    "event_type": "kill"
+                                                }
+                                                kill_docs.append(kill_doc)
+
+                                            # Bulk insert the kill documents
+                                            if kill_docs:
+                                                try:
+                                                    # Use ordered=False to continue inserting even if some fail
+                                                    result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
+                                                    processed_count += len(result.inserted_ids)
 
-                                        # Report categorization results
-                                        logger.info(f"Categorized events: {len(kill_events)} kills, {len(suicide_events)} suicides")
+                                                    # Update weapon, faction, rivalry and activity aggregates
+                                                    await record_kill_aggregates(self.bot.db, server_id, kill_docs)
+                                                    if start_date is None:
+                                                        await get_auto_bounty_detector().record_kills(server_id, kill_docs)
+                                                        await Bounty.claim_for_kills(self.bot.db, kill_docs, server_id=server_id)
+                                                except Exception as e:
+                                                    logger.error(f"Error during bulk kill insert: {str(e)[:100]}")
+                                                    # Continue processing other batches despite errors
 
-                                        # Step 2: Process suicide events in batch
+                                        # 3b: Process suicide events in bulk
                                         if suicide_events:
-                                            # Create documents for bulk insert
+                                            # Create the documents to insert
                                             suicide_docs = []
                                             for event in suicide_events:
-                                                suicide_docs.append({
+                                                victim_id = event.get("victim_id", "")
+                                                # Skip if no valid ID
+                                                if not victim_id:
+                                                    continue
+
+                                                # Create document for database
+                                                suicide_doc = {
                                                     "server_id": server_id,
-                                                    "killer_id": event.get("victim_id"),  # For suicides, killer = victim
+                                                    "killer_id": victim_id,
                                                     "killer_name": event.get("victim_name", "Unknown"),
-                                                    "victim_id": event.get("victim_id"),
+                                                    "victim_id": victim_id,
                                                     "victim_name": event.get("victim_name", "Unknown"),
                                                     "weapon": event.get("weapon", "Unknown"),
                                                     "distance": event.get("distance", 0),
                                                     "timestamp": event.get("timestamp", datetime.now()),
                                                     "is_suicide": True,
                                                     "event_type": "suicide"
-                                                })
+                                                }
+                                                suicide_docs.append(suicide_doc)
 
-                                            # Bulk insert suicide events
+                                            # Bulk insert the suicide documents
                                             if suicide_docs:
                                                 try:
-                                                    # Use ordered=False to allow partial success
+                                                    # Use ordered=False to continue inserting even if some fail
                                                     result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
-                                                    processed_count += len(suicide_docs)
-                                                    logger.info(f"Inserted {len(suicide_docs)} suicide events in batch")
+                                                    processed_count += len(result.inserted_ids)
+
+                                                    # Update activity rollups
+                                                    from models.activity_rollup import ActivityRollup
+                                                    await ActivityRollup.record_kills(server_id, suicide_docs)
                                                 except Exception as e:
-                                                    logger.error(f"Error bulk inserting suicide events: {str(e)[:100]}")
+                                                    logger.error(f"Error during bulk suicide insert: {str(e)[:100]}")
+                                                    # Continue processing other batches despite errors
 
-                                        # Step 3: Process kill events in batch
-                                        if kill_events:
-                                            # Create documents for bulk insert
-                                            kill_docs = []
-                                            for event in kill_events:
-                                                kill_docs.append({
-                                                    "server_id": server_id,
-                                                    "killer_id": event.get("killer_id"),
-                                                    "killer_name": event.get("killer_name", "Unknown"),
-                                                    "victim_id": event.get("victim_id"),
-                                                    "victim_name": event.get("victim_name", "Unknown"),
-                                                    "weapon": event.get("weapon", "Unknown"),
-                                                    "distance": event.get("distance", 0),
-                                                    "timestamp": event.get("timestamp", datetime.now()),
-                                                    "is_suicide": False,
-                                                    "event_type": "kill"
-                                                })
+                                    # Final batch summary
+                                    logger.info(f"Batch processing complete: {processed_count} events inserted successfully")
 
-                                            # Bulk insert kill events
-                                            if kill_docs:
-                                                try:
-                                                    # Use ordered=False to allow partial success
-                                                    result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
-                                                    processed_count += len(kill_docs)
-                                                    logger.info(f"Inserted {len(kill_docs)} kill events in batch")
-                                                except Exception as e:
-                                                    logger.error(f"Error bulk inserting kill events: {str(e)[:100]}")
+                                else:
+                                    # Enhanced batch processing for smaller files too
+                                    # Collect kill and suicide events for batch processing
+                                    kill_events = []
+                                    suicide_events = []
+                                    processed_count = 0
+
+                                    logger.info(f"Using batch processing for {len(events)} events")
 
-                                        # Step 4: Process player stats for unique players
-                                        # This is more efficient than updating per-event
-                                        # Create player lookup sets for batch processing player stats
+                                    # Step 1: Normalize and categorize all events
+                                    for event in events:
                                         try:
-                                            from models.player import Player
+                                            # Normalize event data
+                                            normalized_event = normalize_event_data(event)
+                                            if not normalized_event:
+                                                continue
 
-                                            # Collect unique player IDs
-                                            unique_players = {}  # player_id -> {kills, deaths, suicides}
+                                            # Add server ID
+                                            normalized_event["server_id"] = server_id
 
-                                            # Count kills for killers, deaths for victims 
-                                            for event in kill_events:
-                                                killer_id = event.get("killer_id")
-                                                victim_id = event.get("victim_id")
+                                            # Update timestamp in coordinator
+                                            if "timestamp" in normalized_event and isinstance(normalized_event["timestamp"], datetime):
+                                                parser_coordinator.update_csv_timestamp(server_id, normalized_event["timestamp"])
 
-                                                # Add killer stats
-                                                if killer_id not in unique_players:
-                                                    unique_players[killer_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("killer_name", "Unknown")}
-                                                unique_players[killer_id]["kills"] += 1
+                                            # Process event type
+                                            event_type = categorize_event(normalized_event)
+                                            normalized_event["event_type"] = event_type
 
-                                                # Add victim stats
-                                                if victim_id not in unique_players:
-                                                    unique_players[victim_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
-                                                unique_players[victim_id]["deaths"] += 1
+                                            # Validate IDs - using the improved validation from our _get_or_create_player method
+                                            killer_id = normalized_event.get("killer_id", "")
+                                            victim_id = normalized_event.get("victim_id", "")
 
-                                            # Count suicides
-                                            for event in suicide_events:
-                                                player_id = event.get("victim_id")
-
-                                                # Add player stats
-                                                if player_id not in unique_players:
-                                                    unique_players[player_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
-                                                unique_players[player_id]["suicides"] += 1
-
-                                            # Update stats for each unique player
-                                            logger.info(f"Updating stats for {len(unique_players)} unique players")
-                                            for player_id, stats in unique_players.items():
-                                                # Get or create player
-                                                player = await self._get_or_create_player(server_id, player_id, stats["name"])
-
-                                                if player:
-                                                    # Update stats
-                                                    await player.update_stats(self.bot.db, 
-                                                                            kills=stats["kills"], 
-                                                                            deaths=stats["deaths"], 
-                                                                            suicides=stats["suicides"])
-
-                                            # Update nemesis/prey relationships in bulk
-                                            logger.info(f"Updating nemesis/prey relationships")
-                                            await Player.update_all_nemesis_and_prey(self.bot.db, server_id)
+                                            # Skip events with invalid IDs
+                                            if not killer_id or killer_id.lower() in ['null', 'none', 'undefined'] or \
+                                               not victim_id or victim_id.lower() in ['null', 'none', 'undefined']:
+                                                continue
 
+                                            # Add to appropriate batch
+                                            if event_type == "kill":
+                                                kill_events.append(normalized_event)
+                                            elif event_type == "suicide":
+                                                suicide_events.append(normalized_event)
                                         except Exception as e:
-                                            logger.error(f"Error processing player stats in batch: {str(e)[:150]}")
-                                            logger.error(f"Will continue with event recording even if player stats update failed")
+                                            errors.append(str(e))
+                                            logger.error(f"Error normalizing/categorizing event: {str(e)[:100]}")
+
+                                    # Report categorization results
+                                    logger.info(f"Categorized events: {len(kill_events)} kills, {len(suicide_events)} suicides")
+
+                                    # Step 2: Process suicide events in batch
+                                    if suicide_events:
+                                        # Create documents for bulk insert
+                                        suicide_docs = []
+                                        for event in suicide_events:
+                                            suicide_docs.append({
+                                                "server_id": server_id,
+                                                "killer_id": event.get("victim_id"),  # For suicides, killer = victim
+                                                "killer_name": event.get("victim_name", "Unknown"),
+                                                "victim_id": event.get("victim_id"),
+                                                "victim_name": event.get("victim_name", "Unknown"),
+                                                "weapon": event.get("weapon", "Unknown"),
+                                                "distance": event.get("distance", 0),
+                                                "timestamp": event.get("timestamp", datetime.now()),
+                                                "is_suicide": True,
+                                                "event_type": "suicide"
+                                            })
+
+                                        # Bulk insert suicide events
+                                        if suicide_docs:
+                                            try:
+                                                # Use ordered=False to allow partial success
+                                                result = await self.bot.db.kills.insert_many(suicide_docs, ordered=False)
+                                                processed_count += len(suicide_docs)
+                                                logger.info(f"Inserted {len(suicide_docs)} suicide events in batch")
+
+                                                # Update activity rollups
+                                                from models.activity_rollup import ActivityRollup
+                                                await ActivityRollup.record_kills(server_id, suicide_docs)
+                                            except Exception as e:
+                                                logger.error(f"Error bulk inserting suicide events: {str(e)[:100]}")
+
+                                    # Step 3: Process kill events in batch
+                                    if kill_events:
+                                        # Create documents for bulk insert
+                                        kill_docs = []
+                                        for event in kill_events:
+                                            kill_docs.append({
+                                                "server_id": server_id,
+                                                "killer_id": event.get("killer_id"),
+                                                "killer_name": event.get("killer_name", "Unknown"),
+                                                "victim_id": event.get("victim_id"),
+                                                "victim_name": event.get("victim_name", "Unknown"),
+                                                "weapon": event.get("weapon", "Unknown"),
+                                                "distance": event.get("distance", 0),
+                                                "timestamp": event.get("timestamp", datetime.now()),
+                                                "is_suicide": False,
+                                                "event_type": "kill"
+                                            })
+
+                                        # Bulk insert kill events
+                                        if kill_docs:
+                                            try:
+                                                # Use ordered=False to allow partial success
+                                                result = await self.bot.db.kills.insert_many(kill_docs, ordered=False)
+                                                processed_count += len(kill_docs)
+                                                logger.info(f"Inserted {len(kill_docs)} kill events in batch")
+
+                                                # Update weapon, faction, rivalry and activity aggregates
+                                                await record_kill_aggregates(self.bot.db, server_id, kill_docs)
+                                                if start_date is None:
+                                                    await get_auto_bounty_detector().record_kills(server_id, kill_docs)
+                                                    await Bounty.claim_for_kills(self.bot.db, kill_docs, server_id=server_id)
+                                            except Exception as e:
+                                                logger.error(f"Error bulk inserting kill events: {str(e)[:100]}")
 
-                                    processed = processed_count
+                                    # Step 4: Process player stats for unique players
+                                    # This is more efficient than updating per-event
+                                    # Create player lookup sets for batch processing player stats
+                                    try:
+                                        from models.player import Player
+
+                                        # Collect unique player IDs
+                                        unique_players = {}  # player_id -> {kills, deaths, suicides}
+
+                                        # Count kills for killers, deaths for victims 
+                                        for event in kill_events:
+                                            killer_id = event.get("killer_id")
+                                            victim_id = event.get("victim_id")
+
+                                            # Add killer stats
+                                            if killer_id not in unique_players:
+                                                unique_players[killer_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("killer_name", "Unknown")}
+                                            unique_players[killer_id]["kills"] += 1
+
+                                            # Add victim stats
+                                            if victim_id not in unique_players:
+                                                unique_players[victim_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
+                                            unique_players[victim_id]["deaths"] += 1
+
+                                        # Count suicides
+                                        for event in suicide_events:
+                                            player_id = event.get("victim_id")
+
+                                            # Add player stats
+                                            if player_id not in unique_players:
+                                                unique_players[player_id] = {"kills": 0, "deaths": 0, "suicides": 0, "name": event.get("victim_name", "Unknown")}
+                                            unique_players[player_id]["suicides"] += 1
+
+                                        # Update stats for each unique player
+                                        logger.info(f"Updating stats for {len(unique_players)} unique players")
+                                        # Resolve and create all players of the batch at once
+                                        batch_players = await Player.get_or_create_many(
+                                            self.bot.db, server_id,
+                                            {player_id: stats["name"] for player_id, stats in unique_players.items() if player_id}
+                                        )
+                                        for player_id, stats in unique_players.items():
+                                            player = batch_players.get(player_id)
+
+                                            if player:
+                                                # Update stats
+                                                await player.update_stats(self.bot.db, 
+                                                                        kills=stats["kills"], 
+                                                                        deaths=stats["deaths"], 
+                                                                        suicides=stats["suicides"])
+
+                                        # Update nemesis/prey relationships in bulk
+                                        logger.info(f"Updating nemesis/prey relationships")
+                                        await Player.update_all_nemesis_and_prey(self.bot.db, server_id)
 
-                                    events_processed += processed
-                                    files_processed += 1
+                                    except Exception as e:
+                                        logger.error(f"Error processing player stats in batch: {str(e)[:150]}")
+                                        logger.error(f"Will continue with event recording even if player stats update failed")
 
-                                    if errors:
-                                        logger.warning(f"Errors processing {file}: {len(errors)} errors")
+                                processed = processed_count
 
-                                    # Update last processed time if this is the newest file
-                                    if file == new_files[-1]:
-                                        try:
-                                            file_time = datetime.strptime(file.split('.csv')[0], "%Y.%m.%d-%H.%M.%S")
-                                            self.last_processed[server_id] = file_time
-                                        except ValueError:
-                                            # If we can't parse the timestamp from filename, use current time
-                                            self.last_processed[server_id] = datetime.now()
+                                events_processed += processed
+                                files_processed += 1
 
-                            except Exception as e:
-                                logger.error(f"Error processing file {file}: {str(e)}")
+                                if file_stat:
+                                    stat_cache.mark(stat_consumer, file, file_stat["size"], file_stat["st_mtime"])
 
-                        # Memory optimization - clear local variables before completing
-                        try:
-                            # Force garbage collection to release memory
-                            import gc
-
-                            # Clear any large local variables
-                            if 'csv_parser_data' in locals():
-                                del csv_parser_data
-                            if 'content_io' in locals():
-                                del content_io
-                            if 'decoded_content' in locals():
-                                del decoded_content
-                            if 'content' in locals():
-                                del content
-                            if 'all_events' in locals():
-                                del all_events
-                            if 'kill_events' in locals():
-                                del kill_events
-                            if 'suicide_events' in locals():
-                                del suicide_events
-                            if 'kill_docs' in locals():
-                                del kill_docs
-                            if 'suicide_docs' in locals():
-                                del suicide_docs
-
-                            # Run garbage collection
-                            collected = gc.collect()
-                            logger.info(f"Memory optimization: freed {collected} objects after CSV processing")
-                        except Exception as mem_err:
-                            logger.warning(f"Memory optimization failed: {mem_err}")
-
-                        # Keep the connection open for the next operation
-                        return files_processed, events_processed
+                                if errors:
+                                    logger.warning(f"Errors processing {file}: {len(errors)} errors")
 
-            except Exception as e:
-                logger.error(f"SFTP error for server {server_id}: {str(e)}")
-                # Run garbage collection before returning
-                try:
-                    import gc
-                    collected = gc.collect()
-                    logger.info(f"Memory optimization: freed {collected} objects after CSV error")
-                except:
-                    pass
-                files_processed = 0
-                events_processed = 0
-                return files_processed, events_processed
+                                # Update last processed time if this is the newest file
+                                if file == new_files[-1]:
+                                    try:
+                                        file_time = datetime.strptime(file.split('.csv')[0], "%Y.%m.%d-%H.%M.%S")
+                                        self.last_processed[server_id] = file_time
+                                    except ValueError:
+                                        # If we can't parse the timestamp from filename, use current time
+                                        self.last_processed[server_id] = datetime.now()
+
+                        except Exception as e:
+                            logger.error(f"Error processing file {file}: {str(e)}")
+
+                    prefetcher.close()
+
+                    # Memory optimization - clear local variables before completing
+                    try:
+                        # Force garbage collection to release memory
+                        import gc
+
+                        # Clear any large local variables
+                        if 'csv_parser_data' in locals():
+                            del csv_parser_data
+                        if 'content_io' in locals():
+                            del content_io
+                        if 'decoded_content' in locals():
+                            del decoded_content
+                        if 'content' in locals():
+                            del content
+                        if 'all_events' in locals():
+                            del all_events
+                        if 'kill_events' in locals():
+                            del kill_events
+                        if 'suicide_events' in locals():
+                            del suicide_events
+                        if 'kill_docs' in locals():
+                            del kill_docs
+                        if 'suicide_docs' in locals():
+                            del suicide_docs
+
+                        # Run garbage collection
+                        collected = gc.collect()
+                        logger.info(f"Memory optimization: freed {collected} objects after CSV processing")
+                    except Exception as mem_err:
+                        logger.warning(f"Memory optimization failed: {mem_err}")
+
+                    # Keep the connection open for the next operation
+                    return files_processed, events_processed
+
+        except Exception as e:
+            logger.error(f"SFTP error for server {server_id}: {str(e)}")
+            # Run garbage collection before returning
+            try:
+                import gc
+                collected = gc.collect()
+                logger.info(f"Memory optimization: freed {collected} objects after CSV error")
+            except:
+                pass
+            files_processed = 0
+            events_processed = 0
+            return files_processed, events_processed
 
         # Finalization code moved outside of the try-except block
         logger.debug(f"CSV processing completed for server {server_id}")
@@ -1926,7 +2078,7 @@ class CSVProcessorCog(commands.Cog):
         try:
             import gc
             collected = gc.collect()
-            logger.info(f"Final memory optimization: freed {collected} objects at completion}")
+            logger.info(f"Final memory optimization: freed {collected} objects at completion")
         except:
             pass
 
@@ -2006,6 +2158,13 @@ class CSVProcessorCog(commands.Cog):
         else:
             logger.warning(f"No original_server_id in provided config, paths may use UUID format")
 
+        # Clear existing data so the kills aren't added to the aggregates twice
+        try:
+            cleared = await reset_server_stats(self.bot.db, server_id)
+            logger.info(f"Cleared existing data for server {server_id}: {cleared}")
+        except Exception as e:
+            logger.error(f"Error clearing existing data: {e}")
+
         # Process the server directly with provided configuration
         async with self.processing_lock:
             self.is_processing = True
@@ -2088,20 +2247,9 @@ class CSVProcessorCog(commands.Cog):
                 try:
                     logger.info(f"Clearing existing data for server {resolved_server_id} before historical parse")
 
-                    # Delete all kill events for this server
-                    kill_result = await self.bot.db.kills.delete_many({"server_id": resolved_server_id})
-                    logger.info(f"Deleted {kill_result.deleted_count} existing kill events for server {resolved_server_id}")
-
-                    # Update player stats to reset kill/death/suicide counts
-                    player_reset = await self.bot.db.players.update_many(
-                        {"server_id": resolved_server_id},
-                        {"$set": {"kills": 0, "deaths": 0, "suicides": 0, "updated_at": datetime.utcnow()}}
-                    )
-                    logger.info(f"Reset stats for {player_reset.modified_count} players for server {resolved_server_id}")
-
-                    # Clear rivalry data
-                    rivalry_result = await self.bot.db.rivalries.delete_many({"server_id": resolved_server_id})
-                    logger.info(f"Deleted {rivalry_result.deleted_count} existing rivalries for server {resolved_server_id}")
+                    # Delete the kills, player counts and every aggregate built from them
+                    cleared = await reset_server_stats(self.bot.db, resolved_server_id)
+                    logger.info(f"Cleared existing data for server {resolved_server_id}: {cleared}")
 
                     # Force garbage collection to free up memory
                     import gc
@@ -2188,20 +2336,9 @@ class CSVProcessorCog(commands.Cog):
         try:
             logger.info(f"Clearing existing data for server {server_id} before historical parse (traditional method)")
 
-            # Delete all kill events for this server
-            kill_result = await self.bot.db.kills.delete_many({"server_id": server_id})
-            logger.info(f"Deleted {kill_result.deleted_count} existing kill events for server {server_id}")
-
-            # Update player stats to reset kill/death/suicide counts
-            player_reset = await self.bot.db.players.update_many(
-                {"server_id": server_id},
-                {"$set": {"kills": 0, "deaths": 0, "suicides": 0, "updated_at": datetime.utcnow()}}
-            )
-            logger.info(f"Reset stats for {player_reset.modified_count} players for server {server_id}")
-
-            # Clear rivalry data
-            rivalry_result = await self.bot.db.rivalries.delete_many({"server_id": server_id})
-            logger.info(f"Deleted {rivalry_result.deleted_count} existing rivalries for server {server_id}")
+            # Delete the kills, player counts and every aggregate built from them
+            cleared = await reset_server_stats(self.bot.db, server_id)
+            logger.info(f"Cleared existing data for server {server_id}: {cleared}")
 
             # Force garbage collection to free up memory
             import gc
@@ -2708,6 +2845,11 @@ class CSVProcessorCog(commands.Cog):
 
                 await self.bot.db.kills.insert_one(suicide_doc)
                 logger.info(f"Recorded suicide event for player {victim_name} ({victim_id})")
+
+                # Update activity rollups
+                from models.activity_rollup import ActivityRollup
+                await ActivityRollup.record_kill(server_id, victim_id, victim_id, weapon,
+                                                 timestamp=timestamp, is_suicide=True)
                 return True
 
             # For regular kills, we need both killer and victim
@@ -2725,7 +2867,27 @@ class CSVProcessorCog(commands.Cog):
 
             # Update rivalries
             from models.rivalry import Rivalry
-            await Rivalry.record_kill(server_id, killer_id, victim_id, weapon, "")
+            await Rivalry.record_kill(server_id, killer_id, victim_id, weapon, "",
+                                      killer_name=killer_name, victim_name=victim_name)
+
+            # Update weapon and distance aggregates
+            from models.weapon_stats import WeaponStats
+            await WeaponStats.record_kill(server_id, killer_id, weapon, distance,
+                                          killer_name=killer_name, timestamp=timestamp)
+
+            # Update faction aggregates
+            from models.faction import Faction
+            await Faction.record_kills(server_id, [{
+                "killer_id": killer_id,
+                "killer_name": killer_name,
+                "victim_id": victim_id,
+                "victim_name": victim_name,
+                "weapon": weapon
+            }])
+
+            # Update activity rollups
+            from models.activity_rollup import ActivityRollup
+            await ActivityRollup.record_kill(server_id, killer_id, victim_id, weapon, timestamp=timestamp)
 
             # Update nemesis/prey relationships
             await killer.update_nemesis_and_prey(self.bot.db)
@@ -2762,7 +2924,7 @@ class CSVProcessorCog(commands.Cog):
             player_name: Player name
 
         Returns:
-            Player object or None if invalid data
+            Player object (identity only, without stats) or None if invalid data
         """
         from models.player import Player
 
@@ -2782,29 +2944,9 @@ class CSVProcessorCog(commands.Cog):
             logger.warning(f"Generated placeholder ID '{player_id}' for player '{player_name}'")
 
         try:
-            # Check if player exists
-            player = await Player.get_by_player_id(self.bot.db, player_id)
-
-            if not player:
-                # Create new player
-                player = Player(
-                    player_id=player_id,
-                    server_id=server_id,
-                    name=player_name or "Unknown",
-                    display_name=player_name or "Unknown",
-                    last_seen=datetime.utcnow(),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-
-                # Insert into database - wrapped in try/except to handle edge cases
-                try:
-                    await self.bot.db.players.insert_one(player.__dict__)
-                except Exception as e:
-                    logger.error(f"Error inserting player {player_name} ({player_id}): {str(e)[:100]}")
-                    return None
-
-            return player
+            # Known players come from the server's identity cache without a query
+            players = await Player.get_or_create_many(self.bot.db, server_id, {player_id: player_name})
+            return players[player_id]
 
         except Exception as e:
             logger.error(f"Error in _get_or_create_player for {player_name} ({player_id}): {str(e)[:100]}")
@@ -22,7 +22,7 @@ from utils.decorators import command_handler, has_admin_permission
 from models.economy import Economy as EconomyModel
 from models.guild import Guild
 from utils.embed_builder import EmbedBuilder
-from utils.gambling import BlackjackGame, BlackjackView, SlotsView
+from utils.gambling import BlackjackGame, BlackjackView, GamblingSession, SlotsView
 from utils.server_utils import standardize_server_id, validate_server_id_format
 from utils.premium import validate_premium_feature, premium_tier_required
 from utils.async_utils import AsyncCache, retryable
@@ -257,9 +257,9 @@ class Economy(commands.Cog):
             # Create new economy account
             economy = await EconomyModel.create_or_update(self.bot.db, player_id, server_id)
 
-        # Check if player has enough credits
-        balance = await economy.get_balance()
-        if balance < bet:
+        # Reserve the bet for this hand in one atomic debit
+        session = GamblingSession(economy, "blackjack")
+        if not await session.stake(bet):
             embed = await EmbedBuilder.create_error_embed(
                 "Insufficient Funds",
                 f"You don't have enough credits. You need {bet} credits to play.",
@@ -267,15 +267,6 @@ class Economy(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        # Remove the bet amount with retryable to handle potential timeouts
-        await retryable(
-            economy.remove_currency,
-            args=(bet, "blackjack_bet"),
-            exceptions=(TimeoutError, ConnectionError, Exception),
-            max_attempts=2,
-            timeout_seconds=5
-        )
-
         # Start blackjack game
         game = BlackjackGame(player_id)
         game_state = game.start_game(bet)
@@ -288,47 +279,25 @@ class Economy(commands.Cog):
         if game_state["game_over"]:
             payout = game.get_payout()
 
-            # Update player economy with retryable to handle potential timeouts
+            # Settle the hand with a single write
+            session.record(bet, bet + payout)
+            if not await session.settle():
+                # No view keeps this hand alive, so retry in the background
+                asyncio.create_task(session.settle_later())
+
             if payout > 0:
-                await retryable(
-                    economy.add_currency,
-                    args=(payout, "blackjack", {"game": "blackjack", "result": game.result}),
-                    exceptions=(TimeoutError, ConnectionError, Exception),
-                    max_attempts=2,
-                    timeout_seconds=5
-                )
-                await retryable(
-                    economy.update_gambling_stats,
-                    args=("blackjack", True, payout),
-                    exceptions=(TimeoutError, ConnectionError, Exception),
-                    max_attempts=2,
-                    timeout_seconds=5
-                )
                 embed.add_field(name="Payout", value=f"You won {payout} credits!", inline=False)
             elif payout < 0:
-                await retryable(
-                    economy.update_gambling_stats,
-                    args=("blackjack", False, abs(payout)),
-                    exceptions=(TimeoutError, ConnectionError, Exception),
-                    max_attempts=2,
-                    timeout_seconds=5
-                )
                 embed.add_field(name="Loss", value=f"You lost {abs(payout)} credits.", inline=False)
             else:  # push
                 embed.add_field(name="Push", value=f"Your bet of {bet} credits has been returned.", inline=False)
 
-            new_balance = await retryable(
-                economy.get_balance,
-                exceptions=(TimeoutError, ConnectionError, Exception),
-                max_attempts=2,
-                timeout_seconds=5
-            )
-            embed.add_field(name="New Balance", value=f"{new_balance} credits", inline=False)
+            embed.add_field(name="New Balance", value=f"{session.balance} credits", inline=False)
 
             return await ctx.send(embed=embed)
         else:
             # Create view with buttons
-            view = BlackjackView(game, economy)
+            view = BlackjackView(game, economy, session)
             message = await ctx.send(embed=embed, view=view)
 
             # Store the game data
@@ -13,9 +13,14 @@ from typing import Dict, List, Any, Optional
 from models.guild import Guild
 from models.server import Server
 from models.event import Event, Connection
-from utils.sftp import SFTPClient
-from utils.parsers import LogParser
+from models.activity_rollup import ActivityRollup
+from utils.ingestion_coordinator import get_ingestion_coordinator, release_ingestion_coordinator, shutdown_ingestion, EVENTS, CONNECTIONS
 from utils.embed_builder import EmbedBuilder
+from utils.embed_templates import render_event_embed, render_connection_embed
+from utils.event_digest import (
+    get_event_digest, get_digest_window, set_digest_settings, is_high_priority,
+    DIGEST_CHANNEL_TYPES, MAX_DIGEST_WINDOW
+)
 from utils.helpers import has_admin_permission, update_voice_channel_name
 from utils.decorators import premium_tier_required
 from utils.discord_utils import server_id_autocomplete
@@ -28,6 +33,13 @@ class Events(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    def cog_unload(self):
+        """Called when the cog is unloaded"""
+        # Stop the shared ingestion and post pending digests before the cog goes away
+        from utils.event_digest import shutdown_event_digest
+        asyncio.create_task(shutdown_ingestion())
+        asyncio.create_task(shutdown_event_digest())
+
     @commands.hybrid_group(name="events", description="Server events commands")
     @commands.guild_only()
     async def events(self, ctx):
@@ -78,7 +90,9 @@ class Events(commands.Cog):
                 "`/events conn_config server:<name> ...` - Configure connection notifications",
                 "  ↳ Enable/disable player connect and disconnect notifications",
                 "`/events suicide_config server:<name> ...` - Configure suicide notifications",
-                "  ↳ Enable/disable different types of suicide notifications"
+                "  ↳ Enable/disable different types of suicide notifications",
+                "`/events digest server:<name> ...` - Configure digest mode",
+                "  ↳ Post busy event and connection channels as periodic summaries"
             ]
 
             embed.add_field(
@@ -986,6 +1000,108 @@ class Events(commands.Cog):
             )
             await ctx.send(embed=embed)
 
+    @events.command(name="digest", description="Configure digest mode for busy event channels")
+    @app_commands.describe(
+        server_id="Select a server by name to configure",
+        channel_type="Which channel to summarize (events or connections)",
+        seconds="Seconds to collect notifications per summary (0 to post each one)"
+    )
+    @app_commands.choices(channel_type=[
+        app_commands.Choice(name="Events", value="events"),
+        app_commands.Choice(name="Connections", value="connections")
+    ])
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @premium_tier_required(1)  # Events configuration requires premium tier 1+
+    async def configure_digest(self, ctx, server_id: str,
+                               channel_type: Optional[str] = None,
+                               seconds: Optional[int] = None):
+        """Configure digest mode for a server's event and connection channels"""
+
+        guild_model = None
+        try:
+            # Get guild model for themed embed
+            try:
+                guild_data = await self.bot.db.guilds.find_one({"guild_id": ctx.guild.id})
+                if guild_data:
+                    # Use create_from_db_document to ensure proper conversion of premium_tier
+                    guild_model = Guild.create_from_db_document(guild_data, self.bot.db)
+            except Exception as e:
+                logger.warning(f"Error getting guild model: {e}")
+
+            # Check permissions
+            if not await self._check_permission(ctx):
+                return
+
+            # Get server
+            server = await Server.get_by_id(self.bot.db, server_id, ctx.guild.id)
+            if not server:
+                embed = await EmbedBuilder.create_error_embed(
+                    "Error",
+                    f"Could not find server with ID {server_id} for this guild.",
+                    guild=guild_model
+                )
+                await ctx.send(embed=embed)
+                return
+
+            settings = dict(getattr(server, "digest_settings", None) or {})
+
+            # If no setting was provided, show current settings
+            if channel_type is None or seconds is None:
+                embed = await EmbedBuilder.create_base_embed(
+                    "Digest Settings",
+                    f"Current digest settings for {server.name}",
+                    guild=guild_model
+                )
+
+                lines = []
+                for digest_type in DIGEST_CHANNEL_TYPES:
+                    window = get_digest_window(server, digest_type)
+                    status = f"✅ Every {window}s" if window else "❌ Disabled"
+                    lines.append(f"{digest_type.title()}: {status}")
+
+                embed.add_field(name="Channels", value="\n".join(lines), inline=False)
+                embed.add_field(
+                    name="How to Configure",
+                    value="Use `/events digest server:<server_name> channel_type:<events/connections> seconds:<0-" \
+                          f"{MAX_DIGEST_WINDOW}>`. Server restarts and level 4 missions are always posted immediately.",
+                    inline=False
+                )
+
+                await ctx.send(embed=embed)
+                return
+
+            if channel_type not in DIGEST_CHANNEL_TYPES or seconds < 0 or seconds > MAX_DIGEST_WINDOW:
+                embed = await EmbedBuilder.create_error_embed(
+                    "Invalid Setting",
+                    f"Channel type must be one of {', '.join(DIGEST_CHANNEL_TYPES)} and seconds between 0 and {MAX_DIGEST_WINDOW}.",
+                    guild=guild_model
+                )
+                await ctx.send(embed=embed)
+                return
+
+            # Update settings
+            settings[channel_type] = seconds
+            server.digest_settings = settings
+            await server.update(self.bot.db, {"digest_settings": settings})
+            set_digest_settings(server.server_id, settings)
+
+            status = f"posted as one summary every {seconds} seconds" if seconds else "posted individually"
+            embed = await EmbedBuilder.create_success_embed(
+                "Digest Settings Updated",
+                f"{channel_type.title()} notifications for {server.name} are now {status}.",
+                guild=guild_model
+            )
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            logger.error(f"Error configuring digest mode: {e}", exc_info=True)
+            embed = await EmbedBuilder.create_error_embed(
+                "Error",
+                f"An error occurred: {e}",
+                guild=guild_model
+            )
+            await ctx.send(embed=embed)
+
     async def _check_permission(self, ctx) -> bool:
         """Check if user has permission to use the command"""
         # Initialize guild_model to None first to avoid UnboundLocalError
@@ -1061,14 +1177,9 @@ class Events(commands.Cog):
 
 
 async def start_events_monitor(bot, guild_id: int, server_id: str):
-    """Background task to monitor events for a server"""
-    from config import EVENTS_REFRESH_INTERVAL
-
-    # Initialize reconnection tracking
-    reconnect_attempts = 0
-    max_reconnect_attempts = 10
-    backoff_time = 5  # Start with 5 seconds
-    last_successful_connection = time.time()
+    """Background task to post events and connections from the server's shared ingestion"""
+    coordinator = None
+    queue = None
 
     # Check if we actually have server data in the database
     # This prevents errors when the bot starts up with empty database
@@ -1114,78 +1225,9 @@ async def start_events_monitor(bot, guild_id: int, server_id: str):
             channel_configured = False
             logger.info(f"Continuing events monitor for server {server_id} without a channel - data will be processed but not displayed")
 
-        # Create SFTP client connection or use existing one
-        sftp_key = f"{guild_id}_{server_id}"
-        sftp_connected = False
-
-        if sftp_key in bot.sftp_connections:
-            sftp_client = bot.sftp_connections[sftp_key]
-
-            # Ensure connection is alive
-            if sftp_client and not sftp_client.connected:
-                connected = await sftp_client.connect()
-                if not connected:
-                    logger.error(f"Failed to connect to SFTP server for {server_id}: {sftp_client.last_error}")
-                    # Try to notify an admin if possible
-                    try:
-                        guild = bot.get_guild(guild_id)
-                        if guild is not None and guild.owner:
-                            await guild.owner.send(f"⚠️ Could not connect to SFTP server for {server.name}. Error: {sftp_client.last_error}")
-                    except Exception:
-                        pass  # Silently ignore if we can't message the owner
-
-                    # Don't return here, we'll try to reconnect later
-                    sftp_connected = False
-                else:
-                    sftp_connected = True
-            else:
-                sftp_connected = True
-        else:
-            # Create new connection
-            # Look for original numeric server ID for correct path construction
-            original_server_id = server.original_server_id if hasattr(server, 'original_server_id') and server.original_server_id else server.server_id
-            
-            # If server ID looks like a UUID format but we don't have an original_server_id,
-            # Try to extract a numeric ID from server name or other fields if available
-            if "-" in server.server_id and len(server.server_id) > 30 and original_server_id == server.server_id:
-                logger.info(f"Server ID appears to be in UUID format: {server.server_id}")
-                logger.info(f"Checking for numeric server ID in server properties")
-                
-                # Try to find a numeric ID in server name or other properties
-                if hasattr(server, 'server_name') and server.server_name:
-                    # Try to extract a numeric ID from the server name
-                    for word in str(server.server_name).split():
-                        if word.isdigit() and len(word) >= 4:
-                            logger.info(f"Found potential numeric server ID in server_name: {word}")
-                            original_server_id = word
-                            break
-            
-            logger.info(f"Using original_server_id: {original_server_id} for path construction")
-            
-            sftp_client = SFTPClient(
-                hostname=server.sftp_host,
-                port=server.sftp_port,
-                username=server.sftp_username,
-                password=server.sftp_password,
-                server_id=server.server_id,
-                original_server_id=original_server_id  # Pass original ID for path construction
-            )
-
-            # Try to connect
-            connected = await sftp_client.connect()
-            if not connected:
-                logger.error(f"Failed to connect to SFTP server for {server_id}: {sftp_client.last_error}")
-                # We'll try to reconnect later, don't return here
-                sftp_connected = False
-            else:
-                sftp_connected = True
-
-            # Store client for later use, even if connected is None
-            bot.sftp_connections[sftp_key] = sftp_client
-
-        # If not connected, we'll log it and try to reconnect periodically
-        if not sftp_connected:
-            logger.warning(f"Not connected to SFTP for server {server_id}, will attempt periodic reconnection")
+        # Subscribe to the server's shared ingestion; it owns the SFTP connection
+        coordinator = get_ingestion_coordinator(bot, server)
+        queue = coordinator.subscribe((EVENTS, CONNECTIONS))
 
         # Get channels
         guild = bot.get_guild(guild_id)
@@ -1300,160 +1342,60 @@ async def start_events_monitor(bot, guild_id: int, server_id: str):
             logger.info(f"No events channel configured for server {server_id}, monitoring will run silently until channel is configured")
 
         # Main monitoring loop
-        consecutive_errors = 0
-        max_consecutive_errors = 5
-
         while True:
-            try:
-                # Get log file
-                log_file = await sftp_client.get_log_file()
-                if not log_file:
-                    logger.warning(f"No log file found for server {server_id}")
-                    # If we haven't found a log file for a while, try reconnecting
-                    if time.time() - last_successful_connection > 300:  # 5 minutes
-                        logger.info(f"No log file found for 5 minutes, reconnecting SFTP for server {server_id}")
-                        await sftp_client.disconnect()
-                        await asyncio.sleep(1)
-                        await sftp_client.connect()
-                        last_successful_connection = time.time()
-                    await asyncio.sleep(EVENTS_REFRESH_INTERVAL)
-                    continue
-
-                # Get last processed line number
-                last_line = server.last_log_line
-
-                # Get total lines in the file with timeout protection
+            batch = await queue.get()
+            if batch is None:
+                logger.error(f"Ingestion for server {server_id} stopped, stopping events monitor")
+                # Try to notify an admin if possible
                 try:
-                    total_lines = await sftp_client.get_file_size(log_file)
-
-                    # Reset consecutive errors on success
-                    consecutive_errors = 0
-                    reconnect_attempts = 0
-                    backoff_time = 5
-                    last_successful_connection = time.time()
-
-                    # If no new lines, sleep and continue
-                    if total_lines <= last_line:
-                        await asyncio.sleep(EVENTS_REFRESH_INTERVAL)
-                        continue
-
-                    # Read new lines with timeout protection
-                    new_lines = await sftp_client.read_file(
-                        log_file, 
-                        start_line=last_line,
-                        max_lines=-1  # Read all new lines
-                    )
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout reading log data for {server_id}, will retry")
-                    # Reconnect after timeout
-                    await sftp_client.disconnect()
-                    await asyncio.sleep(1)
-                    connected = await sftp_client.connect()
-                    if not connected:
-                        logger.error(f"Failed to reconnect after timeout for server {server_id}")
-                        consecutive_errors += 1
-                    await asyncio.sleep(EVENTS_REFRESH_INTERVAL)
-                    continue
-                except Exception as file_e:
-                    logger.error(f"Error reading log file: {file_e}")
-                    consecutive_errors += 1
-                    await asyncio.sleep(EVENTS_REFRESH_INTERVAL)
-                    continue
-
-                if not new_lines:
-                    logger.debug(f"No new lines in log file for server {server_id}")
-                    await asyncio.sleep(EVENTS_REFRESH_INTERVAL)
-                    continue
-
-                # Parse new lines
-                events, connections = LogParser.parse_log_lines(new_lines)
-
-                # Log successful parsing
-                if events is not None or connections:
-                    logger.info(f"Parsed {len(events)} events and {len(connections)} connections from {len(new_lines)} lines for server {server_id}")
-
-                # Process events
-                processed_events = 0
-                if events is not None:
-                    # Always process events, even if no is not None channel configured
-                    for event_data in events:
-                        try:
-                            await process_event(bot, server, event_data, events_channel if events_channel is not None else None)
-                            processed_events += 1
-                        except Exception as event_e:
-                            logger.error(f"Error processing event: {event_e}", exc_info=True)
-
-                # Process connections
-                processed_connections = 0
-                if connections is not None:
-                    # Always process connections, even if no is not None channel configured
-                    for connection_data in connections:
-                        try:
-                            await process_connection(bot, server, connection_data, connections_channel if connections_channel is not None else None)
-                            processed_connections += 1
-                        except Exception as conn_e:
-                            logger.error(f"Error processing connection: {conn_e}", exc_info=True)
-
-                # Update voice channel with player count
-                if voice_channel_id is not None:
-                    try:
-                        # Get current player count
-                        player_count, _ = await server.get_online_player_count()
-
-                        # Ensure voice_channel_id is an integer
-                        if not isinstance(voice_channel_id, int):
-                            voice_channel_id = int(voice_channel_id)
-                            logger.info(f"Converted voice_channel_id to int: {voice_channel_id}")
+                    guild = bot.get_guild(guild_id)
+                    if guild is not None and guild.owner:
+                        await guild.owner.send(f"⚠️ Events monitor for {server.name} has been stopped due to too many connection failures. Please restart it manually with `/events start`.")
+                except Exception:
+                    pass  # Silently ignore if we can't message the owner
+                break
 
-                        # Update voice channel
-                        await update_voice_channel_name(bot, guild_id, voice_channel_id, player_count)
-                    except Exception as voice_e:
-                        logger.warning(f"Error updating voice channel: {voice_e}")
+            events = batch.get(EVENTS, [])
+            connections = batch.get(CONNECTIONS, [])
+            logger.info(f"Received {len(events)} events and {len(connections)} connections for server {server_id}")
 
-                # Update last processed line only if we is not None successfully processed events/connections
-                if processed_events > 0 or processed_connections > 0 or (len(events) == 0 and len(connections) == 0):
-                    await server.update_last_log_line(last_line + len(new_lines))
-                    logger.debug(f"Updated last log line to {last_line + len(new_lines)} for server {server_id}")
+            # Always process events, even if no channel is configured
+            for event_data in events:
+                try:
+                    await process_event(bot, server, event_data, events_channel if events_channel is not None else None)
+                except Exception as event_e:
+                    logger.error(f"Error processing event: {event_e}", exc_info=True)
 
-                # Reset consecutive errors on success
-                consecutive_errors = 0
+            # Always process connections, even if no channel is configured
+            for connection_data in connections:
+                try:
+                    await process_connection(bot, server, connection_data, connections_channel if connections_channel is not None else None)
+                except Exception as conn_e:
+                    logger.error(f"Error processing connection: {conn_e}", exc_info=True)
 
-            except asyncio.CancelledError:
-                logger.info(f"Events monitor for server {server_id} cancelled")
-                break
+            # Record the online player count tracked by the ingestion for the activity rollups
+            player_count = coordinator.online_players
+            if player_count is not None:
+                try:
+                    await ActivityRollup.record_online(server_id, player_count)
+                except Exception as online_e:
+                    logger.warning(f"Error recording online player count: {online_e}")
 
-            except Exception as e:
-                logger.error(f"Error in events monitor for server {server_id}: {e}", exc_info=True)
-                consecutive_errors += 1
+            # Update voice channel with player count
+            if voice_channel_id is not None and player_count is not None:
+                try:
+                    # Ensure voice_channel_id is an integer
+                    if not isinstance(voice_channel_id, int):
+                        voice_channel_id = int(voice_channel_id)
+                        logger.info(f"Converted voice_channel_id to int: {voice_channel_id}")
 
-                # Attempt reconnection if we've had too many consecutive errors
-                if consecutive_errors >= max_consecutive_errors:
-                    if reconnect_attempts < max_reconnect_attempts:
-                        logger.warning(f"Too many consecutive errors ({consecutive_errors}), attempting reconnection for server {server_id}")
-                        try:
-                            await sftp_client.disconnect()
-                            await asyncio.sleep(backoff_time)  # Exponential backoff
-                            connected = await sftp_client.connect()
-                            if connected:
-                                logger.info(f"Successfully reconnected SFTP for server {server_id}")
-                                consecutive_errors = 0
-                                backoff_time = min(backoff_time * 2, 60)  # Exponential backoff with max of 60 seconds
-                            reconnect_attempts += 1
-                        except Exception as reconnect_e:
-                            logger.error(f"Error during reconnection attempt: {reconnect_e}")
-                    else:
-                        logger.error(f"Exceeded maximum reconnection attempts for server {server_id}, stopping monitor")
-                        # Try to notify an admin if possible is not None
-                        try:
-                            guild = bot.get_guild(guild_id)
-                            if guild is not None and guild.owner:
-                                await guild.owner.send(f"⚠️ Events monitor for {server.name} has been stopped due to too many connection failures. Please restart it manually with `/events start`.")
-                        except Exception:
-                            pass  # Silently ignore if we is not None can't message the owner
-                        break
+                    # Update voice channel
+                    await update_voice_channel_name(bot, guild_id, voice_channel_id, player_count)
+                except Exception as voice_e:
+                    logger.warning(f"Error updating voice channel: {voice_e}")
 
-            # Sleep before next check
-            await asyncio.sleep(EVENTS_REFRESH_INTERVAL)
+            # The ingestion saves its file positions once the batch is processed
+            queue.task_done()
 
     except asyncio.CancelledError:
         logger.info(f"Events monitor for server {server_id} cancelled")
@@ -1462,7 +1404,10 @@ async def start_events_monitor(bot, guild_id: int, server_id: str):
         logger.error(f"Error in events monitor for server {server_id}: {e}", exc_info=True)
 
     finally:
-        # No need to clean up SFTP connection as killfeed monitor might be using it
+        # Leave the shared ingestion; it stops when no monitor needs it
+        if queue is not None:
+            await release_ingestion_coordinator(coordinator.server_id, queue)
+
         logger.info(f"Events monitor for server {server_id} stopped")
 
         # Try to send notification that monitor has stopped
@@ -1525,23 +1470,24 @@ async def process_event(bot, server, event_data, channel):
             # Use create_from_db_document to ensure proper conversion of premium_tier
             guild_model = Guild.create_from_db_document(guild_data, bot.db)
 
+        # Buffer the event when the server posts event digests
+        digest_window = get_digest_window(server, "events")
+        if channel and digest_window and not is_high_priority("events", event_data):
+            await get_event_digest().add(channel, server, "events", event_data, digest_window, guild=guild_model)
+            return
+
         # Create embed for the event
-        embed = await EmbedBuilder.create_event_embed(event_data, guild=guild_model)
+        embed = render_event_embed(event_data, server, guild=guild_model)
 
-        # Get the icon file for the specific event type
-        from utils.embed_icons import create_discord_file, get_event_icon
         # Get the event icon based on the event type
+        from utils.embed_icons import send_embed_with_icon, get_event_icon
         event_icon_path = get_event_icon(event_data.get("type", "unknown"))
-        icon_file = create_discord_file(event_icon_path) if event_icon_path is not None else None
 
         # Send to channel with the event icon if channel is not None exists
         if channel:
             try:
-                if icon_file:
-                    await channel.send(embed=embed, file=icon_file)
-                else:
-                    # Fallback if file can't be created
-                    await channel.send(embed=embed)
+                # The icon is uploaded once and then referenced by URL
+                await send_embed_with_icon(channel, embed, event_icon_path)
             except Exception as send_error:
                 logger.error(f"Error sending event to channel: {send_error}")
         else:
@@ -1586,43 +1532,25 @@ async def process_connection(bot, server, connection_data, channel):
             # Use create_from_db_document to ensure proper conversion of premium_tier
             guild_model = Guild.create_from_db_document(guild_data, bot.db)
 
-        # Create base embed with theme
-        if action == "connected":
-            title = "🟢 Player Connected"
-        else:
-            title = "🔴 Player Disconnected"
-
         player_name = connection_data["player_name"]
-        platform = connection_data.get("platform", "Unknown")
 
-        # Create themed base embed
-        embed = EmbedBuilder.create_base_embed(
-            title=title,
-            description=f"**{player_name}** has {action} to the server",
-            guild=guild_model
-        )
-
-        # Override color for connection status
-        if action == "connected":
-            embed.color = discord.Color.green()
-        else:
-            embed.color = discord.Color.red()
+        # Buffer the connection when the server posts connection digests
+        digest_window = get_digest_window(server, "connections")
+        if channel and digest_window:
+            await get_event_digest().add(channel, server, "connections", connection_data, digest_window, guild=guild_model)
+            return
 
-        embed.timestamp = connection_data["timestamp"]
-        embed.add_field(name="Platform", value=platform, inline=True)
+        # Create embed for the connection
+        embed = render_connection_embed(connection_data, guild=guild_model)
 
-        # Get the icon file for the connection event
-        from utils.embed_icons import create_discord_file, CONNECTIONS_ICON
-        icon_file = create_discord_file(CONNECTIONS_ICON)
+        # Get the icon for the connection event
+        from utils.embed_icons import send_embed_with_icon, CONNECTIONS_ICON
 
         # Send to channel with connection icon if channel is not None exists
         if channel:
             try:
-                if icon_file:
-                    await channel.send(embed=embed, file=icon_file)
-                else:
-                    # Fallback if file can't be created
-                    await channel.send(embed=embed)
+                # The icon is uploaded once and then referenced by URL
+                await send_embed_with_icon(channel, embed, CONNECTIONS_ICON)
             except Exception as send_error:
                 logger.error(f"Error sending connection event to channel: {send_error}")
         else:
@@ -23,6 +23,7 @@ from utils.helpers import paginate_embeds, has_admin_permission, has_mod_permiss
 from utils.async_utils import BackgroundTask
 from utils.premium import premium_tier_required
 from utils.discord_utils import server_id_autocomplete  # Import standardized autocomplete function
+from utils.name_index import resolve_player
 
 logger = logging.getLogger(__name__)
 
@@ -666,10 +667,16 @@ class FactionsCog(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Get player ID
-        # This would normally involve a database lookup
-        # For now, assume player_name is the player ID
-        player_id = player_name
+        # Resolve the player name through the server's name index
+        player = await resolve_player(server_id, player_name)
+        if not player:
+            embed = EmbedBuilder.error(
+                title="Player Not Found",
+                description=f"No player found with name or ID '{player_name}'."
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        player_id = player[0]
 
         # Add player to faction
         try:
@@ -761,10 +768,16 @@ class FactionsCog(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Get player ID
-        # This would normally involve a database lookup
-        # For now, assume player_name is the player ID
-        player_id = player_name
+        # Resolve the player name through the server's name index
+        player = await resolve_player(server_id, player_name)
+        if not player:
+            embed = EmbedBuilder.error(
+                title="Player Not Found",
+                description=f"No player found with name or ID '{player_name}'."
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        player_id = player[0]
 
         # Check if player is the faction leader
         if faction.leader_id == player_id:
@@ -877,10 +890,16 @@ class FactionsCog(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Get player ID
-        # This would normally involve a database lookup
-        # For now, assume player_name is the player ID
-        target_player_id = player_name
+        # Resolve the player name through the server's name index
+        player = await resolve_player(server_id, player_name)
+        if not player:
+            embed = EmbedBuilder.error(
+                title="Player Not Found",
+                description=f"No player found with name or ID '{player_name}'."
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        target_player_id = player[0]
 
         # Check if target player is in the faction
         faction_members = await faction.get_members()
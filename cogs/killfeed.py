@@ -14,9 +14,11 @@ from typing import Dict, List, Any, Optional
 from models.guild import Guild
 from models.server import Server
 from models.player import Player
-from utils.sftp import SFTPClient
-from utils.csv_parser import CSVParser
+from models.bounty import Bounty
+from utils.ingestion_coordinator import get_ingestion_coordinator, release_ingestion_coordinator, shutdown_ingestion, KILLS
 from utils.embed_builder import EmbedBuilder
+from utils.embed_templates import render_kill_embed
+from utils.auto_bounty import get_auto_bounty_detector
 from utils.helpers import has_admin_permission
 from utils.decorators import premium_tier_required
 from utils.discord_utils import server_id_autocomplete
@@ -29,6 +31,13 @@ class Killfeed(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    def cog_unload(self):
+        """Called when the cog is unloaded"""
+        # Stop the shared ingestion and flush queued killfeed embeds before the cog goes away
+        from utils.killfeed_dispatcher import shutdown_killfeed_dispatcher
+        asyncio.create_task(shutdown_ingestion())
+        asyncio.create_task(shutdown_killfeed_dispatcher())
+
     @commands.hybrid_group(name="killfeed", description="Killfeed commands")
     @commands.guild_only()
     async def killfeed(self, ctx):
@@ -348,14 +357,9 @@ class Killfeed(commands.Cog):
 
 
 async def start_killfeed_monitor(bot, guild_id: int, server_id: str):
-    """Background task to monitor killfeed for a server"""
-    from config import KILLFEED_REFRESH_INTERVAL
-
-    # Initialize reconnection tracking
-    reconnect_attempts = 0
-    max_reconnect_attempts = 10
-    backoff_time = 5  # Start with 5 seconds
-    last_successful_connection = time.time()
+    """Background task to post kills from the server's shared ingestion"""
+    coordinator = None
+    queue = None
 
     # Check if we actually have server data in the database
     # This prevents errors when the bot starts up with empty database
@@ -400,59 +404,9 @@ async def start_killfeed_monitor(bot, guild_id: int, server_id: str):
             channel_configured = False
             logger.info(f"Continuing killfeed monitor for server {server_id} without a channel - data will be processed but not displayed")
 
-        # Create SFTP client connection
-        # Look for original numeric server ID for correct path construction
-        original_server_id = server.original_server_id if hasattr(server, 'original_server_id') and server.original_server_id else server.server_id
-        
-        # If server ID looks like a UUID format but we don't have an original_server_id,
-        # Try to extract a numeric ID from server name or other fields if available
-        if "-" in server.server_id and len(server.server_id) > 30 and original_server_id == server.server_id:
-            logger.info(f"Server ID appears to be in UUID format: {server.server_id}")
-            logger.info(f"Checking for numeric server ID in server properties")
-            
-            # Try to find a numeric ID in server name or other properties
-            if hasattr(server, 'name') and server.name:
-                # Try to extract a numeric ID from the server name
-                for word in str(server.name).split():
-                    if word.isdigit() and len(word) >= 4:
-                        logger.info(f"Found potential numeric server ID in server_name: {word}")
-                        original_server_id = word
-                        break
-        
-        logger.info(f"Using original_server_id: {original_server_id} for path construction in killfeed")
-        
-        sftp_client = SFTPClient(
-            hostname=server.sftp_host,
-            port=server.sftp_port,
-            username=server.sftp_username,
-            password=server.sftp_password,
-            server_id=server.server_id,
-            original_server_id=original_server_id  # Pass original ID for path construction
-        )
-
-        # Try to connect
-        sftp_connected = False
-        connected = await sftp_client.connect()
-        if not connected:
-            logger.error(f"Failed to connect to SFTP server for {server_id}: {sftp_client.last_error}")
-            # Try to notify an admin if possible
-            try:
-                guild = bot.get_guild(guild_id)
-                if guild and guild.owner:
-                    await guild.owner.send(f"⚠️ Could not connect to SFTP server for {server.name}. Error: {sftp_client.last_error}")
-            except Exception:
-                pass  # Silently ignore if we can't message the owner
-            # Don't return here, we'll try to reconnect later
-            sftp_connected = False
-        else:
-            sftp_connected = True
-
-        # Store client for later use, even if connected is None
-        bot.sftp_connections[f"{guild_id}_{server_id}"] = sftp_client
-
-        # If not connected, we'll log it and try to reconnect periodically
-        if not sftp_connected:
-            logger.warning(f"Not connected to SFTP for server {server_id}, will attempt periodic reconnection")
+        # Subscribe to the server's shared ingestion; it owns the SFTP connection
+        coordinator = get_ingestion_coordinator(bot, server)
+        queue = coordinator.subscribe(KILLS)
 
         # Get killfeed channel
         guild = bot.get_guild(guild_id)
@@ -524,137 +478,30 @@ async def start_killfeed_monitor(bot, guild_id: int, server_id: str):
             logger.info(f"No killfeed channel configured for server {server_id}, monitoring will run silently until channel is configured")
 
         # Main monitoring loop
-        consecutive_errors = 0
-        max_consecutive_errors = 5
-
         while True:
-            try:
-                # Get latest CSV file across ALL subdirectories
-                logger.info(f"Searching for most recent CSV file across ALL world subdirectories for server {server_id}")
-                latest_csv = await sftp_client.get_latest_csv_file()
-                if not latest_csv:
-                    logger.warning(f"No CSV file found for server {server_id} in any subdirectory")
-                    # If we haven't found a CSV file for a while, try reconnecting
-                    if time.time() - last_successful_connection > 300:  # 5 minutes
-                        logger.info(f"No CSV file found for 5 minutes, reconnecting SFTP for server {server_id}")
-                        await sftp_client.disconnect()
-                        await asyncio.sleep(1)
-                        await sftp_client.connect()
-                        last_successful_connection = time.time()
-                    await asyncio.sleep(KILLFEED_REFRESH_INTERVAL)
-                    continue
-
-                # Log which directory the latest CSV file was found in
-                csv_dir = os.path.dirname(latest_csv)
-                logger.info(f"Found most recent CSV file in directory: {csv_dir}")
-
-                # Get last processed line number
-                last_line = server.last_csv_line
-
-                # Get total lines in the file with timeout protection
+            batch = await queue.get()
+            if batch is None:
+                logger.error(f"Ingestion for server {server_id} stopped, stopping killfeed monitor")
+                # Try to notify an admin if possible
                 try:
-                    total_lines = await sftp_client.get_file_size(latest_csv)
-
-                    # Reset consecutive errors on success
-                    consecutive_errors = 0
-                    reconnect_attempts = 0
-                    backoff_time = 5
-                    last_successful_connection = time.time()
-
-                    # If no new lines, sleep and continue
-                    if total_lines <= last_line:
-                        await asyncio.sleep(KILLFEED_REFRESH_INTERVAL)
-                        continue
-
-                    # Read new lines with timeout protection
-                    new_lines = await sftp_client.read_file(
-                        latest_csv, 
-                        start_line=last_line,
-                        max_lines=-1  # Read all new lines
-                    )
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout reading CSV data for {server_id}, will retry")
-                    # Reconnect after timeout
-                    await sftp_client.disconnect()
-                    await asyncio.sleep(1)
-                    connected = await sftp_client.connect()
-                    if not connected:
-                        logger.error(f"Failed to reconnect after timeout for server {server_id}")
-                        consecutive_errors += 1
-                    await asyncio.sleep(KILLFEED_REFRESH_INTERVAL)
-                    continue
-                except Exception as file_e:
-                    logger.error(f"Error reading CSV file: {file_e}")
-                    consecutive_errors += 1
-                    await asyncio.sleep(KILLFEED_REFRESH_INTERVAL)
-                    continue
-
-                if not new_lines:
-                    logger.debug(f"No new lines in CSV file for server {server_id}")
-                    await asyncio.sleep(KILLFEED_REFRESH_INTERVAL)
-                    continue
-
-                # Parse new lines
-                kill_events = CSVParser.parse_kill_lines(new_lines)
-
-                # Log successful parsing
-                if kill_events:
-                    logger.info(f"Parsed {len(kill_events)} kill events from {len(new_lines)} lines for server {server_id}")
-
-                # Process each kill event
-                processed_events = 0
-                # Always process kill events, even if no channel is configured
-                for kill_event in kill_events:
-                    try:
-                        await process_kill_event(bot, server, kill_event, killfeed_channel if killfeed_channel else None)
-                        processed_events += 1
-                    except Exception as event_e:
-                        logger.error(f"Error processing kill event: {event_e}", exc_info=True)
-
-                # Update last processed line only if we successfully processed events
-                if processed_events > 0 or len(kill_events) == 0:
-                    await server.update_last_csv_line(last_line + len(new_lines))
-                    logger.info(f"Updated last CSV line to {last_line + len(new_lines)} for server {server_id}")
-
-                # Reset consecutive errors on success
-                consecutive_errors = 0
-
-            except asyncio.CancelledError:
-                logger.info(f"Killfeed monitor for server {server_id} cancelled")
+                    guild = bot.get_guild(guild_id)
+                    if guild and guild.owner:
+                        await guild.owner.send(f"⚠️ Killfeed monitor for {server.name} has been stopped due to too many connection failures. Please restart it manually with `/killfeed start`.")
+                except Exception:
+                    pass  # Silently ignore if we can't message the owner
                 break
 
-            except Exception as e:
-                logger.error(f"Error in killfeed monitor for server {server_id}: {e}", exc_info=True)
-                consecutive_errors += 1
+            kill_events = batch.get(KILLS, [])
+            logger.info(f"Received {len(kill_events)} kill events for server {server_id}")
 
-                # Attempt reconnection if we've had too many consecutive errors
-                if consecutive_errors >= max_consecutive_errors:
-                    if reconnect_attempts < max_reconnect_attempts:
-                        logger.warning(f"Too many consecutive errors ({consecutive_errors}), attempting reconnection for server {server_id}")
-                        try:
-                            await sftp_client.disconnect()
-                            await asyncio.sleep(backoff_time)  # Exponential backoff
-                            connected = await sftp_client.connect()
-                            if connected:
-                                logger.info(f"Successfully reconnected SFTP for server {server_id}")
-                                consecutive_errors = 0
-                                backoff_time = min(backoff_time * 2, 60)  # Exponential backoff with max of 60 seconds
-                            reconnect_attempts += 1
-                        except Exception as reconnect_e:
-                            logger.error(f"Error during reconnection attempt: {reconnect_e}")
-                    else:
-                        logger.error(f"Exceeded maximum reconnection attempts for server {server_id}, stopping monitor")
-                        # Try to notify an admin if possible
-                        try:
-                            guild = bot.get_guild(guild_id)
-                            if guild and guild.owner:
-                                await guild.owner.send(f"⚠️ Killfeed monitor for {server.name} has been stopped due to too many connection failures. Please restart it manually with `/killfeed start`.")
-                        except Exception:
-                            pass  # Silently ignore if we can't message the owner
-                        break
+            # Always process kill events, even if no channel is configured
+            try:
+                await process_kill_events(bot, server, kill_events, killfeed_channel if killfeed_channel else None)
+            except Exception as event_e:
+                logger.error(f"Error processing kill events: {event_e}", exc_info=True)
 
-            # Sleep before next check
-            await asyncio.sleep(KILLFEED_REFRESH_INTERVAL)
+            # The ingestion saves its file positions once the batch is processed
+            queue.task_done()
 
     except asyncio.CancelledError:
         logger.info(f"Killfeed monitor for server {server_id} cancelled")
@@ -663,10 +510,9 @@ async def start_killfeed_monitor(bot, guild_id: int, server_id: str):
         logger.error(f"Error in killfeed monitor for server {server_id}: {e}", exc_info=True)
 
     finally:
-        # Clean up resources
-        if f"{guild_id}_{server_id}" in bot.sftp_connections:
-            client = bot.sftp_connections.pop(f"{guild_id}_{server_id}")
-            await client.disconnect()
+        # Leave the shared ingestion; it stops when no monitor needs it
+        if queue is not None:
+            await release_ingestion_coordinator(coordinator.server_id, queue)
 
         logger.info(f"Killfeed monitor for server {server_id} stopped")
 
@@ -704,183 +550,241 @@ async def start_killfeed_monitor(bot, guild_id: int, server_id: str):
             logger.warning(f"Could not send shutdown notification: {notify_e}")
 
 
-async def process_kill_event(bot, server, kill_event, channel):
-    """Process a kill event and update the database"""
-    try:
-        # Ensure timestamp is consistent format for processing
-        # If it's a string, convert to datetime for processing
-        if isinstance(kill_event["timestamp"], str):
-            try:
-                # Try ISO format first (from historical parser)
-                kill_event["timestamp"] = datetime.fromisoformat(kill_event["timestamp"])
-            except ValueError:
-                # Try the CSV file format as fallback
-                try:
-                    kill_event["timestamp"] = datetime.strptime(
-                        kill_event["timestamp"], "%Y.%m.%d-%H.%M.%S"
-                    )
-                except ValueError:
-                    logger.warning(f"Could not parse timestamp: {kill_event['timestamp']}")
-                    # Use current time as last resort
-                    kill_event["timestamp"] = datetime.utcnow()
-
-        # Add server_id to the event
-        kill_event["server_id"] = server.server_id
-
-        # Store in database
-        await bot.db.kills.insert_one(kill_event)
-
-        # Check if this is a suicide and if notification is enabled
-        is_suicide = kill_event.get("is_suicide", False)
-        if is_suicide:
-            suicide_type = kill_event.get("suicide_type", "other")
-            if suicide_type in server.suicide_notifications and not server.suicide_notifications.get(suicide_type, True):
-                logger.debug(f"Skipping notification for {suicide_type} suicide as it's disabled for server {server.server_id}")
-                # We still update player stats, but don't send a message
-                await update_player_stats(bot, server.server_id, kill_event)
-                return
+async def process_kill_events(bot, server, kill_events, channel):
+    """Process a batch of kill events and queue their embeds
+
+    Kill rewards of the whole batch are collected while player stats are
+    updated and paid with one balance update per player before the embeds
+    are queued, so each embed shows the balance that update returned.
+
+    Args:
+        bot: Bot instance
+        server: Server object
+        kill_events: Kill events in log order
+        channel: Killfeed channel or None
+    """
+    # Get guild data for the server to check premium features
+    guild_model = None
+    guild_data = await bot.db.guilds.find_one({"servers.server_id": server.server_id})
+    if guild_data:
+        # Use create_from_db_document to ensure proper conversion of premium_tier
+        guild_model = Guild.create_from_db_document(guild_data, bot.db)
+    has_economy = guild_model is not None and guild_model.check_feature_access("economy")
+
+    # Create or rename every player of the batch in one round trip, so the
+    # per-kill lookups below are answered by the identity cache
+    batch_players = {}
+    for kill_event in kill_events:
+        for id_field, name_field in (("killer_id", "killer_name"), ("victim_id", "victim_name")):
+            if kill_event.get(id_field):
+                batch_players[kill_event[id_field]] = kill_event.get(name_field)
+    if batch_players:
+        try:
+            await Player.get_or_create_many(bot.db, server.server_id, batch_players)
+        except Exception as e:
+            logger.warning(f"Failed to resolve players for server {server.server_id}: {e}")
 
-        # Get guild data for the server to check premium features
-        guild_data = await bot.db.guilds.find_one({"servers.server_id": server.server_id})
-        has_economy = False
-        guild_model = None
+    credits = []
+    pending = []
+    for kill_event in kill_events:
+        try:
+            result = await _process_kill_event(bot, server, kill_event, guild_model, credits)
+            if result is not None:
+                pending.append(result)
+        except Exception as e:
+            logger.error(f"Error processing kill event: {e}", exc_info=True)
 
-        if guild_data:
-            # Use create_from_db_document to ensure proper conversion of premium_tier
-            guild_model = Guild.create_from_db_document(guild_data, bot.db)
-            has_economy = guild_model.check_feature_access("economy")
-        else:
-            has_economy = False
+    # Fold the batch into rivalries, which also keeps the server's rivalry
+    # leaderboard current
+    rivalry_kills = [kill_event for kill_event in kill_events if not kill_event.get("is_suicide")]
+    if rivalry_kills:
+        try:
+            from models.rivalry import Rivalry
+            await Rivalry.record_kills(server.server_id, rivalry_kills)
+        except Exception as e:
+            logger.warning(f"Failed to update rivalries for server {server.server_id}: {e}")
+
+    if credits:
+        try:
+            await _apply_kill_credits(bot, server.server_id, credits)
+        except Exception as e:
+            logger.error(f"Error paying kill rewards for server {server.server_id}: {e}")
+
+    for kill_event, embed, reward in pending:
+        # Add economy info if the guild has the economy feature
+        if has_economy and reward:
+            reward_text = f"+{reward['base_reward']} credits for kill"
+
+            if reward["distance_bonus"] > 0:
+                reward_text += f"\n+{reward['distance_bonus']} distance bonus"
+
+            if reward["streak_bonus"] > 0:
+                reward_text += f"\n+{reward['streak_bonus']} killstreak bonus (x{reward['killstreak']})"
 
-        # Create embed for the kill
-        embed = EmbedBuilder.create_kill_embed(kill_event, guild=guild_model)
+            if reward.get("balance") is not None:
+                reward_text += f"\nBalance: {reward['balance']} credits"
 
-        # Add economy notification placeholder if the guild has economy feature
-        if has_economy and not is_suicide:
             embed.add_field(
                 name="💰 Economy",
-                value="*Processing rewards...*",
+                value=reward_text,
                 inline=False
             )
 
-        # Get the icon file for the kill embed
-        from utils.embed_icons import create_discord_file, KILLFEED_ICON
-        icon_file = create_discord_file(KILLFEED_ICON)
-
-        # Send to channel with the icon file if channel exists
-        kill_message = None
+        # Queue for the channel; the dispatcher batches embeds per channel
         if channel:
-            try:
-                if icon_file:
-                    kill_message = await channel.send(embed=embed, file=icon_file)
-                else:
-                    # Fallback if file can't be created
-                    kill_message = await channel.send(embed=embed)
-            except Exception as send_error:
-                logger.error(f"Error sending kill event to channel: {send_error}")
+            from utils.embed_icons import KILLFEED_ICON
+            from utils.killfeed_dispatcher import get_killfeed_dispatcher
+            await get_killfeed_dispatcher().enqueue(channel, embed, icon_path=KILLFEED_ICON)
         else:
             # No channel to send to, but we still log this and continue processing
             logger.info(f"Kill event processed but not displayed (no channel): {kill_event['killer_name']} killed {kill_event['victim_name']} with {kill_event.get('weapon', 'unknown')} from {kill_event.get('distance', 0)}m")
 
-        # Update player stats and get economy results
-        await update_player_stats(bot, server.server_id, kill_event)
 
-        # Update the embed with economy info if applicable
-        if has_economy:
+async def process_kill_event(bot, server, kill_event, channel):
+    """Process a kill event and update the database"""
+    try:
+        await process_kill_events(bot, server, [kill_event], channel)
+    except Exception as e:
+        logger.error(f"Error processing kill event: {e}", exc_info=True)
+
+
+async def _process_kill_event(bot, server, kill_event, guild_model, credits):
+    """Store a kill event, update stats and render its embed
+
+    Args:
+        bot: Bot instance
+        server: Server object
+        kill_event: Kill event
+        guild_model: Guild of the server or None
+        credits: List the kill's economy changes are added to
+
+    Returns:
+        Tuple of (kill_event, embed, reward) or None when the kill is not posted
+    """
+    # Ensure timestamp is consistent format for processing
+    # If it's a string, convert to datetime for processing
+    if isinstance(kill_event["timestamp"], str):
+        try:
+            # Try ISO format first (from historical parser)
+            kill_event["timestamp"] = datetime.fromisoformat(kill_event["timestamp"])
+        except ValueError:
+            # Try the CSV file format as fallback
             try:
-                if not kill_event["is_suicide"]:
-                    # Get killer's economy info
-                    from models.economy import Economy
-                    killer_id = kill_event["killer_id"]
-                    killer_economy = await Economy.get_by_player(bot.db, killer_id, server.server_id)
-
-                    if killer_economy:
-                        # Get reward info
-                        base_reward = 10
-                        distance = kill_event.get("distance", 0)
-
-                        if distance >= 100:
-                            base_reward += min(int(distance / 10), 50)  # Cap bonus at +50 credits
-
-                        # Get killer player for streak info
-                        killer = await Player.get_by_id(bot.db, killer_id, server.server_id)
-                        killstreak = killer.current_streak if killer else 0
-
-                        # Calculate streak bonus
-                        streak_bonus = 0
-                        if killstreak == 5:
-                            streak_bonus = 25
-                        elif killstreak == 10:
-                            streak_bonus = 50
-                        elif killstreak == 15:
-                            streak_bonus = 100
-                        elif killstreak == 20:
-                            streak_bonus = 200
-                        elif killstreak >= 25:
-                            streak_bonus = 300
-                        elif killstreak >= 3:
-                            streak_bonus = 15
-
-                        # Update the embed with economy info
-                        reward_text = f"+{base_reward} credits for kill"
-
-                        if distance >= 100:
-                            reward_text += f"\n+{min(int(distance / 10), 50)} distance bonus"
-
-                        if streak_bonus > 0:
-                            reward_text += f"\n+{streak_bonus} killstreak bonus (x{killstreak})"
-
-                        reward_text += f"\nBalance: {await killer_economy.get_balance()} credits"
-
-                        # Update the embed
-                        embed.set_field_at(
-                            index=embed.fields.index([f for f in embed.fields if f.name == "💰 Economy"][0]),
-                            name="💰 Economy",
-                            value=reward_text,
-                            inline=False
-                        )
+                kill_event["timestamp"] = datetime.strptime(
+                    kill_event["timestamp"], "%Y.%m.%d-%H.%M.%S"
+                )
+            except ValueError:
+                logger.warning(f"Could not parse timestamp: {kill_event['timestamp']}")
+                # Use current time as last resort
+                kill_event["timestamp"] = datetime.utcnow()
 
-                        # Update the message if it exists
-                        if kill_message:
-                            await kill_message.edit(embed=embed)
-                        else:
-                            logger.debug(f"Economy info processed but message not updated (no channel): {kill_event['killer_name']} earned {base_reward + streak_bonus} credits")
-            except Exception as e:
-                logger.error(f"Error updating economy info in embed: {e}", exc_info=True)
+    # Add server_id to the event
+    kill_event["server_id"] = server.server_id
+
+    # Store in database
+    await bot.db.kills.insert_one(kill_event)
 
+    # Update activity rollups
+    try:
+        from models.activity_rollup import ActivityRollup
+        await ActivityRollup.record_kills(server.server_id, [kill_event])
     except Exception as e:
-        logger.error(f"Error processing kill event: {e}", exc_info=True)
+        logger.warning(f"Failed to update activity rollups: {e}")
+
+    # Update faction aggregates
+    try:
+        from models.faction import Faction
+        await Faction.record_kills(server.server_id, [kill_event])
+    except Exception as e:
+        logger.warning(f"Failed to update faction statistics: {e}")
 
+    await get_auto_bounty_detector().record_kills(server.server_id, [kill_event])
 
-async def update_player_stats(bot, server_id, kill_event):
-    """Update player statistics based on a kill event"""
     try:
-        # Get or create killer player with direct database query to ensure fresh data
+        await Bounty.claim_for_kills(bot.db, [kill_event], server_id=server.server_id)
+    except Exception as e:
+        logger.warning(f"Failed to check bounties for kill: {e}")
+
+    # Check if this is a suicide and if notification is enabled
+    is_suicide = kill_event.get("is_suicide", False)
+    if is_suicide:
+        suicide_type = kill_event.get("suicide_type", "other")
+        if suicide_type in server.suicide_notifications and not server.suicide_notifications.get(suicide_type, True):
+            logger.debug(f"Skipping notification for {suicide_type} suicide as it's disabled for server {server.server_id}")
+            # We still update player stats, but don't send a message
+            await update_player_stats(bot, server.server_id, kill_event, guild=guild_model, credits=credits)
+            return None
+
+    # Create embed for the kill
+    embed = render_kill_embed(kill_event, guild=guild_model)
+
+    # Update player stats first so the economy reward is known before sending
+    reward = await update_player_stats(bot, server.server_id, kill_event, guild=guild_model, credits=credits)
+
+    return kill_event, embed, None if is_suicide else reward
+
+
+async def _apply_kill_credits(bot, server_id, credits):
+    """Pay collected kill rewards and penalties with one update per player
+
+    Each kill reward is given the balance its player had right after it.
+
+    Args:
+        bot: Bot instance
+        server_id: Server ID
+        credits: Economy changes in kill order; kill rewards carry their reward dict
+    """
+    from models.economy import Economy
+
+    balances = await Economy.apply_credits(bot.db, server_id, credits)
+
+    # Walk back from each player's final balance to the balance after each kill
+    running = dict(balances)
+    for credit in reversed(credits):
+        player_id = credit["player_id"]
+        if player_id not in running:
+            continue
+        if credit.get("reward") is not None:
+            credit["reward"]["balance"] = running[player_id]
+        running[player_id] -= credit["amount"]
+
+
+async def update_player_stats(bot, server_id, kill_event, guild=None, credits=None):
+    """Update player statistics based on a kill event
+
+    Args:
+        bot: Bot instance
+        server_id: Server ID
+        kill_event: Kill event
+        guild: Guild of the server (looked up when None)
+        credits: List to add the kill's economy changes to; when None they
+            are paid immediately
+
+    Returns:
+        Dict with base_reward, distance_bonus, streak_bonus, killstreak and
+        balance when a kill reward was awarded, otherwise None
+    """
+    reward = None
+    try:
         killer_id = kill_event["killer_id"]
         killer_name = kill_event["killer_name"]
-        killer_data = {
-            "player_id": killer_id,
-            "player_name": killer_name,
-            "server_id": server_id,
-            "active": True
-        }
-        killer = await Player.create_or_update(bot.db, killer_data)
-
-        # Get or create victim player with direct database query to ensure fresh data
         victim_id = kill_event["victim_id"]
         victim_name = kill_event["victim_name"]
-        victim_data = {
-            "player_id": victim_id,
-            "player_name": victim_name,
-            "server_id": server_id,
-            "active": True
-        }
-        victim = await Player.create_or_update(bot.db, victim_data)
+
+        # Get or create both players through the server's identity cache
+        try:
+            players = await Player.get_or_create_many(bot.db, server_id, {killer_id: killer_name, victim_id: victim_name})
+        except Exception as e:
+            logger.warning(f"Failed to resolve players {killer_id} and {victim_id}: {e}")
+            players = {}
+        killer = players.get(killer_id)
+        victim = players.get(victim_id)
 
         # Get guild data for the server to check premium features
-        guild_data = await bot.db.guilds.find_one({"servers.server_id": server_id})
-        if guild_data:
-            guild = Guild(bot.db, guild_data)
+        if guild is None:
+            guild_data = await bot.db.guilds.find_one({"servers.server_id": server_id})
+            guild = Guild(bot.db, guild_data) if guild_data else None
+        if guild is not None:
             has_economy = guild.check_feature_access("economy")
             has_rivalries = guild.check_feature_access("rivalries")
         else:
@@ -889,84 +793,63 @@ async def update_player_stats(bot, server_id, kill_event):
 
         # Handle suicide case
         if kill_event["is_suicide"]:
-            # For suicides, get fresh data to ensure stats are up to date
-            victim = await Player.get_by_id(bot.db, victim_id, server_id)
-            if not victim:
-                victim = await Player.create_or_update(bot.db, victim_data)
-
             # Record the suicide
-            suicide_result = await victim.record_suicide(kill_event["suicide_type"])
-
-            # Verify the suicide was recorded
-            if not suicide_result:
-                logger.warning(f"Failed to record suicide for player {victim_name} ({victim_id}) - retrying with updated data")
-                # Try one more time with fresh data
-                victim = await Player.get_by_id(bot.db, victim_id, server_id)
-                if victim:
-                    await victim.record_suicide(kill_event["suicide_type"])
+            try:
+                if victim is None or not await victim.record_suicide(bot.db, kill_event.get("suicide_type")):
+                    logger.warning(f"Failed to record suicide for player {victim_name} ({victim_id})")
+            except Exception as e:
+                logger.warning(f"Error recording suicide for player {victim_name} ({victim_id}): {e}")
 
             # Economy penalty for suicide if enabled
             if has_economy:
-                from models.economy import Economy
-                victim_economy = await Economy.get_by_player(bot.db, victim_id, server_id)
-                if victim_economy:
-                    # Small penalty for suicide
-                    await victim_economy.remove_currency(5, "suicide_penalty", {
-                        "suicide_type": kill_event.get("suicide_type", "unknown")
-                    })
+                # Small penalty for suicide, skipped when the balance can't cover it
+                penalty = [{
+                    "player_id": victim_id,
+                    "amount": -5,
+                    "source": "suicide_penalty",
+                    "details": {"suicide_type": kill_event.get("suicide_type", "unknown")}
+                }]
+                if credits is not None:
+                    credits.extend(penalty)
+                else:
+                    await _apply_kill_credits(bot, server_id, penalty)
         else:
-            # For kills, get fresh data to ensure stats are up to date
-            killer = await Player.get_by_id(bot.db, killer_id, server_id)
-            victim = await Player.get_by_id(bot.db, victim_id, server_id)
-
-            if not killer:
-                killer = await Player.create_or_update(bot.db, killer_data)
-            if not victim:
-                victim = await Player.create_or_update(bot.db, victim_data)
-
-            # Record kill for killer (with null checking)
+            # Record the kill and the death; each is independent of the other
+            # updates, so a failure here doesn't cost the kill its reward
             if killer and victim:
-                kill_result = await killer.record_kill(
-                    victim_id=victim.id,
-                    victim_name=victim.name,
-                    weapon=kill_event["weapon"],
-                    distance=kill_event["distance"]
-                )
-
-                # Verify the kill was recorded
-                if not kill_result:
-                    logger.warning(f"Failed to record kill for player {killer_name} ({killer_id}) - retrying with updated data")
-                    # Try one more time with fresh data
-                    killer = await Player.get_by_id(bot.db, killer_id, server_id)
-                    if killer:
-                        await killer.record_kill(
-                            victim_id=victim.id,
-                            victim_name=victim.name,
-                            weapon=kill_event["weapon"],
-                            distance=kill_event["distance"]
-                        )
-            else:
-                logger.warning(f"Could record kill: killer={not killer}, victim={victim}")
-                # Try to create the missing players again
-                if not killer:
-                    killer = await Player.create_or_update(bot.db, killer_data)
-                if not victim:
-                    victim = await Player.create_or_update(bot.db, victim_data)
-                # If both players exist now, try again
-                if killer and victim:
-                    await killer.record_kill(
-                        victim_id=victim.id,
+                try:
+                    if not await killer.record_kill(
+                        bot.db,
+                        victim_id=victim_id,
                         victim_name=victim.name,
                         weapon=kill_event["weapon"],
                         distance=kill_event["distance"]
-                    )
+                    ):
+                        logger.warning(f"Failed to record kill for player {killer_name} ({killer_id})")
+                except Exception as e:
+                    logger.warning(f"Error recording kill for player {killer_name} ({killer_id}): {e}")
+
+                try:
+                    if not await victim.record_death(bot.db, killer_id=killer_id, killer_name=killer.name):
+                        logger.warning(f"Failed to record death for player {victim_name} ({victim_id})")
+                except Exception as e:
+                    logger.warning(f"Error recording death for player {victim_name} ({victim_id}): {e}")
+            else:
+                logger.warning(f"Could not resolve players for kill: killer={killer_id}, victim={victim_id}")
 
-            # Record death for victim (with null checking)
-            if victim and killer:
-                death_result = await victim.record_death(
-                    killer_id=killer.id,
-                    killer_name=killer.name
+            # Update weapon and distance aggregates
+            try:
+                from models.weapon_stats import WeaponStats
+                await WeaponStats.record_kill(
+                    server_id,
+                    killer_id,
+                    kill_event["weapon"],
+                    kill_event["distance"],
+                    killer_name=killer_name,
+                    timestamp=kill_event.get("timestamp")
                 )
+            except Exception as e:
+                logger.warning(f"Failed to update weapon statistics: {e}")
 
             # Update rivalry data (Prey/Nemesis tracking)
             if has_rivalries:
@@ -984,92 +867,51 @@ async def update_player_stats(bot, server_id, kill_event):
                     logger.warning(f"Failed to update rivalry data: {e}")
                     # This is non-critical, so we continue processing
 
-                # Verify the death was recorded
-                if not death_result:
-                    logger.warning(f"Failed to record death for player {victim_name} ({victim_id}) - retrying with updated data")
-                    # Try one more time with fresh data
-                    victim = await Player.get_by_id(bot.db, victim_id, server_id)
-                    if victim:
-                        await victim.record_death(
-                            killer_id=killer.id,
-                            killer_name=killer.name
-                        )
-            else:
-                logger.warning(f"Could record death: killer={not killer}, victim={victim}")
-                # We already tried to create the players again above, but double-check
-                if killer and victim:
-                    await victim.record_death(
-                        killer_id=killer.id,
-                        killer_name=killer.name
-                    )
-
             # Award currency for kill if economy feature is enabled
-            if has_economy and killer and victim:  # Ensure both players exist before awarding currency
+            if has_economy:
                 try:
                     from models.economy import Economy
 
-                    # Get or create economy data for killer
-                    killer_economy = await Economy.get_by_player(bot.db, killer.id, server_id)
-                    if not killer_economy:
-                        killer_economy = await Economy.create_or_update(bot.db, killer.id, server_id)
-
-                    if killer_economy:  # Double-check that we have a valid economy object
-                        # Base reward amount
-                        reward_amount = 10
-
-                        # Bonus for long-distance kills
-                        distance = kill_event.get("distance", 0)
-                        if distance >= 100:
-                            reward_amount += min(int(distance / 10), 50)  # Cap bonus at +50 credits
-
-                        # Bonus for killstreaks
-                        if killer.current_streak > 1:
-                            killstreak = killer.current_streak
-
-                            # Escalating rewards for killstreaks
-                            if killstreak == 5:
-                                streak_bonus = 25
-                                streak_type = "killstreak_5"
-                            elif killstreak == 10:
-                                streak_bonus = 50
-                                streak_type = "killstreak_10"
-                            elif killstreak == 15:
-                                streak_bonus = 100
-                                streak_type = "killstreak_15"
-                            elif killstreak == 20:
-                                streak_bonus = 200
-                                streak_type = "killstreak_20"
-                            elif killstreak >= 25:
-                                streak_bonus = 300
-                                streak_type = "killstreak_25_plus"
-                            elif killstreak >= 3:
-                                streak_bonus = 15
-                                streak_type = "killstreak_3"
-                            else:
-                                streak_bonus = 0
-                                streak_type = None
-
-                            # If there's a streak bonus, award it separately
-                            if streak_bonus > 0 and streak_type:
-                                await killer_economy.add_currency(streak_bonus, streak_type, {
-                                    "killstreak": killstreak,
-                                    "victim_id": victim.id,
-                                    "victim_name": victim.name
-                                })
-
-                        # Award base currency with kill details
-                        await killer_economy.add_currency(reward_amount, "kill_reward", {
-                            "victim_id": victim.id,
-                            "victim_name": victim.name,
+                    distance = kill_event.get("distance", 0)
+                    # The streak comes from record_kill; 0 if that update failed
+                    streak = getattr(killer, "current_streak", 0) if killer else 0
+                    reward = Economy.calculate_kill_reward(distance, max(streak or 0, 0))
+                    reward["balance"] = None
+
+                    kill_credits = []
+                    # If there's a streak bonus, award it separately
+                    if reward["streak_bonus"] > 0:
+                        kill_credits.append({
+                            "player_id": killer_id,
+                            "amount": reward["streak_bonus"],
+                            "source": reward["streak_type"],
+                            "details": {
+                                "killstreak": reward["killstreak"],
+                                "victim_id": victim_id,
+                                "victim_name": victim_name
+                            }
+                        })
+
+                    # Award base currency with kill details
+                    kill_credits.append({
+                        "player_id": killer_id,
+                        "amount": reward["base_reward"] + reward["distance_bonus"],
+                        "source": "kill_reward",
+                        "details": {
+                            "victim_id": victim_id,
+                            "victim_name": victim_name,
                             "weapon": kill_event.get("weapon", "unknown"),
                             "distance": distance
-                        })
+                        },
+                        "reward": reward
+                    })
+
+                    if credits is not None:
+                        credits.extend(kill_credits)
                     else:
-                        logger.warning(f"Could not create economy profile for player {killer_name} ({killer_id})")
+                        await _apply_kill_credits(bot, server_id, kill_credits)
                 except Exception as econ_e:
                     logger.error(f"Error updating economy for kill: {econ_e}")
-            elif has_economy:
-                logger.warning(f"Could award currency: killer={not killer}, victim={victim}")
 
 
         # Explicitly update leaderboards by resetting cache
@@ -1082,6 +924,8 @@ async def update_player_stats(bot, server_id, kill_event):
     except Exception as e:
         logger.error(f"Error updating player stats: {e}", exc_info=True)
 
+    return reward
+
 
 async def setup(bot):
     """Set up the Killfeed cog"""
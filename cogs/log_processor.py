@@ -47,7 +47,7 @@ class PvPBot(Protocol):
     async def add_cog(self, cog: commands.Cog) -> None: ...
 
 from utils.csv_parser import CSVParser
-from utils.sftp import SFTPManager
+from utils.sftp import SFTPManager, get_file_stat_cache
 from utils.embed_builder import EmbedBuilder
 from utils.helpers import has_admin_permission
 from utils.parser_utils import parser_coordinator, normalize_event_data, categorize_event
@@ -55,6 +55,10 @@ from utils.log_parser import LogParser, parse_log_file
 from utils.server_utils import get_server
 from utils.decorators import has_admin_permission as admin_permission_decorator, premium_tier_required
 from utils.discord_utils import get_server_selection, server_id_autocomplete
+from utils.poll_scheduler import get_poll_scheduler
+from utils.ingestion_coordinator import is_ingesting, EVENTS
+from utils.auto_bounty import get_auto_bounty_detector
+from models.bounty import Bounty
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +90,7 @@ class LogProcessorCog(commands.Cog):
         self.processing_lock = asyncio.Lock()
         self.is_processing = False
         self.last_processed = {}  # Track last processed timestamp per server
+        self.log_file_paths = {}  # Log file path found per server, reused until it stops resolving
 
         # Start background task
         self.process_logs_task.start()
@@ -101,11 +106,12 @@ class LogProcessorCog(commands.Cog):
             except Exception as e:
                 logger.error(f"Error disconnecting SFTP for server {server_id}: {e}")
 
-    @tasks.loop(minutes=3.0)  # Set to 3 minutes as per requirements
+    @tasks.loop(minutes=1.0)  # Servers are polled on their own adaptive intervals
     async def process_logs_task(self):
         """Background task for processing game log files
 
-        This task runs every 3 minutes to check for new log entries in game server logs.
+        This task runs every minute; each server is only processed when its
+        adaptive poll interval is due (see utils.poll_scheduler).
         """
         if self.is_processing:
             logger.debug("Skipping log processing - already running")
@@ -150,20 +156,33 @@ class LogProcessorCog(commands.Cog):
                     logger.warning("Log processing taking too long, stopping after current server")
                     break
                     
+                # The live ingestion coordinator already reads this server's files
+                if is_ingesting(server_id, EVENTS):
+                    logger.debug(f"Skipping log processing for server {server_id}, events are ingested live")
+                    continue
+
+                scheduler = await get_poll_scheduler(self.bot.db, "logs", server_id, config.get("guild_id"))
+                if not scheduler.is_due():
+                    continue
+
                 try:
                     # Set a timeout for this server's processing
                     try:
-                        await asyncio.wait_for(
+                        _, events_processed = await asyncio.wait_for(
                             self._process_server_logs(server_id, config),
                             timeout=60  # 1 minute timeout per server
                         )
                     except asyncio.TimeoutError:
                         logger.error(f"Log processing timed out for server {server_id}")
+                        scheduler.record(0)
                         continue  # Skip to next server
                 except Exception as e:
                     logger.error(f"Error processing logs for server {server_id}: {str(e)}")
+                    scheduler.record(0)
                     continue  # Skip to next server on error
                     
+                scheduler.record(events_processed)
+
                 # Brief pause between servers to reduce resource spikes
                 await asyncio.sleep(1)
 
@@ -549,7 +568,11 @@ class LogProcessorCog(commands.Cog):
                 
                 # Try to get the log file directly using get_log_file method (with enhanced path discovery)
                 # Pass the logs_path we've constructed to help it find the file
-                log_file_path = await sftp.get_log_file(server_dir=server_dir, base_path=logs_path)
+                log_file_path = self.log_file_paths.get(server_id)
+                if not log_file_path:
+                    log_file_path = await sftp.get_log_file(server_dir=server_dir, base_path=logs_path)
+                    if log_file_path:
+                        self.log_file_paths[server_id] = log_file_path
 
                 # Verify connection persisted after get_log_file call
                 still_connected = sftp.client is not None
@@ -633,6 +656,9 @@ class LogProcessorCog(commands.Cog):
                     original_server_id=path_server_id
                 )
 
+                stat_cache = get_file_stat_cache()
+                stat_consumer = f"logs:{server_id}"
+
                 for log_file in log_files:
                     try:
                         # Get file modification time (use os.path.join for proper path handling)
@@ -642,8 +668,18 @@ class LogProcessorCog(commands.Cog):
 
                         if not file_stat:
                             logger.warning(f"Could not get file stats for {file_path}")
+                            # The file may have moved, search for it again next time
+                            self.log_file_paths.pop(server_id, None)
                             continue
 
+                        # Skip the download when size and mtime match the last processed read
+                        stat_key = None
+                        if isinstance(file_stat, dict):
+                            stat_key = (file_stat.get("size"), file_stat.get("st_mtime"))
+                            if not stat_cache.has_changed(stat_consumer, file_path, *stat_key):
+                                logger.debug(f"Skipping unchanged log file {file_path}")
+                                continue
+
                         # Check if the file has been modified since last check
                         if hasattr(file_stat, 'st_mtime'):
                             # OS-style stat object
@@ -731,6 +767,8 @@ class LogProcessorCog(commands.Cog):
 
                                 # Update last processed time to file modification time
                                 self.last_processed[server_id] = file_mtime
+                                if stat_key:
+                                    stat_cache.mark(stat_consumer, file_path, *stat_key)
 
                     except Exception as e:
                         logger.error(f"Error processing log file {log_file}: {str(e)}")
@@ -933,6 +971,11 @@ class LogProcessorCog(commands.Cog):
                 # Update suicide count
                 await victim.update_stats(self.bot.db, kills=0, deaths=0, suicides=1)
 
+                # Update activity rollups
+                from models.activity_rollup import ActivityRollup
+                await ActivityRollup.record_kill(server_id, victim_id, victim_id, weapon,
+                                                 timestamp=timestamp, is_suicide=True)
+
                 return True
 
             # For regular kills, we need both killer and victim
@@ -950,7 +993,27 @@ class LogProcessorCog(commands.Cog):
 
             # Update rivalries
             from models.rivalry import Rivalry
-            await Rivalry.record_kill(server_id, killer_id, victim_id, weapon, "")
+            await Rivalry.record_kill(server_id, killer_id, victim_id, weapon, "",
+                                      killer_name=killer_name, victim_name=victim_name)
+
+            # Update weapon and distance aggregates
+            from models.weapon_stats import WeaponStats
+            await WeaponStats.record_kill(server_id, killer_id, weapon, distance,
+                                          killer_name=killer_name, timestamp=timestamp)
+
+            # Update faction aggregates
+            from models.faction import Faction
+            await Faction.record_kills(server_id, [{
+                "killer_id": killer_id,
+                "killer_name": killer_name,
+                "victim_id": victim_id,
+                "victim_name": victim_name,
+                "weapon": weapon
+            }])
+
+            # Update activity rollups
+            from models.activity_rollup import ActivityRollup
+            await ActivityRollup.record_kill(server_id, killer_id, victim_id, weapon, timestamp=timestamp)
 
             # Update nemesis/prey relationships
             await killer.update_nemesis_and_prey(self.bot.db)
@@ -971,6 +1034,11 @@ class LogProcessorCog(commands.Cog):
             }
 
             await self.bot.db.kills.insert_one(kill_doc)
+            await get_auto_bounty_detector().record_kills(server_id, [kill_doc])
+            try:
+                await Bounty.claim_for_kills(self.bot.db, [kill_doc], server_id=server_id)
+            except Exception as e:
+                logger.warning(f"Failed to check bounties for kill: {e}")
 
             return True
 
@@ -1103,39 +1171,22 @@ class LogProcessorCog(commands.Cog):
     async def _get_or_create_player(self, server_id: str, player_id: str, player_name: str):
         """Get player by ID or create if it doesn't exist
 
+        The name is refreshed when it changed.
+
         Args:
             server_id: Server ID
             player_id: Player ID
             player_name: Player name
 
         Returns:
-            Player object
+            Player object (identity only, without stats)
         """
         from models.player import Player
 
         try:
-            # Check if player exists
-            player = await Player.get_by_player_id(self.bot.db, player_id)
-
-            if not player:
-                # Create new player
-                player = Player(
-                    player_id=player_id,
-                    server_id=server_id,
-                    name=player_name,
-                    display_name=player_name,
-                    last_seen=datetime.utcnow(),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-
-                # Insert into database
-                if hasattr(self.bot, 'db') and self.bot.db is not None:
-                    await self.bot.db.players.insert_one(player.__dict__)
-                else:
-                    logger.error("Database not available for player creation")
-
-            return player
+            # Known players come from the server's identity cache without a query
+            players = await Player.get_or_create_many(self.bot.db, server_id, {player_id: player_name})
+            return players[player_id]
         except Exception as e:
             logger.error(f"Error in _get_or_create_player: {e}")
             # Return a basic player object to avoid further errors
@@ -26,6 +26,7 @@ from utils.helpers import paginate_embeds, has_admin_permission, has_mod_permiss
 from utils.decorators import premium_tier_required
 from utils.async_utils import BackgroundTask
 from utils.discord_utils import server_id_autocomplete  # Import standardized autocomplete function
+from utils.name_index import resolve_player, resolve_player_id
 
 logger = logging.getLogger(__name__)
 
@@ -324,9 +325,8 @@ class RivalriesCog(commands.Cog):
                 return
             server_id = server.server_id
 
-        # TODO: In a real implementation, we would verify the player name
-        # For now, we'll just assume player_name is valid and is the player ID
-        player_id = player_name
+        # Resolve the player name through the server's name index
+        player_id = await resolve_player_id(server_id, player_name)
 
         # Get player's rivalries
         rivalries = await Rivalry.get_for_player(server_id, player_id)
@@ -696,10 +696,9 @@ class RivalriesCog(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # TODO: In a real implementation, we would verify the player names
-        # For now, we'll just assume they are valid and are the player IDs
-        player1_id = player1
-        player2_id = player2
+        # Resolve the player names through the server's name index
+        player1_id = await resolve_player_id(server_id, player1)
+        player2_id = await resolve_player_id(server_id, player2)
 
         # Get rivalry between players
         rivalry = await Rivalry.get_by_players(server_id, player1_id, player2_id)
@@ -778,10 +777,19 @@ class RivalriesCog(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # TODO: In a real implementation, we would verify the player names
-        # For now, we'll just assume they are valid and are the player IDs
-        killer_id = killer
-        victim_id = victim
+        # Resolve the player names through the server's name index
+        killer_player = await resolve_player(server_id, killer)
+        victim_player = await resolve_player(server_id, victim)
+        missing = [name for name, player in ((killer, killer_player), (victim, victim_player)) if not player]
+        if missing:
+            embed = EmbedBuilder.error(
+                title="Player Not Found",
+                description=f"No player found with name or ID '{missing[0]}'."
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        killer_id, killer = killer_player
+        victim_id, victim = victim_player
 
         # Record kill
         rivalry = await Rivalry.record_kill(
@@ -4,7 +4,7 @@ Statistics commands for player and server stats
 import logging
 import asyncio
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -12,149 +12,19 @@ from datetime import datetime, timedelta
 from models.server import Server
 from models.player import Player
 from models.guild import Guild
+from models.weapon_stats import WeaponStats
+from models.activity_rollup import ActivityRollup
 from utils.embed_builder import EmbedBuilder
 from config import EMBED_COLOR, EMBED_FOOTER
 from utils.helpers import paginate_embeds, format_time_ago
 from utils.decorators import premium_tier_required
 from utils.discord_utils import server_id_autocomplete
+from utils.autocomplete import player_name_autocomplete
+from utils.name_index import get_weapon_index, resolve_player
 
 logger = logging.getLogger(__name__)
 
 
-async def player_name_autocomplete(interaction, current):
-    """Autocomplete for player names"""
-    try:
-        # Get user's guild ID and the server ID from the command options
-        guild_id = interaction.guild_id
-
-        if not guild_id:
-            return [app_commands.Choice(name="Must use in a server", value="")]
-
-        # Try to get the server_id from the interaction
-        server_id = None
-        try:
-            for option in interaction.data.get("options", []):
-                if option.get("name") == "server_id":
-                    raw_id = option.get("value")
-                    server_id = str(raw_id) if raw_id else None
-                    logger.debug(f"player_name_autocomplete converting server_id from {type(raw_id).__name__} to string: {server_id}")
-                    break
-
-                # Check in subcommands
-                for suboption in option.get("options", []):
-                    if suboption.get("name") == "server_id":
-                        raw_id = suboption.get("value")
-                        server_id = str(raw_id) if raw_id else None
-                        logger.debug(f"player_name_autocomplete (subcommand) converting server_id from {type(raw_id).__name__} to string: {server_id}")
-                        break
-        except Exception as e:
-            logger.error(f"Error extracting server_id from interaction: {e}")
-            server_id = None
-
-        if not server_id or server_id == "":
-            return [app_commands.Choice(name="Select a server first", value="")]
-
-        # Get cached player data or fetch it
-        cog = interaction.client.get_cog("Stats")
-
-        if not cog:
-            logger.error("Stats cog not found in player_name_autocomplete")
-            return [app_commands.Choice(name="Error: Stats module not loaded", value="")]
-
-        cache_key = f"{guild_id}_{server_id}"
-
-        # Update cache if needed
-        cache_expired = False
-        if not hasattr(cog, "player_autocomplete_cache"):
-            cog.player_autocomplete_cache = {}
-            
-        if cache_key not in cog.player_autocomplete_cache:
-            cache_expired = True
-        else:
-            last_update = cog.player_autocomplete_cache.get(cache_key, {}).get("last_update", datetime.min)
-            cache_expired = (datetime.now() - last_update).total_seconds() > 300
-
-        if cache_expired:
-            try:
-                # Fetch players with a timeout
-                players_cursor = interaction.client.db.players.find(
-                    {"server_id": str(server_id), "active": True},
-                    {"player_id": 1, "player_name": 1}
-                ).limit(100)  # Reduced limit for faster queries
-
-                players = await asyncio.wait_for(
-                    players_cursor.to_list(length=100),
-                    timeout=2.0
-                )
-
-                if players:
-                    # Update cache with valid player data
-                    player_list = []
-                    for player_data in players:
-                        player_id = player_data.get("player_id", "")
-                        player_name = player_data.get("player_name", "Unknown Player")
-
-                        # Skip invalid entries
-                        if not player_name or player_name == "" or player_name == "Unknown Player":
-                            continue
-
-                        player_list.append({
-                            "id": player_id,
-                            "name": player_name
-                        })
-
-                    # Update cache
-                    cog.player_autocomplete_cache[cache_key] = {
-                        "players": player_list,
-                        "last_update": datetime.now()
-                    }
-            except asyncio.TimeoutError:
-                logger.warning(f"Database timeout in player_name_autocomplete for server {server_id}")
-                # Use existing cache if available
-                if cache_key not in cog.player_autocomplete_cache:
-                    return [app_commands.Choice(name="Timeout loading players", value="")]
-            except Exception as e:
-                logger.error(f"Error fetching players: {e}")
-                # Use existing cache if available
-                if cache_key not in cog.player_autocomplete_cache:
-                    return [app_commands.Choice(name="Error loading players", value="")]
-
-        # Get players from cache
-        players = cog.player_autocomplete_cache.get(cache_key, {}).get("players", [])
-
-        if not players or len(players) == 0:
-            return [app_commands.Choice(name="No players found", value="")]
-
-        # Filter by current input
-        try:
-            if current:
-                filtered_players = [
-                    app_commands.Choice(name=player['name'], value=player['name'])
-                    for player in players
-                    if current.lower() in player['name'].lower()
-                ]
-            else:
-                # Without filtering, take a sample of players (max 25)
-                import random
-                sample_size = min(25, len(players))
-                sampled_players = random.sample(players, sample_size) if sample_size > 0 else []
-
-                filtered_players = [
-                    app_commands.Choice(name=player['name'], value=player['name'])
-                    for player in sampled_players
-                ]
-
-            # Always limit to max 25 choices
-            return filtered_players[:25]
-        except Exception as e:
-            logger.error(f"Error filtering players: {e}")
-            return [app_commands.Choice(name="Error processing players", value="")]
-
-    except Exception as e:
-        logger.error(f"Error in player autocomplete: {e}", exc_info=True)
-        return [app_commands.Choice(name="Error loading players", value="")]
-
-
 async def weapon_name_autocomplete(interaction, current):
     """Autocomplete for weapon names"""
     try:
@@ -188,71 +58,11 @@ async def weapon_name_autocomplete(interaction, current):
         if not server_id or server_id == "":
             return [app_commands.Choice(name="Select a server first", value="")]
 
-        # Import weapon stats
         try:
-            from utils.weapon_stats import WEAPON_CATEGORIES, WEAPON_DETAILS
-        except ImportError as e:
-            logger.error(f"Error importing weapon stats: {e}")
-            return [app_commands.Choice(name="Error loading weapon data", value="")]
-
-        try:
-            # Get all available weapon names
-            all_weapons = []
-
-            # Add weapons from categories
-            for category, weapons in WEAPON_CATEGORIES.items():
-                if category != "death_types":  # Exclude death types
-                    all_weapons.extend(weapons)
-
-            # Add any additional weapons from WEAPON_DETAILS that might not be in categories
-            extra_weapons = []
-            death_types = WEAPON_CATEGORIES.get("death_types", [])
-
-            for weapon in WEAPON_DETAILS.keys():
-                if weapon and weapon not in all_weapons and weapon not in death_types:
-                    extra_weapons.append(weapon)
-
-            all_weapons.extend(extra_weapons)
-
-            # Ensure list is not too large
-            all_weapons = all_weapons[:500]  # Reasonable limit
-
-            # Filter by current input
-            if current:
-                current_lower = current.lower()
-                filtered_weapons = []
-
-                # First pass: exact matches
-                for weapon in all_weapons:
-                    if weapon.lower() == current_lower:
-                        filtered_weapons.append(app_commands.Choice(name=weapon, value=weapon))
-
-                # Second pass: starts with the input string
-                if len(filtered_weapons) < 25:
-                    for weapon in all_weapons:
-                        if weapon.lower().startswith(current_lower) and not any(choice.value == weapon for choice in filtered_weapons):
-                            filtered_weapons.append(app_commands.Choice(name=weapon, value=weapon))
-
-                # Third pass: contains the input string
-                if len(filtered_weapons) < 25:
-                    for weapon in all_weapons:
-                        if current_lower in weapon.lower() and not any(choice.value == weapon for choice in filtered_weapons):
-                            filtered_weapons.append(app_commands.Choice(name=weapon, value=weapon))
-                            if len(filtered_weapons) >= 25:
-                                break
-            else:
-                # Without filtering, show top weapons
-                import random
-                sample_size = min(25, len(all_weapons))
-                sampled_weapons = random.sample(all_weapons, sample_size) if sample_size > 0 else []
-
-                filtered_weapons = [
-                    app_commands.Choice(name=weapon, value=weapon)
-                    for weapon in sampled_weapons
-                ]
-
-            return filtered_weapons[:25]
-
+            return [
+                app_commands.Choice(name=weapon, value=weapon)
+                for weapon, _ in get_weapon_index().search(current, limit=25)
+            ]
         except Exception as e:
             logger.error(f"Error processing weapons in weapon_name_autocomplete: {e}", exc_info=True)
             return [app_commands.Choice(name="Error processing weapons", value="")]
@@ -268,7 +78,28 @@ class Stats(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.server_autocomplete_cache = {}
-        self.player_autocomplete_cache = {}
+
+        # Start the background task that compacts activity rollups
+        self.compact_activity_rollups.start()
+
+    def cog_unload(self):
+        """Called when the cog is unloaded"""
+        self.compact_activity_rollups.cancel()
+
+    @tasks.loop(hours=1)
+    async def compact_activity_rollups(self):
+        """Background task to fold old hourly activity rollups into daily ones"""
+        try:
+            from utils.database import get_db, DatabaseManager
+
+            db = await get_db()
+            if not db or not isinstance(db, DatabaseManager) or not db._connected:
+                logger.warning("Database not properly initialized, skipping activity rollup compaction")
+                return
+
+            await ActivityRollup.compact()
+        except Exception as e:
+            logger.error(f"Error in compact_activity_rollups: {e}", exc_info=True)
 
     @commands.hybrid_group(name="stats", description="Statistics commands")
     @commands.guild_only()
@@ -280,7 +111,7 @@ class Stats(commands.Cog):
     @stats.command(name="player", description="View player statistics")
     @app_commands.describe(
         server_id="Select a server by name to check stats for",
-        player_name="The player name to search for"
+        player_name="Select a player by name"
     )
     @app_commands.autocomplete(
         server_id=server_id_autocomplete,
@@ -330,10 +161,16 @@ class Stats(commands.Cog):
                 await ctx.send(embed=embed)
                 return
 
-            # Find the player(s)
-            players = await Player.get_by_name(self.bot.db, player_name, server_id)
-
-            if not players or len(players) == 0:
+            # Autocomplete passes the player ID; a typed name is resolved through the name index
+            player = None
+            resolved = await resolve_player(server_id, player_name)
+            if resolved:
+                document = await self.bot.db.players.find_one({"player_id": resolved[0], "server_id": server_id})
+                player = Player.from_document(document) if document is not None else None
+            if player is None:
+                player = await Player.get_by_name(self.bot.db, player_name, server_id)
+
+            if player is None:
                 embed = EmbedBuilder.create_error_embed(
                     "Player Not Found",
                     f"Player '{player_name}' not found on server {server_name}."
@@ -341,19 +178,21 @@ class Stats(commands.Cog):
                 await ctx.send(embed=embed)
                 return
 
-            # If multiple players found with similar names, use exact match or first match
-            player = None
-            for p in players:
-                if p.name.lower() == player_name.lower():
-                    player = p
-                    break
-
-            if not player:
-                player = players[0]
-
             # Get detailed player stats
             player_stats = await player.get_detailed_stats()
 
+            # Weapon breakdown comes from the pre-aggregated weapon stats document
+            player_weapons = await WeaponStats.get_for_player(server_id, player.player_id)
+            if player_weapons is not None:
+                from utils.weapon_stats import analyze_player_weapon_stats
+                weapon_analysis = analyze_player_weapon_stats(player_weapons.get_weapon_counts())
+                player_stats["weapons"] = player_weapons.get_weapon_counts()
+                player_stats["weapon_categories"] = weapon_analysis.get("category_breakdown", {})
+                player_stats["combat_kills"] = weapon_analysis.get("combat_kills", 0)
+                player_stats["melee_percentage"] = weapon_analysis.get("melee_percentage", 0)
+                player_stats["most_used_category"] = weapon_analysis.get("most_used_category")
+                player_stats["longest_shot"] = max(player_stats.get("longest_shot", 0), round(player_weapons.distance_max, 1))
+
             # Create multiple embeds for different aspects of player stats
             embeds = []
 
@@ -776,9 +615,11 @@ class Stats(commands.Cog):
 
             # Find the server
             server = None
+            server_name = server_id
             for s in guild_data.get("servers", []):
                 if s.get("server_id") == server_id:
                     server = Server(self.bot.db, s)
+                    server_name = s.get("server_name", server_id)
                     break
 
             if not server:
@@ -789,38 +630,57 @@ class Stats(commands.Cog):
                 await ctx.send(embed=embed)
                 return
 
-            # Get server stats
-            server_stats = await server.get_server_stats()
+            # Get server stats from the activity rollups
+            now = datetime.utcnow()
+            last_day = await ActivityRollup.get_summary(server_id, now - timedelta(days=1))
+            last_month = await ActivityRollup.get_summary(server_id, now - timedelta(days=30))
+
+            server_stats = {
+                "kills_24h": last_day["kills"],
+                "suicides_24h": last_day["suicides"],
+                "active_players_24h": last_day["unique_players"],
+                "peak_online_24h": last_day["peak_online"],
+                "kills_30d": last_month["kills"],
+                "deaths_30d": last_month["deaths"],
+                "active_players_30d": last_month["unique_players"],
+                "peak_online_30d": last_month["peak_online"],
+            }
 
             # Create embed
-            embed = EmbedBuilder.create_server_stats_embed(server_stats)
+            embed = await EmbedBuilder.create_server_stats_embed(server_name, server_stats, guild=guild_model)
 
             # Add top killers
-            top_killers = server_stats.get("top_killers", [])
-            if top_killers is not None:
+            top_killers = await Player.get_top_players(self.bot.db, server_id, sort_by="kills", limit=5)
+            if top_killers:
                 killer_str = "\n".join([
-                    f"{i+1}. {killer['player_name']}: {killer['kills']} kills"
-                    for i, killer in enumerate(top_killers[:5])
+                    f"{i+1}. {killer.name}: {killer.kills} kills"
+                    for i, killer in enumerate(top_killers)
                 ])
                 embed.add_field(name="Top Killers", value=killer_str, inline=False)
 
             # Add top weapons
-            top_weapons = server_stats.get("top_weapons", [])
-            if top_weapons is not None:
+            top_weapons = last_month["top_weapons"]
+            if top_weapons:
                 weapon_str = "\n".join([
                     f"{i+1}. {weapon['weapon']}: {weapon['kills']} kills"
                     for i, weapon in enumerate(top_weapons[:5])
                 ])
-                embed.add_field(name="Top Weapons", value=weapon_str, inline=False)
-
-            # Add recent events
-            recent_events = server_stats.get("recent_events", [])
-            if recent_events is not None:
-                event_str = "\n".join([
-                    f"{event['event_type']}: {format_time_ago(event['timestamp'])}"
-                    for event in recent_events[:3]
-                ])
-                embed.add_field(name="Recent Events", value=event_str, inline=False)
+                embed.add_field(name="Top Weapons (30d)", value=weapon_str, inline=False)
+
+            # Add daily activity
+            daily = await ActivityRollup.get_daily_series(server_id, days=7)
+            if daily:
+                embed.add_field(
+                    name="Daily Activity",
+                    value="```Date       | Kills | Players | Peak\n" +
+                          "-----------+-------+---------+-----\n" +
+                          "\n".join([
+                              f"{day['date'].strftime('%Y-%m-%d')} | {day['kills']:>5} | {day['unique_players']:>7} | {day['peak_online']:>4}"
+                              for day in daily
+                          ]) +
+                          "```",
+                    inline=False
+                )
 
             # Send the embed
             await ctx.send(embed=embed)
@@ -1024,26 +884,11 @@ class Stats(commands.Cog):
             # Import weapon utilities
             from utils.weapon_stats import get_weapon_category, WEAPON_CATEGORIES
 
-            # Query all weapons used on this server
-            pipeline = [
-                {
-                    "$match": {
-                        "server_id": server_id,
-                        "is_suicide": False
-                    }
-                },
-                {
-                    "$group": {
-                        "_id": "$weapon",
-                        "kills": {"$sum": 1}
-                    }
-                }
-            ]
-
-            cursor = self.bot.db.kills.aggregate(pipeline)
-            weapons = await cursor.to_list(length=None)
+            # Read the server's pre-aggregated weapon counters
+            server_weapons = await WeaponStats.get_for_server(server_id)
+            weapons = server_weapons.get_weapon_counts() if server_weapons is not None else {}
 
-            if weapons is None or len(weapons) == 0:
+            if not weapons:
                 embed = EmbedBuilder.create_error_embed(
                     "No Data",
                     f"No weapon data found for server {server_name}."
@@ -1055,9 +900,7 @@ class Stats(commands.Cog):
             category_stats = {}
             total_kills = 0
 
-            for weapon in weapons:
-                weapon_name = weapon["_id"]
-                kill_count = weapon["kills"]
+            for weapon_name, kill_count in weapons.items():
                 total_kills += kill_count
 
                 category = get_weapon_category(weapon_name)
@@ -1179,37 +1022,11 @@ class Stats(commands.Cog):
             # Import weapon utilities
             from utils.weapon_stats import get_weapon_category, is_actual_weapon, get_weapon_details
 
-            # Query kills for this weapon
-            pipeline = [
-                {
-                    "$match": {
-                        "server_id": server_id,
-                        "weapon": {"$regex": weapon_name, "$options": "i"},
-                        "is_suicide": False
-                    }
-                },
-                {
-                    "$group": {
-                        "_id": "$weapon",
-                        "kills": {"$sum": 1},
-                        "avg_distance": {"$avg": "$distance"},
-                        "max_distance": {"$max": "$distance"},
-                        "min_distance": {"$min": "$distance"},
-                        "killers": {"$addToSet": "$killer_id"}
-                    }
-                },
-                {
-                    "$sort": {"kills": -1}
-                },
-                {
-                    "$limit": 5
-                }
-            ]
-
-            cursor = self.bot.db.kills.aggregate(pipeline)
-            weapon_stats = await cursor.to_list(length=None)
+            # Read the server's pre-aggregated weapon counters
+            server_weapons = await WeaponStats.get_for_server(server_id)
+            weapon_stats = server_weapons.find_weapons(weapon_name) if server_weapons is not None else []
 
-            if weapon_stats is None or len(weapon_stats) == 0:
+            if not weapon_stats:
                 embed = EmbedBuilder.create_error_embed(
                     "No Data",
                     f"No data found for weapons matching '{weapon_name}' on server {server_name}."
@@ -1221,37 +1038,12 @@ class Stats(commands.Cog):
             embeds = []
 
             for weapon in weapon_stats:
-                weapon_name = weapon["_id"]
+                weapon_name = weapon["name"]
                 weapon_category = get_weapon_category(weapon_name)
 
                 # Get top users of this weapon (only store names, no IDs)
-                top_users_pipeline = [
-                    {
-                        "$match": {
-                            "server_id": server_id,
-                            "weapon": weapon_name,
-                            "is_suicide": False
-                        }
-                    },
-                    {
-                        "$group": {
-                            "_id": {"$toLower": "$killer_name"},
-                            "name": {"$first": "$killer_name"},
-                            "kills": {"$sum": 1},
-                            "avg_distance": {"$avg": "$distance"},
-                            "max_distance": {"$max": "$distance"}
-                        }
-                    },
-                    {
-                        "$sort": {"kills": -1}
-                    },
-                    {
-                        "$limit": 5
-                    }
-                ]
-
-                top_users_cursor = self.bot.db.kills.aggregate(top_users_pipeline)
-                top_users = await top_users_cursor.to_list(length=None)
+                top_users = await WeaponStats.get_top_users(server_id, weapon_name)
+                unique_users = await WeaponStats.count_users(server_id, weapon_name)
 
                 # Get detailed weapon information
                 weapon_details = get_weapon_details(weapon_name)
@@ -1265,7 +1057,7 @@ class Stats(commands.Cog):
                 # Add basic stats
                 embed.add_field(name="Weapon Type", value=weapon_details.get("type", weapon_category.title()), inline=True)
                 embed.add_field(name="Total Kills", value=str(weapon["kills"]), inline=True)
-                embed.add_field(name="Unique Users", value=str(len(weapon["killers"])), inline=True)
+                embed.add_field(name="Unique Users", value=str(unique_users), inline=True)
 
                 # Add weapon details if available is not None
                 if weapon_details.get("ammo"):
@@ -1285,10 +1077,10 @@ class Stats(commands.Cog):
                 distance_info = []
                 if weapon.get("avg_distance"):
                     distance_info.append(f"Avg: {round(weapon['avg_distance'], 1)}m")
-                if weapon.get("min_distance"):
-                    distance_info.append(f"Min: {round(weapon['min_distance'], 1)}m")
-                if weapon.get("max_distance"):
-                    distance_info.append(f"Max: {round(weapon['max_distance'], 1)}m")
+                if weapon.get("distance_min"):
+                    distance_info.append(f"Min: {round(weapon['distance_min'], 1)}m")
+                if weapon.get("distance_max"):
+                    distance_info.append(f"Max: {round(weapon['distance_max'], 1)}m")
 
                 if distance_info is not None:
                     embed.add_field(
@@ -1324,16 +1116,27 @@ class Stats(commands.Cog):
                 embeds.append(embed)
 
             # Get the weapon icon
-            from utils.embed_icons import send_embed_with_icon, WEAPON_STATS_ICON, add_icon_to_embed, create_discord_file
+            from utils.embed_icons import (
+                send_embed_with_icon, WEAPON_STATS_ICON, add_icon_to_embed, create_discord_file,
+                get_icon_url, remember_icon_url
+            )
 
             # Send the first embed with pagination if multiple is not None
             if len(embeds) > 1:
                 # For pagination, we have to use standard send first
                 current_embed, view = paginate_embeds(embeds)
-                # Add the icon to all embeds
-                for embed in embeds:
-                    add_icon_to_embed(embed, WEAPON_STATS_ICON)
-                await ctx.send(embed=current_embed, view=view, file=create_discord_file(WEAPON_STATS_ICON))
+                icon_url = await get_icon_url(WEAPON_STATS_ICON)
+                if icon_url is not None:
+                    # Reference the already uploaded icon on all embeds
+                    for embed in embeds:
+                        embed.set_thumbnail(url=icon_url)
+                    await ctx.send(embed=current_embed, view=view)
+                else:
+                    # Add the icon to all embeds
+                    for embed in embeds:
+                        add_icon_to_embed(embed, WEAPON_STATS_ICON)
+                    message = await ctx.send(embed=current_embed, view=view, file=create_discord_file(WEAPON_STATS_ICON))
+                    remember_icon_url(WEAPON_STATS_ICON, message, 0)
             else:
                 # Single embed can use our helper
                 await send_embed_with_icon(ctx, embeds[0], WEAPON_STATS_ICON)
@@ -6,31 +6,36 @@ PREMIUM_TIERS = {
         "name": "Scavenger",
         "max_servers": 1,
         "features": ["killfeed"],
-        "price": 0  # Free tier
+        "price": 0,  # Free tier
+        "poll_interval": (60, 900)  # Floor and ceiling of the adaptive poll interval (seconds)
     },
     1: {
         "name": "Survivor",
         "max_servers": 1,
         "features": ["killfeed", "basic_stats", "leaderboards"],
-        "price": 5  # £5 per month
+        "price": 5,  # £5 per month
+        "poll_interval": (45, 600)  # Floor and ceiling of the adaptive poll interval (seconds)
     },
     2: {
         "name": "Mercenary",
         "max_servers": 2,
         "features": ["killfeed", "basic_stats", "leaderboards", "rivalries", "bounties", "player_links", "economy", "advanced_analytics"],
-        "price": 15  # £15 per month
+        "price": 15,  # £15 per month
+        "poll_interval": (30, 600)  # Floor and ceiling of the adaptive poll interval (seconds)
     },
     3: {
         "name": "Warlord",
         "max_servers": 3,
         "features": ["killfeed", "basic_stats", "leaderboards", "rivalries", "bounties", "player_links", "factions", "economy", "advanced_analytics"],
-        "price": 25  # £25 per month
+        "price": 25,  # £25 per month
+        "poll_interval": (20, 300)  # Floor and ceiling of the adaptive poll interval (seconds)
     },
     4: {
         "name": "Overseer",
         "max_servers": 10,  # Higher limit
         "features": ["killfeed", "basic_stats", "leaderboards", "rivalries", "bounties", "player_links", "factions", "economy", "advanced_analytics"],
-        "price": 50  # £50 per month
+        "price": 50,  # £50 per month
+        "poll_interval": (10, 300)  # Floor and ceiling of the adaptive poll interval (seconds)
     }
 }
 
@@ -111,3 +116,13 @@ EMBED_THEMES = {
 # Embed footer and icon
 EMBED_FOOTER = "Tower of Temptation PvP Statistics"
 EMBED_ICON = "https://i.imgur.com/example.png"
+ICON_ASSET_CHANNEL_ID = None  # Channel static icons are uploaded to once (None uploads with the first message)
+
+# Database settings
+EVENT_RETENTION_DAYS = 30  # Raw connection/game event documents expire after this many days
+KILL_RETENTION_DAYS = 0  # Raw kill documents expire after this many days (0 keeps them forever)
+ROLLUP_HOURLY_RETENTION_HOURS = 48  # Hourly activity rollups are compacted into daily ones after this
+TRANSACTION_RETENTION_DAYS = 0  # Economy transactions expire after this many days (0 keeps them forever)
+
+# Live ingestion settings
+BUSY_SERVER_PLAYERS = 20  # Online players at which a server is polled near its tier's floor interval
@@ -15,6 +15,8 @@ from models.bounty import Bounty
 from models.faction import Faction
 from models.rivalry import Rivalry
 from models.event import Event
+from models.weapon_stats import WeaponStats
+from models.activity_rollup import ActivityRollup
 
 __all__ = [
     'BaseModel',
@@ -27,5 +29,7 @@ __all__ = [
     'Bounty',
     'Faction',
     'Rivalry',
-    'Event'
+    'Event',
+    'WeaponStats',
+    'ActivityRollup'
 ]
\ No newline at end of file
@@ -0,0 +1,419 @@
+"""
+Activity rollup model for the Tower of Temptation PvP Statistics Discord Bot.
+
+This module provides:
+1. ActivityRollup class for time-bucketed server activity
+2. Incremental hourly updates applied as kills and player counts are ingested
+3. Compaction of old hourly buckets into daily buckets
+4. Range summaries answered from the rollups instead of raw kills
+
+Every bucket document holds the kills, deaths, suicides, unique players,
+per-weapon kill counts and peak online count of one server for one hour or
+one day. Each hour lives in exactly one document: hourly until it is
+compacted, then folded into its day.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+
+from pymongo import UpdateOne
+
+from config import ROLLUP_HOURLY_RETENTION_HOURS
+from models.weapon_stats import weapon_key
+from utils.database import get_db
+
+logger = logging.getLogger(__name__)
+
+# Bucket granularities
+HOUR = "hour"
+DAY = "day"
+
+# Number of hourly buckets folded per compaction write
+COMPACT_BATCH_SIZE = 1000
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    """Get the start of the hour containing a timestamp
+
+    Args:
+        timestamp: Timestamp
+
+    Returns:
+        datetime: Bucket start
+    """
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(timestamp: datetime) -> datetime:
+    """Get the start of the day containing a timestamp
+
+    Args:
+        timestamp: Timestamp
+
+    Returns:
+        datetime: Bucket start
+    """
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class ActivityRollup:
+    """Time-bucketed activity counters for a server"""
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialize an activity rollup
+
+        Args:
+            data: Rollup data from database
+        """
+        self.data = data
+        self.server_id = data.get("server_id")
+        self.granularity = data.get("granularity")
+        self.bucket = data.get("bucket")
+        self.kills = data.get("kills", 0)
+        self.deaths = data.get("deaths", 0)
+        self.suicides = data.get("suicides", 0)
+        self.players = data.get("players", [])
+        self.weapons = data.get("weapons", {})
+        self.peak_online = data.get("peak_online", 0)
+
+    @property
+    def unique_players(self) -> int:
+        """Get the number of distinct players seen in this bucket
+
+        Returns:
+            int: Unique player count
+        """
+        return len(self.players)
+
+    @staticmethod
+    def _new_entry() -> Dict[str, Any]:
+        """Create an empty in-memory bucket entry
+
+        Returns:
+            Dict: Bucket entry
+        """
+        return {
+            "kills": 0,
+            "deaths": 0,
+            "suicides": 0,
+            "players": set(),
+            "weapons": {},
+            "peak_online": 0,
+        }
+
+    @staticmethod
+    def _build_update(server_id: str, granularity: str, bucket: datetime, entry: Dict[str, Any]) -> UpdateOne:
+        """Build the upsert for one folded bucket entry
+
+        Args:
+            server_id: Server ID
+            granularity: HOUR or DAY
+            bucket: Bucket start
+            entry: Folded bucket entry
+
+        Returns:
+            UpdateOne: Upsert operation
+        """
+        now = datetime.utcnow()
+        inc = {
+            "kills": entry["kills"],
+            "deaths": entry["deaths"],
+            "suicides": entry["suicides"],
+        }
+        set_fields = {"updated_at": now}
+        for key, weapon_entry in entry["weapons"].items():
+            inc[f"weapons.{key}.kills"] = weapon_entry["kills"]
+            set_fields[f"weapons.{key}.name"] = weapon_entry["name"]
+
+        update = {
+            "$inc": inc,
+            "$set": set_fields,
+            "$max": {"peak_online": entry["peak_online"]},
+            "$setOnInsert": {"created_at": now},
+        }
+        if entry["players"]:
+            update["$addToSet"] = {"players": {"$each": sorted(entry["players"])}}
+
+        return UpdateOne(
+            {"server_id": server_id, "granularity": granularity, "bucket": bucket},
+            update,
+            upsert=True
+        )
+
+    @classmethod
+    async def record_kill(
+        cls,
+        server_id: str,
+        killer_id: Optional[str],
+        victim_id: str,
+        weapon: Optional[str],
+        timestamp: Optional[datetime] = None,
+        is_suicide: bool = False
+    ) -> int:
+        """Fold a single kill or suicide into its hourly bucket
+
+        Args:
+            server_id: Server ID
+            killer_id: Killer player ID (the victim for suicides)
+            victim_id: Victim player ID
+            weapon: Weapon used
+            timestamp: Event time (defaults to now)
+            is_suicide: Whether the event is a suicide
+
+        Returns:
+            int: Number of buckets upserted or modified
+        """
+        return await cls.record_kills(server_id, [{
+            "killer_id": killer_id,
+            "victim_id": victim_id,
+            "weapon": weapon,
+            "timestamp": timestamp,
+            "is_suicide": is_suicide,
+        }])
+
+    @classmethod
+    async def record_kills(cls, server_id: str, kills: List[Dict[str, Any]], db=None) -> int:
+        """Fold kill events into their hourly buckets
+
+        Every event counts as a death; suicides are also counted separately
+        and don't add a kill or weapon use.
+
+        Args:
+            server_id: Server ID
+            kills: Kill dicts with killer_id, victim_id, weapon, timestamp
+                and optionally is_suicide
+            db: Database to write to (defaults to get_db())
+
+        Returns:
+            int: Number of buckets upserted or modified
+        """
+        buckets = {}
+        for kill in kills:
+            timestamp = kill.get("timestamp")
+            if not isinstance(timestamp, datetime):
+                timestamp = datetime.utcnow()
+
+            entry = buckets.setdefault(hour_bucket(timestamp), cls._new_entry())
+            killer_id = kill.get("killer_id")
+            victim_id = kill.get("victim_id")
+            entry["deaths"] += 1
+
+            if kill.get("is_suicide") or (killer_id and killer_id == victim_id):
+                entry["suicides"] += 1
+            else:
+                entry["kills"] += 1
+                weapon = kill.get("weapon") or "Unknown"
+                weapon_entry = entry["weapons"].setdefault(weapon_key(weapon), {"name": weapon, "kills": 0})
+                weapon_entry["kills"] += 1
+
+            for player_id in (killer_id, victim_id):
+                if player_id:
+                    entry["players"].add(player_id)
+
+        if not buckets:
+            return 0
+
+        operations = [
+            cls._build_update(server_id, HOUR, bucket, entry)
+            for bucket, entry in buckets.items()
+        ]
+
+        if db is None:
+            db = await get_db()
+        result = await db.activity_rollups.bulk_write(operations, ordered=False)
+
+        return result.upserted_count + result.modified_count
+
+    @classmethod
+    async def record_online(cls, server_id: str, player_count: int, timestamp: Optional[datetime] = None) -> bool:
+        """Record an online player count sample
+
+        Args:
+            server_id: Server ID
+            player_count: Number of players online
+            timestamp: Sample time (defaults to now)
+
+        Returns:
+            bool: True if the bucket was updated
+        """
+        db = await get_db()
+        bucket = hour_bucket(timestamp or datetime.utcnow())
+        result = await db.activity_rollups.update_one(
+            {"server_id": server_id, "granularity": HOUR, "bucket": bucket},
+            {
+                "$max": {"peak_online": int(player_count or 0)},
+                "$setOnInsert": {"kills": 0, "deaths": 0, "suicides": 0, "created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+        return result.upserted_id is not None or result.modified_count > 0
+
+    @classmethod
+    async def compact(cls, db=None, retention_hours: int = ROLLUP_HOURLY_RETENTION_HOURS) -> int:
+        """Fold hourly buckets older than the retention window into daily buckets
+
+        Only whole days are compacted. Daily buckets are written before the
+        hourly buckets they absorb are deleted.
+
+        Args:
+            db: Database to use (defaults to get_db())
+            retention_hours: Hours of hourly buckets to keep
+
+        Returns:
+            int: Number of hourly buckets compacted
+        """
+        if db is None:
+            db = await get_db()
+
+        cutoff = day_bucket(datetime.utcnow() - timedelta(hours=retention_hours))
+        compacted = 0
+
+        while True:
+            hourly = await db.activity_rollups.find(
+                {"granularity": HOUR, "bucket": {"$lt": cutoff}}
+            ).limit(COMPACT_BATCH_SIZE).to_list(length=COMPACT_BATCH_SIZE)
+            if not hourly:
+                break
+
+            days = {}
+            for doc in hourly:
+                entry = days.setdefault((doc["server_id"], day_bucket(doc["bucket"])), cls._new_entry())
+                entry["kills"] += doc.get("kills", 0)
+                entry["deaths"] += doc.get("deaths", 0)
+                entry["suicides"] += doc.get("suicides", 0)
+                entry["players"].update(doc.get("players", []))
+                entry["peak_online"] = max(entry["peak_online"], doc.get("peak_online", 0))
+                for key, weapon_entry in doc.get("weapons", {}).items():
+                    day_weapon = entry["weapons"].setdefault(key, {"name": weapon_entry.get("name", key), "kills": 0})
+                    day_weapon["kills"] += weapon_entry.get("kills", 0)
+
+            operations = [
+                cls._build_update(server_id, DAY, bucket, entry)
+                for (server_id, bucket), entry in days.items()
+            ]
+            await db.activity_rollups.bulk_write(operations, ordered=False)
+            await db.activity_rollups.delete_many({"_id": {"$in": [doc["_id"] for doc in hourly]}})
+            compacted += len(hourly)
+
+        if compacted:
+            logger.info(f"Compacted {compacted} hourly activity buckets into daily buckets")
+
+        return compacted
+
+    @classmethod
+    async def get_buckets(cls, server_id: str, since: datetime) -> List['ActivityRollup']:
+        """Get all buckets covering a time range
+
+        Daily buckets are included from the start of the day containing since,
+        so ranges resolve to whole days once compacted.
+
+        Args:
+            server_id: Server ID
+            since: Range start
+
+        Returns:
+            List of buckets sorted by start time
+        """
+        db = await get_db()
+        cursor = db.activity_rollups.find({
+            "server_id": server_id,
+            "$or": [
+                {"granularity": HOUR, "bucket": {"$gte": hour_bucket(since)}},
+                {"granularity": DAY, "bucket": {"$gte": day_bucket(since)}},
+            ]
+        }).sort("bucket", 1)
+
+        return [cls(data) async for data in cursor]
+
+    @classmethod
+    async def get_summary(cls, server_id: str, since: datetime, top_weapons: int = 5) -> Dict[str, Any]:
+        """Summarize server activity over a time range
+
+        Args:
+            server_id: Server ID
+            since: Range start
+            top_weapons: Number of top weapons to include
+
+        Returns:
+            Dict with kills, deaths, suicides, unique_players, peak_online and top_weapons
+        """
+        summary = {"kills": 0, "deaths": 0, "suicides": 0, "peak_online": 0}
+        players = set()
+        weapons = {}
+
+        for rollup in await cls.get_buckets(server_id, since):
+            summary["kills"] += rollup.kills
+            summary["deaths"] += rollup.deaths
+            summary["suicides"] += rollup.suicides
+            summary["peak_online"] = max(summary["peak_online"], rollup.peak_online)
+            players.update(rollup.players)
+            for key, weapon_entry in rollup.weapons.items():
+                weapon = weapons.setdefault(key, {"weapon": weapon_entry.get("name", key), "kills": 0})
+                weapon["kills"] += weapon_entry.get("kills", 0)
+
+        summary["unique_players"] = len(players)
+        summary["top_weapons"] = sorted(weapons.values(), key=lambda w: w["kills"], reverse=True)[:top_weapons]
+
+        return summary
+
+    @classmethod
+    async def get_daily_series(cls, server_id: str, days: int = 7) -> List[Dict[str, Any]]:
+        """Get per-day activity for the last few days
+
+        Args:
+            server_id: Server ID
+            days: Number of days
+
+        Returns:
+            List of dicts with date, kills, deaths, unique_players and peak_online
+        """
+        since = day_bucket(datetime.utcnow()) - timedelta(days=days - 1)
+        series = {}
+
+        for rollup in await cls.get_buckets(server_id, since):
+            day = series.setdefault(day_bucket(rollup.bucket), {
+                "kills": 0, "deaths": 0, "players": set(), "peak_online": 0
+            })
+            day["kills"] += rollup.kills
+            day["deaths"] += rollup.deaths
+            day["players"].update(rollup.players)
+            day["peak_online"] = max(day["peak_online"], rollup.peak_online)
+
+        return [
+            {
+                "date": date,
+                "kills": day["kills"],
+                "deaths": day["deaths"],
+                "unique_players": len(day["players"]),
+                "peak_online": day["peak_online"],
+            }
+            for date, day in sorted(series.items())
+        ]
+
+    @classmethod
+    async def backfill(cls, db, batch_size: int = 5000) -> int:
+        """Build hourly rollups from the kills collection
+
+        Progress is checkpointed in the migrations collection, so the
+        backfill runs to completion once, resuming after a restart, and is
+        a no-op afterwards. Old hours are folded into days by the next
+        compaction.
+
+        Args:
+            db: Motor database
+            batch_size: Number of kills replayed per checkpoint
+
+        Returns:
+            int: Number of kills replayed
+        """
+        from utils.kill_backfill import run_kill_backfill
+
+        async def replay(server_id: str, kills: List[Dict[str, Any]]):
+            await cls.record_kills(server_id, kills, db=db)
+
+        return await run_kill_backfill(
+            db, "activity_rollups", replay,
+            projection={"killer_id": 1, "victim_id": 1, "weapon": 1, "timestamp": 1, "is_suicide": 1},
+            target="activity_rollups",
+            batch_size=batch_size
+        )
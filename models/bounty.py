@@ -2,13 +2,22 @@
 Bounty model for Tower of Temptation PvP Statistics Bot
 
 This module defines the Bounty data structure for player-placed bounties.
+
+Active bounty targets are also kept in memory per server, so the kill path
+only queries the database when the victim actually has a bounty. Their
+expiry times are scheduled on the "bounties" expiry scheduler, which
+expires each bounty when its time is up.
 """
+import asyncio
 import logging
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, ClassVar, List
+from typing import Dict, Any, Optional, ClassVar, List, Set, Tuple
+
+from pymongo import UpdateOne
 
 from models.base_model import BaseModel
+from utils.expiry_scheduler import get_expiry_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +43,17 @@ class Bounty(BaseModel):
     
     # Time constants (in seconds)
     DEFAULT_LIFESPAN = 3600  # 1 hour
+
+    # Name of the expiry scheduler that expires active bounties
+    EXPIRY_SCHEDULER = "bounties"
+
+    # Active bounty IDs by server ID and target ID, maintained by create,
+    # claim, expire and cancel once load_active_targets() has run
+    _active_targets: ClassVar[Dict[str, Dict[str, Set[str]]]] = {}
+    # (created_at, expires_at) of every bounty in the target table
+    _active_windows: ClassVar[Dict[str, Tuple[Optional[datetime], Optional[datetime]]]] = {}
+    _active_loaded: ClassVar[bool] = False
+    _active_lock: ClassVar[Optional[asyncio.Lock]] = None
     
     def __init__(
         self,
@@ -80,6 +100,108 @@ class Bounty(BaseModel):
             if not hasattr(self, key):
                 setattr(self, key, value)
     
+    @classmethod
+    def _track(cls, server_id: Optional[str], target_id: Optional[str], bounty_id: str,
+               expires_at: Optional[datetime] = None, created_at: Optional[datetime] = None):
+        """Add an active bounty to the in-memory target table and schedule its expiry
+
+        Args:
+            server_id: Server ID
+            target_id: Target player ID
+            bounty_id: Bounty ID
+            expires_at: Expiration time (optional)
+            created_at: Creation time (optional)
+        """
+        if target_id:
+            cls._active_targets.setdefault(str(server_id), {}).setdefault(target_id, set()).add(bounty_id)
+            cls._active_windows[bounty_id] = (created_at, expires_at)
+        if expires_at is not None:
+            get_expiry_scheduler(cls.EXPIRY_SCHEDULER).schedule(bounty_id, expires_at)
+
+    @classmethod
+    def _untrack(cls, server_id: Optional[str], target_id: Optional[str], bounty_id: str):
+        """Remove a bounty from the in-memory target table and cancel its expiry
+
+        Args:
+            server_id: Server ID
+            target_id: Target player ID
+            bounty_id: Bounty ID
+        """
+        get_expiry_scheduler(cls.EXPIRY_SCHEDULER).cancel(bounty_id)
+        cls._active_windows.pop(bounty_id, None)
+        targets = cls._active_targets.get(str(server_id))
+        if not targets:
+            return
+        bounty_ids = targets.get(target_id)
+        if bounty_ids is None:
+            return
+        bounty_ids.discard(bounty_id)
+        if not bounty_ids:
+            del targets[target_id]
+            if not targets:
+                del cls._active_targets[str(server_id)]
+
+    @classmethod
+    async def load_active_targets(cls, db, force: bool = False) -> int:
+        """Load the targets of all active bounties into memory and schedule their expiry
+
+        Args:
+            db: Database connection
+            force: Reload even if the table is already loaded
+
+        Returns:
+            int: Number of active bounties loaded
+        """
+        if cls._active_lock is None:
+            cls._active_lock = asyncio.Lock()
+
+        async with cls._active_lock:
+            if cls._active_loaded and not force:
+                return sum(len(ids) for targets in cls._active_targets.values() for ids in targets.values())
+
+            active_targets: Dict[str, Dict[str, Set[str]]] = {}
+            active_windows: Dict[str, Tuple[Optional[datetime], Optional[datetime]]] = {}
+            scheduler = get_expiry_scheduler(cls.EXPIRY_SCHEDULER)
+            count = 0
+            cursor = db.bounties.find(
+                {"status": cls.STATUS_ACTIVE},
+                {"bounty_id": 1, "server_id": 1, "target_id": 1, "created_at": 1, "expires_at": 1}
+            )
+            async for document in cursor:
+                if document.get("target_id") and document.get("bounty_id"):
+                    active_targets.setdefault(str(document.get("server_id")), {}).setdefault(
+                        document["target_id"], set()
+                    ).add(document["bounty_id"])
+                    active_windows[document["bounty_id"]] = (document.get("created_at"), document.get("expires_at"))
+                    count += 1
+                if document.get("bounty_id") and document.get("expires_at"):
+                    scheduler.schedule(document["bounty_id"], document["expires_at"])
+
+            cls._active_targets = active_targets
+            cls._active_windows = active_windows
+            cls._active_loaded = True
+            logger.info(f"Loaded {count} active bounties into the target table")
+            return count
+
+    @classmethod
+    def get_active_bounty_ids(cls, target_id: str, server_id: Optional[str] = None) -> Set[str]:
+        """Get the IDs of a target's active bounties from the in-memory table
+
+        Args:
+            target_id: Target player ID
+            server_id: Server ID (all servers when None)
+
+        Returns:
+            Set of bounty IDs
+        """
+        if server_id is not None:
+            return set(cls._active_targets.get(str(server_id), {}).get(target_id, ()))
+
+        bounty_ids = set()
+        for targets in cls._active_targets.values():
+            bounty_ids.update(targets.get(target_id, ()))
+        return bounty_ids
+
     @classmethod
     async def get_by_bounty_id(cls, db, bounty_id: str) -> Optional['Bounty']:
         """Get a bounty by bounty_id
@@ -271,6 +393,7 @@ class Bounty(BaseModel):
                 "updated_at": self.updated_at
             }}
         )
+        self._untrack(self.server_id, self.target_id, self.bounty_id)
         
         return result.modified_count > 0
     
@@ -297,6 +420,7 @@ class Bounty(BaseModel):
                 "updated_at": self.updated_at
             }}
         )
+        self._untrack(self.server_id, self.target_id, self.bounty_id)
         
         return result.modified_count > 0
     
@@ -323,6 +447,7 @@ class Bounty(BaseModel):
                 "updated_at": self.updated_at
             }}
         )
+        self._untrack(self.server_id, self.target_id, self.bounty_id)
         
         return result.modified_count > 0
     
@@ -440,13 +565,16 @@ class Bounty(BaseModel):
         # Insert into database
         try:
             await db.bounties.insert_one(bounty.to_document())
+            cls._track(server_id, target_id, bounty.bounty_id, expires_at, now)
             return bounty
         except Exception as e:
             logger.error(f"Error creating bounty: {e}")
             return None
     
     @classmethod
-    async def check_bounties_for_kill(cls, db, killer_id: str, victim_id: str, guild_id: Optional[str] = None) -> List['Bounty']:
+    async def check_bounties_for_kill(cls, db, killer_id: str, victim_id: str, guild_id: Optional[str] = None,
+                                      server_id: Optional[str] = None,
+                                      killer_name: Optional[str] = None) -> List['Bounty']:
         """Check if a is not None kill satisfies any active bounties
         
         Args:
@@ -454,27 +582,165 @@ class Bounty(BaseModel):
             killer_id: Killer player ID
             victim_id: Victim player ID
             guild_id: Optional guild ID to filter bounties by
+            server_id: Optional server ID the kill happened on
+            killer_name: Killer name (looked up when not given)
             
         Returns:
             List of bounties that were claimed
         """
-        # Get active bounties for the victim, filtered by guild_id if provided is not None
-        bounties = await cls.get_active_bounties_for_target(db, victim_id, None, guild_id)
+        return await cls.claim_for_kills(db, [{
+            "killer_id": killer_id,
+            "killer_name": killer_name,
+            "victim_id": victim_id,
+        }], server_id=server_id, guild_id=guild_id)
+
+    @staticmethod
+    def _in_window(timestamp: datetime, created_at: Optional[datetime], expires_at: Optional[datetime]) -> bool:
+        """Check whether a kill happened while a bounty was active
+
+        Args:
+            timestamp: Kill time
+            created_at: Bounty creation time (unbounded if None)
+            expires_at: Bounty expiration time (unbounded if None)
+
+        Returns:
+            bool: True if created_at <= timestamp < expires_at
+        """
+        return (created_at is None or created_at <= timestamp) and (expires_at is None or timestamp < expires_at)
+
+    @classmethod
+    async def claim_for_kills(cls, db, kills: List[Dict[str, Any]], server_id: Optional[str] = None,
+                              guild_id: Optional[str] = None) -> List['Bounty']:
+        """Claim the active bounties on the victims of a batch of kills
+
+        Victims are looked up in the in-memory target table first, so kills
+        on players without a bounty never reach the database. A kill only
+        claims a bounty that was active when it happened, so replayed and
+        backlogged kills can't pay bounties placed after them. All claims of
+        the batch are written with one bulk update.
+
+        Args:
+            db: Database connection
+            kills: Kill dicts with killer_id, victim_id and optionally
+                killer_name, timestamp and is_suicide (kills without a
+                timestamp count as happening now)
+            server_id: Server the kills happened on (all servers when None)
+            guild_id: Optional guild ID to filter bounties by
+
+        Returns:
+            List of bounties that were claimed
+        """
+        if not cls._active_loaded:
+            await cls.load_active_targets(db)
+
+        servers = [str(server_id)] if server_id is not None else list(cls._active_targets)
+
+        # Millisecond precision, as stored, so the claims can be matched below
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+        # (timestamp, killer_id, killer_name, server_id, victim_id) of the kills per candidate bounty
+        candidates: Dict[str, List[Tuple[datetime, str, Optional[str], str, str]]] = {}
+        for kill in kills:
+            killer_id = kill.get("killer_id")
+            victim_id = kill.get("victim_id")
+            if not killer_id or not victim_id or killer_id == victim_id or kill.get("is_suicide"):
+                continue
+            timestamp = kill.get("timestamp")
+            if not isinstance(timestamp, datetime):
+                timestamp = now
+            for sid in servers:
+                for bounty_id in cls._active_targets.get(sid, {}).get(victim_id, ()):
+                    created_at, expires_at = cls._active_windows.get(bounty_id, (None, None))
+                    if cls._in_window(timestamp, created_at, expires_at):
+                        candidates.setdefault(bounty_id, []).append(
+                            (timestamp, killer_id, kill.get("killer_name"), sid, victim_id)
+                        )
+
+        if not candidates:
+            return []
+
+        query = {"bounty_id": {"$in": list(candidates)}, "status": cls.STATUS_ACTIVE}
+        if guild_id is not None:
+            query["guild_id"] = guild_id
+
+        bounties = []
+        async for document in db.bounties.find(query):
+            bounties.append(cls.from_document(document))
+
+        operations = []
         claimed_bounties = []
-        
+        hunter_names: Dict[str, str] = {}
         for bounty in bounties:
-            # Get hunter name
-            try:
-                hunter_doc = await db.players.find_one({"player_id": killer_id})
-                hunter_name = hunter_doc.get("name", "Unknown Hunter") if hunter_doc is not None else "Unknown Hunter"
-            except Exception as e:
-                logger.error(f"Error getting hunter name: {e}")
-                hunter_name = "Unknown Hunter"
-                
-            # Claim the bounty
-            if await bounty.claim(db, killer_id, hunter_name):
-                claimed_bounties.append(bounty)
-                
+            # The earliest kill made while the bounty was active claims it; not its own placer
+            eligible = [candidate for candidate in candidates[bounty.bounty_id]
+                        if candidate[1] != bounty.placed_by_id
+                        and cls._in_window(candidate[0], bounty.created_at, bounty.expires_at)]
+            if not eligible:
+                continue
+            timestamp, killer_id, killer_name, _, _ = min(eligible, key=lambda candidate: candidate[0])
+
+            if not killer_name:
+                if killer_id not in hunter_names:
+                    try:
+                        hunter_doc = await db.players.find_one({"player_id": killer_id}, {"name": 1})
+                        hunter_names[killer_id] = hunter_doc.get("name", "Unknown Hunter") if hunter_doc is not None else "Unknown Hunter"
+                    except Exception as e:
+                        logger.error(f"Error getting hunter name: {e}")
+                        hunter_names[killer_id] = "Unknown Hunter"
+                killer_name = hunter_names[killer_id]
+
+            bounty.status = cls.STATUS_CLAIMED
+            bounty.claimed_by_id = killer_id
+            bounty.claimed_by_name = killer_name
+            bounty.claimed_at = now
+            bounty.updated_at = now
+            claim_query = {"bounty_id": bounty.bounty_id, "status": cls.STATUS_ACTIVE}
+            if bounty.created_at is not None:
+                claim_query["created_at"] = {"$lte": timestamp}
+            if bounty.expires_at is not None:
+                claim_query["expires_at"] = {"$gt": timestamp}
+            operations.append(UpdateOne(
+                claim_query,
+                {"$set": {
+                    "status": bounty.status,
+                    "claimed_by_id": bounty.claimed_by_id,
+                    "claimed_by_name": bounty.claimed_by_name,
+                    "claimed_at": bounty.claimed_at,
+                    "updated_at": bounty.updated_at
+                }}
+            ))
+            claimed_bounties.append(bounty)
+
+        # Bounties that are no longer active in the database leave the table too
+        if guild_id is None:
+            found = {bounty.bounty_id for bounty in bounties}
+            for bounty_id, bounty_kills in candidates.items():
+                if bounty_id not in found:
+                    _, _, _, sid, victim_id = bounty_kills[0]
+                    cls._untrack(sid, victim_id, bounty_id)
+
+        if operations:
+            result = await db.bounties.bulk_write(operations, ordered=False)
+            # Every attempted bounty is no longer active, whoever claimed it
+            for bounty in claimed_bounties:
+                cls._untrack(bounty.server_id, bounty.target_id, bounty.bounty_id)
+
+            if result.modified_count < len(operations):
+                # Some were claimed or cancelled concurrently; keep only the ones this batch claimed
+                ours = set()
+                async for document in db.bounties.find(
+                    {"bounty_id": {"$in": [bounty.bounty_id for bounty in claimed_bounties]},
+                     "status": cls.STATUS_CLAIMED, "claimed_at": now},
+                    {"bounty_id": 1, "claimed_by_id": 1}
+                ):
+                    ours.add((document["bounty_id"], document.get("claimed_by_id")))
+                claimed_bounties = [bounty for bounty in claimed_bounties
+                                    if (bounty.bounty_id, bounty.claimed_by_id) in ours]
+
+            for bounty in claimed_bounties:
+                logger.info(f"Bounty {bounty.bounty_id} on {bounty.target_name} claimed by {bounty.claimed_by_name}")
+
         return claimed_bounties
     
     @classmethod
@@ -498,9 +764,15 @@ class Bounty(BaseModel):
         # Add guild_id filter if provided is not None
         if guild_id is not None:
             query["guild_id"] = guild_id
+
+        expiring = await db.bounties.find(
+            query, {"bounty_id": 1, "server_id": 1, "target_id": 1}
+        ).to_list(length=None)
+        if not expiring:
+            return 0
         
         result = await db.bounties.update_many(
-            query,
+            {"bounty_id": {"$in": [doc["bounty_id"] for doc in expiring]}, "status": cls.STATUS_ACTIVE},
             {
                 "$set": {
                     "status": cls.STATUS_EXPIRED,
@@ -508,8 +780,60 @@ class Bounty(BaseModel):
                 }
             }
         )
+        for doc in expiring:
+            cls._untrack(doc.get("server_id"), doc.get("target_id"), doc["bounty_id"])
         
         return result.modified_count
+
+    @classmethod
+    async def expire_by_ids(cls, db, bounty_ids: List[str]) -> int:
+        """Expire bounties whose scheduled expiry has fired
+
+        Bounties that are no longer active are dropped from the in-memory
+        table, and bounties that are not due yet are rescheduled.
+
+        Args:
+            db: Database connection
+            bounty_ids: Bounty IDs
+
+        Returns:
+            Number of bounties expired
+        """
+        if not bounty_ids:
+            return 0
+
+        now = datetime.utcnow()
+        documents = await db.bounties.find(
+            {"bounty_id": {"$in": list(bounty_ids)}},
+            {"bounty_id": 1, "server_id": 1, "target_id": 1, "status": 1, "expires_at": 1}
+        ).to_list(length=None)
+
+        expiring = []
+        for doc in documents:
+            expires_at = doc.get("expires_at")
+            if doc.get("status") != cls.STATUS_ACTIVE:
+                cls._untrack(doc.get("server_id"), doc.get("target_id"), doc["bounty_id"])
+            elif isinstance(expires_at, datetime) and expires_at > now:
+                get_expiry_scheduler(cls.EXPIRY_SCHEDULER).schedule(doc["bounty_id"], expires_at)
+            else:
+                expiring.append(doc)
+
+        if not expiring:
+            return 0
+
+        result = await db.bounties.update_many(
+            {"bounty_id": {"$in": [doc["bounty_id"] for doc in expiring]}, "status": cls.STATUS_ACTIVE},
+            {
+                "$set": {
+                    "status": cls.STATUS_EXPIRED,
+                    "updated_at": now
+                }
+            }
+        )
+        for doc in expiring:
+            cls._untrack(doc.get("server_id"), doc.get("target_id"), doc["bounty_id"])
+
+        return result.modified_count
     
     @classmethod
     async def get_player_stats_for_bounty(
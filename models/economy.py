@@ -2,20 +2,51 @@
 Economy model for Tower of Temptation PvP Statistics Bot
 
 This module defines the Economy data structure for player currency and economic transactions.
+
+Balances are changed with atomic $inc updates; debits only apply while the
+balance covers them. Every change is appended to the economy_transactions
+collection instead of an array inside the economy document, so balance
+reads stay small no matter how long a player's history is.
 """
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, ClassVar, List
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, ClassVar, List, Tuple
 import uuid
 
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
 from models.base_model import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Projection that keeps legacy embedded transaction arrays out of balance reads
+_ACCOUNT_PROJECTION = {"transactions": 0, "settled_sessions": 0}
+
+# Recent gambling session IDs kept per account to make settlement idempotent
+SETTLED_SESSIONS_KEPT = 50
+
+# Kill reward settings
+KILL_REWARD = 10
+DISTANCE_BONUS_MIN_DISTANCE = 100  # Kills from this far earn 1 credit per 10m
+MAX_DISTANCE_BONUS = 50
+
+# Killstreak bonuses as (minimum streak, exact match only, bonus, transaction source)
+STREAK_BONUSES = [
+    (5, True, 25, "killstreak_5"),
+    (10, True, 50, "killstreak_10"),
+    (15, True, 100, "killstreak_15"),
+    (20, True, 200, "killstreak_20"),
+    (25, False, 300, "killstreak_25_plus"),
+    (3, False, 15, "killstreak_3"),
+]
+
+
 class Economy(BaseModel):
     """Player economy data"""
     collection_name: ClassVar[str] = "economy"
-    
+
     # Transaction type constants
     TRANSACTION_DEPOSIT = "deposit"
     TRANSACTION_WITHDRAWAL = "withdrawal"
@@ -23,7 +54,10 @@ class Economy(BaseModel):
     TRANSACTION_BOUNTY_COLLECTED = "bounty_collected"
     TRANSACTION_ADMIN_ADJUSTMENT = "admin_adjustment"
     TRANSACTION_GAME_REWARD = "game_reward"
-    
+
+    # Time between daily rewards
+    DAILY_COOLDOWN = timedelta(days=1)
+
     def __init__(
         self,
         player_id: Optional[str] = None,
@@ -37,6 +71,7 @@ class Economy(BaseModel):
         **kwargs
     ):
         self._id = None
+        self._db = None
         self.player_id = player_id
         self.discord_id = discord_id
         self.server_id = server_id
@@ -45,155 +80,600 @@ class Economy(BaseModel):
         self.lifetime_spent = lifetime_spent
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
-        self.transactions = kwargs.get("transactions", [])
-        
+        self.gambling_stats = kwargs.get("gambling_stats", {})
+
         # Add any additional attributes
         for key, value in kwargs.items():
             if not hasattr(self, key):
                 setattr(self, key, value)
-    
+
+    def to_document(self) -> Dict[str, Any]:
+        """Convert to a MongoDB document without the database handle
+
+        Returns:
+            MongoDB document
+        """
+        document = super().to_document()
+        document.pop("_db", None)
+        return document
+
+    @classmethod
+    def _bind(cls, db, document: Optional[Dict[str, Any]]) -> Optional['Economy']:
+        """Create an economy object that remembers its database
+
+        Args:
+            db: Database connection
+            document: Economy document
+
+        Returns:
+            Economy object or None if document is None
+        """
+        economy = cls.from_document(document) if document is not None else None
+        if economy is not None:
+            economy._db = db
+        return economy
+
+    def _query(self) -> Dict[str, Any]:
+        return {"player_id": self.player_id, "server_id": self.server_id}
+
     @classmethod
     async def get_by_player_id(cls, db, player_id: str) -> Optional['Economy']:
         """Get economy data by player_id
-        
+
         Args:
             db: Database connection
             player_id: Player ID
-            
+
         Returns:
             Economy object or None if found is None
         """
-        document = await db.economy.find_one({"player_id": player_id})
-        return cls.from_document(document) if document is not None else None
-    
+        document = await db.economy.find_one({"player_id": player_id}, _ACCOUNT_PROJECTION)
+        return cls._bind(db, document)
+
     @classmethod
     async def get_by_discord_id(cls, db, discord_id: str) -> Optional['Economy']:
         """Get economy data by discord_id
-        
+
         Args:
             db: Database connection
             discord_id: Discord user ID
-            
+
         Returns:
             Economy object or None if found is None
         """
-        document = await db.economy.find_one({"discord_id": discord_id})
-        return cls.from_document(document) if document is not None else None
-    
+        document = await db.economy.find_one({"discord_id": discord_id}, _ACCOUNT_PROJECTION)
+        return cls._bind(db, document)
+
+    @classmethod
+    async def get_by_player(cls, db, player_id: str, server_id: Optional[str] = None) -> Optional['Economy']:
+        """Get a player's economy data on a server
+
+        Args:
+            db: Database connection
+            player_id: Player ID
+            server_id: Server ID
+
+        Returns:
+            Economy object or None if not found
+        """
+        document = await db.economy.find_one({"player_id": player_id, "server_id": server_id}, _ACCOUNT_PROJECTION)
+        return cls._bind(db, document)
+
+    @classmethod
+    async def create_or_update(cls, db, player_id: str, server_id: Optional[str] = None,
+                               discord_id: Optional[str] = None) -> 'Economy':
+        """Get a player's economy data on a server, creating it if missing
+
+        Args:
+            db: Database connection
+            player_id: Player ID
+            server_id: Server ID
+            discord_id: Discord user ID (optional)
+
+        Returns:
+            Economy object
+        """
+        now = datetime.utcnow()
+        update = {
+            "$setOnInsert": {
+                "balance": 0,
+                "lifetime_earnings": 0,
+                "lifetime_spent": 0,
+                "created_at": now,
+            },
+            "$set": {"updated_at": now},
+        }
+        if discord_id is not None:
+            update["$set"]["discord_id"] = discord_id
+
+        document = await db.economy.find_one_and_update(
+            {"player_id": player_id, "server_id": server_id},
+            update,
+            projection=_ACCOUNT_PROJECTION,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return cls._bind(db, document)
+
+    async def _record(self, db, amount: int, source: str, details: Optional[Dict[str, Any]] = None,
+                      description: Optional[str] = None, transaction_id: Optional[str] = None):
+        """Append a transaction to the ledger
+
+        Args:
+            db: Database connection
+            amount: Signed amount
+            source: What the transaction was for
+            details: Extra transaction data (optional)
+            description: Optional description
+            transaction_id: Fixed ID that makes recording it again a no-op (optional)
+        """
+        transaction = {
+            "transaction_id": transaction_id or str(uuid.uuid4()),
+            "player_id": self.player_id,
+            "server_id": self.server_id,
+            "timestamp": datetime.utcnow(),
+            "amount": amount,
+            "type": "credit" if amount > 0 else "debit",
+            "source": source,
+            "balance": self.balance,
+            "details": details or {},
+        }
+        if description is not None:
+            transaction["description"] = description
+        if transaction_id is not None:
+            transaction["_id"] = transaction_id
+
+        try:
+            await db.economy_transactions.insert_one(transaction)
+        except DuplicateKeyError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not record {source} transaction for player {self.player_id}: {e}")
+
+    async def _change_balance(self, db, amount: int, source: str, details: Optional[Dict[str, Any]] = None,
+                              description: Optional[str] = None) -> bool:
+        """Atomically change the balance and record the transaction
+
+        Debits only apply while the stored balance covers them.
+
+        Args:
+            db: Database connection
+            amount: Signed amount (positive credits, negative debits)
+            source: What the transaction was for
+            details: Extra transaction data (optional)
+            description: Optional description
+
+        Returns:
+            True if the balance was changed, False otherwise
+        """
+        if amount == 0:
+            return False
+
+        query = self._query()
+        if amount > 0:
+            increments = {"balance": amount, "lifetime_earnings": amount}
+        else:
+            query["balance"] = {"$gte": -amount}
+            increments = {"balance": amount, "lifetime_spent": -amount}
+
+        now = datetime.utcnow()
+        document = await db.economy.find_one_and_update(
+            query,
+            {"$inc": increments, "$set": {"updated_at": now}},
+            projection={"balance": 1, "lifetime_earnings": 1, "lifetime_spent": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            return False
+
+        self.balance = document.get("balance", 0)
+        self.lifetime_earnings = document.get("lifetime_earnings", self.lifetime_earnings)
+        self.lifetime_spent = document.get("lifetime_spent", self.lifetime_spent)
+        self.updated_at = now
+
+        await self._record(db, amount, source, details, description)
+        return True
+
     async def add_balance(self, db, amount: int, transaction_type: str, description: str = None) -> bool:
         """Add balance to player account
-        
+
         Args:
             db: Database connection
             amount: Amount to add
             transaction_type: Type of transaction
             description: Optional description
-            
+
         Returns:
             True if updated is not None successfully, False otherwise
         """
         if amount <= 0:
             return False
-            
-        # Update balance
-        self.balance += amount
-        self.lifetime_earnings += amount
-        self.updated_at = datetime.utcnow()
-        
-        # Create transaction record
-        transaction = {
-            "timestamp": datetime.utcnow(),
-            "amount": amount,
-            "balance_after": self.balance,
-            "type": transaction_type,
-            "description": description
-        }
-        
-        if not hasattr(self, "transactions"):
-            self.transactions = []
-            
-        self.transactions.append(transaction)
-        
-        # Update in database
-        result = await db.economy.update_one(
-            {"player_id": self.player_id},
-            {"$set": {
-                "balance": self.balance,
-                "lifetime_earnings": self.lifetime_earnings,
-                "updated_at": self.updated_at
-            },
-            "$push": {
-                "transactions": transaction
-            }}
-        )
-        
-        return result.modified_count > 0
-    
+
+        return await self._change_balance(db, amount, transaction_type, description=description)
+
     async def subtract_balance(self, db, amount: int, transaction_type: str, description: str = None) -> bool:
         """Subtract balance from player account
-        
+
         Args:
             db: Database connection
             amount: Amount to subtract
             transaction_type: Type of transaction
             description: Optional description
-            
+
         Returns:
-            True if updated is not None successfully, False otherwise
+            True if updated is not None successfully, False if the balance is too low
         """
-        if amount <= 0 or self.balance < amount:
+        if amount <= 0:
             return False
-            
-        # Update balance
-        self.balance -= amount
-        self.lifetime_spent += amount
-        self.updated_at = datetime.utcnow()
-        
-        # Create transaction record
-        transaction = {
-            "timestamp": datetime.utcnow(),
-            "amount": -amount,
-            "balance_after": self.balance,
-            "type": transaction_type,
-            "description": description
-        }
-        
-        if not hasattr(self, "transactions"):
-            self.transactions = []
-            
-        self.transactions.append(transaction)
-        
-        # Update in database
-        result = await db.economy.update_one(
-            {"player_id": self.player_id},
-            {"$set": {
-                "balance": self.balance,
-                "lifetime_spent": self.lifetime_spent,
-                "updated_at": self.updated_at
-            },
-            "$push": {
-                "transactions": transaction
+
+        return await self._change_balance(db, -amount, transaction_type, description=description)
+
+    async def add_currency(self, amount: int, source: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        """Add currency to the player's account
+
+        Args:
+            amount: Amount to add
+            source: What the currency was earned with
+            details: Extra transaction data (optional)
+
+        Returns:
+            True if the balance was changed, False otherwise
+        """
+        if amount <= 0:
+            return False
+
+        return await self._change_balance(self._db, amount, source, details)
+
+    async def remove_currency(self, amount: int, source: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        """Remove currency from the player's account
+
+        Args:
+            amount: Amount to remove
+            source: What the currency was spent on
+            details: Extra transaction data (optional)
+
+        Returns:
+            True if the balance was changed, False if the balance is too low
+        """
+        if amount <= 0:
+            return False
+
+        return await self._change_balance(self._db, -amount, source, details)
+
+    async def get_balance(self) -> int:
+        """Get the player's current balance
+
+        Returns:
+            int: Balance
+        """
+        document = await self._db.economy.find_one(self._query(), {"balance": 1})
+        if document is not None:
+            self.balance = document.get("balance", 0)
+        return self.balance
+
+    async def claim_daily(self, amount: int) -> Tuple[bool, str]:
+        """Claim the daily reward
+
+        Args:
+            amount: Reward amount
+
+        Returns:
+            Tuple of (success, message)
+        """
+        now = datetime.utcnow()
+        query = self._query()
+        query["$or"] = [
+            {"last_daily": {"$exists": False}},
+            {"last_daily": None},
+            {"last_daily": {"$lte": now - self.DAILY_COOLDOWN}},
+        ]
+
+        document = await self._db.economy.find_one_and_update(
+            query,
+            {"$inc": {"balance": amount, "lifetime_earnings": amount},
+             "$set": {"last_daily": now, "updated_at": now}},
+            projection={"balance": 1, "lifetime_earnings": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            current = await self._db.economy.find_one(self._query(), {"last_daily": 1})
+            last_daily = (current or {}).get("last_daily")
+            if isinstance(last_daily, datetime):
+                remaining = last_daily + self.DAILY_COOLDOWN - now
+                hours, seconds = divmod(max(int(remaining.total_seconds()), 0), 3600)
+                return False, f"You already claimed your daily reward. Try again in {hours}h {seconds // 60}m."
+            return False, "You already claimed your daily reward."
+
+        self.balance = document.get("balance", 0)
+        self.lifetime_earnings = document.get("lifetime_earnings", self.lifetime_earnings)
+        self.last_daily = now
+        await self._record(self._db, amount, "daily_reward")
+        return True, f"You claimed {amount} credits! Your balance is now {self.balance} credits."
+
+    async def update_gambling_stats(self, game: str, won: bool, amount: int):
+        """Record the outcome of a game
+
+        Args:
+            game: Game name (blackjack, slots, roulette)
+            won: Whether the player won
+            amount: Credits won or lost
+        """
+        await self._db.economy.update_one(
+            self._query(),
+            {"$inc": {
+                f"gambling_stats.{game}.{'wins' if won else 'losses'}": 1,
+                f"gambling_stats.{game}.earnings": amount if won else -amount,
             }}
         )
-        
-        return result.modified_count > 0
-    
+        stats = self.gambling_stats.setdefault(game, {})
+        key = "wins" if won else "losses"
+        stats[key] = stats.get(key, 0) + 1
+        stats["earnings"] = stats.get("earnings", 0) + (amount if won else -amount)
+
+    async def settle_gambling(self, game: str, amount: int, wins: int, losses: int, earnings: int,
+                              details: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None) -> bool:
+        """Close a gambling session in one write
+
+        Credits the funds left in the session and adds its outcomes to the
+        gambling stats with a single update. With a session ID the update is
+        idempotent: the account remembers the sessions it has settled, so a
+        retry after a write that applied but failed to report back is a
+        no-op.
+
+        Args:
+            game: Game name (blackjack, slots, roulette)
+            amount: Credits returned to the balance
+            wins: Rounds won
+            losses: Rounds lost
+            earnings: Net credits won (negative for a net loss)
+            details: Extra transaction data (optional)
+            session_id: ID of the gambling session (optional)
+
+        Returns:
+            True if the account was updated, False otherwise
+        """
+        increments = {}
+        if amount > 0:
+            increments["balance"] = amount
+            increments["lifetime_earnings"] = amount
+        if wins:
+            increments[f"gambling_stats.{game}.wins"] = wins
+        if losses:
+            increments[f"gambling_stats.{game}.losses"] = losses
+        if earnings:
+            increments[f"gambling_stats.{game}.earnings"] = earnings
+        if not increments:
+            return True
+
+        now = datetime.utcnow()
+        query = self._query()
+        update = {"$inc": increments, "$set": {"updated_at": now}}
+        if session_id is not None:
+            query["settled_sessions"] = {"$ne": session_id}
+            update["$push"] = {"settled_sessions": {"$each": [session_id], "$slice": -SETTLED_SESSIONS_KEPT}}
+
+        document = await self._db.economy.find_one_and_update(
+            query,
+            update,
+            projection={"balance": 1, "lifetime_earnings": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None and session_id is not None:
+            # An earlier attempt may have applied without reporting back
+            document = await self._db.economy.find_one(
+                {**self._query(), "settled_sessions": session_id},
+                {"balance": 1, "lifetime_earnings": 1}
+            )
+        if document is None:
+            return False
+
+        self.balance = document.get("balance", 0)
+        self.lifetime_earnings = document.get("lifetime_earnings", self.lifetime_earnings)
+        self.updated_at = now
+
+        stats = self.gambling_stats.setdefault(game, {})
+        stats["wins"] = stats.get("wins", 0) + wins
+        stats["losses"] = stats.get("losses", 0) + losses
+        stats["earnings"] = stats.get("earnings", 0) + earnings
+
+        if amount > 0:
+            await self._record(self._db, amount, f"{game}_settle", details, transaction_id=session_id)
+        return True
+
+    async def get_gambling_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the player's gambling stats
+
+        Returns:
+            Dict mapping game to wins, losses and earnings
+        """
+        document = await self._db.economy.find_one(self._query(), {"gambling_stats": 1})
+        if document is not None:
+            self.gambling_stats = document.get("gambling_stats") or {}
+        return self.gambling_stats
+
+    @staticmethod
+    def calculate_kill_reward(distance: float = 0, killstreak: int = 0) -> Dict[str, Any]:
+        """Calculate the reward for a kill
+
+        Args:
+            distance: Kill distance in meters
+            killstreak: Killer's current killstreak including this kill
+
+        Returns:
+            Dict with base_reward, distance_bonus, streak_bonus, streak_type and killstreak
+        """
+        distance_bonus = 0
+        if distance and distance >= DISTANCE_BONUS_MIN_DISTANCE:
+            distance_bonus = min(int(distance / 10), MAX_DISTANCE_BONUS)
+
+        streak_bonus, streak_type = 0, None
+        if killstreak and killstreak > 1:
+            for minimum, exact, bonus, source in STREAK_BONUSES:
+                if killstreak == minimum or (not exact and killstreak >= minimum):
+                    streak_bonus, streak_type = bonus, source
+                    break
+
+        return {
+            "base_reward": KILL_REWARD,
+            "distance_bonus": distance_bonus,
+            "streak_bonus": streak_bonus,
+            "streak_type": streak_type,
+            "killstreak": killstreak,
+        }
+
+    @classmethod
+    async def apply_credits(cls, db, server_id: str, credits: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Apply a batch of balance changes with one update per player
+
+        Changes are summed per player and applied as a single $inc. A net
+        credit creates the player's account on the server if it is missing,
+        as kill rewards always have; a net debit only applies while the
+        balance covers it and never creates an account. Every change is
+        still recorded in the ledger, with the balance it left behind.
+
+        Args:
+            db: Database connection
+            server_id: Server ID
+            credits: Changes as dicts with player_id, amount, source and details
+
+        Returns:
+            Dict mapping player ID to the resulting balance of every player
+            whose update applied
+        """
+        by_player: Dict[str, List[Dict[str, Any]]] = {}
+        for credit in credits:
+            if credit.get("amount"):
+                by_player.setdefault(credit["player_id"], []).append(credit)
+        if not by_player:
+            return {}
+
+        now = datetime.utcnow()
+
+        async def apply(player_id: str, entries: List[Dict[str, Any]]):
+            net = sum(entry["amount"] for entry in entries)
+            query = {"player_id": player_id, "server_id": server_id}
+            update = {
+                "$inc": {
+                    "balance": net,
+                    "lifetime_earnings": sum(entry["amount"] for entry in entries if entry["amount"] > 0),
+                    "lifetime_spent": -sum(entry["amount"] for entry in entries if entry["amount"] < 0),
+                },
+                "$set": {"updated_at": now},
+            }
+            if net < 0:
+                query["balance"] = {"$gte": -net}
+            else:
+                update["$setOnInsert"] = {"created_at": now}
+            return await db.economy.find_one_and_update(
+                query,
+                update,
+                projection={"balance": 1},
+                upsert=net >= 0,
+                return_document=ReturnDocument.AFTER
+            )
+
+        players = list(by_player)
+        results = await asyncio.gather(*(apply(player_id, by_player[player_id]) for player_id in players),
+                                       return_exceptions=True)
+
+        balances: Dict[str, int] = {}
+        transactions = []
+        for player_id, result in zip(players, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error applying {len(by_player[player_id])} credits for player {player_id}: {result}")
+                continue
+            if result is None:
+                logger.debug(f"Skipped credits for player {player_id}: balance too low or no account")
+                continue
+
+            balance = result.get("balance", 0)
+            balances[player_id] = balance
+
+            # Walk back from the final balance to the balance after each change
+            entries = []
+            for entry in reversed(by_player[player_id]):
+                amount = entry["amount"]
+                entries.append({
+                    "transaction_id": str(uuid.uuid4()),
+                    "player_id": player_id,
+                    "server_id": server_id,
+                    "timestamp": now,
+                    "amount": amount,
+                    "type": "credit" if amount > 0 else "debit",
+                    "source": entry.get("source"),
+                    "balance": balance,
+                    "details": entry.get("details") or {},
+                })
+                balance -= amount
+            transactions.extend(reversed(entries))
+
+        if transactions:
+            try:
+                await db.economy_transactions.insert_many(transactions, ordered=False)
+            except Exception as e:
+                logger.warning(f"Could not record {len(transactions)} batched transactions for server {server_id}: {e}")
+
+        return balances
+
+    @classmethod
+    async def get_transactions(cls, db, player_id: str, server_id: Optional[str] = None, limit: int = 10,
+                               before: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Get a page of a player's transactions, newest first
+
+        Args:
+            db: Database connection
+            player_id: Player ID
+            server_id: Server ID
+            limit: Page size
+            before: Cursor returned with the previous page (optional)
+
+        Returns:
+            Tuple of (transactions, cursor for the next page or None)
+        """
+        query: Dict[str, Any] = {"player_id": player_id, "server_id": server_id}
+        if before:
+            query["$or"] = [
+                {"timestamp": {"$lt": before["timestamp"]}},
+                {"timestamp": before["timestamp"], "_id": {"$lt": before["_id"]}},
+            ]
+
+        cursor = db.economy_transactions.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(limit)
+        transactions = await cursor.to_list(length=limit)
+
+        next_cursor = None
+        if len(transactions) == limit:
+            last = transactions[-1]
+            next_cursor = {"timestamp": last["timestamp"], "_id": last["_id"]}
+        return transactions, next_cursor
+
+    async def get_recent_transactions(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the player's most recent transactions
+
+        Args:
+            limit: Maximum number of transactions
+
+        Returns:
+            List of transactions, newest first
+        """
+        transactions, _ = await self.get_transactions(self._db, self.player_id, self.server_id, limit)
+        return transactions
+
     @classmethod
     async def get_or_create(cls, db, player_id: str, discord_id: str = None, server_id: str = None) -> 'Economy':
         """Get or create economy data for a player
-        
+
         Args:
             db: Database connection
             player_id: Player ID
             discord_id: Discord user ID (optional)
             server_id: Server ID (optional)
-            
+
         Returns:
             Economy object
         """
         # Try to get existing economy data
         economy = await cls.get_by_player_id(db, player_id)
-        
+
         if economy is not None:
             # Update discord_id if provided is not None and different
             if discord_id is not None and economy.discord_id != discord_id:
@@ -204,7 +684,7 @@ class Economy(BaseModel):
                     {"$set": {"discord_id": discord_id, "updated_at": economy.updated_at}}
                 )
             return economy
-            
+
         # Create new economy data
         now = datetime.utcnow()
         economy = cls(
@@ -215,35 +695,177 @@ class Economy(BaseModel):
             lifetime_earnings=0,
             lifetime_spent=0,
             created_at=now,
-            updated_at=now,
-            transactions=[]
+            updated_at=now
         )
-        
+
         # Insert into database
         await db.economy.insert_one(economy.to_document())
-        
+        economy._db = db
+
         return economy
-    
+
     @classmethod
     async def get_top_players(cls, db, server_id: str = None, limit: int = 10) -> List['Economy']:
         """Get top players by balance
-        
+
         Args:
             db: Database connection
             server_id: Server ID (optional)
             limit: Number of players to return
-            
+
         Returns:
             List of Economy objects
         """
         query = {}
         if server_id is not None:
             query["server_id"] = server_id
-            
-        cursor = db.economy.find(query).sort("balance", -1).limit(limit)
-        
+
+        cursor = db.economy.find(query, _ACCOUNT_PROJECTION).sort("balance", -1).limit(limit)
+
         players = []
         async for document in cursor:
-            players.append(cls.from_document(document))
-            
-        return players
\ No newline at end of file
+            players.append(cls._bind(db, document))
+
+        return players
+
+    @classmethod
+    async def get_richest_players(cls, db, server_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the richest players on a server for display
+
+        Args:
+            db: Database connection
+            server_id: Server ID
+            limit: Number of players to return
+
+        Returns:
+            List of dicts with player_id, player_name, currency and lifetime_earnings
+        """
+        players = await cls.get_top_players(db, server_id, limit)
+        return [
+            {
+                "player_id": economy.player_id,
+                "player_name": getattr(economy, "player_name", None) or economy.player_id,
+                "currency": economy.balance,
+                "lifetime_earnings": economy.lifetime_earnings,
+            }
+            for economy in players
+        ]
+
+    @classmethod
+    async def get_economy_stats(cls, db, server_id: str) -> Dict[str, Any]:
+        """Get economy statistics for a server
+
+        Args:
+            db: Database connection
+            server_id: Server ID
+
+        Returns:
+            Dict with currency totals, gambling stats per game and
+            transaction counts and volumes per source
+        """
+        stats: Dict[str, Any] = {
+            "total_currency": 0,
+            "total_lifetime_earnings": 0,
+            "active_accounts": 0,
+            "gambling_stats": {},
+            "transaction_sources": {},
+        }
+
+        async for document in db.economy.find({"server_id": server_id},
+                                              {"balance": 1, "lifetime_earnings": 1, "gambling_stats": 1}):
+            stats["total_currency"] += document.get("balance", 0)
+            stats["total_lifetime_earnings"] += document.get("lifetime_earnings", 0)
+            stats["active_accounts"] += 1
+            for game, game_stats in (document.get("gambling_stats") or {}).items():
+                totals = stats["gambling_stats"].setdefault(game, {"wins": 0, "losses": 0, "earnings": 0})
+                for key in totals:
+                    totals[key] += game_stats.get(key, 0)
+
+        pipeline = [
+            {"$match": {"server_id": server_id}},
+            {"$group": {
+                "_id": {"source": "$source", "type": "$type"},
+                "count": {"$sum": 1},
+                "total": {"$sum": {"$abs": "$amount"}},
+            }},
+        ]
+        async for row in db.economy_transactions.aggregate(pipeline):
+            source = row["_id"].get("source") or "unknown"
+            entry = stats["transaction_sources"].setdefault(source, {"count": 0, "credit": 0, "debit": 0})
+            entry["count"] += row["count"]
+            entry[row["_id"].get("type") or "credit"] += row["total"]
+
+        return stats
+
+    @classmethod
+    async def migrate_account_index(cls, db) -> bool:
+        """Key economy accounts by player and server
+
+        Accounts used to be unique per player_id, so a player with an
+        account on one server could not get one on another. The legacy
+        index is dropped in favor of a unique (player_id, server_id) index.
+
+        Args:
+            db: Motor database
+
+        Returns:
+            bool: True if the legacy index was dropped
+        """
+        indexes = await db.economy.index_information()
+        legacy = indexes.get("player_id_1")
+        dropped = bool(legacy and legacy.get("unique"))
+        if dropped:
+            await db.economy.drop_index("player_id_1")
+            logger.info("Dropped the unique economy player_id index")
+
+        await db.economy.create_index([("player_id", 1), ("server_id", 1)], unique=True)
+        return dropped
+
+    @classmethod
+    async def migrate_transactions(cls, db, batch_size: int = 500) -> int:
+        """Move embedded transaction arrays into the transactions collection
+
+        Only touches economy documents that still carry a transactions
+        array, so it's safe to call on every startup. Moved transactions get
+        an ID derived from their account and position and are upserted, so
+        a run interrupted before the array is removed doesn't duplicate
+        them when it is repeated.
+
+        Args:
+            db: Motor database
+            batch_size: Number of transactions inserted per batch
+
+        Returns:
+            int: Number of transactions moved
+        """
+        moved = 0
+        async for document in db.economy.find({"transactions.0": {"$exists": True}},
+                                              {"player_id": 1, "server_id": 1, "transactions": 1}):
+            batch = []
+            for position, transaction in enumerate(document.get("transactions") or []):
+                amount = transaction.get("amount", 0)
+                transaction_id = f"{document['_id']}:{position}"
+                batch.append({
+                    "transaction_id": transaction_id,
+                    "player_id": document.get("player_id"),
+                    "server_id": document.get("server_id"),
+                    "timestamp": transaction.get("timestamp") or datetime.utcnow(),
+                    "amount": amount,
+                    "type": "credit" if amount > 0 else "debit",
+                    "source": transaction.get("source") or transaction.get("type"),
+                    "balance": transaction.get("balance_after", transaction.get("balance", 0)),
+                    "details": transaction.get("details") or {},
+                    "description": transaction.get("description"),
+                })
+            for i in range(0, len(batch), batch_size):
+                await db.economy_transactions.bulk_write([
+                    UpdateOne({"_id": transaction["transaction_id"]}, {"$setOnInsert": transaction}, upsert=True)
+                    for transaction in batch[i:i + batch_size]
+                ], ordered=False)
+            await db.economy.update_one({"_id": document["_id"]}, {"$unset": {"transactions": ""}})
+            moved += len(batch)
+
+        if moved:
+            logger.info(f"Moved {moved} embedded economy transactions to economy_transactions")
+
+        return moved
@@ -5,6 +5,8 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+from utils.name_index import note_player
+
 logger = logging.getLogger(__name__)
 
 class Event:
@@ -171,6 +173,7 @@ class Connection:
             {"$set": player_data},
             upsert=True
         )
+        note_player(player_data["server_id"], player_data["player_id"], player_data["player_name"])
         
         return cls(db, connection_data)
     
@@ -12,6 +12,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Union, TypeVar, Set
 
 import discord
+from pymongo import UpdateOne
 
 from utils.database import get_db
 from utils.async_utils import AsyncCache
@@ -23,6 +24,10 @@ logger = logging.getLogger(__name__)
 # Type variables
 F = TypeVar('F', bound='Faction')
 
+# Number of members and weapons listed by get_stats
+TOP_MEMBERS = 5
+TOP_WEAPONS = 5
+
 # Faction roles
 FACTION_ROLES = {
     "LEADER": "leader",
@@ -380,6 +385,8 @@ class Faction:
             upsert=True
         )
         
+        await self._add_member_stats(db, player_id)
+        
         # Update local data
         self.updated_at = now
         
@@ -394,7 +401,7 @@ class Faction:
         Returns:
             bool: True if successful is not None
         """
-        if player_id is not None not in self.member_ids:
+        if player_id not in self.member_ids:
             return True  # Not a member
             
         db = await get_db()
@@ -446,6 +453,8 @@ class Faction:
             upsert=True
         )
         
+        await self._remove_member_stats(db, player_id)
+        
         # Update local data
         self.updated_at = now
         
@@ -544,6 +553,7 @@ class Faction:
         
         # Delete faction
         result = await db.collections["factions"].delete_one({"_id": self._id})
+        await db.collections["faction_stats"].delete_one({"faction_id": self.id})
         
         # Clear cache
         AsyncCache.invalidate(self.__class__.get_by_id, self.id)
@@ -605,42 +615,246 @@ class Faction:
         
         return owner_data
     
+    @staticmethod
+    def _member_entry(player_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the stats entry of a member from their player document
+        
+        Args:
+            player_data: Player document
+            
+        Returns:
+            Dict with name, kills, deaths and weapon counts by weapon key
+        """
+        from models.weapon_stats import weapon_key
+        
+        weapons = {}
+        for weapon, count in (player_data.get("weapons") or {}).items():
+            key = weapon_key(weapon)
+            weapons[key] = weapons.get(key, 0) + count
+        
+        return {
+            "name": player_data.get("player_name") or player_data.get("name") or "Unknown",
+            "kills": player_data.get("kills", 0),
+            "deaths": player_data.get("deaths", 0),
+            "weapons": weapons
+        }
+    
+    async def _add_member_stats(self, db, player_id: str):
+        """Add a joining member's stats to the faction aggregates
+        
+        Args:
+            db: Database connection
+            player_id: Player ID
+        """
+        from models.weapon_stats import weapon_key
+        
+        player_data = await db.collections["players"].find_one(
+            {"server_id": self.server_id, "player_id": player_id}
+        ) or {}
+        entry = self._member_entry(player_data)
+        
+        inc = {"kills": entry["kills"], "deaths": entry["deaths"]}
+        set_fields = {f"members.{player_id}": entry, "updated_at": datetime.utcnow()}
+        for weapon, count in (player_data.get("weapons") or {}).items():
+            key = weapon_key(weapon)
+            inc[f"weapons.{key}.count"] = inc.get(f"weapons.{key}.count", 0) + count
+            set_fields[f"weapons.{key}.name"] = weapon
+        
+        # Aggregates that don't exist yet are built from the members on first read
+        await db.collections["faction_stats"].update_one(
+            {"faction_id": self.id, f"members.{player_id}": {"$exists": False}},
+            {"$inc": inc, "$set": set_fields}
+        )
+    
+    async def _remove_member_stats(self, db, player_id: str):
+        """Take a leaving member's stats out of the faction aggregates
+        
+        Args:
+            db: Database connection
+            player_id: Player ID
+        """
+        stats = await db.collections["faction_stats"].find_one(
+            {"faction_id": self.id},
+            {f"members.{player_id}": 1}
+        )
+        entry = (stats or {}).get("members", {}).get(player_id)
+        if entry is None:
+            return
+        
+        inc = {"kills": -entry.get("kills", 0), "deaths": -entry.get("deaths", 0)}
+        for key, count in entry.get("weapons", {}).items():
+            inc[f"weapons.{key}.count"] = -count
+        
+        await db.collections["faction_stats"].update_one(
+            {"faction_id": self.id, f"members.{player_id}": {"$exists": True}},
+            {
+                "$inc": inc,
+                "$unset": {f"members.{player_id}": ""},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        )
+    
+    @classmethod
+    async def record_kills(cls, server_id: str, kills: List[Dict[str, Any]], db=None) -> int:
+        """Add kills to the aggregates of the factions the players belong to
+        
+        Kills are folded per player, the factions of all players are found
+        with one query and each faction's aggregates get a single $inc in one
+        unordered bulk write. Suicides are skipped.
+        
+        Args:
+            server_id: Server ID
+            kills: Kill dicts with killer_id, victim_id and optionally
+                killer_name, victim_name, weapon and is_suicide
+            db: Database to write to (defaults to get_db())
+            
+        Returns:
+            int: Number of faction aggregates updated
+        """
+        from models.weapon_stats import weapon_key
+        
+        players = {}
+        for kill in kills:
+            killer_id = kill.get("killer_id")
+            victim_id = kill.get("victim_id")
+            if not killer_id or not victim_id or kill.get("is_suicide") or killer_id == victim_id:
+                continue
+            
+            for player_id, field, name in ((killer_id, "kills", kill.get("killer_name")),
+                                           (victim_id, "deaths", kill.get("victim_name"))):
+                entry = players.setdefault(player_id, {"kills": 0, "deaths": 0, "weapons": {}, "name": None})
+                entry[field] += 1
+                if name:
+                    entry["name"] = name
+            
+            weapon = kill.get("weapon") or "Unknown"
+            weapons = players[killer_id]["weapons"]
+            weapons[weapon] = weapons.get(weapon, 0) + 1
+        
+        if not players:
+            return 0
+        
+        if db is None:
+            db = await get_db()
+        factions_data = await db.collections["factions"].find(
+            {"server_id": server_id, "member_ids": {"$in": list(players)}},
+            {"member_ids": 1}
+        ).to_list(length=None)
+        
+        now = datetime.utcnow()
+        operations = []
+        for faction_data in factions_data:
+            inc = {}
+            set_fields = {"updated_at": now}
+            for player_id in faction_data.get("member_ids", []):
+                entry = players.get(player_id)
+                if entry is None:
+                    continue
+                
+                for field in ("kills", "deaths"):
+                    if entry[field]:
+                        inc[field] = inc.get(field, 0) + entry[field]
+                        inc[f"members.{player_id}.{field}"] = entry[field]
+                if entry["name"]:
+                    set_fields[f"members.{player_id}.name"] = entry["name"]
+                
+                for weapon, count in entry["weapons"].items():
+                    key = weapon_key(weapon)
+                    member_field = f"members.{player_id}.weapons.{key}"
+                    inc[member_field] = inc.get(member_field, 0) + count
+                    inc[f"weapons.{key}.count"] = inc.get(f"weapons.{key}.count", 0) + count
+                    set_fields[f"weapons.{key}.name"] = weapon
+            
+            if inc:
+                # No upsert: aggregates that don't exist yet are built on first read
+                operations.append(UpdateOne(
+                    {"faction_id": str(faction_data["_id"])},
+                    {"$inc": inc, "$set": set_fields}
+                ))
+        
+        if not operations:
+            return 0
+        
+        result = await db.collections["faction_stats"].bulk_write(operations, ordered=False)
+        
+        return result.modified_count
+    
+    async def rebuild_stats(self) -> Dict[str, Any]:
+        """Rebuild the faction's aggregate stats from its members' player documents
+        
+        Returns:
+            Dict: Faction stats document
+        """
+        from models.weapon_stats import weapon_key
+        
+        db = await get_db()
+        members = await self.get_members()
+        
+        stats = {
+            "faction_id": self.id,
+            "server_id": self.server_id,
+            "kills": 0,
+            "deaths": 0,
+            "members": {},
+            "weapons": {},
+            "updated_at": datetime.utcnow()
+        }
+        
+        for member in members:
+            entry = self._member_entry(member)
+            stats["members"][member.get("player_id", "unknown")] = entry
+            stats["kills"] += entry["kills"]
+            stats["deaths"] += entry["deaths"]
+            for weapon, count in (member.get("weapons") or {}).items():
+                weapon_entry = stats["weapons"].setdefault(weapon_key(weapon), {"name": weapon, "count": 0})
+                weapon_entry["count"] += count
+        
+        await db.collections["faction_stats"].replace_one(
+            {"faction_id": self.id},
+            stats,
+            upsert=True
+        )
+        
+        return stats
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get faction statistics
         
+        Stats are read from the faction's aggregate document, which is kept
+        up to date as members get kills and as they join or leave. It is
+        built from the member documents the first time it's read.
+        
         Returns:
             Dict: Faction statistics
         """
-        # Get faction members
-        members = await self.get_members()
+        db = await get_db()
+        stats = await db.collections["faction_stats"].find_one({"faction_id": self.id})
+        if stats is None:
+            stats = await self.rebuild_stats()
         
-        # Aggregate stats
-        total_kills = sum(member.get("kills", 0) for member in members)
-        total_deaths = sum(member.get("deaths", 0) for member in members)
+        total_kills = stats.get("kills", 0)
+        total_deaths = stats.get("deaths", 0)
+        members = stats.get("members", {})
         
         # Calculate K/D ratio
         faction_kd = total_kills / total_deaths if total_deaths > 0 else total_kills
         
         # Get top members
-        top_members = sorted(members, key=lambda m: m.get("kills", 0), reverse=True)[:5]
+        top_members = sorted(members.items(), key=lambda m: m[1].get("kills", 0), reverse=True)[:TOP_MEMBERS]
         top_members_data = [
             {
-                "id": member.get("player_id", "unknown"),
-                "name": member.get("player_name", "Unknown"),
+                "id": player_id,
+                "name": member.get("name", "Unknown"),
                 "kills": member.get("kills", 0),
                 "deaths": member.get("deaths", 0),
-                "kd_ratio": member.get("kd_ratio", 0)
+                "kd_ratio": member.get("kills", 0) / member["deaths"] if member.get("deaths") else member.get("kills", 0)
             }
-            for member in top_members
+            for player_id, member in top_members
         ]
         
         # Weapons breakdown
-        weapons = {}
-        for member in members:
-            for weapon, count in member.get("weapons", {}).items():
-                weapons[weapon] = weapons.get(weapon, 0) + count
-                
-        top_weapons = sorted(weapons.items(), key=lambda x: x[1], reverse=True)[:5]
+        weapons = [weapon for weapon in stats.get("weapons", {}).values() if weapon.get("count", 0) > 0]
+        top_weapons = sorted(weapons, key=lambda w: w["count"], reverse=True)[:TOP_WEAPONS]
         
         # Return stats
         return {
@@ -649,7 +863,7 @@ class Faction:
             "faction_kd": faction_kd,
             "member_count": len(members),
             "top_members": top_members_data,
-            "top_weapons": [{"name": w, "count": c} for w, c in top_weapons]
+            "top_weapons": [{"name": w["name"], "count": w["count"]} for w in top_weapons]
         }
     
     @staticmethod
@@ -641,6 +641,10 @@ class Guild(BaseModel):
             {"$set": update_dict}
         )
 
+        # Compiled embed templates carry the old theme
+        from utils.embed_templates import invalidate_guild_templates
+        invalidate_guild_templates(self.guild_id)
+
         return result.modified_count > 0
 
     @classmethod
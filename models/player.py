@@ -143,6 +143,54 @@ class Player(BaseModel):
             
         return players
     
+    @classmethod
+    async def get_or_create_many(cls, db, server_id: str, players: Dict[str, Optional[str]]) -> Dict[str, 'Player']:
+        """Get players by ID, creating missing ones
+        
+        Identities come from the server's player cache, so players seen
+        before cost no query; the rest are read and upserted in one batch.
+        The returned players carry identity only (ID, server and name), not
+        stats.
+        
+        Args:
+            db: Database connection
+            server_id: Server ID
+            players: Dict mapping player ID to the current name (None if unknown)
+            
+        Returns:
+            Dict mapping player ID to Player
+        """
+        from utils.player_cache import get_player_cache
+        
+        identities = await get_player_cache(server_id).resolve(db, players)
+        
+        result = {}
+        for player_id, (doc_id, name) in identities.items():
+            player = cls(player_id=player_id, server_id=server_id, name=name)
+            player._id = doc_id
+            result[player_id] = player
+        return result
+    
+    @classmethod
+    async def create_or_update(cls, db, data: Dict[str, Any]) -> Optional['Player']:
+        """Get a player, creating it or refreshing its name as needed
+        
+        Args:
+            db: Database connection
+            data: Dict with player_id, server_id and player_name or name
+            
+        Returns:
+            Player object or None if data has no player_id
+        """
+        player_id = data.get("player_id")
+        if not player_id:
+            return None
+        
+        players = await cls.get_or_create_many(
+            db, data.get("server_id"), {player_id: data.get("player_name") or data.get("name")}
+        )
+        return players.get(player_id)
+    
     async def update_stats(
         self, 
         db, 
@@ -152,6 +200,9 @@ class Player(BaseModel):
     ) -> bool:
         """Update player statistics
         
+        Counters are incremented atomically, so players from the identity
+        cache (which don't hold stats) can be updated safely.
+        
         Args:
             db: Database connection
             kills: Number of kills to add
@@ -161,30 +212,155 @@ class Player(BaseModel):
         Returns:
             True if updated is not None successfully, False otherwise
         """
-        update_dict = {"updated_at": datetime.utcnow()}
+        now = datetime.utcnow()
+        inc = {}
         
-        if kills is not None:
+        if kills:
             self.kills += kills
-            update_dict["kills"] = self.kills
+            inc["kills"] = kills
         
-        if deaths is not None:
+        if deaths:
             self.deaths += deaths
-            update_dict["deaths"] = self.deaths
+            inc["deaths"] = deaths
         
-        if suicides is not None:
+        if suicides:
             self.suicides += suicides
-            update_dict["suicides"] = self.suicides
+            inc["suicides"] = suicides
         
-        self.updated_at = update_dict["updated_at"]
+        self.updated_at = now
+        
+        update = {"$set": {"updated_at": now}}
+        if inc:
+            update["$inc"] = inc
         
         # Update in database
-        result = await db.players.update_one(
-            {"player_id": self.player_id},
-            {"$set": update_dict}
-        )
+        query = {"_id": self._id} if self._id is not None else {"player_id": self.player_id}
+        result = await db.players.update_one(query, update)
         
         return result.modified_count > 0
     
+    # Counters returned by kill, death and suicide updates
+    _EVENT_FIELDS: ClassVar[List[str]] = [
+        "kills", "deaths", "suicides", "current_streak", "highest_killstreak",
+        "highest_deathstreak", "longest_kill_distance", "total_kill_distance",
+    ]
+
+    async def _apply_event(self, db, pipeline: List[Dict[str, Any]]) -> bool:
+        """Apply an update pipeline to the player and refresh its counters
+
+        Args:
+            db: Database connection
+            pipeline: Update pipeline
+
+        Returns:
+            True if the player was updated, False otherwise
+        """
+        from pymongo import ReturnDocument
+
+        query = {"_id": self._id} if self._id is not None else {"player_id": self.player_id}
+        document = await db.players.find_one_and_update(
+            query,
+            pipeline,
+            projection={field: 1 for field in self._EVENT_FIELDS},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            return False
+
+        for field in self._EVENT_FIELDS:
+            if field in document:
+                setattr(self, field, document[field])
+        return True
+
+    async def record_kill(self, db, victim_id: str, victim_name: Optional[str] = None,
+                          weapon: Optional[str] = None, distance: float = 0) -> bool:
+        """Record a kill by this player
+
+        Counters are updated atomically. A kill extends a killing streak
+        (positive current_streak) or starts a new one.
+
+        Args:
+            db: Database connection
+            victim_id: Victim's player ID
+            victim_name: Victim's name (optional)
+            weapon: Weapon used (optional)
+            distance: Kill distance in meters
+
+        Returns:
+            True if the kill was recorded, False otherwise
+        """
+        now = datetime.utcnow()
+        distance = distance or 0
+        streak = {"$ifNull": ["$current_streak", 0]}
+        pipeline = [
+            {"$set": {
+                "kills": {"$add": [{"$ifNull": ["$kills", 0]}, 1]},
+                "current_streak": {"$cond": [{"$gt": [streak, 0]}, {"$add": [streak, 1]}, 1]},
+                "total_kill_distance": {"$add": [{"$ifNull": ["$total_kill_distance", 0]}, distance]},
+                "longest_kill_distance": {"$max": [{"$ifNull": ["$longest_kill_distance", 0]}, distance]},
+                "last_seen": now,
+                "updated_at": now,
+            }},
+            {"$set": {
+                "highest_killstreak": {"$max": [{"$ifNull": ["$highest_killstreak", 0]}, "$current_streak"]},
+            }},
+        ]
+        return await self._apply_event(db, pipeline)
+
+    async def record_death(self, db, killer_id: str, killer_name: Optional[str] = None) -> bool:
+        """Record a death of this player
+
+        A death ends a killing streak and extends a death streak (negative
+        current_streak).
+
+        Args:
+            db: Database connection
+            killer_id: Killer's player ID
+            killer_name: Killer's name (optional)
+
+        Returns:
+            True if the death was recorded, False otherwise
+        """
+        now = datetime.utcnow()
+        streak = {"$ifNull": ["$current_streak", 0]}
+        pipeline = [
+            {"$set": {
+                "deaths": {"$add": [{"$ifNull": ["$deaths", 0]}, 1]},
+                "current_streak": {"$cond": [{"$lt": [streak, 0]}, {"$subtract": [streak, 1]}, -1]},
+                "last_seen": now,
+                "updated_at": now,
+            }},
+            {"$set": {
+                "highest_deathstreak": {"$max": [
+                    {"$ifNull": ["$highest_deathstreak", 0]}, {"$abs": "$current_streak"}
+                ]},
+            }},
+        ]
+        return await self._apply_event(db, pipeline)
+
+    async def record_suicide(self, db, suicide_type: Optional[str] = None) -> bool:
+        """Record a suicide of this player
+
+        A suicide ends a killing streak but doesn't count as a death.
+
+        Args:
+            db: Database connection
+            suicide_type: Kind of suicide (optional)
+
+        Returns:
+            True if the suicide was recorded, False otherwise
+        """
+        now = datetime.utcnow()
+        pipeline = [
+            {"$set": {
+                "suicides": {"$add": [{"$ifNull": ["$suicides", 0]}, 1]},
+                "current_streak": {"$min": [{"$ifNull": ["$current_streak", 0]}, 0]},
+                "last_seen": now,
+                "updated_at": now,
+            }},
+        ]
+        return await self._apply_event(db, pipeline)
+
     async def update_rivalries(
         self, 
         db, 
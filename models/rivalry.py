@@ -11,8 +11,12 @@ import math
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Union, TypeVar, Tuple
 
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
 from utils.database import get_db
 from utils.async_utils import AsyncCache
+from utils.rivalry_leaderboard import LEADERBOARD_SIZE, CLOSEST_MIN_KILLS, get_rivalry_leaderboard
 
 # Local imports are placed inside methods to avoid circular references
 
@@ -21,6 +25,35 @@ logger = logging.getLogger(__name__)
 # Type variables
 R = TypeVar('R', bound='Rivalry')
 
+# Pipeline stage deriving the stored leaderboard metrics from the kill counts;
+# intensity_score matches Rivalry.intensity_score
+_METRICS_STAGE = {"$set": {
+    "total_kills": {"$add": ["$player1_kills", "$player2_kills"]},
+    "kill_difference": {"$abs": {"$subtract": ["$player1_kills", "$player2_kills"]}},
+    "intensity_score": {"$let": {
+        "vars": {
+            "total": {"$add": ["$player1_kills", "$player2_kills"]},
+            "difference": {"$abs": {"$subtract": ["$player1_kills", "$player2_kills"]}}
+        },
+        "in": {"$cond": [
+            {"$eq": ["$$total", 0]},
+            0.0,
+            {"$multiply": [100, {"$add": [
+                {"$multiply": [0.7, {"$subtract": [1, {"$divide": ["$$difference", {"$add": ["$$total", 1]}]}]}]},
+                {"$multiply": [0.3, {"$log10": {"$add": ["$$total", 1]}}]}
+            ]}]}
+        ]}
+    }}
+}}
+
+# Sort order of each leaderboard ranking, matching utils.rivalry_leaderboard.RANKINGS
+_RANKING_SORTS = {
+    "total_kills": [("total_kills", -1), ("last_kill_time", -1)],
+    "intensity_score": [("intensity_score", -1), ("total_kills", -1)],
+    "closest": [("kill_difference", 1), ("total_kills", -1)],
+    "recent": [("last_kill_time", -1), ("total_kills", -1)],
+}
+
 class Rivalry:
     """Rivalry class for tracking feuds between players"""
     
@@ -154,6 +187,23 @@ class Rivalry:
             "last_location": self.last_location
         }
     
+    @staticmethod
+    def canonical_pair(player_a: str, player_b: str) -> Tuple[str, str]:
+        """Get the canonical ordering of a player pair
+        
+        Every rivalry is stored once, with player1_id being the smaller ID.
+        
+        Args:
+            player_a: First player ID
+            player_b: Second player ID
+            
+        Returns:
+            Tuple[str, str]: (player1_id, player2_id)
+        """
+        if str(player_a) <= str(player_b):
+            return player_a, player_b
+        return player_b, player_a
+    
     @classmethod
     @AsyncCache.cached(ttl=60)
     async def get_by_id(cls, rivalry_id: str) -> Optional['Rivalry']:
@@ -166,7 +216,7 @@ class Rivalry:
             Rivalry or None: Rivalry if found is not None
         """
         db = await get_db()
-        rivalry_data = await db.collections["rivalries"].find_one({"_id": rivalry_id})
+        rivalry_data = await db.rivalries.find_one({"_id": rivalry_id})
         
         if rivalry_data is None:
             return None
@@ -193,13 +243,12 @@ class Rivalry:
         """
         db = await get_db()
         
-        # Check both player order possibilities
-        rivalry_data = await db.collections["rivalries"].find_one({
+        # Rivalries are stored under the canonical (ordered) player pair
+        player1_id, player2_id = cls.canonical_pair(player1_id, player2_id)
+        rivalry_data = await db.rivalries.find_one({
             "server_id": server_id,
-            "$or": [
-                {"player1_id": player1_id, "player2_id": player2_id},
-                {"player1_id": player2_id, "player2_id": player1_id}
-            ]
+            "player1_id": player1_id,
+            "player2_id": player2_id
         })
         
         if rivalry_data is None:
@@ -224,7 +273,7 @@ class Rivalry:
         db = await get_db()
         
         # Get rivalries where player is player1 or player2
-        rivalries_data = await db.collections["rivalries"].find({
+        rivalries_data = await db.rivalries.find({
             "server_id": server_id,
             "$or": [
                 {"player1_id": player_id},
@@ -235,58 +284,87 @@ class Rivalry:
         return [cls(rivalry_data) for rivalry_data in rivalries_data]
     
     @classmethod
-    async def get_top_rivalries(cls, server_id: str, limit: int = 10) -> List['Rivalry']:
-        """Get top rivalries by total kills
+    async def _get_ranking(
+        cls,
+        server_id: str,
+        ranking: str,
+        query: Dict[str, Any],
+        limit: int,
+        since: Optional[datetime] = None
+    ) -> List['Rivalry']:
+        """Get the best rivalries of a leaderboard ranking
+        
+        Served from the server's in-memory leaderboard when it holds the
+        ranking, otherwise read with one indexed query that also loads it.
         
         Args:
             server_id: Server ID
-            limit: Maximum number of rivalries to return (default: 10)
+            ranking: Ranking name (see _RANKING_SORTS)
+            query: Filter selecting the rivalries that qualify
+            limit: Maximum number of rivalries to return
+            since: Only include rivalries with a kill since this time (optional)
             
         Returns:
             List[Rivalry]: List of rivalries
         """
+        leaderboard = get_rivalry_leaderboard(server_id)
+        rivalries_data = leaderboard.get(ranking, limit, since)
+        if rivalries_data is not None:
+            return [cls(rivalry_data) for rivalry_data in rivalries_data]
+        
         db = await get_db()
+        rivalries_data = await db.rivalries.find(
+            {"server_id": server_id, **query}
+        ).sort(_RANKING_SORTS[ranking]).limit(max(limit, LEADERBOARD_SIZE)).to_list(length=None)
         
-        # Get rivalries sorted by total kills (player1_kills + player2_kills)
-        pipeline = [
-            {"$match": {"server_id": server_id}},
-            {"$addFields": {"total_kills": {"$add": ["$player1_kills", "$player2_kills"]}}},
-            {"$sort": {"total_kills": -1}},
-            {"$limit": limit}
-        ]
+        leaderboard.load(ranking, rivalries_data)
         
-        rivalries_data = await db.collections["rivalries"].aggregate(pipeline).to_list(length=None)
+        if since is not None:
+            rivalries_data = [
+                rivalry_data for rivalry_data in rivalries_data
+                if rivalry_data.get("last_kill_time") and rivalry_data["last_kill_time"] >= since
+            ]
         
-        return [cls(rivalry_data) for rivalry_data in rivalries_data]
+        return [cls(rivalry_data) for rivalry_data in rivalries_data[:limit]]
     
     @classmethod
-    async def get_closest_rivalries(cls, server_id: str, limit: int = 10) -> List['Rivalry']:
-        """Get closest rivalries by kill difference
+    async def get_top_rivalries(
+        cls,
+        server_id: str,
+        limit: int = 10,
+        sort_by: str = "total_kills"
+    ) -> List['Rivalry']:
+        """Get top rivalries by total kills or intensity
         
         Args:
             server_id: Server ID
             limit: Maximum number of rivalries to return (default: 10)
+            sort_by: "total_kills" or "intensity_score" (default: total_kills)
             
         Returns:
             List[Rivalry]: List of rivalries
         """
-        db = await get_db()
+        if sort_by not in ("total_kills", "intensity_score"):
+            raise ValueError(f"Unknown rivalry sort: {sort_by}")
         
-        # Get rivalries with at least 10 total kills, sorted by kill difference
-        pipeline = [
-            {"$match": {"server_id": server_id}},
-            {"$addFields": {
-                "total_kills": {"$add": ["$player1_kills", "$player2_kills"]},
-                "kill_diff": {"$abs": {"$subtract": ["$player1_kills", "$player2_kills"]}}
-            }},
-            {"$match": {"total_kills": {"$gte": 10}}},  # Only include rivalries with significant activity
-            {"$sort": {"kill_diff": 1, "total_kills": -1}},  # Sort by closest first, then by total kills
-            {"$limit": limit}
-        ]
+        return await cls._get_ranking(server_id, sort_by, {}, limit)
+    
+    @classmethod
+    async def get_closest_rivalries(cls, server_id: str, limit: int = 10) -> List['Rivalry']:
+        """Get closest rivalries by kill difference
         
-        rivalries_data = await db.collections["rivalries"].aggregate(pipeline).to_list(length=None)
+        Only rivalries with at least CLOSEST_MIN_KILLS total kills are ranked.
         
-        return [cls(rivalry_data) for rivalry_data in rivalries_data]
+        Args:
+            server_id: Server ID
+            limit: Maximum number of rivalries to return (default: 10)
+            
+        Returns:
+            List[Rivalry]: List of rivalries
+        """
+        return await cls._get_ranking(
+            server_id, "closest", {"total_kills": {"$gte": CLOSEST_MIN_KILLS}}, limit
+        )
     
     @classmethod
     async def get_all_server_rivalries(cls, db, server_id: str, min_kills: int = 1) -> List[Dict[str, Any]]:
@@ -303,16 +381,24 @@ class Rivalry:
         Returns:
             List of rivalry dictionaries from player perspective
         """
-        # Access the rivalries collection
-        rivalries_collection = db.collections["rivalries"] if hasattr(db, "collections") else db.rivalries
-        
-        cursor = rivalries_collection.find(
+        # total_kills bounds either side's kills, so it narrows the index scan
+        cursor = db.rivalries.find(
             {
                 "server_id": server_id,
+                "total_kills": {"$gte": min_kills},
                 "$or": [
                     {"player1_kills": {"$gte": min_kills}},
                     {"player2_kills": {"$gte": min_kills}}
                 ]
+            },
+            {
+                "server_id": 1,
+                "player1_id": 1,
+                "player2_id": 1,
+                "player1_name": 1,
+                "player2_name": 1,
+                "player1_kills": 1,
+                "player2_kills": 1
             }
         )
         
@@ -356,27 +442,11 @@ class Rivalry:
         Returns:
             List[Rivalry]: List of rivalries
         """
-        db = await get_db()
-        
-        # Calculate cutoff date
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get rivalries with recent activity
-        pipeline = [
-            {"$match": {
-                "server_id": server_id,
-                "last_kill_time": {"$gte": cutoff_date}
-            }},
-            {"$addFields": {
-                "total_kills": {"$add": ["$player1_kills", "$player2_kills"]}
-            }},
-            {"$sort": {"last_kill_time": -1, "total_kills": -1}},  # Sort by most recent first, then by total kills
-            {"$limit": limit}
-        ]
-        
-        rivalries_data = await db.collections["rivalries"].aggregate(pipeline).to_list(length=None)
-        
-        return [cls(rivalry_data) for rivalry_data in rivalries_data]
+        return await cls._get_ranking(
+            server_id, "recent", {"last_kill_time": {"$type": "date"}}, limit, since=cutoff_date
+        )
     
     @classmethod
     async def declare_rivalry(
@@ -421,7 +491,7 @@ class Rivalry:
             
             # Only update if already is None declared
             if existing.declared is False:
-                result = await db.collections["rivalries"].update_one(
+                result = await db.rivalries.update_one(
                     {"_id": existing._id},
                     {
                         "$set": {
@@ -447,6 +517,12 @@ class Rivalry:
             # Create new rivalry
             db = await get_db()
             
+            # Store under the canonical pair ordering
+            if cls.canonical_pair(player1_id, player2_id) != (player1_id, player2_id):
+                player1_id, player2_id = player2_id, player1_id
+                player1_name, player2_name = player2_name, player1_name
+            
+            # first_kill_time is left unset so record_kill's $min can fill it
             rivalry_data = {
                 "server_id": server_id,
                 "player1_id": player1_id,
@@ -455,7 +531,9 @@ class Rivalry:
                 "player2_name": player2_name,
                 "player1_kills": 0,
                 "player2_kills": 0,
-                "first_kill_time": None,
+                "total_kills": 0,
+                "kill_difference": 0,
+                "intensity_score": 0.0,
                 "last_kill_time": None,
                 "last_kill": None,
                 "last_weapon": None,
@@ -467,11 +545,93 @@ class Rivalry:
                 "updated_at": now
             }
             
-            result = await db.collections["rivalries"].insert_one(rivalry_data)
+            result = await db.rivalries.insert_one(rivalry_data)
             rivalry_data["_id"] = result.inserted_id
             
             return cls(rivalry_data), True
     
+    @classmethod
+    def _build_kill_update(
+        cls,
+        server_id: str,
+        killer_id: str,
+        victim_id: str,
+        weapon: Optional[str],
+        location: Optional[str],
+        killer_name: Optional[str] = None,
+        victim_name: Optional[str] = None,
+        kills: int = 1,
+        reverse_kills: int = 0,
+        timestamp: Optional[datetime] = None,
+        first_timestamp: Optional[datetime] = None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Build the upsert filter and update for kills within one player pair
+        
+        Args:
+            server_id: Server ID
+            killer_id: Player ID of the last killer
+            victim_id: Player ID of the last victim
+            weapon: Weapon used for the last kill
+            location: Location of the last kill
+            killer_name: Killer name (optional)
+            victim_name: Victim name (optional)
+            kills: Kills by killer_id on victim_id
+            reverse_kills: Kills by victim_id on killer_id
+            timestamp: Time of the last kill (defaults to now)
+            first_timestamp: Time of the earliest kill (defaults to timestamp)
+            
+        Returns:
+            Tuple of (filter, update pipeline)
+        """
+        now = datetime.utcnow()
+        timestamp = timestamp or now
+        player1_id, player2_id = cls.canonical_pair(killer_id, victim_id)
+        killer_is_player1 = (killer_id == player1_id)
+        
+        killer_side = "player1" if killer_is_player1 else "player2"
+        victim_side = "player2" if killer_is_player1 else "player1"
+        
+        increments = {
+            f"{killer_side}_kills": kills,
+            f"{victim_side}_kills": reverse_kills
+        }
+        
+        fields = {
+            f"{side}_kills": {"$add": [{"$ifNull": [f"${side}_kills", 0]}, increments[f"{side}_kills"]]}
+            for side in ("player1", "player2")
+        }
+        fields.update({
+            "last_kill_time": {"$literal": timestamp},
+            "last_kill": {"$literal": killer_id},
+            "last_weapon": {"$literal": weapon},
+            "last_location": {"$literal": location},
+            "updated_at": {"$literal": now},
+            "first_kill_time": {"$min": ["$first_kill_time", {"$literal": first_timestamp or timestamp}]},
+            "declared": {"$ifNull": ["$declared", False]},
+            "declared_by": {"$ifNull": ["$declared_by", None]},
+            "declared_at": {"$ifNull": ["$declared_at", None]},
+            "created_at": {"$ifNull": ["$created_at", {"$literal": now}]}
+        })
+        
+        # Names are refreshed when known, otherwise only defaulted on insert
+        for side, name in ((killer_side, killer_name), (victim_side, victim_name)):
+            if name:
+                fields[f"{side}_name"] = {"$literal": name}
+            else:
+                fields[f"{side}_name"] = {"$ifNull": [f"${side}_name", "Unknown"]}
+        
+        # An update pipeline, so the leaderboard metrics are derived from the
+        # new kill counts in the same write
+        update = [{"$set": fields}, _METRICS_STAGE]
+        
+        query = {
+            "server_id": server_id,
+            "player1_id": player1_id,
+            "player2_id": player2_id
+        }
+        
+        return query, update
+    
     @classmethod
     async def record_kill(
         cls,
@@ -479,141 +639,261 @@ class Rivalry:
         killer_id: str,
         victim_id: str,
         weapon: str,
-        location: str
+        location: str,
+        killer_name: Optional[str] = None,
+        victim_name: Optional[str] = None
     ) -> 'Rivalry':
         """Record a kill and update the rivalry
         
+        The rivalry is upserted in a single round trip keyed by the canonical
+        (server_id, player1_id, player2_id) pair.
+        
         Args:
             server_id: Server ID
             killer_id: Killer player ID
             victim_id: Victim player ID
             weapon: Weapon used
             location: Kill location
+            killer_name: Killer name (optional, refreshed when given)
+            victim_name: Victim name (optional, refreshed when given)
             
         Returns:
             Rivalry: Updated rivalry
         """
-        # Import here to avoid circular imports
-        # Local import to avoid circular references
-# from models.player import Player
-        # Get or create rivalry
-        rivalry = await cls.get_between_players(server_id, killer_id, victim_id)
+        db = await get_db()
+        query, update = cls._build_kill_update(
+            server_id, killer_id, victim_id, weapon, location,
+            killer_name=killer_name, victim_name=victim_name
+        )
         
-        if rivalry is None:
-            # Get player names
-            killer = await Player.get_by_player_id(server_id, killer_id)
-            victim = await Player.get_by_player_id(server_id, victim_id)
-            
-            if killer is None or victim is None:
-                raise ValueError("One or both players not found")
-                
-            killer_name = killer.player_name
-            victim_name = victim.player_name
-            
-            # Create new rivalry
-            now = datetime.utcnow()
+        rivalry_data = await db.rivalries.find_one_and_update(
+            query,
+            update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        
+        rivalry = cls(rivalry_data)
+        
+        # Clear cache
+        AsyncCache.invalidate(cls.get_by_id, rivalry.id)
+        
+        leaderboard = get_rivalry_leaderboard(server_id, create=False)
+        if leaderboard is not None:
+            leaderboard.update([rivalry_data])
+        
+        return rivalry
+    
+    @classmethod
+    async def record_kills(cls, server_id: str, kills: List[Dict[str, Any]], db=None) -> int:
+        """Record many kills at once
+        
+        Kills are folded per canonical player pair and written with a single
+        unordered bulk upsert.
+        
+        Args:
+            server_id: Server ID
+            kills: Kill dicts with killer_id, victim_id and optionally
+                killer_name, victim_name, weapon, location and timestamp
+            db: Database to write to (defaults to get_db())
             
+        Returns:
+            int: Number of rivalries upserted or modified
+        """
+        pairs = {}
+        for kill in kills:
+            killer_id = kill.get("killer_id")
+            victim_id = kill.get("victim_id")
+            if not killer_id or not victim_id or killer_id == victim_id:
+                continue
+            
+            pair = cls.canonical_pair(killer_id, victim_id)
+            entry = pairs.setdefault(pair, {"counts": {}, "names": {}, "last": None, "first": None})
+            entry["counts"][killer_id] = entry["counts"].get(killer_id, 0) + 1
+            if kill.get("killer_name"):
+                entry["names"][killer_id] = kill["killer_name"]
+            if kill.get("victim_name"):
+                entry["names"][victim_id] = kill["victim_name"]
+            
+            timestamp = kill.get("timestamp")
+            if isinstance(timestamp, datetime) and (entry["first"] is None or timestamp < entry["first"]):
+                entry["first"] = timestamp
+            last = entry["last"]
+            if last is None or (timestamp and (last.get("timestamp") is None or timestamp >= last["timestamp"])):
+                entry["last"] = kill
+        
+        if not pairs:
+            return 0
+        
+        operations = []
+        queries = []
+        for entry in pairs.values():
+            last = entry["last"]
+            killer_id = last["killer_id"]
+            victim_id = last["victim_id"]
+            timestamp = last.get("timestamp")
+            query, update = cls._build_kill_update(
+                server_id, killer_id, victim_id,
+                last.get("weapon"), last.get("location"),
+                killer_name=entry["names"].get(killer_id),
+                victim_name=entry["names"].get(victim_id),
+                kills=entry["counts"].get(killer_id, 0),
+                reverse_kills=entry["counts"].get(victim_id, 0),
+                timestamp=timestamp if isinstance(timestamp, datetime) else None,
+                first_timestamp=entry["first"]
+            )
+            operations.append(UpdateOne(query, update, upsert=True))
+            queries.append(query)
+        
+        if db is None:
             db = await get_db()
+        result = await db.rivalries.bulk_write(operations, ordered=False)
+        
+        # Servers with a leaderboard get the written pairs back in one read
+        leaderboard = get_rivalry_leaderboard(server_id, create=False)
+        if leaderboard is not None:
+            updated = await db.rivalries.find({"$or": queries}).to_list(length=None)
+            leaderboard.update(updated)
+        
+        return result.upserted_count + result.modified_count
+    
+    @classmethod
+    async def migrate_canonical_pairs(cls, db) -> int:
+        """Fold legacy rivalry documents into canonical pair documents
+        
+        Rivalries used to be stored in either player order, and for a while
+        in the "collections.rivalries" collection, and pairs could be
+        duplicated before the pair index was unique. Each legacy or duplicate
+        document is merged into the canonical document and then removed.
+        
+        The canonical document records the merged document IDs in
+        merged_from until the migration completes, so a restart between a
+        merge and its delete never counts the same kills twice.
+        
+        Args:
+            db: Motor database
             
-            rivalry_data = {
-                "server_id": server_id,
-                "player1_id": killer_id,
-                "player2_id": victim_id,
-                "player1_name": killer_name,
-                "player2_name": victim_name,
-                "player1_kills": 1,  # Start with 1 kill for player1 (the killer)
-                "player2_kills": 0,
-                "first_kill_time": now,
-                "last_kill_time": now,
-                "last_kill": killer_id,
-                "last_weapon": weapon,
-                "last_location": location,
-                "declared": False,
-                "declared_by": None,
-                "declared_at": None,
-                "created_at": now,
-                "updated_at": now
+        Returns:
+            int: Number of legacy documents migrated
+        """
+        migrated = 0
+        sources = [db["collections.rivalries"], db.rivalries]
+        
+        for source in sources:
+            query = {"player1_id": {"$exists": True}}
+            if source is sources[1]:
+                # Only reversed pairs need moving within the live collection
+                query["$expr"] = {"$gt": ["$player1_id", "$player2_id"]}
+            
+            async for doc in source.find(query):
+                await cls._merge_legacy_pair(db, source, doc)
+                migrated += 1
+        
+        # Same-order duplicates are merged into the oldest document of the pair
+        duplicates = db.rivalries.aggregate([
+            {"$match": {"player1_id": {"$exists": True}}},
+            {"$sort": {"_id": 1}},
+            {"$group": {
+                "_id": {"server_id": "$server_id", "player1_id": "$player1_id", "player2_id": "$player2_id"},
+                "ids": {"$push": "$_id"}
+            }},
+            {"$match": {"ids.1": {"$exists": True}}}
+        ])
+        async for group in duplicates:
+            for duplicate_id in group["ids"][1:]:
+                doc = await db.rivalries.find_one({"_id": duplicate_id})
+                if doc is not None:
+                    await cls._merge_legacy_pair(db, db.rivalries, doc, target_id=group["ids"][0])
+                    migrated += 1
+        
+        if migrated:
+            await db.rivalries.update_many({"merged_from": {"$exists": True}}, {"$unset": {"merged_from": ""}})
+            logger.info(f"Migrated {migrated} legacy rivalry documents to canonical pairs")
+            # Merged kill counts invalidate the stored metrics
+            await cls.backfill_metrics(db, {})
+        
+        return migrated
+    
+    @classmethod
+    async def _merge_legacy_pair(cls, db, source, doc: Dict[str, Any], target_id: Any = None) -> None:
+        """Merge one legacy rivalry document into its canonical document
+        
+        Every step can be repeated: the merge is skipped once the canonical
+        document lists the legacy ID in merged_from.
+        
+        Args:
+            db: Motor database
+            source: Collection holding the legacy document
+            doc: Legacy rivalry document
+            target_id: Canonical document to merge into (optional, looked up by pair)
+        """
+        player1_id, player2_id = cls.canonical_pair(doc["player1_id"], doc["player2_id"])
+        a, b = ("player2", "player1") if player1_id != doc["player1_id"] else ("player1", "player2")
+        pair = {"server_id": doc.get("server_id"), "player1_id": player1_id, "player2_id": player2_id}
+        
+        if target_id is None:
+            target = await db.rivalries.find_one({**pair, "_id": {"$ne": doc["_id"]}}, {"_id": 1})
+            target_id = target["_id"] if target else None
+        
+        if target_id is None:
+            fields = {
+                **pair,
+                "player1_name": doc.get(f"{a}_name"),
+                "player2_name": doc.get(f"{b}_name"),
+                "player1_kills": doc.get(f"{a}_kills", 0),
+                "player2_kills": doc.get(f"{b}_kills", 0),
+                "updated_at": datetime.utcnow()
             }
+            if source.name == db.rivalries.name:
+                # The only document of the pair is reordered in place
+                await db.rivalries.update_one({"_id": doc["_id"]}, {"$set": fields})
+                return
+            try:
+                await db.rivalries.insert_one({**doc, **fields, "created_at": doc.get("created_at") or datetime.utcnow()})
+            except DuplicateKeyError:
+                pass  # Inserted before a restart
+            await source.delete_one({"_id": doc["_id"]})
+            return
+        
+        update = {
+            "$inc": {
+                "player1_kills": doc.get(f"{a}_kills", 0),
+                "player2_kills": doc.get(f"{b}_kills", 0)
+            },
+            "$addToSet": {"merged_from": doc["_id"]},
+            "$set": {"updated_at": datetime.utcnow()}
+        }
+        if doc.get("last_kill_time"):
+            update["$max"] = {"last_kill_time": doc["last_kill_time"]}
+        if doc.get("first_kill_time"):
+            update["$min"] = {"first_kill_time": doc["first_kill_time"]}
+        
+        await db.rivalries.update_one({"_id": target_id, "merged_from": {"$ne": doc["_id"]}}, update)
+        await source.delete_one({"_id": doc["_id"]})
+    
+    @classmethod
+    async def backfill_metrics(cls, db, query: Optional[Dict[str, Any]] = None) -> int:
+        """Store total_kills, kill_difference and intensity_score on rivalries
+        
+        Args:
+            db: Motor database
+            query: Rivalries to update (defaults to those without total_kills)
             
-            result = await db.collections["rivalries"].insert_one(rivalry_data)
-            rivalry_data["_id"] = result.inserted_id
-            
-            return cls(rivalry_data)
-        else:
-            # Update existing rivalry
-            db = await get_db()
-            now = datetime.utcnow()
-            
-            # Determine which player is the killer
-            if killer_id == rivalry.player1_id:
-                # Player 1 killed Player 2
-                update_query = {
-                    "$inc": {"player1_kills": 1},
-                    "$set": {
-                        "last_kill_time": now,
-                        "last_kill": killer_id,
-                        "last_weapon": weapon,
-                        "last_location": location,
-                        "updated_at": now
-                    }
-                }
-                
-                # Set first_kill_time if this is not None is the first kill
-                if rivalry.first_kill_time is None:
-                    update_query["$set"]["first_kill_time"] = now
-                
-                result = await db.collections["rivalries"].update_one(
-                    {"_id": rivalry._id},
-                    update_query
-                )
-                
-                # Update local data
-                rivalry.player1_kills += 1
-                rivalry.last_kill_time = now
-                rivalry.last_kill = killer_id
-                rivalry.last_weapon = weapon
-                rivalry.last_location = location
-                rivalry.updated_at = now
-                
-                if rivalry.first_kill_time is None:
-                    rivalry.first_kill_time = now
-            else:
-                # Player 2 killed Player 1
-                update_query = {
-                    "$inc": {"player2_kills": 1},
-                    "$set": {
-                        "last_kill_time": now,
-                        "last_kill": killer_id,
-                        "last_weapon": weapon,
-                        "last_location": location,
-                        "updated_at": now
-                    }
-                }
-                
-                # Set first_kill_time if this is not None is the first kill
-                if rivalry.first_kill_time is None:
-                    update_query["$set"]["first_kill_time"] = now
-                
-                result = await db.collections["rivalries"].update_one(
-                    {"_id": rivalry._id},
-                    update_query
-                )
-                
-                # Update local data
-                rivalry.player2_kills += 1
-                rivalry.last_kill_time = now
-                rivalry.last_kill = killer_id
-                rivalry.last_weapon = weapon
-                rivalry.last_location = location
-                rivalry.updated_at = now
-                
-                if rivalry.first_kill_time is None:
-                    rivalry.first_kill_time = now
-            
-            # Clear cache
-            AsyncCache.invalidate(cls.get_by_id, rivalry.id)
-            
-            return rivalry
+        Returns:
+            int: Number of rivalries updated
+        """
+        if query is None:
+            query = {"total_kills": {"$exists": False}}
+        
+        result = await db.rivalries.update_many(
+            {"player1_id": {"$exists": True}, **query},
+            [_METRICS_STAGE]
+        )
+        
+        if result.modified_count:
+            logger.info(f"Stored leaderboard metrics on {result.modified_count} rivalries")
+        
+        return result.modified_count
     
     async def end_rivalry(self) -> bool:
         """End a declared rivalry
@@ -627,7 +907,7 @@ class Rivalry:
         db = await get_db()
         now = datetime.utcnow()
         
-        result = await db.collections["rivalries"].update_one(
+        result = await db.rivalries.update_one(
             {"_id": self._id},
             {
                 "$set": {
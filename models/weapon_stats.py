@@ -0,0 +1,454 @@
+"""
+Weapon statistics model for the Tower of Temptation PvP Statistics Discord Bot.
+
+This module provides:
+1. WeaponStats class holding pre-aggregated weapon and distance counters
+2. Incremental updates applied as kills are ingested
+3. Single-document reads for the weapon statistics commands
+
+Each server has one document with server-wide totals (player_id is None) and
+one document per player. Both carry per-weapon kill counts, distance sums,
+minimum/maximum distances and a kill distance histogram, so the stats
+commands no longer aggregate the kills collection.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+from pymongo import UpdateOne
+
+from utils.database import get_db
+
+logger = logging.getLogger(__name__)
+
+# Kill distance histogram bucket upper bounds in meters (last bucket is open-ended)
+DISTANCE_BUCKETS = [10, 50, 100, 200, 400]
+
+
+def distance_bucket(distance: float) -> str:
+    """Get the histogram bucket label for a kill distance
+
+    Args:
+        distance: Kill distance in meters
+
+    Returns:
+        str: Bucket label (e.g. "10-50" or "400+")
+    """
+    lower = 0
+    for bound in DISTANCE_BUCKETS:
+        if distance < bound:
+            return f"{lower}-{bound}"
+        lower = bound
+    return f"{DISTANCE_BUCKETS[-1]}+"
+
+
+def weapon_key(weapon: str) -> str:
+    """Get the field name a weapon is stored under
+
+    MongoDB field names can't contain dots or start with "$", so those
+    characters are replaced. The original name is kept in the sub-document.
+
+    Args:
+        weapon: Weapon name
+
+    Returns:
+        str: Field-safe weapon key
+    """
+    return weapon.replace(".", "_").replace("$", "_")
+
+
+def _to_distance(value: Any) -> float:
+    """Convert a kill distance to a float
+
+    Args:
+        value: Distance value from a kill event
+
+    Returns:
+        float: Distance in meters (0 if missing or invalid)
+    """
+    try:
+        return max(float(value or 0), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class WeaponStats:
+    """Pre-aggregated weapon statistics for a server or player"""
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialize weapon stats
+
+        Args:
+            data: Weapon stats data from database
+        """
+        self.data = data
+        self.server_id = data.get("server_id")
+        self.player_id = data.get("player_id")
+        self.player_name = data.get("player_name")
+        self.kills = data.get("kills", 0)
+        self.distance_sum = data.get("distance_sum", 0)
+        self.distance_max = data.get("distance_max", 0)
+        self.distance_histogram = data.get("distance_histogram", {})
+        self.weapons = data.get("weapons", {})
+        self.updated_at = data.get("updated_at")
+
+    @property
+    def average_distance(self) -> float:
+        """Get the average kill distance across all weapons
+
+        Returns:
+            float: Average kill distance in meters
+        """
+        if not self.kills:
+            return 0.0
+        return round(self.distance_sum / self.kills, 1)
+
+    def get_weapon(self, weapon: str) -> Optional[Dict[str, Any]]:
+        """Get the counters for one weapon
+
+        Args:
+            weapon: Weapon name
+
+        Returns:
+            Dict with name, kills, distance_sum, distance_min and distance_max, or None
+        """
+        return self.weapons.get(weapon_key(weapon))
+
+    def get_weapon_counts(self) -> Dict[str, int]:
+        """Get kill counts per weapon
+
+        Returns:
+            Dict mapping weapon name to kill count
+        """
+        return {
+            entry.get("name", key): entry.get("kills", 0)
+            for key, entry in self.weapons.items()
+        }
+
+    def get_category_counts(self) -> Dict[str, int]:
+        """Get kill counts per weapon category
+
+        Returns:
+            Dict mapping category to kill count
+        """
+        from utils.weapon_stats import get_weapon_category
+
+        categories = {}
+        for weapon, kills in self.get_weapon_counts().items():
+            category = get_weapon_category(weapon)
+            categories[category] = categories.get(category, 0) + kills
+        return categories
+
+    def find_weapons(self, pattern: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Find weapons whose name matches a pattern
+
+        Args:
+            pattern: Case-insensitive substring or regular expression
+            limit: Maximum number of weapons to return
+
+        Returns:
+            List of weapon counters sorted by kills, each with avg_distance added
+        """
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            regex = re.compile(re.escape(pattern), re.IGNORECASE)
+
+        matches = []
+        for key, entry in self.weapons.items():
+            name = entry.get("name", key)
+            if not regex.search(name):
+                continue
+            kills = entry.get("kills", 0)
+            matches.append({
+                **entry,
+                "name": name,
+                "avg_distance": entry.get("distance_sum", 0) / kills if kills else 0,
+            })
+
+        matches.sort(key=lambda w: w.get("kills", 0), reverse=True)
+        return matches[:limit]
+
+    @staticmethod
+    def _add_kill(
+        entry: Dict[str, Any],
+        weapon: str,
+        distance: float,
+        timestamp: Optional[datetime]
+    ):
+        """Fold one kill into an in-memory counter entry
+
+        Args:
+            entry: Counter entry for a server or player
+            weapon: Weapon used
+            distance: Kill distance in meters
+            timestamp: Kill time (optional)
+        """
+        entry["kills"] += 1
+        entry["distance_sum"] += distance
+        entry["distance_max"] = max(entry["distance_max"], distance)
+
+        bucket = distance_bucket(distance)
+        entry["histogram"][bucket] = entry["histogram"].get(bucket, 0) + 1
+
+        weapon_entry = entry["weapons"].setdefault(weapon_key(weapon), {
+            "name": weapon,
+            "kills": 0,
+            "distance_sum": 0.0,
+            "distance_min": distance,
+            "distance_max": 0.0,
+        })
+        weapon_entry["kills"] += 1
+        weapon_entry["distance_sum"] += distance
+        weapon_entry["distance_min"] = min(weapon_entry["distance_min"], distance)
+        weapon_entry["distance_max"] = max(weapon_entry["distance_max"], distance)
+
+        if isinstance(timestamp, datetime) and (entry["last_kill"] is None or timestamp > entry["last_kill"]):
+            entry["last_kill"] = timestamp
+
+    @staticmethod
+    def _build_update(server_id: str, player_id: Optional[str], entry: Dict[str, Any]) -> UpdateOne:
+        """Build the upsert for one folded counter entry
+
+        Args:
+            server_id: Server ID
+            player_id: Player ID (None for server totals)
+            entry: Folded counter entry
+
+        Returns:
+            UpdateOne: Upsert operation
+        """
+        inc = {
+            "kills": entry["kills"],
+            "distance_sum": entry["distance_sum"],
+        }
+        max_fields = {"distance_max": entry["distance_max"]}
+        min_fields = {}
+
+        for bucket, count in entry["histogram"].items():
+            inc[f"distance_histogram.{bucket}"] = count
+
+        for key, weapon_entry in entry["weapons"].items():
+            inc[f"weapons.{key}.kills"] = weapon_entry["kills"]
+            inc[f"weapons.{key}.distance_sum"] = weapon_entry["distance_sum"]
+            max_fields[f"weapons.{key}.distance_max"] = weapon_entry["distance_max"]
+            min_fields[f"weapons.{key}.distance_min"] = weapon_entry["distance_min"]
+
+        now = datetime.utcnow()
+        set_fields = {"updated_at": now}
+        for key, weapon_entry in entry["weapons"].items():
+            set_fields[f"weapons.{key}.name"] = weapon_entry["name"]
+        if entry.get("name"):
+            set_fields["player_name"] = entry["name"]
+        if entry["last_kill"] is not None:
+            max_fields["last_kill"] = entry["last_kill"]
+
+        update = {
+            "$inc": inc,
+            "$max": max_fields,
+            "$set": set_fields,
+            "$setOnInsert": {"created_at": now},
+        }
+        if min_fields:
+            update["$min"] = min_fields
+
+        return UpdateOne({"server_id": server_id, "player_id": player_id}, update, upsert=True)
+
+    @classmethod
+    async def record_kill(
+        cls,
+        server_id: str,
+        killer_id: str,
+        weapon: str,
+        distance: Any,
+        killer_name: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> int:
+        """Record a single kill in the weapon aggregates
+
+        Args:
+            server_id: Server ID
+            killer_id: Killer player ID
+            weapon: Weapon used
+            distance: Kill distance in meters
+            killer_name: Killer name (optional)
+            timestamp: Kill time (optional)
+
+        Returns:
+            int: Number of aggregate documents upserted or modified
+        """
+        return await cls.record_kills(server_id, [{
+            "killer_id": killer_id,
+            "killer_name": killer_name,
+            "weapon": weapon,
+            "distance": distance,
+            "timestamp": timestamp,
+        }])
+
+    @classmethod
+    async def record_kills(cls, server_id: str, kills: List[Dict[str, Any]], db=None) -> int:
+        """Record many kills in the weapon aggregates
+
+        Kills are folded in memory per player and written, together with the
+        server totals, in a single unordered bulk upsert. Suicides are skipped.
+
+        Args:
+            server_id: Server ID
+            kills: Kill dicts with killer_id, weapon, distance and optionally
+                killer_name, timestamp and is_suicide
+            db: Database to write to (defaults to get_db())
+
+        Returns:
+            int: Number of aggregate documents upserted or modified
+        """
+        def new_entry():
+            return {
+                "kills": 0,
+                "distance_sum": 0.0,
+                "distance_max": 0.0,
+                "histogram": {},
+                "weapons": {},
+                "last_kill": None,
+                "name": None,
+            }
+
+        server_entry = new_entry()
+        players = {}
+
+        for kill in kills:
+            killer_id = kill.get("killer_id")
+            if not killer_id or kill.get("is_suicide") or killer_id == kill.get("victim_id"):
+                continue
+
+            weapon = kill.get("weapon") or "Unknown"
+            distance = _to_distance(kill.get("distance"))
+            timestamp = kill.get("timestamp")
+
+            player_entry = players.setdefault(killer_id, new_entry())
+            if kill.get("killer_name"):
+                player_entry["name"] = kill["killer_name"]
+
+            cls._add_kill(server_entry, weapon, distance, timestamp)
+            cls._add_kill(player_entry, weapon, distance, timestamp)
+
+        if not players:
+            return 0
+
+        operations = [cls._build_update(server_id, None, server_entry)]
+        for player_id, entry in players.items():
+            operations.append(cls._build_update(server_id, player_id, entry))
+
+        if db is None:
+            db = await get_db()
+        result = await db.weapon_stats.bulk_write(operations, ordered=False)
+
+        return result.upserted_count + result.modified_count
+
+    @classmethod
+    async def backfill(cls, db, batch_size: int = 5000) -> int:
+        """Build the weapon aggregates from the kills collection
+
+        Progress is checkpointed in the migrations collection, so the
+        backfill runs to completion once, resuming after a restart, and is
+        a no-op afterwards. Kills ingested after it started are counted by
+        the live paths only.
+
+        Args:
+            db: Motor database
+            batch_size: Number of kills replayed per checkpoint
+
+        Returns:
+            int: Number of kills replayed
+        """
+        from utils.kill_backfill import run_kill_backfill
+
+        async def replay(server_id: str, kills: List[Dict[str, Any]]):
+            await cls.record_kills(server_id, kills, db=db)
+
+        return await run_kill_backfill(
+            db, "weapon_stats", replay,
+            projection={"killer_id": 1, "killer_name": 1, "victim_id": 1, "weapon": 1,
+                        "distance": 1, "timestamp": 1, "is_suicide": 1},
+            query={"is_suicide": {"$ne": True}},
+            target="weapon_stats",
+            batch_size=batch_size
+        )
+
+    @classmethod
+    async def get_for_server(cls, server_id: str) -> Optional['WeaponStats']:
+        """Get server-wide weapon statistics
+
+        Args:
+            server_id: Server ID
+
+        Returns:
+            WeaponStats or None if no kills were recorded
+        """
+        db = await get_db()
+        data = await db.weapon_stats.find_one({"server_id": server_id, "player_id": None})
+        return cls(data) if data else None
+
+    @classmethod
+    async def get_for_player(cls, server_id: str, player_id: str) -> Optional['WeaponStats']:
+        """Get weapon statistics for a player
+
+        Args:
+            server_id: Server ID
+            player_id: Player ID
+
+        Returns:
+            WeaponStats or None if the player has no recorded kills
+        """
+        db = await get_db()
+        data = await db.weapon_stats.find_one({"server_id": server_id, "player_id": player_id})
+        return cls(data) if data else None
+
+    @classmethod
+    async def get_top_users(cls, server_id: str, weapon: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get the players with the most kills using a weapon
+
+        Args:
+            server_id: Server ID
+            weapon: Weapon name
+            limit: Maximum number of players to return
+
+        Returns:
+            List of dicts with player_id, name, kills and max_distance
+        """
+        db = await get_db()
+        field = f"weapons.{weapon_key(weapon)}"
+        cursor = db.weapon_stats.find(
+            {"server_id": server_id, "player_id": {"$ne": None}, f"{field}.kills": {"$gt": 0}},
+            {"player_id": 1, "player_name": 1, field: 1}
+        ).sort(f"{field}.kills", -1).limit(limit)
+
+        users = []
+        async for data in cursor:
+            entry = data.get("weapons", {}).get(weapon_key(weapon), {})
+            users.append({
+                "player_id": data.get("player_id"),
+                "name": data.get("player_name") or "Unknown",
+                "kills": entry.get("kills", 0),
+                "max_distance": entry.get("distance_max", 0),
+            })
+
+        return users
+
+    @classmethod
+    async def count_users(cls, server_id: str, weapon: str) -> int:
+        """Count the players with at least one kill using a weapon
+
+        Args:
+            server_id: Server ID
+            weapon: Weapon name
+
+        Returns:
+            int: Number of players
+        """
+        db = await get_db()
+        return await db.weapon_stats.count_documents({
+            "server_id": server_id,
+            "player_id": {"$ne": None},
+            f"weapons.{weapon_key(weapon)}.kills": {"$gt": 0}
+        })
@@ -62,6 +62,10 @@ async def run_historical_parse():
         files_processed, events_processed = await csv_processor.run_historical_parse(server_id, days=60)
         
         logger.info(f"Historical parse complete. Processed {files_processed} files and {events_processed} events.")
+
+        from utils.deathlog_mirror import get_deathlog_mirror
+        mirror_stats = get_deathlog_mirror().get_stats()
+        logger.info(f"Deathlog mirror: {mirror_stats['hits']} files read locally, {mirror_stats['stored']} files mirrored")
         return True
     except Exception as e:
         logger.error(f"Error running historical parse: {str(e)}")
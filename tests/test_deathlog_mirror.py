@@ -0,0 +1,40 @@
+"""
+The deathlog mirror only keeps files inside its retention period
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+from utils.deathlog_mirror import DeathlogMirror
+
+
+def _remote_path(days_ago):
+    day = datetime.utcnow() - timedelta(days=days_ago)
+    return f"/deathlogs/world_0/{day.strftime('%Y.%m.%d')}-00.00.00.csv"
+
+
+def test_storing_a_file_prunes_expired_days(tmp_path):
+    async def run():
+        old_path, recent_path, new_path = _remote_path(20), _remote_path(5), _remote_path(0)
+
+        # Written while the retention period was longer
+        await DeathlogMirror(str(tmp_path)).store_file("s1", old_path, b"old\n")
+
+        mirror = DeathlogMirror(str(tmp_path), retention_days=10)
+        assert await mirror.store_file("s1", recent_path, b"recent\n")
+        assert not await mirror.store_file("s1", _remote_path(30), b"expired\n")
+        assert await mirror.store_file("s1", new_path, b"new\n")
+
+        assert not mirror.has_file("s1", old_path)
+        assert await mirror.read_file("s1", recent_path) == b"recent\n"
+        assert mirror.stats["days_pruned"] == 1
+
+        server_dir = tmp_path / "s1"
+        with open(server_dir / "index.json", encoding="utf-8") as f:
+            assert len(json.load(f)["days"]) == 2
+        assert sorted(os.listdir(server_dir)) == sorted(
+            [f"{os.path.basename(path)[:10]}.pack" for path in (recent_path, new_path)] + ["index.json"]
+        )
+
+    asyncio.run(run())
@@ -0,0 +1,36 @@
+"""
+Economy accounts are per player and server
+"""
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from models.economy import Economy
+
+
+def test_kill_credits_for_one_player_on_two_servers():
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["killfeed"]
+        # Index left by releases that allowed one account per player
+        await db.economy.create_index("player_id", unique=True)
+        await db.economy.insert_one({"player_id": "p1", "server_id": "s1", "balance": 50})
+
+        assert await Economy.migrate_account_index(db)
+
+        first = await Economy.apply_credits(db, "s1", [{"player_id": "p1", "amount": 10, "source": "kill_reward"}])
+        second = await Economy.apply_credits(db, "s2", [{"player_id": "p1", "amount": 15, "source": "kill_reward"},
+                                                        {"player_id": "p1", "amount": 5, "source": "killstreak"}])
+
+        assert first == {"p1": 60}
+        assert second == {"p1": 20}
+        accounts = {document["server_id"]: document["balance"] async for document in db.economy.find({"player_id": "p1"})}
+        assert accounts == {"s1": 60, "s2": 20}
+        assert await db.economy_transactions.count_documents({"player_id": "p1"}) == 3
+
+        # A debit never opens an account
+        assert await Economy.apply_credits(db, "s3", [{"player_id": "p1", "amount": -5, "source": "suicide_penalty"}]) == {}
+        assert await db.economy.count_documents({"player_id": "p1"}) == 2
+
+    asyncio.run(run())
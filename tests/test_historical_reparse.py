@@ -0,0 +1,90 @@
+"""
+Re-running a historical parse must leave the kill aggregates unchanged
+"""
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from cogs.csv_processor import record_kill_aggregates, reset_server_stats
+from utils.direct_csv_handler import direct_parse_csv_file
+
+SERVER_ID = "test-server"
+
+DEATHLOG = """\
+2025.05.09-11.58.37;Alpha;1001;Bravo;1002;AK47;120;PC
+2025.05.09-12.03.10;Alpha;1001;Charlie;1003;M4;45;PC
+2025.05.09-12.15.44;Bravo;1002;Alpha;1001;Pistol;8;PC
+2025.05.09-13.01.02;Charlie;1003;Charlie;1003;Grenade;0;PC
+2025.05.09-13.20.19;Alpha;1001;Bravo;1002;AK47;310;PC
+"""
+
+# Fields that record when a document was written rather than what it counts
+VOLATILE_FIELDS = {"_id", "created_at", "updated_at"}
+
+
+class _Database:
+    """Mock database that also resolves db.collections["name"] sub-collections like motor"""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        if name == "collections":
+            return _SubCollections(self._db)
+        return getattr(self._db, name)
+
+    def __getitem__(self, name):
+        return self._db[name]
+
+
+class _SubCollections:
+    def __init__(self, db):
+        self._db = db
+
+    def __getitem__(self, name):
+        return self._db[f"collections.{name}"]
+
+
+async def _snapshot(db):
+    """Get the server's aggregates without write timestamps"""
+    snapshot = {}
+    for name in ("weapon_stats", "activity_rollups", "rivalries"):
+        documents = await db[name].find({"server_id": SERVER_ID}).to_list(length=None)
+        snapshot[name] = sorted(
+            (repr(sorted((key, value) for key, value in document.items() if key not in VOLATILE_FIELDS))
+             for document in documents)
+        )
+    return snapshot
+
+
+async def _historical_parse(db, file_path):
+    """Reset the server and add the file's kills as a historical parse does"""
+    await reset_server_stats(db, SERVER_ID)
+    events = direct_parse_csv_file(str(file_path), SERVER_ID)
+    kill_docs = [event for event in events if not event["is_suicide"]]
+    await db.kills.insert_many([dict(kill) for kill in kill_docs])
+    await record_kill_aggregates(db, SERVER_ID, kill_docs)
+    return kill_docs
+
+
+def test_reparsing_the_same_file_keeps_aggregates(tmp_path):
+    file_path = tmp_path / "2025.05.09-00.00.00.csv"
+    file_path.write_text(DEATHLOG)
+
+    async def run():
+        db = _Database(mongomock_motor.AsyncMongoMockClient()["killfeed"])
+        await db["collections.factions"].insert_one({"server_id": SERVER_ID, "member_ids": ["1001", "1002"]})
+
+        kill_docs = await _historical_parse(db, file_path)
+        first = await _snapshot(db)
+        await _historical_parse(db, file_path)
+        second = await _snapshot(db)
+
+        assert len(kill_docs) == 4
+        assert first["weapon_stats"] and first["activity_rollups"] and first["rivalries"]
+        assert second == first
+        assert await db.kills.count_documents({"server_id": SERVER_ID}) == len(kill_docs)
+
+    asyncio.run(run())
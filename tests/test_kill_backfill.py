@@ -0,0 +1,74 @@
+"""
+Kill aggregate backfills resume after an interruption and run only once
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from models.weapon_stats import WeaponStats
+
+
+def _kills(count):
+    start = datetime(2025, 5, 1)
+    return [{
+        "server_id": "s1" if i % 2 else "s2",
+        "killer_id": f"k{i % 3}",
+        "killer_name": f"Killer {i % 3}",
+        "victim_id": f"v{i % 4}",
+        "weapon": "AK47" if i % 2 else "M4",
+        "distance": 10 * i,
+        "timestamp": start + timedelta(minutes=i),
+        "is_suicide": False,
+    } for i in range(count)]
+
+
+async def _server_kills(db):
+    documents = await db.weapon_stats.find({"player_id": None}).to_list(length=None)
+    return {document["server_id"]: document["kills"] for document in documents}
+
+
+def test_interrupted_backfill_resumes_without_double_counting():
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["killfeed"]
+        await db.kills.insert_many(_kills(25))
+
+        original = WeaponStats.record_kills
+        calls = 0
+
+        async def crash_after_first_batch(server_id, kills, db=None):
+            nonlocal calls
+            calls += 1
+            if calls > 2:  # both servers of the first batch were replayed
+                raise RuntimeError("restart")
+            return await original(server_id, kills, db=db)
+
+        WeaponStats.record_kills = crash_after_first_batch
+        try:
+            with pytest.raises(RuntimeError):
+                await WeaponStats.backfill(db, batch_size=10)
+        finally:
+            WeaponStats.record_kills = original
+
+        # Kills ingested after the backfill started are left to the live paths
+        await db.kills.insert_many(_kills(5))
+
+        assert await WeaponStats.backfill(db, batch_size=10) == 15
+        assert await _server_kills(db) == {"s1": 12, "s2": 13}
+        assert await WeaponStats.backfill(db, batch_size=10) == 0
+
+    asyncio.run(run())
+
+
+def test_existing_aggregates_are_not_replayed():
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["killfeed"]
+        await db.kills.insert_many(_kills(4))
+        await db.weapon_stats.insert_one({"server_id": "s1", "player_id": None, "kills": 2})
+
+        assert await WeaponStats.backfill(db) == 0
+        assert await db.migrations.find_one({"_id": "weapon_stats", "completed_at": {"$ne": None}})
+
+    asyncio.run(run())
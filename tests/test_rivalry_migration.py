@@ -0,0 +1,71 @@
+"""
+Legacy rivalry documents merge into one document per pair, once
+"""
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from models.rivalry import Rivalry
+
+SERVER_ID = "s1"
+
+
+def _rivalry(player1_id, player2_id, player1_kills, player2_kills):
+    return {
+        "server_id": SERVER_ID,
+        "player1_id": player1_id,
+        "player2_id": player2_id,
+        "player1_name": f"Player {player1_id}",
+        "player2_name": f"Player {player2_id}",
+        "player1_kills": player1_kills,
+        "player2_kills": player2_kills,
+    }
+
+
+async def _pairs(db):
+    documents = await db.rivalries.find({}).to_list(length=None)
+    return sorted((d["player1_id"], d["player2_id"], d["player1_kills"], d["player2_kills"]) for d in documents)
+
+
+def test_legacy_and_duplicate_pairs_are_merged():
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["killfeed"]
+        await db.rivalries.insert_many([
+            _rivalry("a", "b", 3, 1),
+            _rivalry("b", "a", 2, 5),  # reversed
+            _rivalry("a", "b", 1, 1),  # same-order duplicate
+            _rivalry("d", "c", 4, 0),  # reversed, only document of its pair
+        ])
+        await db["collections.rivalries"].insert_one(_rivalry("b", "a", 1, 0))
+
+        assert await Rivalry.migrate_canonical_pairs(db) == 4
+        assert await _pairs(db) == [("a", "b", 9, 5), ("c", "d", 0, 4)]
+        assert await db["collections.rivalries"].count_documents({}) == 0
+        assert await db.rivalries.count_documents({"merged_from": {"$exists": True}}) == 0
+        assert await Rivalry.migrate_canonical_pairs(db) == 0
+
+    asyncio.run(run())
+
+
+def test_restart_between_merge_and_delete_counts_kills_once(monkeypatch):
+    async def run():
+        db = mongomock_motor.AsyncMongoMockClient()["killfeed"]
+        await db.rivalries.insert_one(_rivalry("a", "b", 3, 1))
+        await db.rivalries.insert_one(_rivalry("b", "a", 2, 5))
+
+        collection_class = type(db.rivalries)
+
+        async def crash(*args, **kwargs):
+            raise RuntimeError("restart")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(collection_class, "delete_one", crash)
+            with pytest.raises(RuntimeError):
+                await Rivalry.migrate_canonical_pairs(db)
+
+        assert await Rivalry.migrate_canonical_pairs(db) == 1
+        assert await _pairs(db) == [("a", "b", 8, 3)]
+
+    asyncio.run(run())
@@ -6,478 +6,270 @@ This module monitors player kill patterns and places automatic bounties on:
 2. Players with target fixation (repeatedly killing the same player)
 
 Auto-bounties encourage dynamic PvP gameplay by placing rewards on dominant players.
+
+Kills are fed to the AutoBountyDetector as they are ingested. It keeps a
+ring buffer of recent kills per killer and per-(killer, victim) counts for
+each server, so both patterns are checked in constant time per kill and a
+bounty is placed seconds after the kill that triggers it.
 """
 import logging
 import asyncio
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable, Deque
 
 logger = logging.getLogger(__name__)
 
-class AutoBountySystem:
-    """Automated bounty placement system based on player behavior patterns"""
-    
-    # Bounty source identifier
-    SOURCE_AUTO = "auto"
-    
-    # Reason templates for auto-bounties
-    REASON_KILLSTREAK = "AI Bounty: On a {streak_count} kill streak!"
-    REASON_TARGET_FIXATION = "AI Bounty: Hunting {victim_name} ({kill_count} kills)"
-    
-    @staticmethod
-    async def check_kill_patterns(
-        db, 
-        guild_id: str,
-        server_id: str,
-        minutes: int = 5,
-        kill_threshold: int = 5,
-        repeat_threshold: int = 3
-    ) -> List[Dict[str, Any]]:
-        """Check for kill patterns that warrant auto-bounties
-        
+# How often the detector re-reads a guild's auto-bounty settings (seconds)
+SETTINGS_REFRESH_INTERVAL = 300
+
+# Kills older than this are not evaluated (backlog and historical replays)
+MAX_KILL_AGE = timedelta(hours=12)
+
+# Kills between sweeps that drop idle killers from a server's windows
+SWEEP_INTERVAL_KILLS = 500
+
+# Auto-bounty settings used when a guild has not configured them
+DEFAULT_AUTO_BOUNTY_SETTINGS = {
+    "kill_threshold": 5,
+    "repeat_threshold": 3,
+    "time_window": 10,
+    "reward_amount": 100,
+}
+
+# Called with (guild_id, server_id, player_id, player_name, reason, reward, bounty_type)
+BountyHandler = Callable[[str, str, str, str, str, int, str], Awaitable[Any]]
+
+
+class ServerKillWindow:
+    """Sliding window of one server's recent kills"""
+
+    def __init__(self):
+        """Initialize kill window"""
+        # killer_id -> ring buffer of (timestamp, victim_id)
+        self.kills: Dict[str, Deque[Tuple[float, str]]] = {}
+        # (killer_id, victim_id) -> kills in the window
+        self.pairs: Dict[Tuple[str, str], int] = {}
+        # killer_id -> monotonic time until which no new bounty is placed
+        self.cooldowns: Dict[str, float] = {}
+        self.kills_since_sweep = 0
+
+    def _evict(self, killer_id: str, cutoff: float):
+        """Drop a killer's kills that fell out of the window
+
         Args:
-            db: Database connection
-            guild_id: Guild ID
-            server_id: Server ID
-            minutes: Time window in minutes to check
-            kill_threshold: Minimum kills needed for killstreak bounty
-            repeat_threshold: Minimum kills on same victim for target fixation bounty
-            
+            killer_id: Killer ID
+            cutoff: Oldest timestamp still in the window
+        """
+        ring = self.kills.get(killer_id)
+        while ring and ring[0][0] < cutoff:
+            _, victim_id = ring.popleft()
+            pair = (killer_id, victim_id)
+            count = self.pairs.get(pair, 0) - 1
+            if count > 0:
+                self.pairs[pair] = count
+            else:
+                self.pairs.pop(pair, None)
+        if ring is not None and not ring:
+            del self.kills[killer_id]
+
+    def add(self, killer_id: str, victim_id: str, timestamp: float, window: float) -> Tuple[int, int]:
+        """Add a kill and count the killer's kills in the window
+
+        Args:
+            killer_id: Killer ID
+            victim_id: Victim ID
+            timestamp: Kill time (seconds)
+            window: Window length (seconds)
+
         Returns:
-            List of generated bounty data
+            Tuple of (kills by the killer, kills by the killer on this victim)
         """
-        try:
-            # Define the time window
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(minutes=minutes)
-            
-            # Get recent kills within time window
-            cursor = db.kills.find({
-                "server_id": server_id,
-                "guild_id": guild_id,
-                "timestamp": {"$gte": start_time, "$lte": end_time},
-                "is_suicide": {"$ne": True}  # Exclude suicides
-            })
-            
-            # Group kills by killer
-            killer_stats = {}
-            async for kill in cursor:
-                killer_id = kill["killer_id"]
-                victim_id = kill["victim_id"]
-                
-                # Initialize killer stats if exists is None
-                if killer_id is not None not in killer_stats:
-                    killer_stats[killer_id] = {
-                        "kills": 0,
-                        "victims": {},
-                        "killer_name": kill["killer_name"]
-                    }
-                
-                # Update total kills
-                killer_stats[killer_id]["kills"] += 1
-                
-                # Update victim-specific kills
-                if victim_id is not None not in killer_stats[killer_id]["victims"]:
-                    killer_stats[killer_id]["victims"][victim_id] = {
-                        "count": 0,
-                        "name": kill["victim_name"]
-                    }
-                killer_stats[killer_id]["victims"][victim_id]["count"] += 1
-            
-            # Check for killstreaks and target fixation
-            bounties_to_create = []
-            
-            for killer_id, stats in killer_stats.items():
-                # Check for killstreak
-                if stats["kills"] >= kill_threshold:
-                    # Create killstreak bounty data
-                    bounty_data = {
-                        "guild_id": guild_id,
-                        "server_id": server_id,
-                        "target_id": killer_id,
-                        "target_name": stats["killer_name"],
-                        "reason": AutoBountySystem.REASON_KILLSTREAK.format(streak_count=stats["kills"]),
-                        "source": AutoBountySystem.SOURCE_AUTO,
-                        "bounty_type": "killstreak",
-                        "metadata": {
-                            "kill_count": stats["kills"],
-                            "detected_at": datetime.utcnow().isoformat()
-                        }
-                    }
-                    bounties_to_create.append(bounty_data)
-                
-                # Check for target fixation
-                for victim_id, victim_data in stats["victims"].items():
-                    if victim_data["count"] >= repeat_threshold:
-                        bounty_data = {
-                            "guild_id": guild_id,
-                            "server_id": server_id,
-                            "target_id": killer_id,
-                            "target_name": stats["killer_name"],
-                            "reason": AutoBountySystem.REASON_TARGET_FIXATION.format(
-                                victim_name=victim_data["name"],
-                                kill_count=victim_data["count"]
-                            ),
-                            "source": AutoBountySystem.SOURCE_AUTO,
-                            "bounty_type": "target_fixation",
-                            "metadata": {
-                                "victim_id": victim_id,
-                                "victim_name": victim_data["name"],
-                                "kill_count": victim_data["count"],
-                                "detected_at": datetime.utcnow().isoformat()
-                            }
-                        }
-                        bounties_to_create.append(bounty_data)
-            
-            return bounties_to_create
-            
-        except Exception as e:
-            logger.error(f"Error checking kill patterns: {e}")
-            return []
-    
-    @staticmethod
-    async def send_bounty_notification(bot, guild_id: str, server_id: str, bounty_id: str, bounty_data: Dict[str, Any]):
-        """Send a notification about a new auto-bounty to the guild's notification channel
-        
+        self._evict(killer_id, timestamp - window)
+
+        self.kills.setdefault(killer_id, deque()).append((timestamp, victim_id))
+        pair = (killer_id, victim_id)
+        self.pairs[pair] = self.pairs.get(pair, 0) + 1
+
+        self.kills_since_sweep += 1
+        if self.kills_since_sweep >= SWEEP_INTERVAL_KILLS:
+            self.kills_since_sweep = 0
+            for other_id in list(self.kills):
+                self._evict(other_id, timestamp - window)
+            now = time.monotonic()
+            self.cooldowns = {k: until for k, until in self.cooldowns.items() if until > now}
+
+        return len(self.kills[killer_id]), self.pairs[pair]
+
+
+class AutoBountyDetector:
+    """Streaming killstreak and target fixation detection"""
+
+    def __init__(self):
+        """Initialize auto-bounty detector"""
+        self._windows: Dict[str, ServerKillWindow] = {}
+        # server_id -> (checked_at, guild_id, settings or None when disabled)
+        self._settings: Dict[str, Tuple[float, Optional[str], Optional[Dict[str, Any]]]] = {}
+        self._handler: Optional[BountyHandler] = None
+        self._tasks = set()
+
+        self.stats = {
+            "kills_seen": 0,
+            "bounties_triggered": 0,
+            "stale_kills": 0,
+        }
+
+    def set_handler(self, handler: Optional[BountyHandler]):
+        """Set the coroutine that places triggered bounties
+
         Args:
-            bot: Discord bot instance
-            guild_id: Guild ID
-            server_id: Server ID
-            bounty_id: Bounty ID for reference
-            bounty_data: Bounty data for notification
+            handler: Bounty handler or None to stop placing bounties
         """
-        try:
-            # Get the guild by ID
-            guild = bot.get_guild(int(guild_id))
-            if guild is None:
-                logger.warning(f"Guild {guild_id} not found for bounty notification")
-                return
-            
-            # Get the guild model for theme and notification settings
-            guild_model = None
-            try:
-                guild_data = await bot.db.guilds.find_one({"guild_id": guild_id})
-                if guild_data is not None:
-                    from models.guild import Guild
-                    # Use create_from_db_document to ensure proper conversion of premium_tier
-            guild_model = Guild.create_from_db_document(guild_data, bot.db)
-            except Exception as e:
-                logger.warning(f"Failed to load guild model: {e}")
-            
-            # Check if notifications is not None are enabled
-            if guild_model is not None and not guild_model.check_feature_access("bounty_notifications"):
-                return
-            
-            # Get notification channel
-            notification_channel = None
-            if guild_model is not None and guild_model.notification_channel_id:
-                notification_channel = guild.get_channel(int(guild_model.notification_channel_id))
-            
-            # If no notification channel set, try to find a bounty or hunt channel
-            if notification_channel is None:
-                for channel in guild.text_channels:
-                    if channel.permissions_for(guild.me).send_messages:
-                        channel_name = channel.name.lower()
-                        if 'bounty' in channel_name or 'hunt' in channel_name or 'target' in channel_name:
-                            notification_channel = channel
-                            break
-            
-            # If still no channel, use the first channel we can send to
-            if notification_channel is None:
-                for channel in guild.text_channels:
-                    if channel.permissions_for(guild.me).send_messages:
-                        notification_channel = channel
-                        break
-            
-            if notification_channel is None:
-                logger.warning(f"No suitable notification channel found in guild {guild_id}")
-                return
-            
-            # Create the notification embed
-            target_name = bounty_data.get("target_name", "Unknown Player")
-            reason = bounty_data.get("reason", "AI Bounty")
-            reward = bounty_data.get("reward", 100)
-            
-            # Get server name
-            server_name = "Unknown Server"
-            try:
-                server_data = await bot.db.game_servers.find_one({"server_id": server_id})
-                if server_data is not None:
-                    server_name = server_data.get("server_name", server_id)
-            except Exception as e:
-                logger.warning(f"Failed to get server name: {e}")
-            
-            # Create the embed
-            from utils.embed_builder import EmbedBuilder
-            embed = EmbedBuilder.create_base_embed(
-                f"🤖 New AI Bounty: {target_name}",
-                f"The AI Bounty System has placed a bounty on **{target_name}**!",
-                guild=guild_model
-            )
-            
-            # Add reason field
-            embed.add_field(
-                name="Reason",
-                value=reason,
-                inline=False
-            )
-            
-            # Add reward field
-            embed.add_field(
-                name="Reward",
-                value=f"💰 {reward} credits",
-                inline=True
-            )
-            
-            # Add server field
-            embed.add_field(
-                name="Server",
-                value=server_name,
-                inline=True
-            )
-            
-            # Add instructions
-            embed.add_field(
-                name="How to Claim",
-                value="Kill this player to claim the bounty automatically. Bounty expires in 1 hour.",
-                inline=False
-            )
-            
-            # Add footer with ID for reference
-            embed.set_footer(text=f"Bounty ID: {bounty_id}")
-            
-            # Send the notification
-            await notification_channel.send(embed=embed)
-            logger.info(f"Sent auto-bounty notification to {notification_channel.name} in {guild.name}")
-            
-        except Exception as e:
-            logger.error(f"Error sending bounty notification: {e}", exc_info=True)
-    
-    @staticmethod
-    async def process_auto_bounties(
-        bot,
-        guild_id: str,
-        server_id: str,
-        active_bounty_limit: int = 1,  # Changed from 5 to 1
-        minutes: int = 5,
-        kill_threshold: int = 5,
-        repeat_threshold: int = 3,
-        expiration_hours: int = 1,
-        reward_amount: int = 100
-    ) -> Tuple[int, int]:
-        """Process auto-bounties for a server
-        
+        self._handler = handler
+
+    def invalidate_guild(self, guild_id: str):
+        """Make the detector re-read a guild's settings on its next kill
+
+        Args:
+            guild_id: Discord guild ID
+        """
+        guild_id = str(guild_id)
+        for server_id in [s for s, (_, g, _) in self._settings.items() if g == guild_id]:
+            del self._settings[server_id]
+
+    async def _get_settings(self, server_id: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Get the auto-bounty settings that apply to a server
+
         Args:
-            bot: Discord bot instance with db access
-            guild_id: Guild ID
             server_id: Server ID
-            active_bounty_limit: Maximum number of active auto-bounties per server
-            minutes: Time window in minutes to check
-            kill_threshold: Minimum kills needed for killstreak bounty
-            repeat_threshold: Minimum kills on same victim for target fixation bounty
-            expiration_hours: Hours until auto-bounty expires
-            reward_amount: Reward amount for auto-bounties
-            
+
         Returns:
-            Tuple of (created_count, skipped_count)
+            Tuple of (guild_id, settings), settings being None when auto-bounties are off
         """
+        cached = self._settings.get(server_id)
+        if cached is not None and time.monotonic() - cached[0] < SETTINGS_REFRESH_INTERVAL:
+            return cached[1], cached[2]
+
+        guild_id = None
+        settings = None
         try:
-            from models.bounty import Bounty
-            db = bot.db
-            
-            # Get current active auto-bounties
-            active_auto_bounties = await db.bounties.count_documents({
-                "guild_id": guild_id,
-                "server_id": server_id,
-                "source": AutoBountySystem.SOURCE_AUTO,
-                "status": "active"
-            })
-            
-            # If we're at the limit, skip processing
-            if active_auto_bounties >= active_bounty_limit:
-                logger.info(f"Active auto-bounty limit reached for server {server_id} ({active_auto_bounties}/{active_bounty_limit})")
-                return 0, 0
-            
-            # Calculate how many bounties we can add
-            bounty_slots_available = active_bounty_limit - active_auto_bounties
-            
-            # Check for new auto-bounties
-            bounty_candidates = await AutoBountySystem.check_kill_patterns(
-                db, guild_id, server_id, minutes, kill_threshold, repeat_threshold
-            )
-            
-            # Sort by killstreak first (prioritize higher threats)
-            bounty_candidates.sort(
-                key=lambda x: x.get("metadata", {}).get("kill_count", 0), 
-                reverse=True
+            from utils.database import get_db
+            db = await get_db()
+            guild_data = await db.guilds.find_one(
+                {"servers.server_id": server_id},
+                {"guild_id": 1, "premium_tier": 1, "auto_bounty": 1, "auto_bounty_settings": 1}
             )
-            
-            # Get existing active bounty targets
-            existing_targets = set()
-            cursor = db.bounties.find({
-                "guild_id": guild_id,
-                "server_id": server_id,
-                "status": "active"
-            })
-            async for bounty in cursor:
-                existing_targets.add(bounty["target_id"])
-            
-            # Prepare to create bounties
-            bounties_to_create = []
-            skipped_count = 0
-            
-            for candidate in bounty_candidates:
-                # Skip if target is not None already has an active bounty
-                if candidate["target_id"] in existing_targets:
-                    skipped_count += 1
-                    continue
-                
-                # Add to creation list and update tracking
-                bounties_to_create.append(candidate)
-                existing_targets.add(candidate["target_id"])
-                
-                # Stop if we've reached the bounty limit
-                if len(bounties_to_create) >= bounty_slots_available:
-                    break
-            
-            # Create bounties
-            created_count = 0
-            for bounty_data in bounties_to_create:
+            if guild_data:
+                guild_id = str(guild_data.get("guild_id"))
                 try:
-                    # Set reward amount and expiration
-                    expires_at = datetime.utcnow() + timedelta(hours=expiration_hours)
-                    
-                    # Get scaled reward based on kill count
-                    kill_count = bounty_data.get("metadata", {}).get("kill_count", 0)
-                    scaled_reward = reward_amount
-                    if kill_count > 10:
-                        scaled_reward = int(reward_amount * 1.5)  # 50% bonus for high killstreaks
-                    elif kill_count > 15:
-                        scaled_reward = reward_amount * 2  # Double reward for extreme killstreaks
-                    
-                    # Create the bounty
-                    bounty = await Bounty.create(
-                        db,
-                        guild_id=bounty_data["guild_id"],
-                        server_id=bounty_data["server_id"],
-                        target_id=bounty_data["target_id"],
-                        target_name=bounty_data["target_name"],
-                        placed_by=None,  # System-placed bounty
-                        placed_by_name="AI Bounty System",
-                        reason=bounty_data["reason"],
-                        reward=scaled_reward,
-                        expires_at=expires_at,
-                        source=AutoBountySystem.SOURCE_AUTO,
-                        metadata=bounty_data.get("metadata", {})
-                    )
-                    
-                    if bounty is not None:
-                        created_count += 1
-                        logger.info(f"Created auto-bounty on {bounty_data['target_name']} ({bounty_data['target_id']}) for {scaled_reward} credits")
-                        
-                        # Send notification for the new bounty
-                        await AutoBountySystem.send_bounty_notification(
-                            bot,
-                            guild_id=bounty_data["guild_id"],
-                            server_id=bounty_data["server_id"],
-                            bounty_id=str(bounty.id),
-                            bounty_data={
-                                "target_name": bounty_data["target_name"],
-                                "reason": bounty_data["reason"],
-                                "reward": scaled_reward
-                            }
-                        )
-                    
-                except Exception as e:
-                    logger.error(f"Error creating auto-bounty: {e}")
-            
-            return created_count, skipped_count
-            
+                    premium_tier = int(guild_data.get("premium_tier", 0) or 0)
+                except (TypeError, ValueError):
+                    premium_tier = 0
+                # Auto-bounty requires premium tier 2+
+                if guild_data.get("auto_bounty", False) and premium_tier >= 2:
+                    settings = {**DEFAULT_AUTO_BOUNTY_SETTINGS, **(guild_data.get("auto_bounty_settings") or {})}
         except Exception as e:
-            logger.error(f"Error processing auto-bounties: {e}")
-            return 0, 0
-    
-    @staticmethod
-    async def run_auto_bounty_system(bot):
-        """Background task to run auto-bounty system for all eligible servers
-        
+            logger.warning(f"Could not load auto-bounty settings for server {server_id}: {e}")
+            if cached is not None:
+                return cached[1], cached[2]
+
+        self._settings[server_id] = (time.monotonic(), guild_id, settings)
+        return guild_id, settings
+
+    async def record_kills(self, server_id: str, kills: List[Dict[str, Any]]) -> int:
+        """Feed ingested kills to the detector
+
         Args:
-            bot: Discord bot instance
+            server_id: Server ID
+            kills: Kill dicts with killer_id, killer_name, victim_id,
+                victim_name, timestamp and optionally is_suicide
+
+        Returns:
+            int: Number of bounties triggered
         """
-        try:
-            # Get all guilds with premium features
-            premium_guilds = await bot.db.guilds.find({
-                "premium_tier": {"$gte": 2}  # Tier 2 or higher
-            }).to_list(None)
-            
-            total_created = 0
-            total_skipped = 0
-            
-            for guild_data in premium_guilds:
-                guild_id = guild_data["guild_id"]
-                
-                # Check if auto-bounty feature is enabled for this guild
-                if guild_data is None.get("features", {}).get("auto_bounty", False):
-                    continue
-                
-                # Get settings
-                settings = guild_data.get("auto_bounty_settings", {})
-                minutes = settings.get("minutes", 5)
-                kill_threshold = settings.get("kill_threshold", 5)
-                repeat_threshold = settings.get("repeat_threshold", 3)
-                active_bounty_limit = settings.get("active_bounty_limit", 5)
-                expiration_hours = settings.get("expiration_hours", 1)
-                reward_amount = settings.get("reward_amount", 100)
-                
-                # Get all servers for this guild
-                servers = await bot.db.game_servers.find({
-                    "guild_id": guild_id,
-                    "active": True
-                }).to_list(None)
-                
-                for server in servers:
-                    server_id = server["server_id"]
-                    
-                    # Process auto-bounties for this server (passing bot instance for notifications)
-                    created, skipped = await AutoBountySystem.process_auto_bounties(
-                        bot,  # Pass the full bot instance for Discord notifications
-                        guild_id,
-                        server_id,
-                        active_bounty_limit,
-                        minutes,
-                        kill_threshold,
-                        repeat_threshold,
-                        expiration_hours,
-                        reward_amount
-                    )
-                    
-                    total_created += created
-                    total_skipped += skipped
-            
-            logger.info(f"Auto-bounty system run complete: {total_created} bounties created, {total_skipped} skipped")
-            
-        except Exception as e:
-            logger.error(f"Error running auto-bounty system: {e}", exc_info=True)
-    
-    @staticmethod
-    async def start_auto_bounty_task(bot, interval_minutes: int = 45):
-        """Start the auto-bounty background task
-        
-        Args:
-            bot: Discord bot instance
-            interval_minutes: Base interval time for auto-bounty system in minutes
+        if not kills or self._handler is None:
+            return 0
+
+        server_id = str(server_id)
+        guild_id, settings = await self._get_settings(server_id)
+        if not settings:
+            return 0
+
+        window = float(settings["time_window"]) * 60
+        kill_threshold = settings["kill_threshold"]
+        repeat_threshold = settings["repeat_threshold"]
+        kill_window = self._windows.setdefault(server_id, ServerKillWindow())
+        oldest = datetime.utcnow() - MAX_KILL_AGE
+
+        triggered = 0
+        for kill in kills:
+            killer_id = kill.get("killer_id")
+            victim_id = kill.get("victim_id")
+            if not killer_id or not victim_id or kill.get("is_suicide") or killer_id == victim_id:
+                continue
+
+            timestamp = kill.get("timestamp")
+            if not isinstance(timestamp, datetime):
+                timestamp = datetime.utcnow()
+            elif timestamp < oldest:
+                self.stats["stale_kills"] += 1
+                continue
+
+            self.stats["kills_seen"] += 1
+            killstreak, fixation = kill_window.add(killer_id, victim_id, timestamp.timestamp(), window)
+
+            if kill_window.cooldowns.get(killer_id, 0) > time.monotonic():
+                continue
+
+            if killstreak >= kill_threshold:
+                reason = f"Killstreak of {killstreak} in {settings['time_window']} minutes"
+                bounty_type = "killstreak"
+            elif fixation >= repeat_threshold:
+                reason = f"Target fixation on {kill.get('victim_name', 'Unknown')} ({fixation} kills)"
+                bounty_type = "fixation"
+            else:
+                continue
+
+            kill_window.cooldowns[killer_id] = time.monotonic() + window
+            triggered += 1
+            self.stats["bounties_triggered"] += 1
+
+            task = asyncio.create_task(self._handler(
+                guild_id, server_id, killer_id, kill.get("killer_name", "Unknown"),
+                reason, settings["reward_amount"], bounty_type
+            ))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        return triggered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector metrics
+
+        Returns:
+            Dict with counters and the number of killers tracked
         """
-        import random
-        
-        while True:
-            try:
-                await AutoBountySystem.run_auto_bounty_system(bot)
-            except Exception as e:
-                logger.error(f"Error in auto-bounty task: {e}")
-            
-            # Create a random interval between 30-60 minutes
-            random_interval = random.randint(30, 60)
-            logger.info(f"Auto-bounty system scheduled to run next in {random_interval} minutes")
-            
-            # Wait for next interval
-            await asyncio.sleep(random_interval * 60)
\ No newline at end of file
+        return {
+            **self.stats,
+            "servers": len(self._windows),
+            "killers_tracked": sum(len(w.kills) for w in self._windows.values()),
+        }
+
+
+# Global detector instance
+_auto_bounty_detector = None
+
+
+def get_auto_bounty_detector() -> AutoBountyDetector:
+    """Get the global auto-bounty detector
+
+    Returns:
+        AutoBountyDetector: Auto-bounty detector instance
+    """
+    global _auto_bounty_detector
+
+    if _auto_bounty_detector is None:
+        _auto_bounty_detector = AutoBountyDetector()
+
+    return _auto_bounty_detector
@@ -11,6 +11,7 @@ import discord
 from discord import app_commands
 
 from utils.server_utils import standardize_server_id
+from utils.name_index import get_player_index, search_names
 
 logger = logging.getLogger(__name__)
 
@@ -50,12 +51,14 @@ async def server_id_autocomplete(interaction: discord.Interaction, current: str)
         if std_sid:  # Only add if standardization succeeded
             standardized_options.append((std_sid, name))
     
-    # Filter by current input
+    # Rank by current input, matching either the server name or its ID
     if current:
-        standardized_options = [
-            (sid, name) for sid, name in standardized_options
-            if current.lower() in sid.lower() or current.lower() in name.lower()
-        ]
+        names = dict(standardized_options)
+        matches = search_names(current, names)
+        matched_ids = {sid for sid, _ in matches}
+        matches += [(sid, names[sid]) for sid, _ in search_names(current, {sid: sid for sid in names})
+                    if sid not in matched_ids]
+        standardized_options = matches
     
     # Return as choices (limited to 25 as per Discord API limits)
     return [
@@ -64,6 +67,67 @@ async def server_id_autocomplete(interaction: discord.Interaction, current: str)
     ]
 
 
+async def player_name_autocomplete(interaction: discord.Interaction, current: str):
+    """
+    Autocomplete for player names on the server picked in the server_id option
+    
+    Args:
+        interaction: Discord interaction
+        current: Current input value
+        
+    Returns:
+        List of discord.app_commands.Choice options
+    """
+    try:
+        # Get user's guild ID and the server ID from the command options
+        guild_id = interaction.guild_id
+
+        if not guild_id:
+            return [app_commands.Choice(name="Must use in a server", value="")]
+
+        # Try to get the server_id from the interaction
+        server_id = None
+        try:
+            for option in interaction.data.get("options", []):
+                if option.get("name") == "server_id":
+                    raw_id = option.get("value")
+                    server_id = str(raw_id) if raw_id else None
+                    logger.debug(f"player_name_autocomplete converting server_id from {type(raw_id).__name__} to string: {server_id}")
+                    break
+
+                # Check in subcommands
+                for suboption in option.get("options", []):
+                    if suboption.get("name") == "server_id":
+                        raw_id = suboption.get("value")
+                        server_id = str(raw_id) if raw_id else None
+                        logger.debug(f"player_name_autocomplete (subcommand) converting server_id from {type(raw_id).__name__} to string: {server_id}")
+                        break
+        except Exception as e:
+            logger.error(f"Error extracting server_id from interaction: {e}")
+            server_id = None
+
+        if not server_id or server_id == "":
+            return [app_commands.Choice(name="Select a server first", value="")]
+
+        # Search the server's name index
+        index = await get_player_index(server_id)
+        if index is None:
+            return [app_commands.Choice(name="Loading players, try again", value="")]
+
+        if len(index) == 0:
+            return [app_commands.Choice(name="No players found", value="")]
+
+        # The name is the label; commands receive the player ID
+        return [
+            app_commands.Choice(name=name, value=str(player_id))
+            for player_id, name in index.search(current, limit=25)
+        ]
+
+    except Exception as e:
+        logger.error(f"Error in player autocomplete: {e}", exc_info=True)
+        return [app_commands.Choice(name="Error loading players", value="")]
+
+
 async def get_server_selection(interaction: discord.Interaction, guild_id: str, db):
     """
     Get server selection options for the given guild
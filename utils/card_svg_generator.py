@@ -13,6 +13,16 @@ logger = logging.getLogger(__name__)
 # Cache for card SVGs
 card_svg_cache: Dict[str, str] = {}
 
+# Cache for card data URLs
+card_data_url_cache: Dict[str, str] = {}
+
+# Template files read once (path -> contents)
+_template_files: Dict[str, str] = {}
+
+# Card values and suits of a full deck
+CARD_VALUES = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+CARD_SUITS = ["HEARTS", "DIAMONDS", "CLUBS", "SPADES"]
+
 def get_template_path() -> str:
     """Get the full path for the card template SVG"""
     current_dir = Path(__file__).parent
@@ -27,25 +37,26 @@ def get_card_back_path() -> str:
     back_path = root_dir / "static" / "icons" / "cards" / "card_back.svg"
     return str(back_path)
 
-def load_template() -> str:
-    """Load the card template SVG"""
-    template_path = get_template_path()
+def _read_template_file(path: str, description: str) -> str:
+    """Read a template file, once per process"""
+    if path in _template_files:
+        return _template_files[path]
     try:
-        with open(template_path, 'r') as file:
-            return file.read()
+        with open(path, 'r') as file:
+            content = file.read()
     except Exception as e:
-        logger.error(f"Error loading card template: {e}")
+        logger.error(f"Error loading {description}: {e}")
         return ""
+    _template_files[path] = content
+    return content
+
+def load_template() -> str:
+    """Load the card template SVG"""
+    return _read_template_file(get_template_path(), "card template")
 
 def load_card_back() -> str:
     """Load the card back SVG"""
-    back_path = get_card_back_path()
-    try:
-        with open(back_path, 'r') as file:
-            return file.read()
-    except Exception as e:
-        logger.error(f"Error loading card back: {e}")
-        return ""
+    return _read_template_file(get_card_back_path(), "card back")
 
 def get_suit_symbol(suit: str) -> str:
     """Get the symbol for a card suit"""
@@ -117,7 +128,7 @@ def generate_card_svg(value: str, suit: str) -> str:
         return card_svg_cache[cache_key]
     
     template = load_template()
-    if template is None:
+    if not template:
         logger.error("Failed to load card template")
         return ""
     
@@ -146,35 +157,52 @@ def get_card_back_svg() -> str:
     
     # Load from file
     svg = load_card_back()
-    if svg is not None:
+    if svg:
         card_svg_cache[cache_key] = svg
     
     return svg
 
+def _to_data_url(svg: str) -> str:
+    """Encode SVG content as a base64 data URL"""
+    svg_base64 = base64.b64encode(svg.encode('utf-8')).decode('utf-8')
+    return f"data:image/svg+xml;base64,{svg_base64}"
+
 def get_card_svg_as_data_url(value: str, suit: str) -> str:
     """Convert card SVG to a data URL for use in embeds"""
+    cache_key = f"{value}_{suit}"
+    if cache_key in card_data_url_cache:
+        return card_data_url_cache[cache_key]
+    
     svg = generate_card_svg(value, suit)
-    if svg is None:
+    if not svg:
         return ""
     
-    # Encode the SVG content to base64
-    svg_base64 = base64.b64encode(svg.encode('utf-8')).decode('utf-8')
-    
-    # Create a data URL
-    data_url = f"data:image/svg+xml;base64,{svg_base64}"
-    
+    data_url = _to_data_url(svg)
+    card_data_url_cache[cache_key] = data_url
     return data_url
 
 def get_card_back_as_data_url() -> str:
     """Convert card back SVG to a data URL for use in embeds"""
+    cache_key = "CARD_BACK"
+    if cache_key in card_data_url_cache:
+        return card_data_url_cache[cache_key]
+    
     svg = get_card_back_svg()
-    if svg is None:
+    if not svg:
         return ""
     
-    # Encode the SVG content to base64
-    svg_base64 = base64.b64encode(svg.encode('utf-8')).decode('utf-8')
-    
-    # Create a data URL
-    data_url = f"data:image/svg+xml;base64,{svg_base64}"
+    data_url = _to_data_url(svg)
+    card_data_url_cache[cache_key] = data_url
+    return data_url
+
+def precompute_cards() -> int:
+    """Render all 52 card faces and the card back with their data URLs
     
-    return data_url
\ No newline at end of file
+    Returns:
+        int: Number of card images cached
+    """
+    for suit in CARD_SUITS:
+        for value in CARD_VALUES:
+            get_card_svg_as_data_url(value, suit)
+    get_card_back_as_data_url()
+    return len(card_data_url_cache)
\ No newline at end of file
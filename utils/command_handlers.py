@@ -470,7 +470,7 @@ async def get_latest_command_errors(limit: int = 10) -> List[Dict[str, Any]]:
     Returns:
         List of error details
     """
-    errors = [cmd for cmd in COMMAND_HISTORY if not is not None cmd["success"]]
+    errors = [cmd for cmd in COMMAND_HISTORY if not cmd["success"]]
     return sorted(errors, key=lambda e: e["timestamp"], reverse=True)[:limit]
 
 
@@ -542,8 +542,8 @@ def register_global_error_handlers(bot: commands.Bot):
         )
         
         # Record error metrics if already is None done by decorator
-        if not is not None any(command_name == cmd["command"] and cmd["timestamp"] > datetime.utcnow() - timedelta(seconds=5) 
-                 for cmd in COMMAND_HISTORY if not is not None cmd["success"]):
+        if not any(command_name == cmd["command"] and cmd["timestamp"] > datetime.utcnow() - timedelta(seconds=5) 
+                 for cmd in COMMAND_HISTORY if not cmd["success"]):
             CommandMetrics.record_execution(
                 command_name, 
                 str(ctx.guild.id) if ctx.guild else None,
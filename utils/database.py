@@ -11,6 +11,10 @@ import motor.motor_asyncio
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from utils.query_profiler import get_query_profiler
+from utils.index_advisor import TTL_INDEXES, RIVALRY_PAIR_INDEX, RIVALRY_PAIR_INDEX_OPTIONS
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +89,7 @@ class DatabaseManager:
         self._connection_attempts = 0
         self._max_connection_attempts = 5
         self._reconnection_delay = 1  # Starting delay in seconds
+        self._backfill_task = None
     
     async def connect(self) -> bool:
         """Connect to MongoDB database
@@ -100,7 +105,8 @@ class DatabaseManager:
             self._client = motor.motor_asyncio.AsyncIOMotorClient(
                 self.connection_string,
                 serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000
+                connectTimeoutMS=5000,
+                event_listeners=[get_query_profiler()]
             )
             
             # Test connection
@@ -137,6 +143,9 @@ class DatabaseManager:
     
     async def disconnect(self):
         """Disconnect from MongoDB database"""
+        if self._backfill_task is not None and not self._backfill_task.done():
+            # An interrupted backfill resumes from its checkpoint on the next start
+            self._backfill_task.cancel()
         if self._client:
             self._client.close()
             self._client = None
@@ -209,9 +218,15 @@ class DatabaseManager:
         await self._db.player_links.create_index([("player_id", 1), ("status", 1)])
         await self._db.player_links.create_index([("discord_id", 1), ("status", 1)])
         
-        # Economy indexes
-        await self._db.economy.create_index("player_id", unique=True)
+        # Economy indexes (one account per player and server)
+        from models.economy import Economy
+        await Economy.migrate_account_index(self._db)
         await self._db.economy.create_index("discord_id")
+
+        # Economy transaction indexes (append-only ledger)
+        await self._db.economy_transactions.create_index([("player_id", 1), ("server_id", 1), ("timestamp", -1), ("_id", -1)])
+        await self._db.economy_transactions.create_index([("server_id", 1), ("source", 1)])
+        await Economy.migrate_transactions(self._db)
         
         # Bounty indexes
         await self._db.bounties.create_index("bounty_id", unique=True)
@@ -226,13 +241,88 @@ class DatabaseManager:
         await self._db.kills.create_index([("server_id", 1), ("timestamp", -1)])
         await self._db.kills.create_index([("killer_id", 1), ("timestamp", -1)])
         await self._db.kills.create_index([("victim_id", 1), ("timestamp", -1)])
-        
+        # The guild index served the auto-bounty kill scan, which was replaced by
+        # detection at ingestion; nothing reads kills by guild, so drop it
+        if "server_id_1_guild_id_1_timestamp_-1" in await self._db.kills.index_information():
+            await self._db.kills.drop_index("server_id_1_guild_id_1_timestamp_-1")
+        await self._db.kills.create_index([("server_id", 1), ("killer_id", 1), ("timestamp", -1)])
+
+        # Rivalry indexes (one document per canonical player pair)
+        from models.rivalry import Rivalry
+        await Rivalry.migrate_canonical_pairs(self._db)
+        await self._create_rivalry_pair_index()
+        await self._db.rivalries.create_index([("server_id", 1), ("player2_id", 1)])
+        await Rivalry.backfill_metrics(self._db)
+        await self._db.rivalries.create_index([("server_id", 1), ("total_kills", -1), ("last_kill_time", -1)])
+        await self._db.rivalries.create_index([("server_id", 1), ("intensity_score", -1), ("total_kills", -1)])
+        await self._db.rivalries.create_index([("server_id", 1), ("kill_difference", 1), ("total_kills", -1)])
+        await self._db.rivalries.create_index([("server_id", 1), ("last_kill_time", -1), ("total_kills", -1)])
+
+        # Faction indexes (aggregate stats are one document per faction)
+        await self._db["collections.factions"].create_index([("server_id", 1), ("member_ids", 1)])
+        await self._db["collections.faction_stats"].create_index("faction_id", unique=True)
+
+        # Weapon statistics indexes (one document per server and per player)
+        await self._db.weapon_stats.create_index([("server_id", 1), ("player_id", 1)], unique=True)
+
+        # Activity rollup indexes (hourly and daily buckets per server)
+        await self._db.activity_rollups.create_index(
+            [("server_id", 1), ("granularity", 1), ("bucket", 1)],
+            unique=True
+        )
+        await self._db.activity_rollups.create_index([("granularity", 1), ("bucket", 1)])
+
+        # Aggregates are built from existing kills without holding up startup
+        if self._backfill_task is None or self._backfill_task.done():
+            self._backfill_task = asyncio.create_task(self._run_backfills(), name="kill_backfills")
+
+        # Event indexes (raw event collections expire via TTL)
+        await self._db.connections.create_index([("server_id", 1), ("timestamp", -1)])
+        await self._db.connections.create_index([("server_id", 1), ("player_id", 1), ("timestamp", -1)])
+        await self._db.events.create_index([("server_id", 1), ("event_type", 1), ("timestamp", -1)])
+        await self._db.game_events.create_index([("server_id", 1), ("event_type", 1), ("timestamp", -1)])
+        await self._db.missions.create_index([("server_id", 1), ("timestamp", -1)])
+        for collection_name, (field, days) in TTL_INDEXES.items():
+            await self._db[collection_name].create_index(field, expireAfterSeconds=days * 86400)
+
         # Historical data indexes
         await self._db.historical_data.create_index([("server_id", 1), ("date", -1)])
         await self._db.historical_data.create_index([("server_id", 1), ("player_id", 1), ("date", -1)])
         
         logger.info("Created indexes for all collections")
         
+    async def _create_rivalry_pair_index(self):
+        """Create the unique rivalry pair index, replacing a plain index on the same key"""
+        try:
+            try:
+                await self._db.rivalries.create_index(RIVALRY_PAIR_INDEX, **RIVALRY_PAIR_INDEX_OPTIONS)
+            except OperationFailure as e:
+                if e.code not in (85, 86):  # IndexOptionsConflict, IndexKeySpecsConflict
+                    raise
+                # Older releases built this key as a plain index; replace it
+                await self._db.rivalries.drop_index(RIVALRY_PAIR_INDEX)
+                await self._db.rivalries.create_index(RIVALRY_PAIR_INDEX, **RIVALRY_PAIR_INDEX_OPTIONS)
+        except DuplicateKeyError as e:
+            # migrate_canonical_pairs merges duplicates, so this means they were
+            # written concurrently; the next start merges them and retries
+            logger.error(
+                "Rivalries still contain duplicate player pairs, the unique pair index "
+                f"was not created and will be retried on the next start: {e.details or e}"
+            )
+
+    async def _run_backfills(self):
+        """Build the kill aggregates from existing kills (resumable, see utils.kill_backfill)"""
+        from models.weapon_stats import WeaponStats
+        from models.activity_rollup import ActivityRollup
+        try:
+            await WeaponStats.backfill(self._db)
+            if await ActivityRollup.backfill(self._db):
+                await ActivityRollup.compact(self._db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error backfilling kill aggregates (resumes on next start): {e}", exc_info=True)
+
     async def initialize(self):
         """Initialize database connection and create indexes"""
         await self.connect()
@@ -0,0 +1,391 @@
+"""
+Compressed local mirror of remote deathlog CSV files
+
+Once the game server rotates to a new CSV file the old one no longer
+changes. Completed files are stored here compressed (zstd when the
+zstandard package is installed, gzip otherwise) so historical parses and
+re-parses read them from local disk instead of downloading them again.
+
+Files are kept per server in one pack per day, <server_id>/<day>.pack, with
+each file compressed as its own member. <server_id>/index.json maps every
+day to the byte range, codec and remote size and mtime of each mirrored
+file, so a single file is read with one seek. Day packs older than the
+retention period are removed whenever a file is stored.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Root directory of the mirror
+MIRROR_DIR = "deathlog_mirror"
+
+# Date prefix of deathlog file names (YYYY.MM.DD-HH.MM.SS.csv)
+FILE_DAY_PATTERN = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})-")
+
+# Days of files kept; matches the longest historical parse window
+RETENTION_DAYS = 90
+
+# Codec used for new files
+DEFAULT_CODEC = "zstd" if zstandard is not None else "gzip"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    """Compress file contents
+
+    Args:
+        data: File contents
+        codec: "zstd" or "gzip"
+
+    Returns:
+        bytes: Compressed contents
+    """
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """Decompress a stored file
+
+    Args:
+        data: Compressed contents
+        codec: Codec the contents were compressed with
+
+    Returns:
+        bytes: File contents
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def get_file_day(remote_path: str, mtime: Optional[float] = None) -> str:
+    """Get the day a deathlog file belongs to
+
+    Args:
+        remote_path: Remote file path
+        mtime: Remote modification time, used when the name has no date
+
+    Returns:
+        str: Day as YYYY.MM.DD
+    """
+    match = FILE_DAY_PATTERN.search(os.path.basename(remote_path))
+    if match:
+        return ".".join(match.groups())
+    timestamp = datetime.utcfromtimestamp(mtime) if mtime else datetime.utcnow()
+    return timestamp.strftime("%Y.%m.%d")
+
+
+def get_completed_files(file_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Get the CSV files that the server has rotated away from
+
+    The newest CSV file of each directory may still be written to; every
+    older one is complete.
+
+    Args:
+        file_stats: Dict mapping remote path to file information, as
+            returned by SFTPClient.stat_directory()
+
+    Returns:
+        Dict with the entries of completed files
+    """
+    newest: Dict[str, str] = {}
+    for path, info in file_stats.items():
+        if info.get("is_file", True) and path.endswith(".csv"):
+            directory = os.path.dirname(path)
+            if directory not in newest or os.path.basename(path) > os.path.basename(newest[directory]):
+                newest[directory] = path
+
+    latest = set(newest.values())
+    return {
+        path: info for path, info in file_stats.items()
+        if path.endswith(".csv") and info.get("is_file", True) and path not in latest
+    }
+
+
+class DeathlogMirror:
+    """On-disk store of completed deathlog files"""
+
+    def __init__(self, root: str = MIRROR_DIR, retention_days: Optional[int] = RETENTION_DAYS):
+        """Initialize deathlog mirror
+
+        Args:
+            root: Root directory of the mirror
+            retention_days: Days of files kept (None keeps everything)
+        """
+        self.root = root
+        self.retention_days = retention_days
+        # Loaded indexes by server ID: {"days": {day: {remote_path: entry}}}
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "bytes_stored": 0,
+            "bytes_read": 0,
+            "days_pruned": 0,
+            "errors": 0,
+        }
+
+    def _server_dir(self, server_id: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^\w.-]", "_", str(server_id)))
+
+    def _lock(self, server_id: str) -> asyncio.Lock:
+        lock = self._locks.get(server_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[server_id] = lock
+        return lock
+
+    def _load_index(self, server_id: str) -> Dict[str, Any]:
+        """Get a server's index, reading it from disk on first use
+
+        Args:
+            server_id: Server ID
+
+        Returns:
+            Dict: Server index
+        """
+        index = self._indexes.get(server_id)
+        if index is None:
+            path = os.path.join(self._server_dir(server_id), "index.json")
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except FileNotFoundError:
+                index = {"days": {}}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read deathlog mirror index for server {server_id}: {e}")
+                index = {"days": {}}
+            self._indexes[server_id] = index
+        return index
+
+    def _save_index(self, server_id: str, index: Dict[str, Any]):
+        """Write a server's index atomically
+
+        Args:
+            server_id: Server ID
+            index: Server index
+        """
+        path = os.path.join(self._server_dir(server_id), "index.json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(temp_path, path)
+
+    def get_entry(self, server_id: str, remote_path: str,
+                  size: Optional[int] = None, mtime: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get the index entry of a mirrored file
+
+        Args:
+            server_id: Server ID
+            remote_path: Remote file path
+            size: Current remote size; entries of a different size are ignored
+            mtime: Current remote mtime; entries with a different mtime are ignored
+
+        Returns:
+            Dict with day, offset, length, codec, size and mtime, or None
+        """
+        server_id = str(server_id)
+        index = self._load_index(server_id)
+        for entries in index["days"].values():
+            entry = entries.get(remote_path)
+            if entry is None:
+                continue
+            if size is not None and entry.get("size") != size:
+                return None
+            if mtime is not None and entry.get("mtime") != mtime:
+                return None
+            return entry
+        return None
+
+    def has_file(self, server_id: str, remote_path: str,
+                 size: Optional[int] = None, mtime: Optional[float] = None) -> bool:
+        """Check if a file is mirrored
+
+        Args:
+            server_id: Server ID
+            remote_path: Remote file path
+            size: Current remote size (optional)
+            mtime: Current remote mtime (optional)
+
+        Returns:
+            bool: True if the mirrored copy can be used
+        """
+        return self.get_entry(server_id, remote_path, size, mtime) is not None
+
+    def _read(self, server_id: str, entry: Dict[str, Any]) -> bytes:
+        pack_path = os.path.join(self._server_dir(server_id), f"{entry['day']}.pack")
+        with open(pack_path, "rb") as f:
+            f.seek(entry["offset"])
+            compressed = f.read(entry["length"])
+        return _decompress(compressed, entry["codec"])
+
+    async def read_file(self, server_id: str, remote_path: str,
+                        size: Optional[int] = None, mtime: Optional[float] = None) -> Optional[bytes]:
+        """Read a mirrored file
+
+        Args:
+            server_id: Server ID
+            remote_path: Remote file path
+            size: Current remote size (optional)
+            mtime: Current remote mtime (optional)
+
+        Returns:
+            bytes: File contents or None if the file is not mirrored
+        """
+        server_id = str(server_id)
+        entry = self.get_entry(server_id, remote_path, size, mtime)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        try:
+            content = await asyncio.to_thread(self._read, server_id, entry)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Could not read {remote_path} from deathlog mirror: {e}")
+            return None
+
+        self.stats["hits"] += 1
+        self.stats["bytes_read"] += len(content)
+        return content
+
+    def _first_kept_day(self) -> Optional[str]:
+        """Get the oldest day inside the retention period
+
+        Returns:
+            str: Day as YYYY.MM.DD, or None if files are kept forever
+        """
+        if self.retention_days is None:
+            return None
+        return (datetime.utcnow() - timedelta(days=self.retention_days)).strftime("%Y.%m.%d")
+
+    def _remove_packs(self, server_id: str, days: List[str]):
+        server_dir = self._server_dir(server_id)
+        for day in days:
+            try:
+                os.remove(os.path.join(server_dir, f"{day}.pack"))
+            except FileNotFoundError:
+                pass
+
+    def _append(self, server_id: str, day: str, compressed: bytes) -> int:
+        server_dir = self._server_dir(server_id)
+        os.makedirs(server_dir, exist_ok=True)
+        with open(os.path.join(server_dir, f"{day}.pack"), "ab") as f:
+            offset = f.tell()
+            f.write(compressed)
+        return offset
+
+    async def store_file(self, server_id: str, remote_path: str, content: bytes,
+                         size: Optional[int] = None, mtime: Optional[float] = None) -> bool:
+        """Store a completed file
+
+        A file that is already mirrored with the same size and mtime is not
+        stored again. A changed file gets a new member in its day pack and
+        the index entry is moved to it.
+
+        Args:
+            server_id: Server ID
+            remote_path: Remote file path
+            content: File contents
+            size: Remote size (defaults to the content length)
+            mtime: Remote modification time
+
+        Returns:
+            bool: True if the file was stored
+        """
+        server_id = str(server_id)
+        size = len(content) if size is None else size
+
+        async with self._lock(server_id):
+            if self.has_file(server_id, remote_path, size, mtime):
+                return False
+
+            day = get_file_day(remote_path, mtime)
+            first_kept_day = self._first_kept_day()
+            if first_kept_day is not None and day < first_kept_day:
+                return False
+
+            try:
+                compressed = await asyncio.to_thread(_compress, content, DEFAULT_CODEC)
+                offset = await asyncio.to_thread(self._append, server_id, day, compressed)
+
+                index = self._load_index(server_id)
+                for entries in index["days"].values():
+                    entries.pop(remote_path, None)
+                index["days"].setdefault(day, {})[remote_path] = {
+                    "day": day,
+                    "offset": offset,
+                    "length": len(compressed),
+                    "codec": DEFAULT_CODEC,
+                    "size": size,
+                    "mtime": mtime,
+                }
+
+                # Expired days leave the index before their packs are removed
+                expired = [d for d in index["days"] if first_kept_day is not None and d < first_kept_day]
+                for expired_day in expired:
+                    del index["days"][expired_day]
+                await asyncio.to_thread(self._save_index, server_id, index)
+                if expired:
+                    await asyncio.to_thread(self._remove_packs, server_id, expired)
+                    self.stats["days_pruned"] += len(expired)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Could not store {remote_path} in deathlog mirror: {e}")
+                return False
+
+        self.stats["stored"] += 1
+        self.stats["bytes_stored"] += len(compressed)
+        logger.debug(f"Mirrored {remote_path} for server {server_id} ({size} -> {len(compressed)} bytes)")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get mirror metrics
+
+        Returns:
+            Dict with counters and the number of mirrored files per server
+        """
+        return {
+            **self.stats,
+            "codec": DEFAULT_CODEC,
+            "files": {
+                server_id: sum(len(entries) for entries in index["days"].values())
+                for server_id, index in self._indexes.items()
+            },
+        }
+
+
+# Global mirror instance
+_deathlog_mirror = None
+
+
+def get_deathlog_mirror() -> DeathlogMirror:
+    """Get the global deathlog mirror
+
+    Returns:
+        DeathlogMirror: Deathlog mirror instance
+    """
+    global _deathlog_mirror
+
+    if _deathlog_mirror is None:
+        _deathlog_mirror = DeathlogMirror()
+
+    return _deathlog_mirror
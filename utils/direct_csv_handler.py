@@ -15,6 +15,8 @@ import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple, Union, cast
 
+from utils.name_index import note_player
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -328,6 +330,7 @@ async def update_player_stats(db, server_id: str) -> int:
                 
                 if result.modified_count > 0:
                     updated_count += 1
+                note_player(server_id, player_id, stats['name'])
             else:
                 # Create new player
                 stats['created_at'] = datetime.now()
@@ -336,6 +339,7 @@ async def update_player_stats(db, server_id: str) -> int:
                 result = await db.players.insert_one(stats)
                 if result.inserted_id:
                     updated_count += 1
+                    note_player(server_id, player_id, stats.get('name'))
         
         logger.info(f"Updated {updated_count} players for server {server_id}")
         return updated_count
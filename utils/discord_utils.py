@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional, Union, Tuple
 from discord.ext import commands
 from discord import app_commands
 from utils.server_utils import standardize_server_id
+from utils.name_index import search_names
 
 logger = logging.getLogger(__name__)
 
@@ -92,12 +93,14 @@ async def server_id_autocomplete(interaction: discord.Interaction, current: str)
         if std_sid:  # Only add if standardization succeeded
             standardized_options.append((std_sid, name))
     
-    # Filter by current input
+    # Rank by current input, matching either the server name or its ID
     if current:
-        standardized_options = [
-            (sid, name) for sid, name in standardized_options
-            if current.lower() in sid.lower() or current.lower() in name.lower()
-        ]
+        names = dict(standardized_options)
+        matches = search_names(current, names)
+        matched_ids = {sid for sid, _ in matches}
+        matches += [(sid, names[sid]) for sid, _ in search_names(current, {sid: sid for sid in names})
+                    if sid not in matched_ids]
+        standardized_options = matches
     
     # Return as choices (limited to 25 as per Discord API limits)
     return [
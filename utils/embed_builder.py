@@ -1002,36 +1002,26 @@ class EmbedBuilder:
         Returns:
             discord.Embed: Kill feed embed
         """
-        # Determine color based on factions
+        # Filled in from the guild's compiled killfeed template
+        from utils.embed_templates import render_kill_embed
+
+        embed = render_kill_embed({
+            "killer_name": killer_name,
+            "victim_name": victim_name,
+            "weapon": weapon,
+            "distance": distance,
+            "killer_faction": killer_faction,
+            "victim_faction": victim_faction,
+            "timestamp": timestamp,
+        }, guild=guild)
+
+        # Faction colors take precedence over the guild theme
         if killer_faction is not None and killer_faction.lower() == "faction a":
-            color = cls.COLORS["faction_a"]
+            embed.color = cls.COLORS["faction_a"]
         elif killer_faction is not None and killer_faction.lower() == "faction b":
-            color = cls.COLORS["faction_b"]
-        else:
-            color = cls.COLORS["primary"]
-        
-        # Create title with kill info
-        title = f"{killer_name} ⚔️ {victim_name}"
-        
-        # Create description with weapon and distance
-        description = f"**Weapon:** {weapon}"
-        if distance is not None:
-            description += f"\n**Distance:** {distance:.1f}m"
-            
-        if killer_faction is not None and victim_faction:
-            description += f"\n**Factions:** {killer_faction} vs {victim_faction}"
-        
-        # Create embed
-        return await cls.create_embed(
-            title=title,
-            description=description,
-            color=color,
-            thumbnail_url=cls.ICONS["skull"],
-            footer_text="Kill Feed",
-            timestamp=timestamp or datetime.utcnow(),
-            guild=guild,
-            bot=bot
-        )
+            embed.color = cls.COLORS["faction_b"]
+
+        return embed
     
     @classmethod
     async def create_event_embed(cls,
@@ -1,8 +1,13 @@
 """Utility module for embedding icons in Discord embeds"""
 
 import os
+import time
+import logging
 import discord
-from typing import Dict, Optional, Any, Union
+from typing import Dict, Optional, Any, Union, Tuple
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
 
 # Define the mapping for event types to icon files
 EVENT_ICONS = {
@@ -28,6 +33,18 @@ DEFAULT_ICON = "attached_assets/output - 2025-04-19T181237.933.jpg"
 # Cache for Discord Files to avoid recreating them
 file_cache: Dict[str, discord.File] = {}
 
+# Uploaded icon URLs (icon_path -> (url, expires_at)) so icons are uploaded once
+icon_url_cache: Dict[str, Tuple[str, float]] = {}
+
+# Re-upload icons this many seconds before their CDN URL expires
+ICON_URL_REFRESH_MARGIN = 600
+
+# Assumed lifetime of attachment URLs that carry no expiry parameter (seconds)
+ICON_URL_DEFAULT_TTL = 12 * 3600
+
+# Channel icons are uploaded to ahead of use (None to upload with the first message)
+_asset_channel = None
+
 def get_event_icon(event_type: str) -> Optional[str]:
     """Get the icon file path for an event type
     
@@ -62,6 +79,113 @@ def create_discord_file(icon_path: str) -> Optional[discord.File]:
     file_cache[icon_path] = file
     return file
 
+def _attachment_expiry(url: str) -> float:
+    """Get the expiry time of a Discord CDN attachment URL
+
+    Signed attachment URLs carry their expiry as a hex timestamp in the
+    "ex" query parameter.
+
+    Args:
+        url: Attachment URL
+
+    Returns:
+        float: Expiry as a Unix timestamp
+    """
+    try:
+        expiry = parse_qs(urlparse(url).query).get("ex")
+        if expiry:
+            return float(int(expiry[0], 16))
+    except (ValueError, TypeError):
+        pass
+    return time.time() + ICON_URL_DEFAULT_TTL
+
+def get_cached_icon_url(icon_path: Optional[str]) -> Optional[str]:
+    """Get the uploaded URL for an icon if it is still valid
+
+    Args:
+        icon_path: Path to the icon file
+
+    Returns:
+        str: Attachment URL or None if the icon must be (re-)uploaded
+    """
+    cached = icon_url_cache.get(icon_path) if icon_path else None
+    if cached is None:
+        return None
+
+    url, expires_at = cached
+    if expires_at - ICON_URL_REFRESH_MARGIN <= time.time():
+        icon_url_cache.pop(icon_path, None)
+        return None
+    return url
+
+def remember_icon_url(icon_path: str, message: Optional[discord.Message], embed_index: Optional[int] = None) -> Optional[str]:
+    """Remember the uploaded URL of an icon sent with a message
+
+    Files an embed references through attachment:// are not listed in the
+    message's attachments; Discord resolves the embed's thumbnail to the
+    uploaded URL instead. A file sent on its own (e.g. to the asset channel)
+    is the message's first attachment.
+
+    Args:
+        icon_path: Path to the icon file
+        message: Message the icon was sent with
+        embed_index: Position of the embed whose thumbnail is the icon, or
+            None if the icon was sent as a plain attachment
+
+    Returns:
+        str: Uploaded URL or None if the message doesn't carry the icon
+    """
+    url = None
+    if embed_index is None:
+        attachments = getattr(message, "attachments", None) or []
+        if attachments:
+            url = attachments[0].url
+    else:
+        embeds = getattr(message, "embeds", None) or []
+        if embed_index < len(embeds):
+            embed = embeds[embed_index]
+            url = getattr(embed.thumbnail, "url", None) or getattr(embed.image, "url", None)
+
+    # An unresolved reference is not a reusable URL
+    if not url or url.startswith("attachment://"):
+        return None
+
+    icon_url_cache[icon_path] = (url, _attachment_expiry(url))
+    return url
+
+def set_icon_asset_channel(channel) -> None:
+    """Set the channel icons are uploaded to ahead of use
+
+    Args:
+        channel: Discord text channel or None to upload with the first message
+    """
+    global _asset_channel
+    _asset_channel = channel
+
+async def get_icon_url(icon_path: Optional[str]) -> Optional[str]:
+    """Get an uploaded URL for an icon, uploading it to the asset channel if needed
+
+    Args:
+        icon_path: Path to the icon file
+
+    Returns:
+        str: Attachment URL or None if the icon should be attached to the message
+    """
+    url = get_cached_icon_url(icon_path)
+    if url is not None or icon_path is None or _asset_channel is None:
+        return url
+
+    file = create_discord_file(icon_path)
+    if file is None:
+        return None
+
+    try:
+        message = await _asset_channel.send(file=file)
+        return remember_icon_url(icon_path, message)
+    except Exception as e:
+        logger.warning(f"Error uploading icon {icon_path} to asset channel: {e}")
+        return None
+
 def add_icon_to_embed(embed: discord.Embed, icon_path: Optional[str]) -> None:
     """Add an icon to an embed as a thumbnail
     
@@ -89,25 +213,33 @@ async def send_embed_with_icon(ctx_or_channel, embed: discord.Embed, icon_path:
         discord.Message: The sent message or None if failed
     """
     try:
-        # Create the file for the icon if a path is provided
+        # Reference an already uploaded icon when possible
         file = None
-        if icon_path is not None and os.path.exists(icon_path):
+        icon_url = await get_icon_url(icon_path)
+        if icon_url is not None:
+            embed.set_thumbnail(url=icon_url)
+        elif icon_path is not None and os.path.exists(icon_path):
+            # Create the file for the icon and add it to the embed
             file = create_discord_file(icon_path)
-            # Add the icon to the embed
             add_icon_to_embed(embed, icon_path)
         
         # Send the message with the file if available
+        message = None
         if hasattr(ctx_or_channel, 'send'):
             if file is not None:
-                return await ctx_or_channel.send(embed=embed, file=file, **kwargs)
+                message = await ctx_or_channel.send(embed=embed, file=file, **kwargs)
             else:
-                return await ctx_or_channel.send(embed=embed, **kwargs)
+                message = await ctx_or_channel.send(embed=embed, **kwargs)
         elif hasattr(ctx_or_channel, 'followup'):
             if file is not None:
-                return await ctx_or_channel.followup.send(embed=embed, file=file, **kwargs)
+                message = await ctx_or_channel.followup.send(embed=embed, file=file, **kwargs)
             else:
-                return await ctx_or_channel.followup.send(embed=embed, **kwargs)
-        return None
+                message = await ctx_or_channel.followup.send(embed=embed, **kwargs)
+
+        # Remember the uploaded icon so later messages can reuse it
+        if file is not None:
+            remember_icon_url(icon_path, message, 0)
+        return message
     except Exception as e:
         # Fall back to sending without the file if there's an error
         try:
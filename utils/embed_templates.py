@@ -0,0 +1,358 @@
+"""
+Precompiled embed templates for high-volume messages
+
+Killfeed, game event and connection messages share everything but a few
+values per event type and guild: color, footer, icon and static fields such
+as the server name. Every template is compiled by themed_template(), so all
+of them carry the guild's theme color and footer. Those parts are compiled into a template once and each
+message only copies the skeleton and fills in its own title, description
+and fields. Templates are keyed by guild, so Guild.update_theme() drops the
+guild's templates through invalidate_guild_templates().
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+import discord
+
+from utils.embed_builder import EmbedBuilder
+from utils.embed_icons import get_event_icon, KILLFEED_ICON, CONNECTIONS_ICON
+
+logger = logging.getLogger(__name__)
+
+# Discord embed limits
+MAX_TITLE_LENGTH = 256
+MAX_DESCRIPTION_LENGTH = 4096
+MAX_FIELD_NAME_LENGTH = 256
+MAX_FIELD_VALUE_LENGTH = 1024
+MAX_FIELDS = 25
+
+# Title, description and color of each game event type
+EVENT_STYLES = {
+    "mission": ("Level {mission_level} Mission Available", "A high-value mission is ready at **{location}**", discord.Color.orange()),
+    "airdrop": ("Air Drop Incoming", "An aircraft has been spotted flying overhead", discord.Color.blue()),
+    "helicrash": ("Helicopter Crash", "A helicopter has crashed somewhere on the map", discord.Color.red()),
+    "trader": ("Roaming Trader", "A trader has appeared on the map", discord.Color.green()),
+    "convoy": ("Convoy Event", "A convoy is moving through the area", discord.Color.purple()),
+}
+
+# Icon names used by get_event_icon() where they differ from the event type
+EVENT_ICON_NAMES = {
+    "helicrash": "crash",
+}
+
+
+def _truncate(value: Any, limit: int) -> str:
+    """Convert a value to a string within a Discord length limit
+
+    Args:
+        value: Value to convert
+        limit: Maximum length
+
+    Returns:
+        str: Truncated string
+    """
+    value = str(value)
+    return value if len(value) <= limit else value[:limit]
+
+
+def _theme_color(guild, default: int) -> int:
+    """Get a guild's primary theme color
+
+    Args:
+        guild: Guild model (or None)
+        default: Color used when the guild has no valid theme color
+
+    Returns:
+        int: Color value
+    """
+    color = getattr(guild, "color_primary", None)
+    if not color:
+        return default
+    try:
+        return int(str(color).lstrip("#"), 16)
+    except ValueError:
+        return default
+
+
+def _guild_key(guild) -> Optional[str]:
+    """Get the cache key for a guild model or Discord guild
+
+    Args:
+        guild: Guild model, discord.Guild or None
+
+    Returns:
+        str: Guild ID or None for guild-less templates
+    """
+    if guild is None:
+        return None
+    guild_id = getattr(guild, "guild_id", None) or getattr(guild, "id", None)
+    return str(guild_id) if guild_id is not None else None
+
+
+class EmbedTemplate:
+    """Compiled embed skeleton with static styling and fields"""
+
+    def __init__(self,
+                 color: Union[int, discord.Colour],
+                 footer_text: Optional[str] = None,
+                 footer_icon_url: Optional[str] = None,
+                 thumbnail_url: Optional[str] = None,
+                 static_fields: Optional[List[Dict[str, Any]]] = None):
+        """Compile an embed template
+
+        Args:
+            color: Embed color
+            footer_text: Footer text (optional)
+            footer_icon_url: Footer icon URL (optional)
+            thumbnail_url: Thumbnail URL (optional)
+            static_fields: Fields shared by every message (optional)
+        """
+        embed = discord.Embed(color=color)
+        if footer_text is not None:
+            embed.set_footer(text=_truncate(footer_text, 2048), icon_url=footer_icon_url)
+        if thumbnail_url is not None:
+            embed.set_thumbnail(url=thumbnail_url)
+
+        for field in (static_fields or [])[:MAX_FIELDS]:
+            embed.add_field(
+                name=_truncate(field["name"], MAX_FIELD_NAME_LENGTH),
+                value=_truncate(field["value"], MAX_FIELD_VALUE_LENGTH),
+                inline=field.get("inline", False)
+            )
+
+        self._skeleton = embed
+
+    def render(self,
+               title: Optional[str] = None,
+               description: Optional[str] = None,
+               fields: Optional[List[Tuple[str, Any, bool]]] = None,
+               color: Optional[Any] = None,
+               timestamp: Optional[datetime] = None) -> discord.Embed:
+        """Create a message embed from the template
+
+        Args:
+            title: Embed title (optional)
+            description: Embed description (optional)
+            fields: (name, value, inline) tuples appended after the static fields
+            color: Color overriding the template color (optional)
+            timestamp: Embed timestamp (optional)
+
+        Returns:
+            discord.Embed: Filled embed
+        """
+        embed = self._skeleton.copy()
+
+        if title is not None:
+            embed.title = _truncate(title, MAX_TITLE_LENGTH)
+        if description is not None:
+            embed.description = _truncate(description, MAX_DESCRIPTION_LENGTH)
+        if color is not None:
+            embed.color = color
+        if timestamp is not None:
+            embed.timestamp = timestamp
+
+        for name, value, inline in fields or ():
+            if len(embed.fields) >= MAX_FIELDS:
+                break
+            embed.add_field(
+                name=_truncate(name, MAX_FIELD_NAME_LENGTH),
+                value=_truncate(value, MAX_FIELD_VALUE_LENGTH),
+                inline=inline
+            )
+
+        return embed
+
+
+def themed_template(guild, default_color: Union[int, discord.Colour], footer_text: str,
+                    thumbnail_url: Optional[str] = None,
+                    static_fields: Optional[List[Dict[str, Any]]] = None) -> EmbedTemplate:
+    """Compile a template with the guild's theme color and footer
+
+    Args:
+        guild: Guild model for theming (or None)
+        default_color: Color used when the guild has no theme color
+        footer_text: Footer text, shown with the guild icon
+        thumbnail_url: Thumbnail URL (optional)
+        static_fields: Fields shared by every message (optional)
+
+    Returns:
+        EmbedTemplate: Compiled template
+    """
+    return EmbedTemplate(
+        color=_theme_color(guild, int(default_color)),
+        footer_text=footer_text,
+        footer_icon_url=getattr(guild, "icon_url", None),
+        thumbnail_url=thumbnail_url,
+        static_fields=static_fields
+    )
+
+
+# Compiled templates by (guild_id, template key)
+_templates: Dict[Tuple[Optional[str], Tuple], EmbedTemplate] = {}
+
+
+def get_template(guild, key: Tuple, factory) -> EmbedTemplate:
+    """Get a compiled template, compiling it on first use
+
+    Args:
+        guild: Guild model, discord.Guild or None
+        key: Template key within the guild (e.g. ("kill",))
+        factory: Callable returning a new EmbedTemplate for the guild
+
+    Returns:
+        EmbedTemplate: Compiled template
+    """
+    cache_key = (_guild_key(guild), key)
+    template = _templates.get(cache_key)
+    if template is None:
+        template = factory()
+        _templates[cache_key] = template
+    return template
+
+
+def invalidate_guild_templates(guild_id) -> int:
+    """Drop all compiled templates of a guild
+
+    Args:
+        guild_id: Discord guild ID
+
+    Returns:
+        int: Number of templates dropped
+    """
+    guild_id = str(guild_id)
+    stale = [key for key in _templates if key[0] == guild_id]
+    for key in stale:
+        del _templates[key]
+    if stale:
+        logger.debug(f"Dropped {len(stale)} embed templates for guild {guild_id}")
+    return len(stale)
+
+
+def render_kill_embed(kill_event: Dict[str, Any], guild=None) -> discord.Embed:
+    """Create a killfeed embed
+
+    Args:
+        kill_event: Kill event with killer_name, victim_name, weapon, distance,
+            is_suicide and timestamp
+        guild: Guild model for theming (optional)
+
+    Returns:
+        discord.Embed: Killfeed embed
+    """
+    template = get_template(guild, ("kill",), lambda: themed_template(
+        guild,
+        EmbedBuilder.COLORS["primary"],
+        "Kill Feed",
+        thumbnail_url=f"attachment://{KILLFEED_ICON.split('/')[-1]}"
+    ))
+
+    killer_name = kill_event.get("killer_name") or "Unknown"
+    victim_name = kill_event.get("victim_name") or "Unknown"
+    weapon = kill_event.get("weapon") or "Unknown"
+    distance = kill_event.get("distance")
+
+    if kill_event.get("is_suicide"):
+        title = f"💀 {victim_name}"
+        description = f"**Cause:** {weapon}"
+    else:
+        title = f"{killer_name} ⚔️ {victim_name}"
+        description = f"**Weapon:** {weapon}"
+        try:
+            if distance:
+                description += f"\n**Distance:** {float(distance):.1f}m"
+        except (TypeError, ValueError):
+            pass
+
+    killer_faction = kill_event.get("killer_faction")
+    victim_faction = kill_event.get("victim_faction")
+    if killer_faction and victim_faction:
+        description += f"\n**Factions:** {killer_faction} vs {victim_faction}"
+
+    timestamp = kill_event.get("timestamp")
+    return template.render(
+        title=title,
+        description=description,
+        timestamp=timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
+    )
+
+
+def render_event_embed(event_data: Dict[str, Any], server, guild=None) -> discord.Embed:
+    """Create a game event embed
+
+    Args:
+        event_data: Event data from the log parser
+        server: Server object
+        guild: Guild model for theming (optional)
+
+    Returns:
+        discord.Embed: Game event embed
+    """
+    event_type = event_data.get("event_type") or event_data.get("type") or "unknown"
+    style = EVENT_STYLES.get(event_type)
+    server_name = getattr(server, "server_name", None) or getattr(server, "server_id", "Unknown")
+
+    def compile_template():
+        icon_path = get_event_icon(EVENT_ICON_NAMES.get(event_type, event_type))
+        return themed_template(
+            guild,
+            style[2] if style else EmbedBuilder.COLORS["primary"],
+            "Game Events",
+            thumbnail_url=f"attachment://{icon_path.split('/')[-1]}" if icon_path else None,
+            static_fields=[{"name": "Server", "value": server_name, "inline": True}]
+        )
+
+    template = get_template(guild, ("event", event_type, getattr(server, "server_id", None), server_name), compile_template)
+
+    color = None
+    if style is None:
+        title = f"Game Event: {event_type.capitalize()}"
+        description = f"A {event_type} event has occurred"
+    elif event_type == "mission":
+        level = event_data.get("mission_level", 0)
+        title = style[0].format(mission_level=level)
+        description = style[1].format(location=event_data.get("location", "Unknown"))
+        if level == 4:
+            color = discord.Color.red()
+    elif event_type == "airdrop" and event_data.get("state", "Flying") != "Flying":
+        title = "Air Drop Dropping"
+        description = "Supplies are being dropped from the aircraft"
+    else:
+        title, description = style[0], style[1]
+
+    fields = [("Time", event_data.get("timestamp", "Unknown"), True)]
+    event_id = event_data.get("event_id")
+    if event_id is not None and event_type in ("helicrash", "trader", "convoy"):
+        fields.append(("ID", event_id, True))
+
+    return template.render(title=title, description=description, fields=fields, color=color)
+
+
+def render_connection_embed(connection_data: Dict[str, Any], guild=None) -> discord.Embed:
+    """Create a player connection embed
+
+    Args:
+        connection_data: Connection event with action, player_name, platform and timestamp
+        guild: Guild model for theming (optional)
+
+    Returns:
+        discord.Embed: Connection embed
+    """
+    connected = connection_data.get("action") == "connected"
+    template = get_template(guild, ("connection", connected), lambda: themed_template(
+        guild,
+        discord.Color.green() if connected else discord.Color.red(),
+        "Connections",
+        thumbnail_url=f"attachment://{CONNECTIONS_ICON.split('/')[-1]}"
+    ))
+
+    player_name = connection_data.get("player_name", "Unknown")
+    action = connection_data.get("action", "disconnected")
+    timestamp = connection_data.get("timestamp")
+
+    return template.render(
+        title="🟢 Player Connected" if connected else "🔴 Player Disconnected",
+        description=f"**{player_name}** has {action} to the server",
+        fields=[("Platform", connection_data.get("platform", "Unknown"), True)],
+        timestamp=timestamp if isinstance(timestamp, datetime) else None
+    )
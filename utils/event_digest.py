@@ -0,0 +1,338 @@
+"""
+Digest mode for high-volume event channels
+
+Servers can enable a digest window per channel type ("events" or
+"connections"). Events for that channel are buffered for the window and
+posted as one summary embed ("12 joined, 9 left") instead of one message
+each. High-priority events such as server restarts and level 4 missions
+skip the buffer and are posted immediately.
+
+Digest windows are stored on the server document as
+digest_settings = {"events": seconds, "connections": seconds}; 0 or a
+missing entry disables the digest for that channel type.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+import discord
+
+from utils.embed_icons import send_embed_with_icon, get_event_icon, CONNECTIONS_ICON, DEFAULT_ICON
+from utils.embed_templates import (
+    EmbedTemplate, get_template, render_event_embed, render_connection_embed,
+    EVENT_ICON_NAMES, MAX_FIELD_VALUE_LENGTH
+)
+
+logger = logging.getLogger(__name__)
+
+# Channel types that support digests
+DIGEST_CHANNEL_TYPES = ("events", "connections")
+
+# Longest allowed digest window (seconds)
+MAX_DIGEST_WINDOW = 600
+
+# Event types that are always posted immediately
+HIGH_PRIORITY_EVENTS = {"server_restart"}
+
+# Event types and how a digest line describes them (singular, plural)
+EVENT_LABELS = {
+    "mission": ("mission became available", "missions became available"),
+    "airdrop": ("airdrop", "airdrops"),
+    "helicrash": ("helicopter crash", "helicopter crashes"),
+    "trader": ("roaming trader appeared", "roaming traders appeared"),
+    "convoy": ("convoy", "convoys"),
+    "encounter": ("encounter", "encounters"),
+}
+
+# Detail lines listed per event type in a digest
+MAX_DETAIL_LINES = 10
+
+# Digest settings changed since running monitors loaded their server (server_id -> settings)
+_digest_settings: Dict[str, Dict[str, int]] = {}
+
+
+def set_digest_settings(server_id: str, settings: Dict[str, int]):
+    """Apply changed digest settings to running monitors
+
+    Args:
+        server_id: Server ID
+        settings: Digest windows by channel type
+    """
+    _digest_settings[str(server_id)] = dict(settings)
+
+
+def get_digest_window(server, channel_type: str) -> int:
+    """Get a server's digest window for a channel type
+
+    Args:
+        server: Server object
+        channel_type: "events" or "connections"
+
+    Returns:
+        int: Window in seconds (0 when digests are disabled)
+    """
+    settings = _digest_settings.get(str(getattr(server, "server_id", "")))
+    if settings is None:
+        settings = getattr(server, "digest_settings", None) or {}
+    try:
+        return max(0, min(int(settings.get(channel_type, 0) or 0), MAX_DIGEST_WINDOW))
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_high_priority(channel_type: str, data: Dict[str, Any]) -> bool:
+    """Check if an event must be posted immediately
+
+    Args:
+        channel_type: "events" or "connections"
+        data: Event or connection data
+
+    Returns:
+        bool: True if the event bypasses the digest
+    """
+    if channel_type != "events":
+        return False
+
+    event_type = data.get("event_type") or data.get("type")
+    if event_type in HIGH_PRIORITY_EVENTS:
+        return True
+    return event_type == "mission" and data.get("mission_level") == 4
+
+
+def _join_names(names: List[str], limit: int = MAX_FIELD_VALUE_LENGTH) -> str:
+    """Join names into a field value, summarizing the overflow
+
+    Args:
+        names: Names to join
+        limit: Maximum length
+
+    Returns:
+        str: Comma separated names
+    """
+    text = ""
+    for i, name in enumerate(names):
+        part = name if not text else f", {name}"
+        suffix = f" and {len(names) - i} more"
+        if len(text) + len(part) + len(suffix) > limit:
+            return text + suffix
+        text += part
+    return text
+
+
+def render_connection_digest(connections: List[Dict[str, Any]], server, guild=None) -> discord.Embed:
+    """Create a digest embed for buffered connection events
+
+    Args:
+        connections: Connection events in arrival order
+        server: Server object
+        guild: Guild model for theming (optional)
+
+    Returns:
+        discord.Embed: Digest embed
+    """
+    server_name = getattr(server, "server_name", None) or getattr(server, "server_id", "Unknown")
+    template = get_template(guild, ("digest", "connections", server_name), lambda: EmbedTemplate(
+        color=discord.Color.blue(),
+        thumbnail_url=f"attachment://{CONNECTIONS_ICON.split('/')[-1]}",
+        static_fields=[{"name": "Server", "value": server_name, "inline": True}]
+    ))
+
+    joined = [c.get("player_name", "Unknown") for c in connections if c.get("action") == "connected"]
+    left = [c.get("player_name", "Unknown") for c in connections if c.get("action") != "connected"]
+
+    fields = []
+    if joined:
+        fields.append(("🟢 Joined", _join_names(joined), False))
+    if left:
+        fields.append(("🔴 Left", _join_names(left), False))
+
+    return template.render(
+        title="👥 Player Activity",
+        description=f"**{len(joined)}** joined, **{len(left)}** left",
+        fields=fields,
+        timestamp=datetime.utcnow()
+    )
+
+
+def render_event_digest(events: List[Dict[str, Any]], server, guild=None) -> discord.Embed:
+    """Create a digest embed for buffered game events
+
+    Args:
+        events: Game events in arrival order
+        server: Server object
+        guild: Guild model for theming (optional)
+
+    Returns:
+        discord.Embed: Digest embed
+    """
+    server_name = getattr(server, "server_name", None) or getattr(server, "server_id", "Unknown")
+    template = get_template(guild, ("digest", "events", server_name), lambda: EmbedTemplate(
+        color=discord.Color.gold(),
+        thumbnail_url=f"attachment://{DEFAULT_ICON.split('/')[-1]}",
+        static_fields=[{"name": "Server", "value": server_name, "inline": True}]
+    ))
+
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        event_type = event.get("event_type") or event.get("type") or "unknown"
+        by_type.setdefault(event_type, []).append(event)
+
+    lines = []
+    fields = []
+    for event_type, typed_events in by_type.items():
+        singular, plural = EVENT_LABELS.get(event_type, (f"{event_type} event", f"{event_type} events"))
+        count = len(typed_events)
+        lines.append(f"**{count}** {singular if count == 1 else plural}")
+
+        details = []
+        for event in typed_events[:MAX_DETAIL_LINES]:
+            detail = str(event.get("timestamp", ""))
+            if event_type == "mission":
+                detail += f" - Level {event.get('mission_level', '?')} at {event.get('location', 'Unknown')}"
+            elif event.get("location"):
+                detail += f" - {event['location']}"
+            details.append(detail.strip(" -") or "Unknown time")
+        if count > MAX_DETAIL_LINES:
+            details.append(f"... and {count - MAX_DETAIL_LINES} more")
+        fields.append((event_type.replace("_", " ").title(), "\n".join(details), False))
+
+    return template.render(
+        title="📢 Server Events",
+        description="\n".join(lines),
+        fields=fields,
+        timestamp=datetime.utcnow()
+    )
+
+
+class EventDigest:
+    """Buffers events per channel and posts them as digests"""
+
+    def __init__(self):
+        """Initialize event digest"""
+        # (channel_id, server_id, channel_type) -> buffered event data
+        self._buffers: Dict[Tuple[int, str, str], List[Dict[str, Any]]] = {}
+        self._contexts: Dict[Tuple[int, str, str], Tuple[Any, Any, Any]] = {}
+        self._flush_tasks: Dict[Tuple[int, str, str], asyncio.Task] = {}
+
+        self.stats = {
+            "buffered": 0,
+            "digests_sent": 0,
+            "messages_saved": 0,
+            "failed": 0,
+        }
+
+    async def add(self, channel, server, channel_type: str, data: Dict[str, Any], window: int, guild=None):
+        """Buffer an event for the next digest of a channel
+
+        Args:
+            channel: Discord channel the digest is posted to
+            server: Server object
+            channel_type: "events" or "connections"
+            data: Event or connection data
+            window: Seconds to buffer before posting
+            guild: Guild model for theming (optional)
+        """
+        key = (channel.id, str(server.server_id), channel_type)
+        self._buffers.setdefault(key, []).append(data)
+        self._contexts[key] = (channel, server, guild)
+        self.stats["buffered"] += 1
+
+        task = self._flush_tasks.get(key)
+        if task is None or task.done():
+            self._flush_tasks[key] = asyncio.create_task(self._flush_after(key, window))
+
+    async def _flush_after(self, key: Tuple[int, str, str], window: int):
+        """Post a channel's digest once its window has passed
+
+        Args:
+            key: Buffer key
+            window: Seconds to wait
+        """
+        try:
+            await asyncio.sleep(window)
+        finally:
+            self._flush_tasks.pop(key, None)
+            await self._flush(key)
+
+    async def _flush(self, key: Tuple[int, str, str]):
+        """Post the buffered events of a channel
+
+        Args:
+            key: Buffer key
+        """
+        buffered = self._buffers.pop(key, None)
+        channel, server, guild = self._contexts.pop(key, (None, None, None))
+        if not buffered or channel is None:
+            return
+
+        channel_type = key[2]
+        try:
+            if len(buffered) == 1:
+                # A lone event is posted as usual
+                if channel_type == "connections":
+                    embed = render_connection_embed(buffered[0], guild=guild)
+                    icon_path = CONNECTIONS_ICON
+                else:
+                    embed = render_event_embed(buffered[0], server, guild=guild)
+                    event_type = buffered[0].get("event_type") or buffered[0].get("type", "unknown")
+                    icon_path = get_event_icon(EVENT_ICON_NAMES.get(event_type, event_type))
+            elif channel_type == "connections":
+                embed = render_connection_digest(buffered, server, guild=guild)
+                icon_path = CONNECTIONS_ICON
+            else:
+                embed = render_event_digest(buffered, server, guild=guild)
+                icon_path = DEFAULT_ICON
+
+            await send_embed_with_icon(channel, embed, icon_path)
+            self.stats["digests_sent"] += 1
+            self.stats["messages_saved"] += len(buffered) - 1
+        except Exception as e:
+            self.stats["failed"] += len(buffered)
+            logger.error(f"Error sending {channel_type} digest to channel {key[0]}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get digest metrics
+
+        Returns:
+            Dict with counters and the number of pending events
+        """
+        return {
+            **self.stats,
+            "pending": sum(len(buffer) for buffer in self._buffers.values()),
+        }
+
+    async def close(self):
+        """Post all pending digests immediately"""
+        for task in list(self._flush_tasks.values()):
+            task.cancel()
+        for key in list(self._buffers):
+            await self._flush(key)
+        self._flush_tasks.clear()
+
+
+# Global digest instance
+_event_digest = None
+
+
+def get_event_digest() -> EventDigest:
+    """Get the global event digest
+
+    Returns:
+        EventDigest: Event digest instance
+    """
+    global _event_digest
+
+    if _event_digest is None:
+        _event_digest = EventDigest()
+
+    return _event_digest
+
+
+async def shutdown_event_digest():
+    """Post pending digests and discard the global event digest"""
+    global _event_digest
+
+    if _event_digest is not None:
+        await _event_digest.close()
+        _event_digest = None
@@ -0,0 +1,257 @@
+"""
+Heap based expiry scheduling for time limited state
+
+Keys (bounty IDs, premium subscriptions, faction invites, ...) are
+scheduled with the UTC datetime they expire at. One worker per scheduler
+sleeps until the earliest deadline and then hands the due keys to its
+handler in small batches, so state expires when it should instead of at
+the next periodic sweep.
+
+Rescheduling or cancelling a key only updates the deadline table; stale
+heap entries are skipped when they reach the top. When the handler fails
+the batch is retried after RETRY_DELAY seconds.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of keys handed to the handler at once
+DEFAULT_BATCH_SIZE = 50
+
+# Longest a worker sleeps without re-checking the heap (seconds)
+MAX_WAIT = 300
+
+# Delay before a failed batch is retried (seconds)
+RETRY_DELAY = 60
+
+
+class ExpiryScheduler:
+    """Fires expirations at their deadline in small batches"""
+
+    def __init__(self, name: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """Initialize expiry scheduler
+
+        Args:
+            name: Scheduler name (used in logs and metrics)
+            batch_size: Maximum number of keys per handler call
+        """
+        self.name = name
+        self.batch_size = batch_size
+
+        # Heap of (deadline, sequence, key); _deadlines holds the live deadline of each key
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, datetime] = {}
+        self._sequence = itertools.count()
+        self._handler: Optional[Callable[[List[Hashable]], Awaitable[Any]]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "scheduled": 0,
+            "cancelled": 0,
+            "fired": 0,
+            "batches": 0,
+            "failed": 0,
+            "max_lag": 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, when: datetime):
+        """Schedule or reschedule a key
+
+        Args:
+            key: Key to expire
+            when: UTC datetime the key expires at
+        """
+        if not isinstance(when, datetime):
+            return
+
+        self._deadlines[key] = when
+        heapq.heappush(self._heap, (when, next(self._sequence), key))
+        self.stats["scheduled"] += 1
+
+        # Wake the worker if this is now the earliest deadline
+        if self._wakeup is not None and self._heap[0][0] == when:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a scheduled key
+
+        Args:
+            key: Key to cancel
+
+        Returns:
+            bool: True if the key was scheduled
+        """
+        if self._deadlines.pop(key, None) is None:
+            return False
+        self.stats["cancelled"] += 1
+        if len(self._heap) > 4 * len(self._deadlines) + 1024:
+            self._compact()
+        return True
+
+    def get_deadline(self, key: Hashable) -> Optional[datetime]:
+        """Get the deadline of a scheduled key
+
+        Args:
+            key: Scheduled key
+
+        Returns:
+            datetime: Deadline or None if the key is not scheduled
+        """
+        return self._deadlines.get(key)
+
+    def _compact(self):
+        """Rebuild the heap without stale entries"""
+        self._heap = [(when, seq, key) for when, seq, key in self._heap if self._deadlines.get(key) == when]
+        heapq.heapify(self._heap)
+
+    def _discard_stale(self):
+        """Pop cancelled and rescheduled entries off the top of the heap"""
+        while self._heap:
+            when, _, key = self._heap[0]
+            if self._deadlines.get(key) == when:
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Get the earliest deadline
+
+        Returns:
+            datetime: Earliest deadline or None if nothing is scheduled
+        """
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Hashable]:
+        """Remove and return the keys that are due
+
+        Args:
+            now: Current UTC time (defaults to datetime.utcnow())
+
+        Returns:
+            List of at most batch_size keys in deadline order
+        """
+        now = now or datetime.utcnow()
+        due = []
+        while len(due) < self.batch_size:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            when, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            self.stats["max_lag"] = max(self.stats["max_lag"], (now - when).total_seconds())
+            due.append(key)
+        return due
+
+    def start(self, handler: Callable[[List[Hashable]], Awaitable[Any]]):
+        """Start firing expirations
+
+        Args:
+            handler: Coroutine function called with each batch of due keys
+        """
+        self._handler = handler
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker; scheduled keys are kept"""
+        task, self._task = self._task, None
+        self._handler = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        """Worker loop"""
+        while True:
+            due = self.pop_due()
+            if due:
+                await self._fire(due)
+                # Let other tasks run between batches of a large backlog
+                await asyncio.sleep(0)
+                continue
+
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            timeout = MAX_WAIT
+            if deadline is not None:
+                timeout = min(MAX_WAIT, max(0.0, (deadline - datetime.utcnow()).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, keys: List[Hashable]):
+        """Hand a batch of keys to the handler
+
+        Args:
+            keys: Due keys
+        """
+        try:
+            await self._handler(keys)
+            self.stats["fired"] += len(keys)
+            self.stats["batches"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += len(keys)
+            logger.error(f"Error expiring {len(keys)} {self.name} keys, retrying in {RETRY_DELAY}s: {e}")
+            retry_at = datetime.utcnow() + timedelta(seconds=RETRY_DELAY)
+            for key in keys:
+                if key not in self._deadlines:
+                    self.schedule(key, retry_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler metrics
+
+        Returns:
+            Dict with counters, pending keys and the next deadline
+        """
+        deadline = self.next_deadline()
+        return {
+            **self.stats,
+            "pending": len(self._deadlines),
+            "next_deadline": deadline.isoformat() if deadline else None,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+# Schedulers by name
+_expiry_schedulers: Dict[str, ExpiryScheduler] = {}
+
+
+def get_expiry_scheduler(name: str) -> ExpiryScheduler:
+    """Get a named expiry scheduler, creating it on first use
+
+    Args:
+        name: Scheduler name (e.g. "bounties")
+
+    Returns:
+        ExpiryScheduler: Scheduler instance
+    """
+    scheduler = _expiry_schedulers.get(name)
+    if scheduler is None:
+        scheduler = ExpiryScheduler(name)
+        _expiry_schedulers[name] = scheduler
+    return scheduler
+
+
+async def shutdown_expiry_schedulers():
+    """Stop all expiry scheduler workers"""
+    for scheduler in list(_expiry_schedulers.values()):
+        await scheduler.stop()
@@ -4,6 +4,7 @@ Gambling utilities for blackjack, slots, and roulette games
 import random
 import asyncio
 import logging
+import uuid
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -13,6 +14,11 @@ import discord
 from discord.ui import View, Button, Select
 from discord import ButtonStyle, SelectOption
 
+from utils.async_utils import retryable
+
+# Attempts at writing a session back before giving up until the next try
+SETTLE_RETRIES = 3
+
 class CardSuit(Enum):
     HEARTS = auto()
     DIAMONDS = auto()
@@ -100,6 +106,153 @@ class Deck:
             self.reset()
         return self.cards.pop()
 
+class GamblingSession:
+    """Session-scoped wallet for one game view
+
+    Each stake the session can't cover is reserved from the player's
+    account with one atomic debit, and the rounds played with it are
+    settled in memory. Whatever is left in the session, together with the session's
+    wins, losses and earnings, is written back once by settle() when the
+    player leaves or the view times out.
+    """
+
+    def __init__(self, economy, game: str):
+        """Initialize gambling session
+
+        Args:
+            economy: Player's Economy
+            game: Game name (blackjack, slots, roulette)
+        """
+        self.economy = economy
+        self.game = game
+        # Makes the settlement write idempotent, so it can be retried
+        self.session_id = str(uuid.uuid4())
+        # Credits debited from the account for this session
+        self.reserved = 0
+        # Session credits not riding on a round
+        self.available = 0
+        self.rounds = 0
+        self.wins = 0
+        self.losses = 0
+        self.earnings = 0
+        self.settled = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def balance(self) -> int:
+        """Player's balance including the credits held by the session"""
+        return self.economy.balance + self.available
+
+    async def reserve(self, amount: int) -> bool:
+        """Move credits from the account into the session
+
+        Args:
+            amount: Credits to reserve
+
+        Returns:
+            bool: True if the account covered the amount
+        """
+        if self.settled or amount <= 0:
+            return False
+        if not await self.economy.remove_currency(amount, f"{self.game}_bet", {"game": self.game}):
+            return False
+        self.reserved += amount
+        self.available += amount
+        return True
+
+    async def stake(self, bet: int) -> bool:
+        """Take the stake of a round, reserving the shortfall if the session is short
+
+        Only the credits the current bet needs are reserved, never bets
+        ahead of it.
+
+        Args:
+            bet: Round stake
+
+        Returns:
+            bool: True if the stake was taken, False if the player can't cover it
+        """
+        async with self._lock:
+            if self.settled or bet <= 0:
+                return False
+            if self.available < bet and not await self.reserve(bet - self.available):
+                return False
+            self.available -= bet
+            return True
+
+    def record(self, bet: int, returned: int):
+        """Settle a round in memory
+
+        Args:
+            bet: Round stake
+            returned: Credits paid back for the round (0 for a loss, the stake
+                for a push, stake plus winnings for a win)
+        """
+        if self.settled:
+            logger.warning(f"Ignoring {self.game} round recorded after its session was settled")
+            return
+        self.available += returned
+        self.rounds += 1
+        net = returned - bet
+        if net > 0:
+            self.wins += 1
+        elif net < 0:
+            self.losses += 1
+        self.earnings += net
+
+    @retryable(max_retries=SETTLE_RETRIES, delay=1.0, backoff=2.0)
+    async def _write_settlement(self):
+        """Write the session back in one update, raising if it didn't apply"""
+        if not await self.economy.settle_gambling(
+            self.game, self.available, self.wins, self.losses, self.earnings,
+            {"game": self.game, "rounds": self.rounds, "reserved": self.reserved},
+            session_id=self.session_id
+        ):
+            raise RuntimeError("economy account not found")
+
+    async def settle(self) -> bool:
+        """Write the session back to the player's account
+
+        The write is retried; a session that still can't be written stays
+        unsettled so a later call can try again. Safe to call more than
+        once; only the first successful call writes.
+
+        Returns:
+            bool: True if the session is settled
+        """
+        async with self._lock:
+            if self.settled:
+                return True
+            try:
+                await self._write_settlement()
+            except Exception as e:
+                logger.error(
+                    f"Could not settle {self.game} session for player {self.economy.player_id} "
+                    f"({self.available} credits, {self.wins} wins, {self.losses} losses, "
+                    f"{self.earnings} earnings): {e}"
+                )
+                return False
+            self.settled = True
+            self.available = 0
+            return True
+
+    async def settle_later(self, delay: float = 60.0, attempts: int = 10) -> bool:
+        """Keep retrying the settlement after its view has ended
+
+        Args:
+            delay: Seconds between attempts
+            attempts: Maximum number of attempts
+
+        Returns:
+            bool: True if the session was settled
+        """
+        for _ in range(attempts):
+            await asyncio.sleep(delay)
+            if await self.settle():
+                return True
+        return False
+
+
 class BlackjackGame:
     def __init__(self, player_id: str):
         self.player_id = player_id
@@ -223,10 +376,12 @@ class BlackjackGame:
             return -self.bet
 
 class BlackjackView(View):
-    def __init__(self, game: BlackjackGame, economy):
+    def __init__(self, game: BlackjackGame, economy, session: Optional[GamblingSession] = None):
         super().__init__(timeout=300)  # 5 minutes timeout
         self.game = game
         self.economy = economy
+        # Session holding the staked bet
+        self.session = session or GamblingSession(economy, "blackjack")
         self.EMERALD_GREEN = 0x50C878  # Hex color for emerald green
         self.WASTELAND_BROWN = 0x8B4513  # Survival-themed color
         self.BLOOD_RED = 0xA91101      # For lost games
@@ -234,6 +389,13 @@ class BlackjackView(View):
     async def on_timeout(self):
         """Handle view timeout by disabling buttons"""
         self.disable_all_buttons()
+        if not self.game.game_over:
+            # The abandoned hand forfeits its bet
+            self.game.game_over = True
+            self.session.record(self.game.bet, 0)
+        if not await self.session.settle():
+            # The view is finished; keep retrying so the credits aren't lost
+            asyncio.create_task(self.session.settle_later())
         if self.game.message:
             try:
                 embed = self.game.message.embeds[0]
@@ -250,6 +412,11 @@ class BlackjackView(View):
             await interaction.response.send_message("This isn't your hand! Find your own game.", ephemeral=True)
             return
         
+        # A late click must not settle a finished hand again
+        if self.game.game_over:
+            await interaction.response.send_message("This hand is already over.", ephemeral=True)
+            return
+        
         # Dramatic drawing animation
         await interaction.response.defer()
         
@@ -302,11 +469,12 @@ class BlackjackView(View):
             self.disable_all_buttons()
             payout = self.game.get_payout()
             
-            # Update player economy with themed messages
+            # Settle the hand and close the session
+            self.session.record(self.game.bet, self.game.bet + payout)
+            await self.session.settle()
+            
+            # Themed outcome messages
             if payout > 0:
-                await self.economy.add_currency(payout, "blackjack", {"game": "blackjack", "result": self.game.result})
-                await self.economy.update_gambling_stats("blackjack", True, payout)
-                
                 if self.game.result == "blackjack":
                     embed.add_field(
                         name="MAJOR VICTORY!", 
@@ -320,7 +488,6 @@ class BlackjackView(View):
                         inline=False
                     )
             elif payout < 0:
-                await self.economy.update_gambling_stats("blackjack", False, abs(payout))
                 embed.add_field(
                     name="Defeat", 
                     value=f"The wasteland claims {abs(payout)} of your credits.", 
@@ -334,8 +501,7 @@ class BlackjackView(View):
                 )
             
             # Add new balance with themed text
-            new_balance = await self.economy.get_balance()
-            embed.add_field(name="Current Assets", value=f"{new_balance} credits", inline=False)
+            embed.add_field(name="Current Assets", value=f"{self.session.balance} credits", inline=False)
             
             # Set a thematic footer based on the outcome
             if payout > 0:
@@ -361,6 +527,11 @@ class BlackjackView(View):
             await interaction.response.send_message("This isn't your hand! Find your own game.", ephemeral=True)
             return
         
+        # A late click must not settle a finished hand again
+        if self.game.game_over:
+            await interaction.response.send_message("This hand is already over.", ephemeral=True)
+            return
+        
         # Dramatic dealer animation
         await interaction.response.defer()
         
@@ -414,11 +585,12 @@ class BlackjackView(View):
         self.disable_all_buttons()
         payout = self.game.get_payout()
         
-        # Update player economy with themed messages
+        # Settle the hand and close the session
+        self.session.record(self.game.bet, self.game.bet + payout)
+        await self.session.settle()
+        
+        # Themed outcome messages
         if payout > 0:
-            await self.economy.add_currency(payout, "blackjack", {"game": "blackjack", "result": self.game.result})
-            await self.economy.update_gambling_stats("blackjack", True, payout)
-            
             if self.game.result == "dealer_bust":
                 embed.add_field(
                     name="Dealer Collapse", 
@@ -432,7 +604,6 @@ class BlackjackView(View):
                     inline=False
                 )
         elif payout < 0:
-            await self.economy.update_gambling_stats("blackjack", False, abs(payout))
             embed.add_field(
                 name="Outplayed", 
                 value=f"The dealer's experience cost you {abs(payout)} credits.", 
@@ -446,8 +617,7 @@ class BlackjackView(View):
             )
         
         # Add new balance with themed text
-        new_balance = await self.economy.get_balance()
-        embed.add_field(name="Current Assets", value=f"{new_balance} credits", inline=False)
+        embed.add_field(name="Current Assets", value=f"{self.session.balance} credits", inline=False)
         
         # Set thematic footer based on outcome
         if payout > 0:
@@ -1048,10 +1218,12 @@ class RouletteGame:
 class RouletteView(View):
     """Interactive view for roulette game with enhanced Deadside-themed visuals"""
     
-    def __init__(self, player_id: str, economy, bet: int = 10):
+    def __init__(self, player_id: str, economy, bet: int = 10, session: Optional[GamblingSession] = None):
         super().__init__(timeout=300)  # 5 minutes timeout
         self.player_id = player_id
         self.economy = economy
+        # Spins are staked from and paid into the session until the player leaves
+        self.session = session or GamblingSession(economy, "roulette")
         self.game = RouletteGame(player_id)
         self.bet = bet
         self.message = None
@@ -1087,6 +1259,9 @@ class RouletteView(View):
     async def on_timeout(self):
         """Handle view timeout by disabling buttons"""
         self.disable_all_items()
+        if not await self.session.settle():
+            # The view is finished; keep retrying so the credits aren't lost
+            asyncio.create_task(self.session.settle_later())
         if self.message:
             try:
                 embed = discord.Embed(
@@ -1094,8 +1269,7 @@ class RouletteView(View):
                     description="Game timed out due to inactivity.",
                     color=discord.Color.dark_gray()
                 )
-                balance = await self.economy.get_balance()
-                embed.add_field(name="Your Balance", value=f"{balance} credits", inline=False)
+                embed.add_field(name="Your Balance", value=f"{self.session.balance} credits", inline=False)
                 await self.message.edit(embed=embed, view=None)
             except Exception as e:
                 logger.error(f"Error handling roulette timeout: {e}")
@@ -1144,9 +1318,8 @@ class RouletteView(View):
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
             
-        # Check if player is not None has enough credits
-        balance = await self.economy.get_balance()
-        if balance < self.game.bet_amount:
+        # Take the stake from the session, reserving more credits if needed
+        if not await self.session.stake(self.game.bet_amount):
             await interaction.response.send_message(
                 f"You don't have enough credits! You need {self.game.bet_amount} credits to place this bet.",
                 ephemeral=True
@@ -1186,13 +1359,7 @@ class RouletteView(View):
             embed=loading_embed,
             view=None
         )
-            
-        # Remove the bet amount
-        await self.economy.remove_currency(self.game.bet_amount, "roulette_bet", {
-            "game": "roulette", 
-            "bet_type": self.game.bet_type
-        })
-        
+
         # Enhanced multi-frame spinning animation sequence
         for frame_idx in range(5):  # Multiple frames for dynamic animation
             spin_frame = frame_idx % 3  # We have 3 different frames, cycle through them
@@ -1254,7 +1421,7 @@ class RouletteView(View):
         result_embed = discord.Embed(
             title="🎲 Deadside Roulette 🎲",
             description=f"The ball lands on **{result['number']}**!",
-            color=self.EMERALD_GREEN if is_win is not None else self.WASTELAND_BROWN
+            color=self.EMERALD_GREEN if is_win else self.WASTELAND_BROWN
         )
         
         # Add the visual result display using our fancy emoji-based display
@@ -1287,7 +1454,7 @@ class RouletteView(View):
         )
         
         # Update player economy and create themed outcome message
-        if is_win is not None:
+        if is_win:
             winnings = result["winnings"]
             
             # Create an exciting win message with Deadside theme
@@ -1302,13 +1469,8 @@ class RouletteView(View):
                 inline=False
             )
             
-            # Process the economy updates
-            await self.economy.add_currency(
-                winnings,
-                "roulette_win",
-                {"game": "roulette", "bet_type": self.game.bet_type}
-            )
-            await self.economy.update_gambling_stats("roulette", True, winnings)
+            # Winnings are paid at X:1, on top of the returned stake
+            self.session.record(self.game.bet_amount, self.game.bet_amount + winnings)
         else:
             # Create a themed but encouraging loss message
             result_embed.add_field(
@@ -1317,18 +1479,17 @@ class RouletteView(View):
                 inline=False
             )
             
-            await self.economy.update_gambling_stats("roulette", False, self.game.bet_amount)
+            self.session.record(self.game.bet_amount, 0)
         
         # Show updated balance
-        new_balance = await self.economy.get_balance()
         result_embed.add_field(
             name="Your Balance", 
-            value=f"**{new_balance}** credits", 
+            value=f"**{self.session.balance}** credits", 
             inline=False
         )
         
         # Add thematic footer
-        if is_win is not None:
+        if is_win:
             result_embed.set_footer(text="Fortune favors the brave in Deadside!")
         else:
             result_embed.set_footer(text="Even the greatest survivors face defeat in the wasteland...")
@@ -1389,8 +1550,14 @@ class RouletteView(View):
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
             
-        # Get balance
-        balance = await self.economy.get_balance()
+        # Pay the session back into the account; keep the game open until it is
+        if not await self.session.settle():
+            await interaction.response.send_message(
+                "Couldn't return your credits yet, please try again.", ephemeral=True
+            )
+            return
+        balance = self.session.balance
+        self.stop()
         
         # Border styling elements
         table_border_top = "╔═════════════════════════════╗"
@@ -2096,10 +2263,12 @@ class SlotMachine:
         return results, multiplier
 
 class SlotsView(View):
-    def __init__(self, player_id: str, economy, bet: int = 10):
+    def __init__(self, player_id: str, economy, bet: int = 10, session: Optional[GamblingSession] = None):
         super().__init__(timeout=300)  # 5 minutes timeout
         self.player_id = player_id
         self.economy = economy
+        # Spins are staked from and paid into the session until the player quits
+        self.session = session or GamblingSession(economy, "slots")
         self.slot_machine = SlotMachine()
         self.bet = bet
         self.message = None
@@ -2107,10 +2276,13 @@ class SlotsView(View):
     async def on_timeout(self):
         """Handle view timeout by disabling buttons"""
         self.disable_all_buttons()
+        if not await self.session.settle():
+            # The view is finished; keep retrying so the credits aren't lost
+            asyncio.create_task(self.session.settle_later())
         if self.message:
             try:
                 # Get player's balance for the timeout message
-                balance = await self.economy.get_balance()
+                balance = self.session.balance
                 
                 # Use our standardized embed for timeout state
                 embed = create_slots_embed(
@@ -2134,18 +2306,14 @@ class SlotsView(View):
             await interaction.response.send_message("This isn't your salvage machine!", ephemeral=True)
             return
         
-        # Check if player is not None has enough credits
-        balance = await self.economy.get_balance()
-        if balance < self.bet:
+        # Take the stake from the session, reserving more credits if needed
+        if not await self.session.stake(self.bet):
             await interaction.response.send_message(
                 f"You don't have enough credits! You need {self.bet} credits to operate this machine.", 
                 ephemeral=True
             )
             return
         
-        # Remove the bet amount
-        await self.economy.remove_currency(self.bet, "slots_bet")
-        
         # Spin the slots
         symbols, multiplier = self.slot_machine.spin()
         
@@ -2153,12 +2321,8 @@ class SlotsView(View):
         winnings = self.bet * multiplier
         won = winnings > 0
         
-        # Update player economy and gambling stats
-        if won is not None:
-            await self.economy.add_currency(winnings, "slots_win", {"game": "slots", "multiplier": multiplier})
-            await self.economy.update_gambling_stats("slots", True, winnings)
-        else:
-            await self.economy.update_gambling_stats("slots", False, self.bet)
+        # Settle the spin in the session
+        self.session.record(self.bet, winnings)
         
         # Defer response to allow for animation sequence
         await interaction.response.defer()
@@ -2236,7 +2400,7 @@ class SlotsView(View):
             await asyncio.sleep(0.7)  # Slightly longer pause when a reel stops
         
         # Show the final result with our standardized embed
-        new_balance = await self.economy.get_balance()
+        new_balance = self.session.balance
         
         final_embed = create_slots_embed(
             self.slot_machine,
@@ -2258,7 +2422,7 @@ class SlotsView(View):
         )
         
         # Add special thumbnail for jackpot wins
-        if won is not None and multiplier >= 20:
+        if won and multiplier >= 20:
             # Use emerald as thumbnail for big wins regardless of actual symbols
             emerald_url = self.slot_machine.get_symbol_image_url("emerald")
             if emerald_url is not None:
@@ -2287,11 +2451,17 @@ class SlotsView(View):
             await interaction.response.send_message("This isn't your salvage machine!", ephemeral=True)
             return
         
+        # Pay the session back into the account; keep the machine open until it is
+        if not await self.session.settle():
+            await interaction.response.send_message(
+                "Couldn't return your credits yet, please try again.", ephemeral=True
+            )
+            return
+        balance = self.session.balance
+        self.stop()
+        
         # Disable all buttons
         self.disable_all_buttons()
-        
-        # Get player's balance
-        balance = await self.economy.get_balance()
         player_name = interaction.user.display_name
         
         # Create final embed using our standardized design
@@ -2360,7 +2530,7 @@ class BetModal(discord.ui.Modal):
                 
             # Check if player is not None has enough credits for this bet
             if self.parent_view and self.parent_view.economy:
-                balance = await self.parent_view.economy.get_balance()
+                balance = self.parent_view.session.balance
                 if new_bet > balance:
                     await interaction.response.send_message(
                         f"You don't have enough credits for that bet. Your balance: {balance} credits", 
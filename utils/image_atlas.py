@@ -0,0 +1,75 @@
+"""
+Pre-rendered images for the gambling games
+
+build_image_atlas() renders every card face, the card back and every
+roulette result and spin frame once at startup, so dealing a card or
+spinning a wheel is a dictionary lookup with no file I/O and no templating.
+Slot symbols are emoji constants and need no rendering.
+"""
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ImageAtlas:
+    """In-memory atlas of game images"""
+
+    def __init__(self):
+        """Initialize image atlas"""
+        self.built = False
+
+        self.stats = {
+            "cards": 0,
+            "roulette": 0,
+        }
+
+    def build(self):
+        """Render every card and roulette display into memory"""
+        from utils.card_svg_generator import precompute_cards
+        from utils.roulette_svg_generator import precompute_roulette
+
+        self.stats["cards"] = precompute_cards()
+        self.stats["roulette"] = precompute_roulette()
+        self.built = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get atlas metrics
+
+        Returns:
+            Dict with image counts
+        """
+        return {**self.stats, "built": self.built}
+
+
+# Global atlas instance
+_image_atlas = None
+
+
+def get_image_atlas() -> ImageAtlas:
+    """Get the global image atlas
+
+    Returns:
+        ImageAtlas: Image atlas instance
+    """
+    global _image_atlas
+
+    if _image_atlas is None:
+        _image_atlas = ImageAtlas()
+
+    return _image_atlas
+
+
+async def build_image_atlas() -> ImageAtlas:
+    """Render the game images
+
+    Returns:
+        ImageAtlas: The built atlas
+    """
+    atlas = get_image_atlas()
+    if not atlas.built:
+        atlas.build()
+        logger.info(
+            f"Image atlas ready: {atlas.stats['cards']} cards, {atlas.stats['roulette']} roulette displays"
+        )
+    return atlas
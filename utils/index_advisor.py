@@ -0,0 +1,415 @@
+"""
+Index advisor for Emeralds Killfeed PvP Statistics Bot
+
+This module keeps a registry of the query shapes the bot issues on its hot
+paths, runs explain() on each of them and flags plans that fall back to a
+collection scan (COLLSCAN). For every flagged shape it proposes the compound
+index that would serve it, and can optionally create the missing indexes,
+including TTL indexes for the raw event collections.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import EVENT_RETENTION_DAYS, KILL_RETENTION_DAYS, TRANSACTION_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Sample values used when explaining query shapes. Only the plan matters,
+# so the values don't need to match any real documents.
+_SAMPLE_SERVER = "index_advisor_server"
+_SAMPLE_GUILD = "index_advisor_guild"
+_SAMPLE_PLAYER = "index_advisor_player"
+_SAMPLE_PLAYER_2 = "index_advisor_player_2"
+
+# One rivalry document per canonical player pair. create_indexes() builds
+# this index and the advisor proposes it with the same options, so the key
+# is only ever defined as a unique index.
+RIVALRY_PAIR_INDEX = [("server_id", 1), ("player1_id", 1), ("player2_id", 1)]
+RIVALRY_PAIR_INDEX_OPTIONS = {
+    "unique": True,
+    "partialFilterExpression": {"player1_id": {"$exists": True}},
+}
+
+# Registered query shapes
+# Each shape lists the filter/sort the code issues and the index that serves it,
+# plus any index_options the index must be created with.
+QUERY_SHAPES = [
+    {
+        "name": "player_recent_kills",
+        "source": "weapon_stats / stats cog",
+        "collection": "kills",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "killer_id": _SAMPLE_PLAYER},
+        "sort": [("timestamp", -1)],
+        "index": [("server_id", 1), ("killer_id", 1), ("timestamp", -1)],
+    },
+    {
+        "name": "rivalry_between_players",
+        "source": "Rivalry.get_between_players",
+        "collection": "rivalries",
+        "filter": lambda now: {
+            "server_id": _SAMPLE_SERVER,
+            "player1_id": _SAMPLE_PLAYER,
+            "player2_id": _SAMPLE_PLAYER_2
+        },
+        "sort": None,
+        "index": RIVALRY_PAIR_INDEX,
+        "index_options": RIVALRY_PAIR_INDEX_OPTIONS,
+    },
+    {
+        "name": "rivalry_for_player",
+        "source": "Rivalry.get_for_player",
+        "collection": "rivalries",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "player2_id": _SAMPLE_PLAYER},
+        "sort": None,
+        "index": [("server_id", 1), ("player2_id", 1)],
+    },
+    {
+        "name": "rivalry_top",
+        "source": "Rivalry.get_top_rivalries",
+        "collection": "rivalries",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER},
+        "sort": [("total_kills", -1), ("last_kill_time", -1)],
+        "index": [("server_id", 1), ("total_kills", -1), ("last_kill_time", -1)],
+    },
+    {
+        "name": "rivalry_intensity",
+        "source": "Rivalry.get_top_rivalries",
+        "collection": "rivalries",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER},
+        "sort": [("intensity_score", -1), ("total_kills", -1)],
+        "index": [("server_id", 1), ("intensity_score", -1), ("total_kills", -1)],
+    },
+    {
+        "name": "rivalry_closest",
+        "source": "Rivalry.get_closest_rivalries",
+        "collection": "rivalries",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "total_kills": {"$gte": 10}},
+        "sort": [("kill_difference", 1), ("total_kills", -1)],
+        "index": [("server_id", 1), ("kill_difference", 1), ("total_kills", -1)],
+    },
+    {
+        "name": "rivalry_recent",
+        "source": "Rivalry.get_recent_rivalries",
+        "collection": "rivalries",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "last_kill_time": {"$type": "date"}},
+        "sort": [("last_kill_time", -1), ("total_kills", -1)],
+        "index": [("server_id", 1), ("last_kill_time", -1), ("total_kills", -1)],
+    },
+    {
+        "name": "factions_for_players",
+        "source": "Faction.get_for_player / Faction.record_kills",
+        "collection": "collections.factions",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "member_ids": {"$in": [_SAMPLE_PLAYER]}},
+        "sort": None,
+        "index": [("server_id", 1), ("member_ids", 1)],
+    },
+    {
+        "name": "active_bounties_for_target",
+        "source": "Bounty.get_active_bounties_for_target",
+        "collection": "bounties",
+        "filter": lambda now: {
+            "guild_id": _SAMPLE_GUILD,
+            "server_id": _SAMPLE_SERVER,
+            "target_id": _SAMPLE_PLAYER,
+            "status": "active"
+        },
+        "sort": None,
+        "index": [("target_id", 1), ("status", 1)],
+    },
+    {
+        "name": "server_connections",
+        "source": "Connection.get_latest_connections / LogProcessorCog",
+        "collection": "connections",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "timestamp": {"$gt": now - timedelta(hours=1)}},
+        "sort": [("timestamp", -1)],
+        "index": [("server_id", 1), ("timestamp", -1)],
+    },
+    {
+        "name": "player_connections",
+        "source": "Connection.get_by_player",
+        "collection": "connections",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "player_id": _SAMPLE_PLAYER},
+        "sort": [("timestamp", -1)],
+        "index": [("server_id", 1), ("player_id", 1), ("timestamp", -1)],
+    },
+    {
+        "name": "server_events_by_type",
+        "source": "Event.get_latest_by_type",
+        "collection": "events",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "event_type": "server_restart"},
+        "sort": [("timestamp", -1)],
+        "index": [("server_id", 1), ("event_type", 1), ("timestamp", -1)],
+    },
+    {
+        "name": "server_game_events",
+        "source": "LogProcessorCog._process_game_event",
+        "collection": "game_events",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER, "event_type": "airdrop"},
+        "sort": [("timestamp", -1)],
+        "index": [("server_id", 1), ("event_type", 1), ("timestamp", -1)],
+    },
+    {
+        "name": "server_missions",
+        "source": "LogProcessorCog._process_game_event",
+        "collection": "missions",
+        "filter": lambda now: {"server_id": _SAMPLE_SERVER},
+        "sort": [("timestamp", -1)],
+        "index": [("server_id", 1), ("timestamp", -1)],
+    },
+    {
+        "name": "player_transactions",
+        "source": "Economy.get_transactions",
+        "collection": "economy_transactions",
+        "filter": lambda now: {"player_id": _SAMPLE_PLAYER, "server_id": _SAMPLE_SERVER},
+        "sort": [("timestamp", -1), ("_id", -1)],
+        "index": [("player_id", 1), ("server_id", 1), ("timestamp", -1), ("_id", -1)],
+    },
+]
+
+# TTL indexes for raw event collections (collection -> (field, retention in days))
+TTL_INDEXES = {
+    "connections": ("timestamp", EVENT_RETENTION_DAYS),
+    "events": ("timestamp", EVENT_RETENTION_DAYS),
+    "game_events": ("timestamp", EVENT_RETENTION_DAYS),
+    "missions": ("timestamp", EVENT_RETENTION_DAYS),
+}
+
+# Raw kills only expire when enabled; long-range stats come from the rollups
+if KILL_RETENTION_DAYS:
+    TTL_INDEXES["kills"] = ("timestamp", KILL_RETENTION_DAYS)
+
+# Economy transactions are kept unless a retention period is configured
+if TRANSACTION_RETENTION_DAYS:
+    TTL_INDEXES["economy_transactions"] = ("timestamp", TRANSACTION_RETENTION_DAYS)
+
+
+def _find_stages(plan: Dict[str, Any]) -> List[str]:
+    """Collect all stage names in a query plan tree
+
+    Args:
+        plan: Query plan document (winningPlan)
+
+    Returns:
+        List of stage names
+    """
+    stages = []
+    if not isinstance(plan, dict):
+        return stages
+
+    if "stage" in plan:
+        stages.append(plan["stage"])
+
+    # Slot-based engine plans nest the classic plan under queryPlan
+    for key in ("queryPlan", "inputStage"):
+        if key in plan:
+            stages.extend(_find_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_find_stages(child))
+
+    return stages
+
+
+def _index_keys(index_info: Dict[str, Any]) -> List[List[Tuple[str, Any]]]:
+    """Get key patterns from index_information() output
+
+    Args:
+        index_info: Result of collection.index_information()
+
+    Returns:
+        List of key patterns
+    """
+    return [[(field, direction) for field, direction in info.get("key", [])]
+            for info in index_info.values()]
+
+
+def _has_prefix_index(existing: List[List[Tuple[str, Any]]], wanted: List[Tuple[str, Any]]) -> bool:
+    """Check whether an existing index starts with the wanted key pattern
+
+    Args:
+        existing: Existing key patterns
+        wanted: Wanted key pattern
+
+    Returns:
+        bool: True if the wanted index (or a superset with the same prefix) exists
+    """
+    wanted_fields = [field for field, _ in wanted]
+    for keys in existing:
+        fields = [field for field, _ in keys]
+        if fields[:len(wanted_fields)] == wanted_fields:
+            return True
+    return False
+
+
+class IndexAdvisor:
+    """Verifies registered query shapes against the existing indexes"""
+
+    def __init__(self, db, shapes: Optional[List[Dict[str, Any]]] = None):
+        """Initialize index advisor
+
+        Args:
+            db: Database connection
+            shapes: Query shapes to check (defaults to QUERY_SHAPES)
+        """
+        self.db = db
+        self.shapes = shapes if shapes is not None else QUERY_SHAPES
+
+    async def explain_shape(self, shape: Dict[str, Any]) -> Dict[str, Any]:
+        """Run explain() on a query shape
+
+        Args:
+            shape: Query shape
+
+        Returns:
+            Dict with the shape name, winning plan stages and COLLSCAN flag
+        """
+        collection = getattr(self.db, shape["collection"])
+        cursor = collection.find(shape["filter"](datetime.utcnow()))
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+
+        result = {
+            "name": shape["name"],
+            "source": shape["source"],
+            "collection": shape["collection"],
+            "index": shape["index"],
+            "index_options": shape.get("index_options") or {},
+            "stages": [],
+            "collscan": False,
+            "error": None,
+        }
+
+        try:
+            explanation = await cursor.explain()
+            plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+            result["stages"] = _find_stages(plan)
+            result["collscan"] = "COLLSCAN" in result["stages"]
+        except Exception as e:
+            logger.error(f"Error explaining query shape {shape['name']}: {e}")
+            result["error"] = str(e)
+
+        return result
+
+    async def analyze(self) -> List[Dict[str, Any]]:
+        """Explain every registered query shape and check its index
+
+        Returns:
+            List of shape reports
+        """
+        reports = []
+        index_cache = {}
+
+        for shape in self.shapes:
+            report = await self.explain_shape(shape)
+
+            collection_name = shape["collection"]
+            if collection_name not in index_cache:
+                try:
+                    index_cache[collection_name] = _index_keys(
+                        await getattr(self.db, collection_name).index_information()
+                    )
+                except Exception as e:
+                    logger.error(f"Error reading indexes for {collection_name}: {e}")
+                    index_cache[collection_name] = []
+
+            report["index_missing"] = not _has_prefix_index(index_cache[collection_name], shape["index"])
+            reports.append(report)
+
+            if report["collscan"]:
+                logger.warning(
+                    f"Query shape {shape['name']} ({shape['source']}) uses COLLSCAN on {collection_name}; "
+                    f"suggested index: {shape['index']}"
+                )
+
+        return reports
+
+    async def get_missing_ttl_indexes(self) -> List[Dict[str, Any]]:
+        """Find event collections without their TTL index
+
+        Returns:
+            List of missing TTL index specs
+        """
+        missing = []
+        for collection_name, (field, days) in TTL_INDEXES.items():
+            try:
+                index_info = await getattr(self.db, collection_name).index_information()
+            except Exception as e:
+                logger.error(f"Error reading indexes for {collection_name}: {e}")
+                continue
+
+            has_ttl = any(
+                "expireAfterSeconds" in info and info.get("key", [])[:1] == [(field, 1)]
+                for info in index_info.values()
+            )
+            if not has_ttl:
+                missing.append({"collection": collection_name, "field": field, "days": days})
+
+        return missing
+
+    async def propose(self, reports: Optional[List[Dict[str, Any]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Propose indexes for all flagged query shapes
+
+        Args:
+            reports: Result of analyze() (computed if None)
+
+        Returns:
+            Dict with "compound" and "ttl" index proposals
+        """
+        if reports is None:
+            reports = await self.analyze()
+        compound = []
+        seen = set()
+
+        for report in reports:
+            if not (report["collscan"] or report["index_missing"]):
+                continue
+            key = (report["collection"], tuple(report["index"]))
+            if key in seen:
+                continue
+            seen.add(key)
+            compound.append({
+                "collection": report["collection"],
+                "keys": report["index"],
+                "options": report.get("index_options") or {},
+                "shapes": [r["name"] for r in reports
+                           if r["collection"] == report["collection"] and r["index"] == report["index"]],
+            })
+
+        return {
+            "compound": compound,
+            "ttl": await self.get_missing_ttl_indexes(),
+        }
+
+    async def apply(self, proposals: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> int:
+        """Create proposed indexes
+
+        Args:
+            proposals: Result of propose() (computed if None)
+
+        Returns:
+            int: Number of indexes created
+        """
+        if proposals is None:
+            proposals = await self.propose()
+
+        created = 0
+        for proposal in proposals["compound"]:
+            try:
+                await getattr(self.db, proposal["collection"]).create_index(proposal["keys"], **proposal.get("options", {}))
+                created += 1
+                logger.info(f"Created index {proposal['keys']} on {proposal['collection']}")
+            except Exception as e:
+                logger.error(f"Error creating index {proposal['keys']} on {proposal['collection']}: {e}")
+
+        for proposal in proposals["ttl"]:
+            try:
+                await getattr(self.db, proposal["collection"]).create_index(
+                    proposal["field"],
+                    expireAfterSeconds=proposal["days"] * 86400
+                )
+                created += 1
+                logger.info(f"Created TTL index on {proposal['collection']}.{proposal['field']} ({proposal['days']} days)")
+            except Exception as e:
+                logger.error(f"Error creating TTL index on {proposal['collection']}: {e}")
+
+        return created
@@ -0,0 +1,554 @@
+"""
+Live ingestion coordinator for game servers
+
+Each game server gets one coordinator that owns its SFTP connection. Every
+tick the coordinator stats the newest kill CSVs (one readdir per map
+directory) and the server log, downloads only files whose size or
+modification time changed, parses the new lines once and
+fans the results out to subscribers (killfeed, events, ...) over asyncio
+queues. Subscribers receive one dict per tick mapping topic to the new
+records, e.g. {"kills": [...]}, and None once the coordinator has stopped.
+Subscribers call queue.task_done() once they have processed a tick's
+records.
+
+File positions are kept per server on the server document as
+last_csv_file, last_csv_line and last_log_line, and are saved once every
+subscriber has processed the tick's records. If a subscriber leaves with
+records unprocessed, the positions are not saved that tick, so a restarted
+coordinator reads those records again. Ticks are spaced by an AdaptivePollScheduler
+(utils.poll_scheduler): close together while kills and connections keep
+arriving, further apart while the server is quiet.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from utils.parsers import LegacyCSVParser, LogParser
+from utils.poll_scheduler import get_poll_scheduler
+from utils.sftp import SFTPClient
+
+logger = logging.getLogger(__name__)
+
+# Topics subscribers can receive
+KILLS = "kills"
+EVENTS = "events"
+CONNECTIONS = "connections"
+TOPICS = (KILLS, EVENTS, CONNECTIONS)
+
+# Reconnection limits
+MAX_CONSECUTIVE_ERRORS = 5
+MAX_RECONNECT_ATTEMPTS = 10
+MAX_BACKOFF = 60
+
+
+def _resolve_original_server_id(server) -> str:
+    """Get the numeric server ID used in SFTP paths
+
+    Args:
+        server: Server object
+
+    Returns:
+        str: Original server ID
+    """
+    original_server_id = getattr(server, "original_server_id", None) or server.server_id
+
+    # UUID server IDs without an original ID may carry the numeric ID in the name
+    if "-" in server.server_id and len(server.server_id) > 30 and original_server_id == server.server_id:
+        for word in str(getattr(server, "name", None) or "").split():
+            if word.isdigit() and len(word) >= 4:
+                logger.info(f"Found potential numeric server ID in server name: {word}")
+                return word
+
+    return original_server_id
+
+
+class IngestionCoordinator:
+    """Fetches and parses a server's files once per tick for all subscribers"""
+
+    def __init__(self, bot, server, poll_interval: Optional[float] = None):
+        """Initialize ingestion coordinator
+
+        Args:
+            bot: Discord bot instance
+            server: Server object
+            poll_interval: Fixed seconds between ticks (adaptive when None)
+        """
+        self.bot = bot
+        self.server = server
+        self.server_id = str(server.server_id)
+        self.poll_interval = poll_interval
+        self.connection_key = f"{server.guild_id}_{server.server_id}"
+
+        self.sftp_client = SFTPClient(
+            hostname=server.sftp_host,
+            port=server.sftp_port,
+            username=server.sftp_username,
+            password=server.sftp_password,
+            server_id=server.server_id,
+            original_server_id=_resolve_original_server_id(server)
+        )
+
+        self._subscribers: Dict[asyncio.Queue, Set[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._unsubscribed = asyncio.Event()
+
+        # Player IDs seen connecting and not yet disconnecting
+        self._online: Set[str] = set()
+
+        # File positions; a line of None means "start at the current end" and
+        # an offset of None means the byte position of the line is not known yet
+        self._csv = {
+            "path": getattr(server, "last_csv_file", None),
+            "line": getattr(server, "last_csv_line", None),
+            "offset": None,
+            "size": None,
+            "mtime": None,
+        }
+        self._log = {
+            "path": None,
+            "line": getattr(server, "last_log_line", None),
+            "offset": None,
+            "size": None,
+            "mtime": None,
+        }
+
+        self.stats = {
+            "ticks": 0,
+            "files_read": 0,
+            "files_unchanged": 0,
+            "lines_read": 0,
+            "records_published": 0,
+            "errors": 0,
+            "last_tick": None,
+            "interval": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def online_players(self) -> Optional[int]:
+        """Players online according to the connections seen, None until the log is read"""
+        return len(self._online) if self._log["size"] is not None else None
+
+    def subscribe(self, topics) -> asyncio.Queue:
+        """Subscribe to one or more topics
+
+        Args:
+            topics: Topic name or iterable of topic names
+
+        Returns:
+            asyncio.Queue: Queue receiving {topic: records} dicts, then None on stop
+        """
+        topics = {topics} if isinstance(topics, str) else set(topics)
+        unknown = topics - set(TOPICS)
+        if unknown:
+            raise ValueError(f"Unknown ingestion topics: {', '.join(sorted(unknown))}")
+
+        queue = asyncio.Queue()
+        self._subscribers[queue] = topics
+        # Poll right away so the new topics don't wait out a long idle interval
+        self._wakeup.set()
+        self.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a subscriber
+
+        Args:
+            queue: Queue returned by subscribe()
+        """
+        self._subscribers.pop(queue, None)
+        self._unsubscribed.set()
+
+    def is_subscribed(self, topic: str) -> bool:
+        """Check if any subscriber receives a topic
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            bool: True if the topic is being ingested live
+        """
+        return self.running and any(topic in topics for topics in self._subscribers.values())
+
+    def start(self):
+        """Start the polling task if it is not running"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop polling, notify subscribers and close the SFTP connection"""
+        if self.running and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+        self._subscribers.clear()
+
+        if self.bot.sftp_connections.get(self.connection_key) is self.sftp_client:
+            self.bot.sftp_connections.pop(self.connection_key, None)
+        try:
+            await self.sftp_client.disconnect()
+        except Exception as e:
+            logger.warning(f"Error disconnecting SFTP for server {self.server_id}: {e}")
+
+    async def _run(self):
+        """Poll the server until it has no subscribers or keeps failing"""
+        consecutive_errors = 0
+        reconnect_attempts = 0
+        backoff_time = 5
+
+        self.bot.sftp_connections[self.connection_key] = self.sftp_client
+        logger.info(f"Starting ingestion for server {self.server_id}")
+
+        try:
+            while self._subscribers:
+                self._wakeup.clear()
+                scheduler = await get_poll_scheduler(self.bot.db, "ingestion", self.server_id, getattr(self.server, "guild_id", None))
+                try:
+                    batch = await self.poll_once()
+                    interval = scheduler.record(sum(len(records) for records in batch.values()), self.online_players)
+                    consecutive_errors = 0
+                    reconnect_attempts = 0
+                    backoff_time = 5
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    interval = scheduler.record(0)
+                    consecutive_errors += 1
+                    self.stats["errors"] += 1
+                    logger.error(f"Error ingesting server {self.server_id}: {e}", exc_info=True)
+
+                    if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                        if reconnect_attempts >= MAX_RECONNECT_ATTEMPTS:
+                            logger.error(f"Exceeded maximum reconnection attempts for server {self.server_id}, stopping ingestion")
+                            break
+
+                        reconnect_attempts += 1
+                        logger.warning(f"Too many consecutive errors ({consecutive_errors}), reconnecting SFTP for server {self.server_id}")
+                        try:
+                            await self.sftp_client.disconnect()
+                            await asyncio.sleep(backoff_time)
+                            if await self.sftp_client.connect():
+                                consecutive_errors = 0
+                            backoff_time = min(backoff_time * 2, MAX_BACKOFF)
+                        except Exception as reconnect_e:
+                            logger.error(f"Error during reconnection attempt: {reconnect_e}")
+
+                self.stats["interval"] = self.poll_interval or interval
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.stats["interval"])
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            pass
+        finally:
+            logger.info(f"Ingestion for server {self.server_id} stopped")
+            if _coordinators.get(self.server_id) is self:
+                _coordinators.pop(self.server_id, None)
+            if self._subscribers:
+                await self.stop()
+
+    async def poll_once(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch, parse and publish new records for all subscribed topics
+
+        Returns:
+            Dict mapping topic to the records published this tick
+        """
+        topics = set()
+        for subscribed in self._subscribers.values():
+            topics |= subscribed
+
+        if not self.sftp_client.is_connected and not await self.sftp_client.connect():
+            raise ConnectionError(f"Could not connect to SFTP: {self.sftp_client.last_error}")
+
+        self.stats["ticks"] += 1
+        self.stats["last_tick"] = time.time()
+
+        batch: Dict[str, List[Dict[str, Any]]] = {}
+        if KILLS in topics:
+            lines = await self._read_new_csv_lines()
+            if lines:
+                batch[KILLS] = LegacyCSVParser.parse_kill_lines(lines)
+
+        if EVENTS in topics or CONNECTIONS in topics:
+            lines = await self._read_new_log_lines()
+            if lines:
+                batch[EVENTS], batch[CONNECTIONS] = LogParser.parse_log_lines(lines)
+                self._track_online(batch[EVENTS], batch[CONNECTIONS])
+
+        published = []
+        for queue, subscribed in self._subscribers.items():
+            records = {topic: batch[topic] for topic in subscribed if batch.get(topic)}
+            if records:
+                queue.put_nowait(records)
+                published.append(queue)
+                self.stats["records_published"] += sum(len(r) for r in records.values())
+
+        if await self._wait_for_subscribers(published):
+            await self._save_positions()
+        return batch
+
+    async def _wait_for_subscribers(self, queues: List[asyncio.Queue]) -> bool:
+        """Wait until subscribers have processed the records queued for them
+
+        Args:
+            queues: Queues that received records this tick
+
+        Returns:
+            bool: True if every subscriber processed its records, False if one
+            unsubscribed first
+        """
+        joins = {queue: asyncio.ensure_future(queue.join()) for queue in queues}
+        try:
+            while True:
+                pending = [join for queue, join in joins.items() if not join.done()]
+                if not pending:
+                    return True
+                if any(queue not in self._subscribers for queue, join in joins.items() if not join.done()):
+                    return False
+
+                self._unsubscribed.clear()
+                unsubscribed = asyncio.ensure_future(self._unsubscribed.wait())
+                try:
+                    await asyncio.wait(pending + [unsubscribed], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    unsubscribed.cancel()
+        finally:
+            for join in joins.values():
+                join.cancel()
+
+    def _track_online(self, events: List[Dict[str, Any]], connections: List[Dict[str, Any]]):
+        """Update the online players from new log records
+
+        Args:
+            events: Parsed game events
+            connections: Parsed connection events
+        """
+        if any(event.get("type") == "server_restart" for event in events):
+            self._online.clear()
+
+        for connection in connections:
+            player_id = connection.get("player_id")
+            if connection.get("action") == "connected":
+                self._online.add(player_id)
+            else:
+                self._online.discard(player_id)
+
+    async def _read_new_csv_lines(self) -> List[str]:
+        """Read lines added to the kill CSV since the last tick
+
+        A new CSV file replaces the old one when the server rotates logs; the
+        rest of the old file is read before switching.
+
+        Returns:
+            List of new lines
+        """
+        probe = await self.sftp_client.probe_csv_files()
+        if not probe:
+            logger.debug(f"No CSV file found for server {self.server_id}")
+            return []
+
+        latest = probe[0]
+        lines = []
+        if self._csv["path"] != latest["path"]:
+            if self._csv["path"] and self._csv["line"] is not None:
+                old_info = next((info for info in probe if info["path"] == self._csv["path"]), None)
+                lines = await self._read_new_lines(self._csv, old_info) or []
+                self._csv["line"] = 0
+            self._csv.update(path=latest["path"], offset=None, size=None, mtime=None)
+
+        return lines + (await self._read_new_lines(self._csv, latest) or [])
+
+    async def _read_new_log_lines(self) -> List[str]:
+        """Read lines added to the server log since the last tick
+
+        Returns:
+            List of new lines
+        """
+        if not self._log["path"]:
+            self._log["path"] = await self.sftp_client.get_log_file()
+            if not self._log["path"]:
+                logger.debug(f"No log file found for server {self.server_id}")
+                return []
+
+        lines = await self._read_new_lines(self._log)
+        if lines is None:
+            # Look the log file up again next tick
+            self._log["path"] = None
+            return []
+        return lines
+
+    async def _read_new_lines(self, cursor: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+        """Read the lines of a file past a cursor and advance it
+
+        Files are only read when their size or modification time changed
+        since the last read, and then only from the byte offset the previous
+        read stopped at. A trailing line without a newline is still being
+        written and is left for the next read.
+
+        Args:
+            cursor: Dict with path, line, offset, size and mtime
+            info: Current file information if already known (stat when None)
+
+        Returns:
+            List of new lines or None if the file could not be read
+        """
+        if info is None:
+            info = await self.sftp_client.get_file_info(cursor["path"])
+            if info is None:
+                return None
+
+        size, mtime = info["size"], info.get("st_mtime")
+        if size == cursor["size"] and mtime == cursor.get("mtime"):
+            self.stats["files_unchanged"] += 1
+            return []
+
+        if cursor["size"] is not None and size < cursor["size"]:
+            # Truncated by a server restart, start over
+            cursor["line"] = 0
+            cursor["offset"] = 0
+            if cursor is self._log:
+                self._online.clear()
+
+        offset = cursor["offset"]
+        data = await self.sftp_client.read_range(cursor["path"], offset or 0)
+        if data is None:
+            return None
+
+        self.stats["files_read"] += 1
+        cursor["size"] = size
+        cursor["mtime"] = mtime
+
+        complete = data[:data.rfind(b"\n") + 1]
+        lines = complete.decode('utf-8', errors='replace').splitlines()
+        cursor["offset"] = (offset or 0) + len(complete)
+
+        if offset is None:
+            # Whole file read, find the saved line position in it
+            if cursor["line"] is None:
+                # No saved position, skip the backlog
+                cursor["line"] = len(lines)
+                return []
+            start_line = cursor["line"]
+            lines = lines[start_line:]
+        else:
+            start_line = cursor["line"] or 0
+
+        cursor["line"] = start_line + len(lines)
+        self.stats["lines_read"] += len(lines)
+        return lines
+
+    async def _save_positions(self):
+        """Persist file positions that changed this tick"""
+        update = {}
+        for key, value in (
+            ("last_csv_file", self._csv["path"]),
+            ("last_csv_line", self._csv["line"]),
+            ("last_log_line", self._log["line"]),
+        ):
+            if value is not None and getattr(self.server, key, None) != value:
+                setattr(self.server, key, value)
+                update[key] = value
+
+        if update:
+            try:
+                await self.server.update(self.bot.db, update)
+            except Exception as e:
+                logger.error(f"Error saving file positions for server {self.server_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion metrics
+
+        Returns:
+            Dict with counters, positions and subscriber queue depths
+        """
+        return {
+            **self.stats,
+            "running": self.running,
+            "subscribers": len(self._subscribers),
+            "queued": sum(queue.qsize() for queue in self._subscribers),
+            "csv_file": self._csv["path"],
+            "csv_line": self._csv["line"],
+            "log_line": self._log["line"],
+            "online_players": self.online_players,
+        }
+
+
+# Coordinators by server ID
+_coordinators: Dict[str, IngestionCoordinator] = {}
+
+
+def get_ingestion_coordinator(bot, server) -> IngestionCoordinator:
+    """Get the ingestion coordinator for a server, creating it if needed
+
+    Args:
+        bot: Discord bot instance
+        server: Server object
+
+    Returns:
+        IngestionCoordinator: Coordinator for the server
+    """
+    server_id = str(server.server_id)
+    coordinator = _coordinators.get(server_id)
+    if coordinator is None:
+        coordinator = IngestionCoordinator(bot, server)
+        _coordinators[server_id] = coordinator
+    return coordinator
+
+
+async def release_ingestion_coordinator(server_id: str, queue: asyncio.Queue):
+    """Unsubscribe from a server and stop its coordinator when unused
+
+    Args:
+        server_id: Server ID
+        queue: Queue returned by subscribe()
+    """
+    server_id = str(server_id)
+    coordinator = _coordinators.get(server_id)
+    if coordinator is None:
+        return
+
+    coordinator.unsubscribe(queue)
+    if not coordinator._subscribers:
+        _coordinators.pop(server_id, None)
+        await coordinator.stop()
+
+
+def is_ingesting(server_id: str, topic: str) -> bool:
+    """Check if a server's topic is ingested live
+
+    Args:
+        server_id: Server ID
+        topic: Topic name
+
+    Returns:
+        bool: True if a running coordinator has subscribers for the topic
+    """
+    coordinator = _coordinators.get(str(server_id))
+    return coordinator is not None and coordinator.is_subscribed(topic)
+
+
+def get_ingestion_stats() -> Dict[str, Dict[str, Any]]:
+    """Get metrics of all coordinators
+
+    Returns:
+        Dict mapping server ID to coordinator metrics
+    """
+    return {server_id: coordinator.get_stats() for server_id, coordinator in _coordinators.items()}
+
+
+async def shutdown_ingestion():
+    """Stop all coordinators"""
+    for server_id in list(_coordinators):
+        coordinator = _coordinators.pop(server_id, None)
+        if coordinator is not None:
+            await coordinator.stop()
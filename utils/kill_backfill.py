@@ -0,0 +1,104 @@
+"""
+Resumable backfills of kill aggregates
+
+Aggregates that are kept up to date as kills are ingested (weapon stats,
+activity rollups) are built for existing data by replaying the kills
+collection once. The progress of each backfill is stored in the migrations
+collection:
+
+- the newest kill _id when the backfill started, so kills ingested after
+  that are left to the live paths and never counted twice
+- the _id of the last replayed kill, so a restart resumes where it stopped
+- whether the backfill has completed, so it never runs again
+"""
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Replays one server's batch of kills into an aggregate
+ReplayFunc = Callable[[str, List[Dict[str, Any]]], Awaitable[Any]]
+
+
+async def run_kill_backfill(
+    db,
+    name: str,
+    replay: ReplayFunc,
+    projection: Dict[str, int],
+    query: Optional[Dict[str, Any]] = None,
+    target: Optional[str] = None,
+    batch_size: int = 5000
+) -> int:
+    """Replay the kills collection into an aggregate, resuming from the last checkpoint
+
+    Args:
+        db: Motor database
+        name: Backfill name (the migration document ID)
+        replay: Coroutine function called with (server_id, kills) per batch
+        projection: Kill fields the replay needs
+        query: Additional filter on the replayed kills (optional)
+        target: Aggregate collection; if it has documents but no backfill
+            was ever recorded, it was built before progress was tracked and
+            is not replayed again (optional)
+        batch_size: Number of kills replayed per checkpoint
+
+    Returns:
+        int: Number of kills replayed by this run
+    """
+    marker = await db.migrations.find_one({"_id": name})
+    if marker is not None and marker.get("completed_at") is not None:
+        return 0
+
+    if marker is None and target is not None and await db[target].find_one({}, {"_id": 1}) is not None:
+        now = datetime.utcnow()
+        await db.migrations.insert_one({"_id": name, "started_at": now, "completed_at": now})
+        logger.info(f"Recorded the existing {target} as a completed {name} backfill")
+        return 0
+
+    if marker is None:
+        newest = await db.kills.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        marker = {
+            "_id": name,
+            "until_id": newest["_id"] if newest else None,
+            "last_id": None,
+            "replayed": 0,
+            "started_at": datetime.utcnow(),
+            "completed_at": None,
+        }
+        await db.migrations.insert_one(marker)
+        logger.info(f"Starting {name} backfill")
+    else:
+        logger.info(f"Resuming {name} backfill after {marker.get('replayed', 0)} kills")
+
+    replayed = 0
+    if marker.get("until_id") is not None:
+        id_range = {"$lte": marker["until_id"]}
+        if marker.get("last_id") is not None:
+            id_range["$gt"] = marker["last_id"]
+        kill_query = {**(query or {}), "_id": id_range}
+        projection = {**projection, "server_id": 1}
+
+        while True:
+            batch = await db.kills.find(kill_query, projection).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                break
+
+            by_server: Dict[str, List[Dict[str, Any]]] = {}
+            for kill in batch:
+                by_server.setdefault(kill.get("server_id"), []).append(kill)
+            for server_id, kills in by_server.items():
+                await replay(server_id, kills)
+
+            # A crash before this checkpoint replays at most this batch again
+            replayed += len(batch)
+            id_range["$gt"] = batch[-1]["_id"]
+            await db.migrations.update_one(
+                {"_id": name},
+                {"$set": {"last_id": batch[-1]["_id"], "updated_at": datetime.utcnow()},
+                 "$inc": {"replayed": len(batch)}}
+            )
+
+    await db.migrations.update_one({"_id": name}, {"$set": {"completed_at": datetime.utcnow()}})
+    logger.info(f"Completed {name} backfill ({marker.get('replayed', 0) + replayed} kills)")
+    return replayed
@@ -0,0 +1,263 @@
+"""
+Batched killfeed dispatcher for Emeralds Killfeed PvP Statistics Bot
+
+Kill embeds are queued per channel and sent by one worker per channel.
+Each worker packs up to 10 embeds (Discord's per-message limit) into a
+single message, so a burst of kills costs a handful of requests instead of
+one per kill. discord.py already waits on the X-RateLimit bucket headers of
+every request; when a 429 still gets through, the worker backs off for the
+Retry-After period and resends the same batch.
+
+Icons are referenced by their uploaded URL (see utils.embed_icons), so a
+file is only attached when its URL is unknown or about to expire.
+
+Queue depth, enqueue-to-send latency and rate limit counts are tracked so
+killfeed lag can be observed.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+import discord
+
+from utils.embed_icons import add_icon_to_embed, get_icon_url, remember_icon_url
+
+logger = logging.getLogger(__name__)
+
+# Discord allows at most 10 embeds per message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# How long a worker waits for more kills before sending a partial batch (seconds)
+DEFAULT_BATCH_WINDOW = 1.0
+
+# Maximum number of queued embeds per channel before the oldest are dropped
+MAX_QUEUE_SIZE = 500
+
+# Fallback backoff when a 429 carries no retry-after value (seconds)
+DEFAULT_RETRY_AFTER = 5.0
+
+# Number of send attempts per batch
+MAX_SEND_ATTEMPTS = 3
+
+
+class KillfeedDispatcher:
+    """Per-channel batching sender for killfeed embeds"""
+
+    def __init__(self, batch_window: float = DEFAULT_BATCH_WINDOW, max_queue_size: int = MAX_QUEUE_SIZE):
+        """Initialize killfeed dispatcher
+
+        Args:
+            batch_window: Seconds to wait for more embeds before sending
+            max_queue_size: Maximum queued embeds per channel
+        """
+        self.batch_window = batch_window
+        self.max_queue_size = max_queue_size
+
+        self._queues: Dict[int, deque] = {}
+        self._channels: Dict[int, Any] = {}
+        self._wakeups: Dict[int, asyncio.Event] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._closed = False
+
+        self.stats = {
+            "enqueued": 0,
+            "embeds_sent": 0,
+            "messages_sent": 0,
+            "dropped": 0,
+            "failed": 0,
+            "rate_limited": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "last_latency": 0.0,
+        }
+
+    async def enqueue(self, channel, embed: discord.Embed, icon_path: Optional[str] = None):
+        """Queue an embed for a channel
+
+        Args:
+            channel: Discord channel to send to
+            embed: Embed to send
+            icon_path: Local icon attached to the message (optional)
+        """
+        if self._closed:
+            logger.warning("Killfeed dispatcher is closed, dropping embed")
+            return
+
+        channel_id = channel.id
+        queue = self._queues.setdefault(channel_id, deque())
+        self._channels[channel_id] = channel
+
+        if len(queue) >= self.max_queue_size:
+            queue.popleft()
+            self.stats["dropped"] += 1
+            logger.warning(f"Killfeed queue for channel {channel_id} is full, dropped oldest embed")
+
+        queue.append((embed, icon_path, time.monotonic()))
+        self.stats["enqueued"] += 1
+
+        wakeup = self._wakeups.setdefault(channel_id, asyncio.Event())
+        wakeup.set()
+
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(self._run_channel(channel_id))
+
+    async def _run_channel(self, channel_id: int):
+        """Send queued embeds for one channel
+
+        Args:
+            channel_id: Discord channel ID
+        """
+        queue = self._queues[channel_id]
+        wakeup = self._wakeups[channel_id]
+
+        while not self._closed or queue:
+            if not queue:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=60)
+                except asyncio.TimeoutError:
+                    # Idle channel, let the worker exit
+                    if not queue:
+                        break
+                continue
+
+            # Give a burst a moment to fill the batch
+            if len(queue) < MAX_EMBEDS_PER_MESSAGE and not self._closed:
+                await asyncio.sleep(self.batch_window)
+
+            batch = [queue.popleft() for _ in range(min(len(queue), MAX_EMBEDS_PER_MESSAGE))]
+            await self._send_batch(self._channels[channel_id], batch)
+
+        self._workers.pop(channel_id, None)
+
+    async def _send_batch(self, channel, batch: List[tuple]):
+        """Send a batch of embeds as one message
+
+        Args:
+            channel: Discord channel
+            batch: List of (embed, icon_path, enqueued_at) tuples
+        """
+        embeds = [embed for embed, _, _ in batch]
+
+        # Reference uploaded icons by URL; only icons without one are attached
+        # Attached icons by path, with the first embed that shows each
+        icon_paths = {}
+        for position, (embed, icon_path, _) in enumerate(batch):
+            if not icon_path or not os.path.exists(icon_path):
+                continue
+            icon_url = await get_icon_url(icon_path)
+            if icon_url is not None:
+                embed.set_thumbnail(url=icon_url)
+            else:
+                add_icon_to_embed(embed, icon_path)
+                icon_paths.setdefault(icon_path, position)
+
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            # Files are consumed by a send, so build fresh ones per attempt
+            files = [discord.File(path, filename=os.path.basename(path)) for path in icon_paths]
+            try:
+                if files:
+                    message = await channel.send(embeds=embeds, files=files)
+                    for icon_path, position in icon_paths.items():
+                        remember_icon_url(icon_path, message, position)
+                else:
+                    await channel.send(embeds=embeds)
+                break
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == MAX_SEND_ATTEMPTS:
+                    self.stats["failed"] += len(batch)
+                    logger.error(f"Error sending killfeed batch to channel {channel.id}: {e}")
+                    return
+
+                self.stats["rate_limited"] += 1
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is None and getattr(e, "response", None) is not None:
+                    retry_after = e.response.headers.get("Retry-After")
+                retry_after = float(retry_after or DEFAULT_RETRY_AFTER)
+                logger.warning(f"Killfeed channel {channel.id} rate limited, retrying in {retry_after:.1f}s")
+                await asyncio.sleep(retry_after)
+            except Exception as e:
+                self.stats["failed"] += len(batch)
+                logger.error(f"Error sending killfeed batch to channel {channel.id}: {e}")
+                return
+
+        now = time.monotonic()
+        for _, _, enqueued_at in batch:
+            latency = now - enqueued_at
+            self.stats["total_latency"] += latency
+            self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+            self.stats["last_latency"] = latency
+        self.stats["embeds_sent"] += len(batch)
+        self.stats["messages_sent"] += 1
+
+    def get_queue_depths(self) -> Dict[int, int]:
+        """Get the number of queued embeds per channel
+
+        Returns:
+            Dict mapping channel ID to queue depth
+        """
+        return {channel_id: len(queue) for channel_id, queue in self._queues.items() if queue}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatcher metrics
+
+        Returns:
+            Dict with counters, latency figures (seconds) and queue depths
+        """
+        depths = self.get_queue_depths()
+        sent = self.stats["embeds_sent"]
+        return {
+            **self.stats,
+            "avg_latency": self.stats["total_latency"] / sent if sent else 0.0,
+            "embeds_per_message": sent / self.stats["messages_sent"] if self.stats["messages_sent"] else 0.0,
+            "queued": sum(depths.values()),
+            "max_queue_depth": max(depths.values(), default=0),
+            "active_channels": len(self._workers),
+        }
+
+    async def close(self, timeout: float = 10.0):
+        """Flush queued embeds and stop all workers
+
+        Args:
+            timeout: Seconds to wait for queues to drain
+        """
+        self._closed = True
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+
+        workers = list(self._workers.values())
+        if workers:
+            done, pending = await asyncio.wait(workers, timeout=timeout)
+            for task in pending:
+                task.cancel()
+
+
+# Global dispatcher instance
+_killfeed_dispatcher = None
+
+
+def get_killfeed_dispatcher() -> KillfeedDispatcher:
+    """Get the global killfeed dispatcher
+
+    Returns:
+        KillfeedDispatcher: Killfeed dispatcher instance
+    """
+    global _killfeed_dispatcher
+
+    if _killfeed_dispatcher is None:
+        _killfeed_dispatcher = KillfeedDispatcher()
+
+    return _killfeed_dispatcher
+
+
+async def shutdown_killfeed_dispatcher():
+    """Flush and discard the global killfeed dispatcher"""
+    global _killfeed_dispatcher
+
+    if _killfeed_dispatcher is not None:
+        await _killfeed_dispatcher.close()
+        _killfeed_dispatcher = None
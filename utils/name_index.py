@@ -0,0 +1,420 @@
+"""
+Name index for autocomplete and name lookups
+
+Each game server gets an in-memory index of its player names: a sorted array
+of lowercased names for prefix matches and a trigram index for substring
+and fuzzy matches. Indexes are loaded from the players collection the first
+time a server is looked up and are kept current by ingestion through
+note_player(), so autocomplete never has to query the database while
+Discord's 3 second budget is running.
+
+Weapon names come from the static tables in utils.weapon_stats and share
+the same index type.
+"""
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# How long a lookup waits for a server's index to load (seconds)
+PLAYER_INDEX_LOAD_TIMEOUT = 2.0
+
+# Minimum share of trigrams a name must have in common with the query to
+# count as a fuzzy match
+FUZZY_MATCH_THRESHOLD = 0.3
+
+# Names Discord shows per autocomplete response
+MAX_CHOICES = 25
+
+
+def _normalize(name: str) -> str:
+    """Normalize a name for matching
+
+    Args:
+        name: Name to normalize
+
+    Returns:
+        str: Lowercased name without surrounding whitespace
+    """
+    return str(name).strip().lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the trigrams of a normalized string
+
+    Args:
+        text: Normalized string
+
+    Returns:
+        Set of 3 character substrings
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """Prefix and trigram index over a set of names"""
+
+    def __init__(self):
+        """Initialize an empty name index"""
+        self._names: Dict[Any, str] = {}
+        self._sorted: List[Tuple[str, str, Any]] = []
+        self._trigrams: Dict[str, Set[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, key) -> bool:
+        return key in self._names
+
+    def add(self, key, name: str):
+        """Add a name or replace the name stored under a key
+
+        Args:
+            key: Unique key for the name (e.g. player ID)
+            name: Display name
+        """
+        if not name:
+            return
+
+        name = str(name).strip()
+        if self._names.get(key) == name:
+            return
+
+        self.remove(key)
+
+        normalized = _normalize(name)
+        self._names[key] = name
+        insort(self._sorted, (normalized, str(key), key))
+        for trigram in _trigrams(normalized):
+            self._trigrams.setdefault(trigram, set()).add(key)
+
+    def remove(self, key):
+        """Remove the name stored under a key
+
+        Args:
+            key: Key to remove
+        """
+        name = self._names.pop(key, None)
+        if name is None:
+            return
+
+        normalized = _normalize(name)
+        entry = (normalized, str(key), key)
+        position = bisect_left(self._sorted, entry)
+        if position < len(self._sorted) and self._sorted[position] == entry:
+            del self._sorted[position]
+
+        for trigram in _trigrams(normalized):
+            keys = self._trigrams.get(trigram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._trigrams[trigram]
+
+    def get_name(self, key) -> Optional[str]:
+        """Get the name stored under a key
+
+        Args:
+            key: Key to look up
+
+        Returns:
+            str: Display name or None if not indexed
+        """
+        return self._names.get(key)
+
+    def find(self, name: str) -> Optional[Any]:
+        """Find the key of a name (case-insensitive exact match)
+
+        Args:
+            name: Name to find
+
+        Returns:
+            Key of the name or None if not indexed
+        """
+        normalized = _normalize(name)
+        position = bisect_left(self._sorted, (normalized,))
+        if position < len(self._sorted) and self._sorted[position][0] == normalized:
+            return self._sorted[position][2]
+        return None
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> List[Tuple[Any, str]]:
+        """Search names by prefix, substring and similarity
+
+        Exact matches come first, then prefix matches in alphabetical order,
+        then other names containing the query, then names sharing enough
+        trigrams with the query to be likely misspellings.
+
+        Args:
+            query: Text typed by the user
+            limit: Maximum number of results
+
+        Returns:
+            List of (key, name) tuples
+        """
+        normalized = _normalize(query or "")
+        if not normalized:
+            return [(key, self._names[key]) for _, _, key in self._sorted[:limit]]
+
+        results: List[Any] = []
+        seen: Set[Any] = set()
+
+        def collect(key) -> bool:
+            if key not in seen:
+                seen.add(key)
+                results.append(key)
+            return len(results) >= limit
+
+        # Exact and prefix matches are a contiguous run of the sorted array
+        position = bisect_left(self._sorted, (normalized,))
+        while position < len(self._sorted) and self._sorted[position][0].startswith(normalized):
+            if collect(self._sorted[position][2]):
+                return self._results(results)
+            position += 1
+
+        query_trigrams = _trigrams(normalized)
+        if not query_trigrams:
+            # Too short for trigrams, scan for the substring instead
+            for name, _, key in self._sorted:
+                if normalized in name and collect(key):
+                    break
+            return self._results(results)
+
+        # Substring matches contain every trigram of the query
+        candidates = None
+        for trigram in sorted(query_trigrams, key=lambda t: len(self._trigrams.get(t, ()))):
+            keys = self._trigrams.get(trigram)
+            if not keys:
+                candidates = set()
+                break
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                break
+
+        substring_matches = [
+            key for key in candidates or ()
+            if key not in seen and normalized in _normalize(self._names[key])
+        ]
+        for key in sorted(substring_matches, key=lambda k: _normalize(self._names[k])):
+            if collect(key):
+                return self._results(results)
+
+        # Fuzzy matches share a large part of the query's trigrams
+        shared = Counter()
+        for trigram in query_trigrams:
+            for key in self._trigrams.get(trigram, ()):
+                if key not in seen:
+                    shared[key] += 1
+
+        scored = []
+        for key, count in shared.items():
+            name_trigrams = len(_trigrams(_normalize(self._names[key])))
+            similarity = count / (len(query_trigrams) + name_trigrams - count)
+            if similarity >= FUZZY_MATCH_THRESHOLD:
+                scored.append((-similarity, _normalize(self._names[key]), key))
+
+        for _, _, key in sorted(scored, key=lambda s: s[:2]):
+            if collect(key):
+                break
+
+        return self._results(results)
+
+    def _results(self, keys: List[Any]) -> List[Tuple[Any, str]]:
+        return [(key, self._names[key]) for key in keys]
+
+
+# Player name indexes by server ID
+_player_indexes: Dict[str, NameIndex] = {}
+
+# Player name indexes that are still loading, by server ID
+_loading_indexes: Dict[str, NameIndex] = {}
+_load_tasks: Dict[str, asyncio.Task] = {}
+
+# Static weapon name index
+_weapon_index: Optional[NameIndex] = None
+
+
+async def _load_player_index(server_id: str, index: NameIndex) -> NameIndex:
+    """Fill a player name index from the players collection
+
+    Args:
+        server_id: Server ID
+        index: Index to fill
+
+    Returns:
+        NameIndex: The filled index
+    """
+    from utils.database import get_db
+
+    try:
+        db = await get_db()
+        # Names noted by ingestion while loading are newer than the database read
+        noted = set(index._names)
+
+        cursor = db.players.find(
+            {"server_id": server_id},
+            {"player_id": 1, "name": 1, "player_name": 1}
+        )
+        async for doc in cursor:
+            player_id = doc.get("player_id")
+            name = doc.get("name") or doc.get("player_name")
+            if not player_id or not name or player_id in noted:
+                continue
+            index.add(player_id, name)
+
+        _player_indexes[server_id] = index
+        logger.info(f"Loaded name index for server {server_id} with {len(index)} players")
+        return index
+    finally:
+        _loading_indexes.pop(server_id, None)
+        _load_tasks.pop(server_id, None)
+
+
+async def get_player_index(server_id: str, timeout: float = PLAYER_INDEX_LOAD_TIMEOUT) -> Optional[NameIndex]:
+    """Get the player name index for a server, loading it if needed
+
+    Args:
+        server_id: Server ID
+        timeout: Seconds to wait for a load in progress
+
+    Returns:
+        NameIndex: Player name index or None if it is still loading
+    """
+    server_id = str(server_id)
+    index = _player_indexes.get(server_id)
+    if index is not None:
+        return index
+
+    task = _load_tasks.get(server_id)
+    if task is None:
+        loading = _loading_indexes.setdefault(server_id, NameIndex())
+        task = asyncio.create_task(_load_player_index(server_id, loading))
+        _load_tasks[server_id] = task
+
+    try:
+        # Shield the load so a timed out lookup leaves it running for the next one
+        return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Name index for server {server_id} is still loading")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading name index for server {server_id}: {e}")
+        return None
+
+
+def note_player(server_id: str, player_id: str, name: str):
+    """Record a created or renamed player in the server's name index
+
+    Servers whose index has not been loaded yet are skipped; their index
+    picks the player up from the database when it loads.
+
+    Args:
+        server_id: Server ID
+        player_id: Player ID
+        name: Current player name
+    """
+    if not server_id or not player_id or not name:
+        return
+
+    server_id = str(server_id)
+    index = _player_indexes.get(server_id) or _loading_indexes.get(server_id)
+    if index is not None:
+        index.add(player_id, name)
+
+
+def forget_player(server_id: str, player_id: str):
+    """Remove a player from the server's name index
+
+    Args:
+        server_id: Server ID
+        player_id: Player ID
+    """
+    index = _player_indexes.get(str(server_id))
+    if index is not None:
+        index.remove(player_id)
+
+
+async def resolve_player(server_id: str, name: str) -> Optional[Tuple[str, str]]:
+    """Resolve a typed player name to a player
+
+    Only an exact name (case-insensitive) or player ID matches; fuzzy
+    matches are for autocomplete suggestions, never for picking a player.
+
+    Args:
+        server_id: Server ID
+        name: Player name or ID as typed
+
+    Returns:
+        Tuple of (player_id, player_name) or None if no player matches
+    """
+    index = await get_player_index(server_id)
+    if index is None or not name:
+        return None
+
+    player_id = index.find(name)
+    if player_id is None:
+        # Accept an ID picked from autocomplete or typed directly
+        if name not in index:
+            return None
+        player_id = name
+
+    return player_id, index.get_name(player_id)
+
+
+async def resolve_player_id(server_id: str, name: str) -> str:
+    """Resolve a typed player name to a player ID
+
+    Args:
+        server_id: Server ID
+        name: Player name or ID as typed
+
+    Returns:
+        str: Matching player ID, or the input unchanged when nothing matches
+    """
+    player = await resolve_player(server_id, name)
+    return player[0] if player else name
+
+
+def get_weapon_index() -> NameIndex:
+    """Get the weapon name index
+
+    Returns:
+        NameIndex: Index of known weapon names (death types excluded)
+    """
+    global _weapon_index
+
+    if _weapon_index is None:
+        from utils.weapon_stats import WEAPON_CATEGORIES, WEAPON_DETAILS
+
+        index = NameIndex()
+        death_types = set(WEAPON_CATEGORIES.get("death_types", []))
+        for category, weapons in WEAPON_CATEGORIES.items():
+            if category != "death_types":
+                for weapon in weapons:
+                    index.add(weapon, weapon)
+        for weapon in WEAPON_DETAILS:
+            if weapon and weapon not in death_types:
+                index.add(weapon, weapon)
+
+        _weapon_index = index
+
+    return _weapon_index
+
+
+def search_names(query: str, names: Dict[Any, str], limit: int = MAX_CHOICES) -> List[Tuple[Any, str]]:
+    """Rank a small set of names the same way as the cached indexes
+
+    Args:
+        query: Text typed by the user
+        names: Dict mapping keys to names
+        limit: Maximum number of results
+
+    Returns:
+        List of (key, name) tuples
+    """
+    index = NameIndex()
+    for key, name in names.items():
+        index.add(key, name)
+    return index.search(query, limit=limit)
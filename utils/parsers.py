@@ -19,10 +19,10 @@ CSVParser = EnhancedCSVParser
 
 # Expose the normalize_weapon_name method directly for backward compatibility
 def normalize_weapon_name(weapon: str) -> str:
-    """Normalize weapon names to ensure consistency - forwarded to enhanced parser"""
-    return CSVParser.normalize_weapon_name(weapon)
+    """Normalize weapon names to ensure consistency"""
+    return LegacyCSVParser.normalize_weapon_name(weapon)
 
-# Legacy CSVParser for reference only (not used)
+# Line-based parser for the live killfeed (sets is_suicide and suicide_type)
 class LegacyCSVParser:
     """Parser for CSV kill data files"""
     
@@ -365,7 +365,7 @@ class LegacyCSVParser:
             if not line.strip():
                 continue
                 
-            kill_event = CSVParser.parse_kill_line(line)
+            kill_event = LegacyCSVParser.parse_kill_line(line)
             if kill_event is not None:
                 kill_events.append(kill_event)
         
@@ -0,0 +1,214 @@
+"""
+Per-server cache of player identities for ingestion
+
+Every kill, suicide and connection names one or two players that must exist
+in the players collection. Each server gets an LRU of the players it has
+seen, mapping player ID to the document ID and the name last written, so
+known players cost no database round trip.
+
+Players missing from the cache are resolved in one batch: a single find
+for all of them, then one unordered bulk write that upserts the new
+players and refreshes names that changed.
+"""
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from utils.name_index import note_player
+
+logger = logging.getLogger(__name__)
+
+# Players remembered per server
+PLAYER_CACHE_SIZE = 20000
+
+
+class PlayerIdentityCache:
+    """LRU of player ID -> (document ID, name) for one server"""
+
+    def __init__(self, server_id: str, max_size: int = PLAYER_CACHE_SIZE):
+        """Initialize player identity cache
+
+        Args:
+            server_id: Server ID
+            max_size: Maximum number of players remembered
+        """
+        self.server_id = server_id
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "renamed": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, player_id: str) -> Optional[Tuple[Any, str]]:
+        """Get a cached player identity
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            Tuple of (document ID, name) or None if the player is not cached
+        """
+        entry = self._entries.get(player_id)
+        if entry is not None:
+            self._entries.move_to_end(player_id)
+        return entry
+
+    def put(self, player_id: str, doc_id: Any, name: str):
+        """Remember a player identity
+
+        Args:
+            player_id: Player ID
+            doc_id: Player document ID
+            name: Player name as stored
+        """
+        self._entries[player_id] = (doc_id, name)
+        self._entries.move_to_end(player_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def forget(self, player_id: str):
+        """Drop a player from the cache
+
+        Args:
+            player_id: Player ID
+        """
+        self._entries.pop(player_id, None)
+
+    async def resolve(self, db, players: Dict[str, Optional[str]]) -> Dict[str, Tuple[Any, str]]:
+        """Get the identities of players, creating and renaming them as needed
+
+        Args:
+            db: Database connection
+            players: Dict mapping player ID to the current name (None if unknown)
+
+        Returns:
+            Dict mapping player ID to (document ID, name)
+        """
+        resolved = {}
+        renames = {}
+        missing = {}
+
+        for player_id, name in players.items():
+            entry = self.get(player_id)
+            if entry is None:
+                missing[player_id] = name
+                continue
+            self.stats["hits"] += 1
+            resolved[player_id] = entry
+            if name and name != entry[1]:
+                renames[player_id] = name
+
+        if missing:
+            self.stats["misses"] += len(missing)
+            cursor = db.players.find(
+                {"player_id": {"$in": list(missing)}},
+                {"player_id": 1, "name": 1, "player_name": 1}
+            )
+            async for doc in cursor:
+                player_id = doc["player_id"]
+                stored_name = doc.get("name") or doc.get("player_name") or "Unknown"
+                resolved[player_id] = (doc["_id"], stored_name)
+                name = missing.pop(player_id)
+                if name and name != stored_name:
+                    renames[player_id] = name
+
+        if not missing and not renames:
+            for player_id, (doc_id, name) in resolved.items():
+                self.put(player_id, doc_id, name)
+            return resolved
+
+        # Local import to avoid circular references
+        from models.player import Player
+
+        now = datetime.utcnow()
+        operations = []
+        created = list(missing)
+
+        for player_id in created:
+            name = missing[player_id] or "Unknown"
+            document = Player(
+                player_id=player_id,
+                server_id=self.server_id,
+                name=name,
+                display_name=name,
+                last_seen=now,
+                created_at=now,
+                updated_at=now
+            ).to_document()
+            document.pop("player_id", None)
+            operations.append(UpdateOne({"player_id": player_id}, {"$setOnInsert": document}, upsert=True))
+
+        for player_id, name in renames.items():
+            operations.append(UpdateOne(
+                {"_id": resolved[player_id][0]},
+                {"$set": {"name": name, "display_name": name, "updated_at": now}}
+            ))
+
+        result = await db.players.bulk_write(operations, ordered=False)
+
+        # Players created by someone else in the meantime are read back
+        upserted_ids = result.upserted_ids or {}
+        raced = []
+        for i, player_id in enumerate(created):
+            if i in upserted_ids:
+                resolved[player_id] = (upserted_ids[i], missing[player_id] or "Unknown")
+                note_player(self.server_id, player_id, missing[player_id])
+            else:
+                raced.append(player_id)
+        if raced:
+            async for doc in db.players.find({"player_id": {"$in": raced}}, {"player_id": 1, "name": 1}):
+                resolved[doc["player_id"]] = (doc["_id"], doc.get("name") or "Unknown")
+
+        for player_id, name in renames.items():
+            resolved[player_id] = (resolved[player_id][0], name)
+            note_player(self.server_id, player_id, name)
+
+        self.stats["created"] += len(upserted_ids)
+        self.stats["renamed"] += len(renames)
+
+        for player_id, (doc_id, name) in resolved.items():
+            self.put(player_id, doc_id, name)
+        return resolved
+
+
+# Caches by server ID
+_player_caches: Dict[str, PlayerIdentityCache] = {}
+
+
+def get_player_cache(server_id: str) -> PlayerIdentityCache:
+    """Get a server's player identity cache, creating it on first use
+
+    Args:
+        server_id: Server ID
+
+    Returns:
+        PlayerIdentityCache: Cache instance
+    """
+    server_id = str(server_id)
+    cache = _player_caches.get(server_id)
+    if cache is None:
+        cache = PlayerIdentityCache(server_id)
+        _player_caches[server_id] = cache
+    return cache
+
+
+def get_player_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Get the counters of every player cache
+
+    Returns:
+        Dict mapping server ID to cache counters and size
+    """
+    return {
+        server_id: {**cache.stats, "size": len(cache)}
+        for server_id, cache in _player_caches.items()
+    }
@@ -0,0 +1,159 @@
+"""
+Adaptive poll scheduling for game server files
+
+A server's poll interval drops to its floor as soon as a poll returns new
+data and is halved while many players are online. Each poll that finds
+nothing new doubles the interval up to the ceiling, so an empty server
+settles at a few polls per hour while a busy one is checked at the floor
+rate. Floor and ceiling come from the premium tier of the server's guild
+(PREMIUM_TIERS[tier]["poll_interval"]).
+"""
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from config import PREMIUM_TIERS, BUSY_SERVER_PLAYERS
+
+logger = logging.getLogger(__name__)
+
+# Factor the interval grows by after a poll without new data
+BACKOFF_FACTOR = 2.0
+
+# How often a scheduler re-reads its guild's premium tier (seconds)
+TIER_REFRESH_INTERVAL = 600
+
+
+def get_poll_bounds(premium_tier: int) -> Tuple[float, float]:
+    """Get the poll interval floor and ceiling for a premium tier
+
+    Args:
+        premium_tier: Premium tier
+
+    Returns:
+        Tuple of (floor, ceiling) in seconds
+    """
+    tier_info = PREMIUM_TIERS.get(premium_tier) or PREMIUM_TIERS[0]
+    floor, ceiling = tier_info.get("poll_interval", PREMIUM_TIERS[0]["poll_interval"])
+    return float(floor), float(max(floor, ceiling))
+
+
+class AdaptivePollScheduler:
+    """Poll interval that follows a server's activity"""
+
+    def __init__(self, premium_tier: int = 0):
+        """Initialize poll scheduler
+
+        Args:
+            premium_tier: Premium tier of the server's guild
+        """
+        self.set_premium_tier(premium_tier)
+        self.interval = self.floor
+        self.next_poll = 0.0
+        self.tier_checked_at = 0.0
+
+    def set_premium_tier(self, premium_tier: int):
+        """Apply the bounds of a premium tier
+
+        Args:
+            premium_tier: Premium tier
+        """
+        self.premium_tier = premium_tier
+        self.floor, self.ceiling = get_poll_bounds(premium_tier)
+        if hasattr(self, "interval"):
+            self.interval = min(max(self.interval, self.floor), self.ceiling)
+
+    def record(self, new_records: int, online_players: Optional[int] = None) -> float:
+        """Record the outcome of a poll and schedule the next one
+
+        Args:
+            new_records: Number of new records the poll returned
+            online_players: Players currently online, if known
+
+        Returns:
+            float: Seconds until the next poll
+        """
+        if new_records > 0:
+            self.interval = self.floor
+        elif online_players is not None and online_players >= BUSY_SERVER_PLAYERS:
+            self.interval = max(self.floor, self.interval / BACKOFF_FACTOR)
+        else:
+            self.interval = min(self.ceiling, self.interval * BACKOFF_FACTOR)
+
+        self.next_poll = time.monotonic() + self.interval
+        return self.interval
+
+    def is_due(self) -> bool:
+        """Check if the next poll is due
+
+        Returns:
+            bool: True if the server should be polled now
+        """
+        return time.monotonic() >= self.next_poll
+
+
+# Schedulers by (kind, server ID)
+_schedulers: Dict[Tuple[str, str], AdaptivePollScheduler] = {}
+
+
+async def get_premium_tier(db, server_id: str, guild_id: Optional[str] = None) -> int:
+    """Get the premium tier of the guild a server belongs to
+
+    Args:
+        db: Database connection
+        server_id: Server ID
+        guild_id: Guild ID (optional, looked up by server when missing)
+
+    Returns:
+        int: Premium tier (0 if the guild is not found)
+    """
+    query = {"guild_id": guild_id} if guild_id else {"servers.server_id": server_id}
+    try:
+        guild = await db.guilds.find_one(query, {"premium_tier": 1})
+        return int(guild.get("premium_tier", 0)) if guild else 0
+    except (TypeError, ValueError):
+        return 0
+    except Exception as e:
+        logger.warning(f"Could not get premium tier for server {server_id}: {e}")
+        return 0
+
+
+async def get_poll_scheduler(db, kind: str, server_id: str, guild_id: Optional[str] = None) -> AdaptivePollScheduler:
+    """Get the poll scheduler of a server, refreshing its tier bounds when stale
+
+    Args:
+        db: Database connection
+        kind: What is polled (e.g. "ingestion", "csv", "logs")
+        server_id: Server ID
+        guild_id: Guild ID (optional)
+
+    Returns:
+        AdaptivePollScheduler: Scheduler for the server
+    """
+    key = (kind, str(server_id))
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        scheduler = AdaptivePollScheduler()
+        _schedulers[key] = scheduler
+
+    now = time.monotonic()
+    if now - scheduler.tier_checked_at >= TIER_REFRESH_INTERVAL:
+        scheduler.tier_checked_at = now
+        scheduler.set_premium_tier(await get_premium_tier(db, str(server_id), guild_id))
+
+    return scheduler
+
+
+def get_poll_intervals() -> Dict[str, Dict[str, float]]:
+    """Get the current interval of every scheduler
+
+    Returns:
+        Dict mapping "kind:server_id" to interval, floor and ceiling
+    """
+    return {
+        f"{kind}:{server_id}": {
+            "interval": scheduler.interval,
+            "floor": scheduler.floor,
+            "ceiling": scheduler.ceiling,
+        }
+        for (kind, server_id), scheduler in _schedulers.items()
+    }
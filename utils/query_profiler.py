@@ -0,0 +1,375 @@
+"""
+MongoDB query profiler for Emeralds Killfeed PvP Statistics Bot
+
+This module hooks into pymongo's command monitoring so that every Motor
+operation is measured automatically. It records:
+1. Per-collection and per-operation latency histograms
+2. Returned/affected document counts
+3. Slow-query samples
+4. Aggregated query shapes (filter keys with values stripped)
+
+Every completed command is also forwarded to DatabaseQueryOptimizer when
+the resource optimizer is available. It is imported lazily because it pulls
+in the monitoring stack, which itself depends on the database layer.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+# Default slow query threshold in milliseconds
+DEFAULT_SLOW_QUERY_THRESHOLD = 200
+
+# Number of slow query samples to keep
+MAX_SLOW_SAMPLES = 50
+
+# Commands that carry no collection or are driver housekeeping
+IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildinfo", "buildInfo",
+    "saslStart", "saslContinue", "getnonce", "authenticate", "endSessions",
+    "killCursors", "getLastError", "listCollections", "listIndexes",
+    "listDatabases", "serverStatus", "explain", "createIndexes",
+}
+
+# Where each command keeps its filter
+FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+
+def _shape(value: Any) -> Any:
+    """Reduce a filter document to its shape
+
+    Field names and query operators are kept, literal values are replaced
+    by 1 so that queries differing only in values collapse together.
+
+    Args:
+        value: Filter document or value
+
+    Returns:
+        Shape of the value
+    """
+    if isinstance(value, dict):
+        return {key: _shape(val) for key, val in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        # Logical operators ($and/$or) keep their sub-shapes, value lists collapse
+        if value and all(isinstance(item, dict) for item in value):
+            return [_shape(item) for item in value]
+        return 1
+    return 1
+
+
+def _extract_filter(command_name: str, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extract the query filter from a command document
+
+    Args:
+        command_name: Command name
+        command: Command document
+
+    Returns:
+        Filter document or None
+    """
+    field = FILTER_FIELDS.get(command_name)
+    if field is not None:
+        return command.get(field) or {}
+
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or []
+        if statements:
+            return statements[0].get("q") or {}
+        return {}
+
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        if pipeline and "$match" in pipeline[0]:
+            return pipeline[0]["$match"]
+        return {}
+
+    return None
+
+
+def _count_documents(command_name: str, reply: Dict[str, Any]) -> int:
+    """Count documents returned or affected by a command
+
+    Args:
+        command_name: Command name
+        reply: Server reply document
+
+    Returns:
+        int: Number of documents
+    """
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch")
+        if batch is None:
+            batch = cursor.get("nextBatch", [])
+        return len(batch)
+
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+
+    n = reply.get("n")
+    if isinstance(n, (int, float)):
+        return int(n)
+
+    return 0
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """
+    Command listener that profiles MongoDB operations
+
+    Listener callbacks are invoked from Motor's worker threads, so all
+    shared state is guarded by a lock.
+    """
+
+    def __init__(self, optimizer=None, slow_query_threshold: float = DEFAULT_SLOW_QUERY_THRESHOLD):
+        """Initialize query profiler
+
+        Args:
+            optimizer: DatabaseQueryOptimizer to feed (created lazily if None)
+            slow_query_threshold: Slow query threshold in milliseconds
+        """
+        self._optimizer = optimizer
+        self._optimizer_unavailable = False
+        self.slow_query_threshold = slow_query_threshold
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[Any, int], Dict[str, Any]] = {}
+        self._operations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._shapes: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._slow_samples: deque = deque(maxlen=MAX_SLOW_SAMPLES)
+        self.started_at = time.time()
+
+    @property
+    def optimizer(self):
+        """Get the query optimizer fed by this profiler
+
+        Returns:
+            DatabaseQueryOptimizer or None if the resource optimizer can't be imported
+        """
+        if self._optimizer is None and not self._optimizer_unavailable:
+            try:
+                from utils.resource_optimizer import DatabaseQueryOptimizer
+                self._optimizer = DatabaseQueryOptimizer()
+                self._optimizer.slow_query_threshold = self.slow_query_threshold
+            except Exception as e:
+                logger.warning(f"Query optimizer not available, profiling only: {e}")
+                self._optimizer_unavailable = True
+
+        return self._optimizer
+
+    def started(self, event):
+        """Record a command start"""
+        command_name = event.command_name
+        if command_name in IGNORED_COMMANDS:
+            return
+
+        try:
+            command = event.command
+            if command_name == "getMore":
+                collection = command.get("collection")
+            else:
+                collection = command.get(command_name)
+
+            if not isinstance(collection, str):
+                return
+
+            query = _extract_filter(command_name, command)
+            projection = command.get("projection") if command_name == "find" else None
+
+            with self._lock:
+                self._pending[(event.connection_id, event.request_id)] = {
+                    "collection": collection,
+                    "operation": command_name,
+                    "query": query,
+                    "projection": projection,
+                    "sort": command.get("sort") if command_name == "find" else None,
+                }
+        except Exception as e:
+            logger.debug(f"Error recording command start: {e}")
+
+    def succeeded(self, event):
+        """Record a successful command"""
+        self._finish(event, event.reply, failed=False)
+
+    def failed(self, event):
+        """Record a failed command"""
+        self._finish(event, None, failed=True)
+
+    def _finish(self, event, reply: Optional[Dict[str, Any]], failed: bool):
+        """Record a completed command
+
+        Args:
+            event: Succeeded or failed command event
+            reply: Server reply (None for failures)
+            failed: Whether the command failed
+        """
+        with self._lock:
+            info = self._pending.pop((event.connection_id, event.request_id), None)
+        if info is None:
+            return
+
+        try:
+            duration = event.duration_micros / 1000.0
+            documents = _count_documents(info["operation"], reply) if reply else 0
+            query = info["query"]
+            shape = str(_shape(query)) if query is not None else "-"
+
+            with self._lock:
+                op_stats = self._operations.setdefault(
+                    (info["collection"], info["operation"]),
+                    {
+                        "count": 0,
+                        "failures": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                        "documents": 0,
+                        "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    }
+                )
+                op_stats["count"] += 1
+                op_stats["total_ms"] += duration
+                op_stats["max_ms"] = max(op_stats["max_ms"], duration)
+                op_stats["documents"] += documents
+                op_stats["histogram"][self._bucket(duration)] += 1
+                if failed:
+                    op_stats["failures"] += 1
+
+                shape_stats = self._shapes.setdefault(
+                    (info["collection"], info["operation"], shape),
+                    {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "documents": 0}
+                )
+                shape_stats["count"] += 1
+                shape_stats["total_ms"] += duration
+                shape_stats["max_ms"] = max(shape_stats["max_ms"], duration)
+                shape_stats["documents"] += documents
+
+                if duration > self.slow_query_threshold:
+                    self._slow_samples.append({
+                        "timestamp": time.time(),
+                        "collection": info["collection"],
+                        "operation": info["operation"],
+                        "shape": shape,
+                        "duration_ms": duration,
+                        "documents": documents,
+                    })
+
+                optimizer = self.optimizer
+                if optimizer is not None:
+                    optimizer.record_query(
+                        info["collection"], info["operation"], query or {},
+                        info["projection"], duration, sort=info["sort"]
+                    )
+        except Exception as e:
+            logger.debug(f"Error recording command completion: {e}")
+
+    @staticmethod
+    def _bucket(duration: float) -> int:
+        """Get the histogram bucket index for a duration
+
+        Args:
+            duration: Duration in milliseconds
+
+        Returns:
+            int: Bucket index
+        """
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration <= bound:
+                return index
+        return len(LATENCY_BUCKETS_MS)
+
+    def get_top_shapes(self, limit: int = 10, sort_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """Get the most costly query shapes
+
+        Args:
+            limit: Maximum number of shapes to return
+            sort_by: Sort key (total_ms, count, max_ms or documents)
+
+        Returns:
+            List of query shape statistics
+        """
+        with self._lock:
+            shapes = [
+                {
+                    "collection": collection,
+                    "operation": operation,
+                    "shape": shape,
+                    "avg_ms": stats["total_ms"] / stats["count"] if stats["count"] else 0,
+                    **stats
+                }
+                for (collection, operation, shape), stats in self._shapes.items()
+            ]
+
+        shapes.sort(key=lambda s: s.get(sort_by, 0), reverse=True)
+        return shapes[:limit]
+
+    def get_operation_stats(self) -> List[Dict[str, Any]]:
+        """Get per-collection, per-operation statistics
+
+        Returns:
+            List of operation statistics sorted by total time
+        """
+        with self._lock:
+            stats = [
+                {
+                    "collection": collection,
+                    "operation": operation,
+                    "avg_ms": op["total_ms"] / op["count"] if op["count"] else 0,
+                    "histogram": dict(zip(
+                        [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"],
+                        op["histogram"]
+                    )),
+                    **{k: v for k, v in op.items() if k != "histogram"}
+                }
+                for (collection, operation), op in self._operations.items()
+            ]
+
+        stats.sort(key=lambda s: s["total_ms"], reverse=True)
+        return stats
+
+    def get_slow_samples(self) -> List[Dict[str, Any]]:
+        """Get recent slow query samples
+
+        Returns:
+            List of slow query samples, newest first
+        """
+        with self._lock:
+            return list(reversed(self._slow_samples))
+
+    def reset(self):
+        """Reset all collected statistics"""
+        with self._lock:
+            self._operations.clear()
+            self._shapes.clear()
+            self._slow_samples.clear()
+            self.started_at = time.time()
+
+
+# Global profiler instance
+_query_profiler = None
+
+
+def get_query_profiler() -> QueryProfiler:
+    """Get the global query profiler
+
+    Returns:
+        QueryProfiler: Query profiler instance
+    """
+    global _query_profiler
+
+    if _query_profiler is None:
+        _query_profiler = QueryProfiler()
+
+    return _query_profiler
@@ -272,7 +272,7 @@ class ResourceOptimizer:
         check_result = await self.check_resources()
         
         # Skip if optimization is not None not needed and not forced
-        if not is not None check_result["needs_optimization"] and not force:
+        if not check_result["needs_optimization"] and not force:
             return {"success": False, "reason": "not_needed"}
             
         # Start optimization
@@ -717,6 +717,21 @@ class DatabaseQueryOptimizer:
             projection: Query projection
             duration: Query duration in milliseconds
         """
+        self.record_query(collection, operation, query, projection, duration)
+        
+    def record_query(self, collection: str, operation: str, query: Dict[str, Any],
+                     projection: Optional[Dict[str, Any]], duration: float,
+                     sort: Optional[Dict[str, Any]] = None):
+        """Record query execution (synchronous, safe to call from driver threads)
+        
+        Args:
+            collection: Collection name
+            operation: Operation type (find, update, etc.)
+            query: Query filter
+            projection: Query projection
+            duration: Query duration in milliseconds
+            sort: Query sort specification
+        """
         # Record query
         query_info = {
             "timestamp": datetime.utcnow(),
@@ -727,6 +742,8 @@ class DatabaseQueryOptimizer:
             "duration": duration,
             "is_slow": duration > self.slow_query_threshold
         }
+        if sort:
+            query_info["sort"] = sort
         
         self.query_history.append(query_info)
         
@@ -782,7 +799,7 @@ class DatabaseQueryOptimizer:
         # Check for query rewrite opportunity
         if query_info["operation"] == "find" and "sort" in query_info:
             # Check if querying is not None a large number of documents then sorting
-            if not is not None query_info["query"] and query_info["is_slow"]:
+            if not query_info["query"] and query_info["is_slow"]:
                 optimization["rewrite_query"] = True
                 optimization["message"] = "Add filter to reduce documents before sorting"
                 self.optimizations["query_rewritten"] += 1
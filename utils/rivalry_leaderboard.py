@@ -0,0 +1,235 @@
+"""
+In-memory rivalry leaderboards for busy servers
+
+A server gets a leaderboard the first time one of its rivalry rankings is
+read. It keeps the best LEADERBOARD_SIZE rivalry documents for each
+ranking (most kills, most intense, closest and most recent) and is updated
+with every rivalry document ingestion writes, so repeated /rivalries
+commands are answered from memory.
+
+A ranking whose member got worse while documents outside the leaderboard
+may now beat it is marked stale and reloaded with one indexed query on
+the next read. Leaderboards that nobody reads for IDLE_TIMEOUT seconds are
+dropped again.
+"""
+import bisect
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rivalries kept per ranking
+LEADERBOARD_SIZE = 25
+
+# Seconds without a read after which a server's leaderboard is dropped
+IDLE_TIMEOUT = 1800
+
+# Minimum total kills for a rivalry to rank as "closest"
+CLOSEST_MIN_KILLS = 10
+
+_EPOCH = datetime.min
+
+
+def _recency(doc: Dict[str, Any]) -> float:
+    last_kill_time = doc.get("last_kill_time")
+    if not isinstance(last_kill_time, datetime):
+        return 0.0
+    return (last_kill_time - _EPOCH).total_seconds()
+
+
+# Rankings as (sort key, qualifies); lower keys rank first
+RANKINGS: Dict[str, Tuple[Callable[[Dict[str, Any]], tuple], Callable[[Dict[str, Any]], bool]]] = {
+    "total_kills": (
+        lambda doc: (-doc.get("total_kills", 0), -_recency(doc)),
+        lambda doc: True,
+    ),
+    "intensity_score": (
+        lambda doc: (-doc.get("intensity_score", 0.0), -doc.get("total_kills", 0)),
+        lambda doc: True,
+    ),
+    "closest": (
+        lambda doc: (doc.get("kill_difference", 0), -doc.get("total_kills", 0)),
+        lambda doc: doc.get("total_kills", 0) >= CLOSEST_MIN_KILLS,
+    ),
+    "recent": (
+        lambda doc: (-_recency(doc), -doc.get("total_kills", 0)),
+        lambda doc: isinstance(doc.get("last_kill_time"), datetime),
+    ),
+}
+
+
+class _Ranking:
+    """Best documents of one ranking"""
+
+    def __init__(self, key: Callable[[Dict[str, Any]], tuple], qualifies: Callable[[Dict[str, Any]], bool]):
+        self.key = key
+        self.qualifies = qualifies
+        self.keys: List[tuple] = []
+        self.docs: List[Dict[str, Any]] = []
+        # True when every qualifying document is in the ranking
+        self.complete = False
+        self.loaded = False
+
+    def load(self, docs: List[Dict[str, Any]], size: int):
+        ranked = sorted((doc for doc in docs if self.qualifies(doc)), key=self.key)[:size]
+        self.keys = [self.key(doc) for doc in ranked]
+        self.docs = ranked
+        self.complete = len(docs) < size
+        self.loaded = True
+
+    def _remove(self, doc_id) -> Optional[tuple]:
+        for i, doc in enumerate(self.docs):
+            if doc.get("_id") == doc_id:
+                del self.docs[i]
+                return self.keys.pop(i)
+        return None
+
+    def update(self, doc: Dict[str, Any], size: int):
+        if not self.loaded:
+            return
+
+        old_key = self._remove(doc.get("_id"))
+        inserted = False
+        if self.qualifies(doc):
+            key = self.key(doc)
+            position = bisect.bisect_right(self.keys, key)
+            # Documents we don't hold all rank below the last one we do, and
+            # below this one's previous key if it was the last
+            fits = position < len(self.docs) or self.complete or (old_key is not None and key <= old_key)
+            if position < size and fits:
+                self.keys.insert(position, key)
+                self.docs.insert(position, doc)
+                inserted = True
+            else:
+                self.complete = False
+
+        if len(self.docs) > size:
+            self.keys.pop()
+            self.docs.pop()
+            self.complete = False
+
+        # A member that dropped out may rank below documents we don't hold
+        if old_key is not None and not inserted and not self.complete:
+            self.loaded = False
+
+    def get(self, limit: int, since: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
+        if not self.loaded:
+            return None
+
+        docs = self.docs
+        if since is not None:
+            docs = [doc for doc in docs if doc.get("last_kill_time") and doc["last_kill_time"] >= since]
+            # Rankings are by recency, so an old last member means nothing newer is missing
+            exhausted = not self.docs or not self.docs[-1].get("last_kill_time") or self.docs[-1]["last_kill_time"] < since
+            if len(docs) >= limit or self.complete or exhausted:
+                return docs[:limit]
+            return None
+
+        if len(docs) >= limit or self.complete:
+            return docs[:limit]
+        return None
+
+
+class RivalryLeaderboard:
+    """Rivalry rankings of one server"""
+
+    def __init__(self, server_id: str, size: int = LEADERBOARD_SIZE):
+        """Initialize rivalry leaderboard
+
+        Args:
+            server_id: Server ID
+            size: Rivalries kept per ranking
+        """
+        self.server_id = server_id
+        self.size = size
+        self.rankings = {name: _Ranking(key, qualifies) for name, (key, qualifies) in RANKINGS.items()}
+        self.last_read = time.monotonic()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "updates": 0,
+        }
+
+    def get(self, ranking: str, limit: int, since: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get the best rivalry documents of a ranking
+
+        Args:
+            ranking: Ranking name (total_kills, intensity_score, closest, recent)
+            limit: Maximum number of documents
+            since: Only include rivalries with a kill since this time (optional)
+
+        Returns:
+            List of rivalry documents, or None when the ranking must be loaded
+        """
+        self.last_read = time.monotonic()
+        docs = self.rankings[ranking].get(limit, since) if limit <= self.size else None
+        self.stats["hits" if docs is not None else "misses"] += 1
+        return docs
+
+    def load(self, ranking: str, docs: List[Dict[str, Any]]):
+        """Replace a ranking with documents read from the database
+
+        Args:
+            ranking: Ranking name
+            docs: The best documents of the ranking, at most size of them
+        """
+        self.rankings[ranking].load(docs, self.size)
+
+    def update(self, docs: List[Dict[str, Any]]):
+        """Apply rivalry documents written by ingestion
+
+        Args:
+            docs: Updated rivalry documents
+        """
+        for doc in docs:
+            for ranking in self.rankings.values():
+                ranking.update(doc, self.size)
+        self.stats["updates"] += len(docs)
+
+
+# Leaderboards by server ID
+_leaderboards: Dict[str, RivalryLeaderboard] = {}
+
+
+def get_rivalry_leaderboard(server_id: str, create: bool = True) -> Optional[RivalryLeaderboard]:
+    """Get a server's rivalry leaderboard
+
+    Args:
+        server_id: Server ID
+        create: Create the leaderboard if the server has none
+
+    Returns:
+        RivalryLeaderboard or None if the server has none and create is False
+    """
+    server_id = str(server_id)
+    leaderboard = _leaderboards.get(server_id)
+    if leaderboard is not None and not create and time.monotonic() - leaderboard.last_read > IDLE_TIMEOUT:
+        # Nobody reads it anymore; stop paying for updates
+        del _leaderboards[server_id]
+        return None
+
+    if leaderboard is None and create:
+        leaderboard = RivalryLeaderboard(server_id)
+        _leaderboards[server_id] = leaderboard
+    return leaderboard
+
+
+def drop_rivalry_leaderboard(server_id: str):
+    """Forget a server's leaderboard, e.g. after its rivalries were cleared
+
+    Args:
+        server_id: Server ID
+    """
+    _leaderboards.pop(str(server_id), None)
+
+
+def get_leaderboard_stats() -> Dict[str, Dict[str, int]]:
+    """Get hit and update counts of every leaderboard
+
+    Returns:
+        Dict mapping server ID to leaderboard counters
+    """
+    return {server_id: dict(leaderboard.stats) for server_id, leaderboard in _leaderboards.items()}
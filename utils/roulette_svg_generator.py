@@ -24,6 +24,12 @@ RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36
 # Cached wheel representations - basic string results to avoid regenerating
 wheel_cache: Dict[int, str] = {}
 
+# Cached compact wheel displays by highlighted number
+compact_wheel_cache: Dict[int, str] = {}
+
+# Cached spin animation frames by frame index
+spin_frame_cache: Dict[int, str] = {}
+
 # Emoji indicators for colors
 COLOR_INDICATORS = {
     "red": "🔴",
@@ -96,6 +102,8 @@ def generate_compact_wheel_display(highlight_number: Optional[int] = None) -> st
     # Default to 0 if no is not None highlight number provided
     if highlight_number is None:
         highlight_number = 0
+    if highlight_number in compact_wheel_cache:
+        return compact_wheel_cache[highlight_number]
     # Create a rectangular grid showing key numbers from the wheel
     display_lines = [
         "┏━━━━━━━━━━━━━━━━━━━━━━━┓",
@@ -128,7 +136,9 @@ def generate_compact_wheel_display(highlight_number: Optional[int] = None) -> st
         display_lines.append(row)
     
     display_lines.append("┗━━━━━━━━━━━━━━━━━━━━━━━┛")
-    return "\n".join(display_lines)
+    display = "\n".join(display_lines)
+    compact_wheel_cache[highlight_number] = display
+    return display
 
 def generate_result_display(result: Optional[int] = None) -> str:
     """Generate a visually appealing display for a roulette result
@@ -169,7 +179,7 @@ def generate_result_display(result: Optional[int] = None) -> str:
     
     # Add information about odd/even and high/low
     if result != 0:
-        odd_even = "ODD" if result is not None % 2 == 1 else "EVEN"
+        odd_even = "ODD" if result % 2 == 1 else "EVEN"
         high_low = "HIGH" if result > 18 else "LOW"
         display_lines.append(f"║     {odd_even} & {high_low} NUMBERS    ║")
     
@@ -190,7 +200,11 @@ def get_spin_animation_frame(frame_idx: int) -> str:
         Text representation of the animation frame
     """
     frame_idx = frame_idx % len(SPIN_FRAMES)
-    return "\n".join(SPIN_FRAMES[frame_idx])
+    frame = spin_frame_cache.get(frame_idx)
+    if frame is None:
+        frame = "\n".join(SPIN_FRAMES[frame_idx])
+        spin_frame_cache[frame_idx] = frame
+    return frame
 
 def get_neighboring_numbers(result: Optional[int] = None, count: int = 5) -> List[int]:
     """Get numbers neighboring the result on the wheel
@@ -244,4 +258,17 @@ def get_roulette_svg_as_data_url(result: Optional[int] = None) -> str:
     Returns:
         Emoji/ASCII art representation of the roulette wheel
     """
-    return generate_result_display(result)
\ No newline at end of file
+    return generate_result_display(result)
+
+def precompute_roulette() -> int:
+    """Render the result displays, wheel displays and spin frames of every outcome
+    
+    Returns:
+        int: Number of displays cached
+    """
+    for number in WHEEL_SEQUENCE:
+        generate_result_display(number)
+        generate_compact_wheel_display(number)
+    for frame_idx in range(len(SPIN_FRAMES)):
+        get_spin_animation_frame(frame_idx)
+    return len(wheel_cache) + len(compact_wheel_cache) + len(spin_frame_cache)
@@ -38,6 +38,142 @@ ACTIVE_OPERATIONS: Dict[str, Set[str]] = {}
 # Track operation timeouts to cleanup stuck operations
 OPERATION_TIMEOUTS: Dict[str, datetime] = {}
 
+# Newest CSV files per map directory checked by probe_csv_files()
+PROBE_NEWEST_FILES = 3
+
+# How long discovered CSV map directories are reused (seconds)
+CSV_DIRECTORY_REFRESH_INTERVAL = 600
+
+# Size of each read request of a pipelined download (bytes)
+DOWNLOAD_BLOCK_SIZE = 65536
+
+# Read requests kept in flight per file during a pipelined download
+DOWNLOAD_MAX_REQUESTS = 16
+
+# Files downloaded at once per connection by FilePrefetcher
+PREFETCH_FILES = 4
+
+
+class FileStatCache:
+    """Remembers the (size, mtime) of remote files each consumer last read
+
+    Consumers check a file's current stat against the cache before
+    downloading it and mark it once it has been processed, so unchanged
+    files are never downloaded twice by the same consumer.
+    """
+
+    def __init__(self):
+        """Initialize file stat cache"""
+        self._stats: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        self.stats = {"unchanged": 0, "changed": 0}
+
+    def has_changed(self, consumer: str, path: str, size: Any, mtime: Any) -> bool:
+        """Check if a file changed since a consumer last read it
+
+        Args:
+            consumer: Consumer key (e.g. "csv:<server_id>")
+            path: Remote file path
+            size: Current file size
+            mtime: Current modification time
+
+        Returns:
+            bool: True if the file is new or changed
+        """
+        changed = self._stats.get((consumer, path)) != (size, mtime)
+        self.stats["changed" if changed else "unchanged"] += 1
+        return changed
+
+    def mark(self, consumer: str, path: str, size: Any, mtime: Any):
+        """Record that a consumer read a file
+
+        Args:
+            consumer: Consumer key
+            path: Remote file path
+            size: File size that was read
+            mtime: Modification time that was read
+        """
+        self._stats[(consumer, path)] = (size, mtime)
+
+    def forget(self, consumer: str):
+        """Drop everything a consumer read, forcing full downloads
+
+        Args:
+            consumer: Consumer key
+        """
+        for key in [key for key in self._stats if key[0] == consumer]:
+            del self._stats[key]
+
+
+# Global file stat cache shared by all SFTP consumers
+_file_stat_cache = FileStatCache()
+
+
+def get_file_stat_cache() -> FileStatCache:
+    """Get the global file stat cache
+
+    Returns:
+        FileStatCache: File stat cache instance
+    """
+    return _file_stat_cache
+
+
+class FilePrefetcher:
+    """Downloads the next few files of a list while earlier ones are processed
+
+    Files are requested with get() in list order. Up to `window` downloads
+    run concurrently over the client's connection, so the transfer of the
+    following files overlaps with parsing the current one.
+    """
+
+    def __init__(self, client, paths: Sequence[str], window: int = PREFETCH_FILES):
+        """Initialize file prefetcher
+
+        Args:
+            client: SFTPClient or SFTPManager used for downloads
+            paths: Remote paths in the order they will be requested
+            window: Maximum number of downloads in flight
+        """
+        self._client = client
+        self._paths = list(paths)
+        self._window = max(1, window)
+        self._next = 0
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _fill(self):
+        """Start downloads until the window is full"""
+        while self._next < len(self._paths) and len(self._tasks) < self._window:
+            path = self._paths[self._next]
+            self._next += 1
+            if path not in self._tasks:
+                self._tasks[path] = asyncio.create_task(self._client.download_file(path))
+
+    async def get(self, path: str) -> Optional[bytes]:
+        """Get the contents of a file, downloading it now if it was not prefetched
+
+        Args:
+            path: Remote file path
+
+        Returns:
+            bytes: File contents or None if the download failed
+        """
+        self._fill()
+        task = self._tasks.pop(path, None)
+        if task is None:
+            return await self._client.download_file(path)
+
+        try:
+            return await task
+        finally:
+            self._fill()
+
+    def close(self):
+        """Cancel downloads that were not requested"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._next = len(self._paths)
+
+
 def with_operation_tracking(op_name: str, timeout_minutes: int = 5):
     """Decorator to track and prevent conflicting SFTP operations with timeout handling.
 
@@ -661,6 +797,33 @@ class SFTPManager:
         except Exception as e:
             logger.error(f"Failed to get file info for {path}: {e}")
             return None
+
+    async def stat_directory(self, directory: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get the attributes of every entry in a directory in one request
+
+        Args:
+            directory: Remote directory
+
+        Returns:
+            Dict mapping entry path to file information or None on error
+        """
+        if not self.client:
+            logger.error(f"SFTP client is missing when trying to stat directory: {directory}")
+            return None
+
+        return await self.client.stat_directory(directory)
+
+    def prefetch_files(self, remote_paths: Sequence[str], window: int = PREFETCH_FILES) -> FilePrefetcher:
+        """Create a prefetcher that downloads files ahead of their use
+
+        Args:
+            remote_paths: Remote paths in the order they will be requested
+            window: Maximum number of downloads in flight
+
+        Returns:
+            FilePrefetcher: Prefetcher for the paths
+        """
+        return FilePrefetcher(self, remote_paths, window)
             
     async def is_file(self, path: str) -> bool:
         """Check if a path is a file (not a directory) on the SFTP server
@@ -1349,6 +1512,10 @@ class SFTPManager:
         if not self.client:
             logger.error("Not connected when trying to download to memory")
             return None
+
+        # Our own client downloads with pipelined reads
+        if isinstance(self.client, SFTPClient):
+            return await self.client.download_file(path)
             
         # Try multiple methods to download file to memory
         try:
@@ -1619,6 +1786,10 @@ class SFTPClient:
         self.operation_count = 0
         self.last_activity = datetime.now()
 
+        # Map directories holding CSV files, found by get_csv_directories()
+        self._csv_directories: List[str] = []
+        self._csv_directories_found_at = 0.0
+
     @property
     def is_connected(self) -> bool:
         """Check if the client is connected and ready for operations
@@ -1992,17 +2163,14 @@ class SFTPClient:
             try:
                 import asyncssh
                 if isinstance(self._sftp_client, asyncssh.SFTPClient):
-                    logger.info(f"Detected AsyncSSH SFTP client, using optimized methods")
                     try:
-                        # Try the direct AsyncSSH method for reading files
-                        content = await self._sftp_client.readfile(remote_path)
+                        # Keep several read requests in flight instead of one at a time
+                        content = await self._read_range(remote_path)
                         self.last_activity = datetime.now()
-                        if isinstance(content, str):
-                            content = content.encode('utf-8')
-                        logger.info(f"Downloaded {remote_path} using AsyncSSH readfile ({len(content)} bytes)")
+                        logger.info(f"Downloaded {remote_path} using pipelined reads ({len(content)} bytes)")
                         return content
                     except Exception as ssh_err:
-                        logger.warning(f"AsyncSSH readfile failed: {ssh_err}, trying other methods")
+                        logger.warning(f"Pipelined download failed: {ssh_err}, trying other methods")
             except (ImportError, Exception) as e:
                 # If asyncssh isn't available or there's another error, continue with other methods
                 logger.debug(f"AsyncSSH special handling skipped: {e}")
@@ -2161,6 +2329,108 @@ class SFTPClient:
             logger.error(f"Failed to download file {remote_path}: {e}")
             return None
 
+    async def _read_range(self, remote_path: str, offset: int = 0, length: Optional[int] = None,
+                          block_size: int = DOWNLOAD_BLOCK_SIZE,
+                          max_requests: int = DOWNLOAD_MAX_REQUESTS) -> bytes:
+        """Read a byte range of a file with several read requests in flight
+
+        The range is split into blocks that are requested concurrently at
+        their offsets, so a download takes about size / (block_size *
+        max_requests) round trips instead of one round trip per block.
+
+        Args:
+            remote_path: Remote file path
+            offset: Byte offset to start at
+            length: Number of bytes to read (None reads to the end of the file)
+            block_size: Bytes per read request
+            max_requests: Maximum number of read requests in flight
+
+        Returns:
+            bytes: Data read (shorter than length if the file ends first)
+        """
+        async with self._sftp_client.open(remote_path, 'rb') as f:
+            if length is None:
+                attrs = await f.stat()
+                length = max(0, (attrs.size or 0) - offset)
+            end = offset + length
+            semaphore = asyncio.Semaphore(max(1, max_requests))
+
+            async def read_block(block_offset: int) -> bytes:
+                wanted = min(block_size, end - block_offset)
+                async with semaphore:
+                    data = await f.read(wanted, block_offset)
+                    # Servers may answer with fewer bytes than requested
+                    while data and len(data) < wanted:
+                        more = await f.read(wanted - len(data), block_offset + len(data))
+                        if not more:
+                            break
+                        data += more
+                return data or b""
+
+            blocks = await asyncio.gather(*(
+                read_block(block_offset) for block_offset in range(offset, end, block_size)
+            ))
+
+        return b"".join(blocks)
+
+    async def read_range(self, remote_path: str, offset: int = 0, length: Optional[int] = None) -> Optional[bytes]:
+        """Read a byte range of a file with pipelined reads
+
+        Args:
+            remote_path: Remote file path
+            offset: Byte offset to start at
+            length: Number of bytes to read (None reads to the end of the file)
+
+        Returns:
+            bytes: Data read or None if failed
+        """
+        await self.ensure_connected()
+
+        try:
+            if not self._sftp_client:
+                logger.error(f"SFTP client is missing when trying to read file {remote_path}")
+                return None
+
+            self.operation_count += 1
+            data = await self._read_range(remote_path, offset, length)
+            self.last_activity = datetime.now()
+            return data
+
+        except Exception as e:
+            logger.error(f"Failed to read {remote_path} from offset {offset}: {e}")
+            return None
+
+    async def download_files(self, remote_paths: Sequence[str], max_concurrent: int = PREFETCH_FILES) -> Dict[str, Optional[bytes]]:
+        """Download several files concurrently over this connection
+
+        Args:
+            remote_paths: Remote file paths
+            max_concurrent: Maximum number of files downloaded at once
+
+        Returns:
+            Dict mapping each path to its contents (None if its download failed)
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def download(path: str) -> Optional[bytes]:
+            async with semaphore:
+                return await self.download_file(path)
+
+        contents = await asyncio.gather(*(download(path) for path in remote_paths))
+        return dict(zip(remote_paths, contents))
+
+    def prefetch_files(self, remote_paths: Sequence[str], window: int = PREFETCH_FILES) -> FilePrefetcher:
+        """Create a prefetcher that downloads files ahead of their use
+
+        Args:
+            remote_paths: Remote paths in the order they will be requested
+            window: Maximum number of downloads in flight
+
+        Returns:
+            FilePrefetcher: Prefetcher for the paths
+        """
+        return FilePrefetcher(self, remote_paths, window)
+
     async def read_file_by_chunks(self, remote_path: str, chunk_size: int = 4096) -> Optional[List[bytes]]:
         """Read file by chunks
 
@@ -2178,13 +2448,10 @@ class SFTPClient:
                 logger.error(f"SFTP client is missing when trying to read file {remote_path} by chunks")
                 return None
 
-            chunks = []
-            async with self._sftp_client.open(remote_path, 'rb') as f:
-                while True:
-                    chunk = await f.read(chunk_size)
-                    if not chunk:
-                        break
-                    chunks.append(chunk)
+            # Download with pipelined reads, then split into the requested chunks
+            content = await self._read_range(remote_path)
+            self.last_activity = datetime.now()
+            chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
 
             logger.info(f"Read {remote_path} by chunks ({len(chunks)} chunks)")
             return chunks
@@ -3354,6 +3621,112 @@ class SFTPClient:
             return info["size"]
         return None
 
+    async def stat_directory(self, directory: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get the attributes of every entry in a directory in one request
+
+        Args:
+            directory: Remote directory
+
+        Returns:
+            Dict mapping entry path to file information (as get_file_info())
+            or None on error
+        """
+        await self.ensure_connected()
+
+        try:
+            if not self._sftp_client:
+                logger.error(f"SFTP client is missing when trying to stat directory {directory}")
+                return None
+
+            entries = await self._sftp_client.readdir(directory)
+            self.last_activity = datetime.now()
+            self.operation_count += 1
+
+            result = {}
+            for entry in entries:
+                if entry.filename in ('.', '..'):
+                    continue
+                attrs = entry.attrs
+                result[os.path.join(directory, entry.filename)] = {
+                    "size": attrs.size,
+                    "mtime": datetime.fromtimestamp(attrs.mtime or 0),
+                    "is_dir": attrs.type == 2,  # asyncssh.FILEXFER_TYPE_DIRECTORY = 2
+                    "is_file": attrs.type == 1,  # asyncssh.FILEXFER_TYPE_REGULAR = 1
+                    "st_mtime": attrs.mtime,
+                    "st_size": attrs.size,
+                }
+            return result
+        except Exception as e:
+            logger.error(f"Failed to stat directory {directory}: {e}")
+            return None
+
+    async def get_csv_directories(self, refresh: bool = False) -> List[str]:
+        """Get the map directories that hold kill CSV files
+
+        The full search of get_latest_csv_file() runs once; its result is
+        reused for CSV_DIRECTORY_REFRESH_INTERVAL seconds.
+
+        Args:
+            refresh: Search again even if directories are cached
+
+        Returns:
+            List of remote directories
+        """
+        if (not refresh and self._csv_directories
+                and time.monotonic() - self._csv_directories_found_at < CSV_DIRECTORY_REFRESH_INTERVAL):
+            return self._csv_directories
+
+        latest = await self.get_latest_csv_file()
+        if not latest:
+            self._csv_directories = []
+            return []
+
+        latest_dir = os.path.dirname(latest)
+        deathlogs_path = latest_dir if os.path.basename(latest_dir) == "deathlogs" else os.path.dirname(latest_dir)
+        directories = [latest_dir]
+
+        # Pick up the other map directories next to the one holding the newest file
+        if os.path.basename(deathlogs_path) == "deathlogs":
+            entries = await self.stat_directory(deathlogs_path) or {}
+            directories += sorted(path for path, info in entries.items() if info["is_dir"] and path != latest_dir)
+
+        self._csv_directories = directories
+        self._csv_directories_found_at = time.monotonic()
+        logger.debug(f"Found {len(directories)} CSV directories for server {self.server_id}")
+        return directories
+
+    async def probe_csv_files(self, newest: int = PROBE_NEWEST_FILES) -> List[Dict[str, Any]]:
+        """Stat the newest CSV files of every map directory
+
+        Each map directory costs a single readdir request returning names and
+        attributes together, so callers can compare sizes and modification
+        times against what they last read before downloading anything.
+
+        Args:
+            newest: Number of newest files to return per map directory
+
+        Returns:
+            List of file information dicts with a "path" key, newest first
+        """
+        for refresh in (False, True):
+            files = []
+            for directory in await self.get_csv_directories(refresh=refresh):
+                entries = await self.stat_directory(directory)
+                if not entries:
+                    continue
+                csv_paths = sorted(
+                    (path for path, info in entries.items() if path.lower().endswith(".csv") and not info["is_dir"]),
+                    key=os.path.basename,
+                    reverse=True
+                )[:newest]
+                files.extend(dict(entries[path], path=path) for path in csv_paths)
+
+            if files:
+                files.sort(key=lambda info: (os.path.basename(info["path"]), info["st_mtime"] or 0), reverse=True)
+                return files
+
+        return []
+
     @with_operation_tracking("get_latest_csv")
     @retryable(max_retries=2, delay=1.0, backoff=2.0, 
                exceptions=(asyncio.TimeoutError, ConnectionError, OSError))
@@ -1,7 +1,7 @@
 """
 Weapon categorization and statistics utilities for Deadside weapons
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 
 # Weapon categories based on Deadside game
 WEAPON_CATEGORIES = {
@@ -142,19 +142,28 @@ def analyze_player_weapon_stats(weapon_data: Dict[str, int]) -> Dict[str, Any]:
         )
     }
 
-def get_average_kill_distance(weapon: str, kills_data: List[Dict[str, Any]]) -> Optional[float]:
+def get_average_kill_distance(weapon: str, kills_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Optional[float]:
     """
     Calculate the average kill distance for a specific weapon
     
     Args:
         weapon: Weapon name
-        kills_data: List of kill data dictionaries
+        kills_data: Weapon stats document (see models.weapon_stats) or a
+            list of kill data dictionaries
         
     Returns:
-        Average kill distance or None if no is not None data
+        Average kill distance or None if there is no data
     """
-    if kills_data is None or len(kills_data) == 0:
+    if not kills_data:
         return None
+    
+    # Pre-aggregated weapon stats document: a single lookup
+    if isinstance(kills_data, dict):
+        from models.weapon_stats import weapon_key
+        entry = kills_data.get("weapons", {}).get(weapon_key(weapon))
+        if not entry or not entry.get("kills"):
+            return None
+        return round(entry.get("distance_sum", 0) / entry["kills"], 1)
         
     # Filter kills for the specific weapon
     weapon_kills = [kill for kill in kills_data if kill.get("weapon") == weapon]